@@ -34,6 +34,10 @@ class IntegrityException(DatabaseProxyException):
   def __init__(self,value):
     DatabaseProxyException.__init__(self,value)
 
+class ImportCancelled(ARMException):
+  def __init__(self,value):
+    ARMException.__init__(self,value)
+
 class RequirementDoesNotExist(ARMException):
   def __init__(self,value):
     ARMException.__init__(self,value)
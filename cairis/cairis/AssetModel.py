@@ -44,8 +44,7 @@ class AssetModel:
   def buildNode(self,dimName,objtName):
     objtUrl = dimName + '#' + objtName
     if (dimName == 'persona'):
-      objt = self.dbProxy.dimensionObject(objtName,'persona')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('persona',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName
         self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='ellipse',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
       else:
@@ -55,9 +54,8 @@ class AssetModel:
     elif (dimName == 'obstacleconcern'):
       self.theGraph.add_node(pydot.Node(objtName,shape='note',fontname=self.fontName,fontsize=self.fontSize,fontcolor='red',color='red',URL=objtUrl))
     else:
-      assetObjt = self.dbProxy.dimensionObject(objtName,dimName)
       borderColour = 'black'
-      if (dimName == 'asset' and assetObjt.critical()):
+      if (dimName == 'asset' and self.theAttributes.critical(objtName)):
         borderColour = 'red'
       assetNode = pydot.Node(objtName,shape='record',color=borderColour,fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl)
       self.theGraph.add_node(assetNode)
@@ -92,6 +90,7 @@ class AssetModel:
       assets = self.dbProxy.classModelElements(self.theEnvironmentName,self.hideConcerns)
     if (len(assets) == 0 and self.theEnvironmentName == ''):
       self.theAssetName = 'Component'
+    self.theAttributes = self.dbProxy.environmentNodeAttributes(self.theEnvironmentName,['asset','persona'])
     self.nodeList = set([])
     for asset in assets:
       self.buildNode(asset[0],asset[1])
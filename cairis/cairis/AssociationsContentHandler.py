@@ -44,7 +44,7 @@ class AssociationsContentHandler(ContentHandler,EntityResolver):
     b = Borg()
     self.dbProxy = b.get_dbproxy(session_id)
     self.configDir = b.configDir
-    self.theManualAssociations = set([])
+    self.theManualAssociations = []
     self.theGoalAssociations = []
     self.theDependencyAssociations = []
 
@@ -56,7 +56,16 @@ class AssociationsContentHandler(ContentHandler,EntityResolver):
     return self.configDir + '/associations.dtd'
 
   def manualAssociations(self):
-    return self.theManualAssociations
+    # Trace end points are looked up here rather than during the parse, so traces to objects imported from the same model file resolve
+    traces = set([])
+    for fromName,fromDim,toName,toDim,refType in self.theManualAssociations:
+      try:
+        fromId = self.dbProxy.getDimensionId(fromName,fromDim)
+        toId = self.dbProxy.getDimensionId(toName,toDim)
+        traces.add((fromDim + '_' + toDim,fromId,toId,refType))
+      except DatabaseProxyException, e:
+        pass # skipping invalid trace
+    return traces
 
   def goalAssociations(self):
     return self.theGoalAssociations
@@ -134,14 +143,7 @@ class AssociationsContentHandler(ContentHandler,EntityResolver):
 
   def endElement(self,name):
     if name == 'manual_association':
-      try:
-        fromId = self.dbProxy.getDimensionId(self.theFromName,self.theFromDim)
-        toId = self.dbProxy.getDimensionId(self.theToName,self.theToDim)
-        tableName = self.theFromDim + '_' + self.theToDim
-        if (tableName,fromId,toId,self.theReferenceType) not in self.theManualAssociations:
-          self.theManualAssociations.add((tableName,fromId,toId,self.theReferenceType))
-      except DatabaseProxyException, e:
-        pass # skipping invalid trace
+      self.theManualAssociations.append((self.theFromName,self.theFromDim,self.theToName,self.theToDim,self.theReferenceType))
       self.resetManualAssociationAttributes()
     elif name == 'goal_association':
       p = GoalAssociationParameters(self.theEnvironmentName,self.theGoalName,self.theGoalDim,self.theReferenceType,self.theSubGoalName,self.theSubGoalDim,self.isAlternative,self.theRationale)
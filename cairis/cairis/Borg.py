@@ -16,14 +16,21 @@
 #  under the License.
 from random import choice
 import string
+from threading import Lock, local
 from time import sleep
 
+poolLock = Lock()
+boundProxies = local()
+
 class Borg:
   __shared_state = {}
   def __init__(self):
     self.__dict__ = self.__shared_state
 
   def get_dbproxy(self, id=None):
+    boundProxy = getattr(boundProxies, 'dbProxy', None)
+    if boundProxy is not None:
+      return boundProxy
     if self.runmode == 'desktop':
       if self.dbProxy is not None:
         return self.dbProxy
@@ -33,12 +40,55 @@ class Borg:
       else:
         settings = self.get_settings(id)
         if settings is not None:
-          return settings.get('dbProxy', None)
+          dbProxy = settings.get('dbProxy', None)
+          if dbProxy is not None:
+            if not dbProxy.conn.open:
+              dbProxy.reconnect(False, id)
+            dbProxy.theDimensionIdCache = self.get_dbproxy_pool(id).dimensionIdCache()
+          return dbProxy
         else:
           return None
     else:
       return None
 
+  def bind_dbproxy(self, dbProxy):
+    """
+    Makes get_dbproxy return dbProxy on the calling thread, whatever the session, until it is bound to None
+    """
+    boundProxies.dbProxy = dbProxy
+
+  def get_dbproxy_pool(self, id):
+    """
+    Returns the connection pool serving the database of the session, creating it on first use.
+    Pools are shared by every session connecting to the same (host,port,user,db).
+    :rtype : DatabaseProxyPool
+    """
+    settings = self.get_settings(id)
+    if settings is None:
+      return None
+
+    from DatabaseProxyPool import DatabaseProxyPool
+    key = (settings['dbHost'], settings['dbPort'], settings['dbUser'], settings['dbName'])
+    poolLock.acquire()
+    try:
+      if not hasattr(self, 'dbPools'):
+        self.dbPools = {}
+      pool = self.dbPools.get(key, None)
+      if pool is None:
+        pool = DatabaseProxyPool(
+          host=settings['dbHost'],
+          port=settings['dbPort'],
+          user=settings['dbUser'],
+          passwd=settings['dbPasswd'],
+          db=settings['dbName'],
+          poolSize=getattr(self, 'dbPoolSize', 8),
+          idleTimeout=getattr(self, 'dbPoolIdleTimeout', 300)
+        )
+        self.dbPools[key] = pool
+      return pool
+    finally:
+      poolLock.release()
+
   def init_settings(self):
     """
     Creates a new settings dictionary in the Borg instance and returns the identifier for the settings dictionary
@@ -17,11 +17,15 @@
 
 import os
 import logging
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 from string import strip
 
 from Borg import Borg
 import DatabaseProxyFactory
 from tools.GraphicsGenerator import GraphicsGenerator
+from tools.LayoutPool import LayoutPool
+from tools.ModelCache import ModelCache
 from MySQLDatabaseProxy import MySQLDatabaseProxy
 
 
@@ -95,6 +99,18 @@ def dInitialise(configFile):
   b = Borg()
   b.runmode = 'web'
   b.settings = dict()
+  b.dbPools = dict()
+  b.dbPoolSize = 8
+  b.dbPoolIdleTimeout = 300
+  b.simulationWorkers = 4
+  b.importWorkers = 2
+  b.importJobRetention = 3600
+  b.importSizeLimit = 256 * 1024 * 1024
+  b.layoutWorkers = 4
+  b.layoutQueueLimit = 16
+  b.layoutTimeout = 30
+  b.modelCacheSize = 64 * 1024 * 1024
+  b.modelCacheDiskSize = 0
   b.logger = logging.getLogger('cairisd')
 
   homeDir = os.getenv("HOME")
@@ -135,6 +151,51 @@ def dInitialise(configFile):
         except TypeError, ex:
           b.logger.error(str(ex.message))
           b.webPort = 0
+      elif cfgKey == 'db_pool_size':
+        try:
+          b.dbPoolSize = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid db_pool_size in config file, using the default pool size')
+      elif cfgKey == 'db_pool_idle_timeout':
+        try:
+          b.dbPoolIdleTimeout = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid db_pool_idle_timeout in config file, using the default idle timeout')
+      elif cfgKey == 'simulation_workers':
+        try:
+          b.simulationWorkers = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid simulation_workers in config file, using the default number of simulation workers')
+      elif cfgKey == 'import_size_limit':
+        try:
+          b.importSizeLimit = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid import_size_limit in config file, using the default size limit')
+      elif cfgKey == 'layout_workers':
+        try:
+          b.layoutWorkers = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid layout_workers in config file, using the default number of layout workers')
+      elif cfgKey == 'layout_queue_limit':
+        try:
+          b.layoutQueueLimit = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid layout_queue_limit in config file, using the default queue limit')
+      elif cfgKey == 'layout_timeout':
+        try:
+          b.layoutTimeout = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid layout_timeout in config file, using the default layout timeout')
+      elif cfgKey == 'model_cache_size':
+        try:
+          b.modelCacheSize = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid model_cache_size in config file, using the default cache size')
+      elif cfgKey == 'model_cache_disk_size':
+        try:
+          b.modelCacheDiskSize = int(cfgVal)
+        except ValueError:
+          b.logger.warning('Invalid model_cache_disk_size in config file, not caching models on disk')
       elif cfgKey == 'log_level':
         log_level = cfgVal.lower()
         if log_level == 'debug':
@@ -191,7 +252,17 @@ def dInitialise(configFile):
       err_msg = 'Unable to create directory to store images into. Image uploading will probably not work.'
       b.logger.warning(err_msg)
 
-  b.model_generator = GraphicsGenerator('svg')
+  # Simulation workers are forked here, before the layout workers and the server start any threads
+  b.simulationPool = None
+  if b.simulationWorkers > 1:
+    try:
+      b.simulationPool = Pool(b.simulationWorkers)
+    except OSError, ex:
+      b.logger.warning('Unable to start the simulation processes, running simulations on threads instead: {0}'.format(str(ex)))
+      b.simulationPool = ThreadPool(b.simulationWorkers)
+
+  modelCache = ModelCache(b.modelCacheSize, os.path.join(b.tmpDir, 'cairis-models'), b.modelCacheDiskSize)
+  b.model_generator = GraphicsGenerator('svg', LayoutPool(b.layoutWorkers, b.layoutQueueLimit, b.layoutTimeout), modelCache)
 
   b.docBookDir = 'http://www.docbook.org/sgml/4.5'
   if os.path.exists('/usr/share/sgml/docbook/dtd/4.5'):
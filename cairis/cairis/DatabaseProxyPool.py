@@ -0,0 +1,135 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+from threading import Lock
+from time import time
+
+from DimensionIdCache import DimensionIdCache
+from MySQLDatabaseProxy import MySQLDatabaseProxy
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_IDLE_TIMEOUT = 300
+
+class DatabaseProxyPool:
+  """
+  Keeps warm MySQLDatabaseProxy instances for a single (host,port,user,db) combination.
+  Proxies are handed out by checkout() and returned by checkin(); a returned proxy keeps
+  its connection, dimension lookup tables and session variables for the next request.
+  All proxies of a pool share a single name to id cache.
+  """
+  def __init__(self,host,port,user,passwd,db,poolSize = DEFAULT_POOL_SIZE,idleTimeout = DEFAULT_IDLE_TIMEOUT):
+    self.theHost = host
+    self.thePort = port
+    self.theUser = user
+    self.thePasswd = passwd
+    self.theDb = db
+    self.thePoolSize = poolSize
+    self.theIdleTimeout = idleTimeout
+    self.theIdleProxies = []
+    self.theCheckedOutCount = 0
+    self.theLock = Lock()
+    self.theDimensionIdCache = DimensionIdCache()
+    self.logger = logging.getLogger('cairisd')
+
+  def key(self): return (self.theHost,self.thePort,self.theUser,self.theDb)
+
+  def checkout(self):
+    """
+    Returns a healthy proxy, reusing an idle one where possible
+    :rtype : MySQLDatabaseProxy
+    """
+    proxy = None
+    self.theLock.acquire()
+    try:
+      self.expireIdle()
+      while proxy is None and len(self.theIdleProxies) > 0:
+        candidate,lastUsed = self.theIdleProxies.pop()
+        if candidate.isAlive():
+          proxy = candidate
+        else:
+          self.logger.debug('Discarding stale connection to %s', self.theDb)
+          candidate.close()
+      self.theCheckedOutCount += 1
+    finally:
+      self.theLock.release()
+
+    if proxy is None:
+      try:
+        proxy = MySQLDatabaseProxy(host=self.theHost,port=self.thePort,user=self.theUser,passwd=self.thePasswd,db=self.theDb)
+      except:
+        self.theLock.acquire()
+        self.theCheckedOutCount -= 1
+        self.theLock.release()
+        raise
+    proxy.thePool = self
+    proxy.theDimensionIdCache = self.theDimensionIdCache
+    return proxy
+
+  def checkin(self,proxy):
+    """
+    Hands a proxy back to the pool.  Any open transaction is rolled back so the next user does
+    not see a stale consistent read snapshot.
+    """
+    try:
+      proxy.discardChanges()
+      isHealthy = proxy.conn.open
+    except Exception:
+      isHealthy = False
+
+    self.theLock.acquire()
+    try:
+      self.theCheckedOutCount = max(0,self.theCheckedOutCount - 1)
+      if isHealthy and len(self.theIdleProxies) < self.thePoolSize:
+        self.theIdleProxies.append((proxy,time()))
+        return
+    finally:
+      self.theLock.release()
+    proxy.close()
+
+  def expireIdle(self):
+    if self.theIdleTimeout <= 0:
+      return
+    cutOff = time() - self.theIdleTimeout
+    freshProxies = []
+    for proxy,lastUsed in self.theIdleProxies:
+      if lastUsed < cutOff:
+        proxy.close()
+      else:
+        freshProxies.append((proxy,lastUsed))
+    self.theIdleProxies = freshProxies
+
+  def clear(self):
+    """
+    Closes every idle connection, e.g. after the database has been rebuilt
+    """
+    self.theLock.acquire()
+    try:
+      for proxy,lastUsed in self.theIdleProxies:
+        proxy.close()
+      self.theIdleProxies = []
+    finally:
+      self.theLock.release()
+    self.theDimensionIdCache.invalidate()
+
+  def size(self): return self.thePoolSize
+
+  def idleCount(self): return len(self.theIdleProxies)
+
+  def checkedOutCount(self): return self.theCheckedOutCount
+
+  def dimensionIdCache(self): return self.theDimensionIdCache
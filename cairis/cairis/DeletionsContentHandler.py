@@ -0,0 +1,36 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+
+from xml.sax.handler import ContentHandler,EntityResolver
+from Borg import Borg
+
+class DeletionsContentHandler(ContentHandler,EntityResolver):
+  def __init__(self):
+    b = Borg()
+    self.configDir = b.configDir
+    self.theDeletions = []
+
+  def resolveEntity(self,publicId,systemId):
+    return self.configDir + '/cairis_model.dtd'
+
+  def deletions(self):
+    return self.theDeletions
+
+  def startElement(self,name,attrs):
+    if name == 'deletion':
+      self.theDeletions.append((attrs['dimension'],attrs['name']))
@@ -0,0 +1,98 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from threading import Lock
+
+class DimensionIdCache:
+  """
+  Maps (dimension table, object name) to object id for a single database, shared by every connection to it.
+  Only committed ids belong here: a connection keeps the ids it reads until its transaction commits and then
+  publishes them, unless another connection invalidated the same table in the meantime.
+  """
+  def __init__(self):
+    self.theIds = {}
+    self.theEpoch = 0
+    self.theGenerations = {}
+    self.theHits = 0
+    self.theMisses = 0
+    self.theLock = Lock()
+
+  def get(self,dimensionTable,dimensionName):
+    self.theLock.acquire()
+    try:
+      dimId = self.theIds.get((dimensionTable,dimensionName),None)
+      if (dimId == None):
+        self.theMisses += 1
+      else:
+        self.theHits += 1
+      return dimId
+    finally:
+      self.theLock.release()
+
+  def generation(self,dimensionTable):
+    self.theLock.acquire()
+    try:
+      return (self.theEpoch,self.theGenerations.get(dimensionTable,0))
+    finally:
+      self.theLock.release()
+
+  def publish(self,pendingIds):
+    """
+    Adds the ids a connection read before committing, given as {(dimension table,object name) : (id,generation)};
+    ids read before their table was last invalidated may be stale and are dropped
+    """
+    self.theLock.acquire()
+    try:
+      for (dimensionTable,dimensionName),(dimId,readGeneration) in pendingIds.items():
+        if (dimId != None and readGeneration == (self.theEpoch,self.theGenerations.get(dimensionTable,0))):
+          self.theIds[(dimensionTable,dimensionName)] = dimId
+    finally:
+      self.theLock.release()
+
+  def invalidateId(self,dimensionTable,dimId):
+    self.theLock.acquire()
+    try:
+      self.theGenerations[dimensionTable] = self.theGenerations.get(dimensionTable,0) + 1
+      for key,cachedId in self.theIds.items():
+        if (key[0] == dimensionTable and cachedId == dimId):
+          del self.theIds[key]
+    finally:
+      self.theLock.release()
+
+  def invalidate(self,dimensionTable = None):
+    self.theLock.acquire()
+    try:
+      if (dimensionTable == None):
+        self.theEpoch += 1
+        self.theGenerations = {}
+        self.theIds = {}
+      else:
+        self.theGenerations[dimensionTable] = self.theGenerations.get(dimensionTable,0) + 1
+        for key in self.theIds.keys():
+          if (key[0] == dimensionTable):
+            del self.theIds[key]
+    finally:
+      self.theLock.release()
+
+  def hits(self): return self.theHits
+
+  def misses(self): return self.theMisses
+
+  def size(self): return len(self.theIds)
+
+  def stats(self):
+    return {'hits' : self.theHits, 'misses' : self.theMisses, 'size' : len(self.theIds)}
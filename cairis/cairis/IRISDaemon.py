@@ -10,10 +10,11 @@ from flask.ext.restful_swagger import swagger
 from Borg import Borg
 from CairisHTTPError import CairisHTTPError, ARMHTTPError
 from ARM import ARMException, DatabaseProxyException
-from controllers import AssetController, AttackerController, CImportController, DependencyController, \
-    DimensionController, EnvironmentController, GoalController, MisuseCaseController, ProjectController, \
-    RequirementController, ResponseController, RiskController, RoleController, ThreatController, \
-    UploadController, UserController, VulnerabilityController
+from controllers import AssetController, AttackerController, CExportController, CImportController, \
+    DependencyController, DimensionController, EnvironmentController, GoalController, MisuseCaseController, \
+    ModelController, ProjectController, RequirementController, ResponseController, RiskController, \
+    RoleController, ThreatController, UploadController, UserController, VulnerabilityController
+from tools.LayoutPool import LayoutPoolSaturatedError, LayoutTimeoutError
 
 __author__ = 'Robin Quetin'
 ''' This module uses Flask (tested using 0.10) & Flask-Restful (tested using 0.3.3) '''
@@ -60,6 +61,19 @@ def handle_keyerror(error):
     return handle_error(err)
 
 
+@app.errorhandler(LayoutPoolSaturatedError)
+def handle_layoutsaturatederror(error):
+    err = CairisHTTPError(httplib.SERVICE_UNAVAILABLE, str(error), 'Model rendering unavailable')
+    err.response.headers['Retry-After'] = '5'
+    return handle_error(err)
+
+
+@app.errorhandler(LayoutTimeoutError)
+def handle_layouttimeouterror(error):
+    err = CairisHTTPError(httplib.SERVICE_UNAVAILABLE, str(error), 'Model rendering timed out')
+    return handle_error(err)
+
+
 @app.errorhandler(ARMException)
 @app.errorhandler(DatabaseProxyException)
 def handle_keyerror(e):
@@ -134,17 +148,30 @@ api.add_resource(GoalController.GoalsAPI, '/api/goals')
 api.add_resource(GoalController.GoalByNameAPI, '/api/goals/name/<string:name>')
 api.add_resource(GoalController.GoalModelAPI, '/api/goals/model/environment/<string:environment>')
 
+# Export routes
+api.add_resource(CExportController.CExportModelAPI, '/api/export/model')
+
 # Import routes
 api.add_resource(CImportController.CImportTextAPI, '/api/import/text')
 api.add_resource(CImportController.CImportFileAPI, '/api/import/file/type/<string:type>')
+api.add_resource(CImportController.CImportStreamAPI, '/api/import/stream/type/<string:type>')
+api.add_resource(CImportController.CImportTextJobAPI, '/api/import/jobs/text')
+api.add_resource(CImportController.CImportFileJobAPI, '/api/import/jobs/file/type/<string:type>')
+api.add_resource(CImportController.CImportStreamJobAPI, '/api/import/jobs/stream/type/<string:type>')
+api.add_resource(CImportController.CImportJobAPI, '/api/import/jobs/<string:job_id>')
 
 # Misuse case routes
 api.add_resource(MisuseCaseController.MisuseCasesAPI, '/api/misuse-cases')
 api.add_resource(MisuseCaseController.MisuseCaseByNameAPI, '/api/misuse-cases/risk/<string:risk_name>')
 
+# Model routes
+api.add_resource(ModelController.ModelMetricsAPI, '/api/models/metrics')
+
 # Project routes
 api.add_resource(ProjectController.ProjectSettingsAPI, '/api/settings')
 api.add_resource(ProjectController.ProjectCreateAPI, '/api/settings/create')
+api.add_resource(ProjectController.ProjectSnapshotAPI, '/api/settings/snapshot')
+api.add_resource(ProjectController.ProjectRestoreAPI, '/api/settings/restore')
 
 # Requirement routes
 api.add_resource(RequirementController.RequirementsAPI, '/api/requirements')
@@ -171,6 +198,12 @@ api.add_resource(
     '/api/risks/vulnerability/<string:vulnerability>/threat/<string:threat>/environment/<string:environment>'
 )
 api.add_resource(RiskController.RiskAnalysisModelByNameAPI, '/api/risks/model/environment/<string:environment>')
+api.add_resource(
+    RiskController.RisksScoreByEnvironmentAPI,
+    '/api/risks/scores',
+    '/api/risks/scores/environment/<string:environment>'
+)
+api.add_resource(RiskController.RisksSimulationAPI, '/api/risks/simulate')
 
 # Role routes
 api.add_resource(RoleController.RolesAPI, '/api/roles')
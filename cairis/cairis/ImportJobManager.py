@@ -0,0 +1,199 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+from os import remove as removeFile
+from Queue import Queue
+from threading import Lock, Thread
+from time import time
+from uuid import uuid4
+
+from ARM import ARMException, ImportCancelled
+from Borg import Borg
+import cimport
+from ImportProgress import ImportProgress, setCurrentProgress
+
+DEFAULT_WORKERS = 2
+DEFAULT_RETENTION = 3600
+
+managerLock = Lock()
+
+def importJobManager():
+  """
+  Returns the process wide job manager, starting its workers on first use
+  :rtype : ImportJobManager
+  """
+  b = Borg()
+  managerLock.acquire()
+  try:
+    if not hasattr(b,'importJobManager'):
+      b.importJobManager = ImportJobManager(getattr(b,'importWorkers',DEFAULT_WORKERS),getattr(b,'importJobRetention',DEFAULT_RETENTION))
+    return b.importJobManager
+  finally:
+    managerLock.release()
+
+
+class ImportJob:
+  def __init__(self,sessionId,importFile,modelType,overwriteFlag,removeAfterwards = True):
+    self.theId = uuid4().hex
+    self.theSessionId = sessionId
+    self.theImportFile = importFile
+    self.theModelType = modelType
+    self.theOverwriteFlag = overwriteFlag
+    self.removeAfterwards = removeAfterwards
+    self.theStatus = 'queued'
+    self.theMessage = ''
+    self.theProgress = ImportProgress()
+    self.theSubmissionTime = time()
+    self.theFinishTime = None
+
+  def id(self): return self.theId
+  def sessionId(self): return self.theSessionId
+  def importFile(self): return self.theImportFile
+  def modelType(self): return self.theModelType
+  def overwriteFlag(self): return self.theOverwriteFlag
+  def status(self): return self.theStatus
+  def message(self): return self.theMessage
+  def progress(self): return self.theProgress
+  def finishTime(self): return self.theFinishTime
+
+  def finished(self):
+    return self.theStatus in ['completed','failed','cancelled']
+
+  def setStatus(self,status,message = ''):
+    self.theStatus = status
+    self.theMessage = message
+    if (self.finished()):
+      self.theFinishTime = time()
+
+  def summary(self):
+    return {
+      'id' : self.theId,
+      'type' : self.theModelType,
+      'status' : self.theStatus,
+      'phase' : self.theProgress.phase(),
+      'parsed' : self.theProgress.parsedCounts(),
+      'written' : self.theProgress.writtenCounts(),
+      'message' : self.theMessage
+    }
+
+
+class ImportJobManager:
+  """
+  Runs model imports on a fixed number of worker threads, so however many imports are submitted
+  only that many run at once and request handling threads are never tied up by them.
+  Finished jobs are kept for retention seconds so their outcome can be polled.
+  """
+  def __init__(self,workers = DEFAULT_WORKERS,retention = DEFAULT_RETENTION):
+    self.theJobs = {}
+    self.theQueue = Queue()
+    self.theRetention = retention
+    self.theLock = Lock()
+    self.logger = logging.getLogger('cairisd')
+    self.theWorkers = []
+    for idx in range(max(1,workers)):
+      worker = Thread(target=self.work,name='import-worker-' + str(idx))
+      worker.daemon = True
+      worker.start()
+      self.theWorkers.append(worker)
+
+  def submit(self,sessionId,importFile,modelType,overwriteFlag,removeAfterwards = True):
+    job = ImportJob(sessionId,importFile,modelType,overwriteFlag,removeAfterwards)
+    self.theLock.acquire()
+    try:
+      self.expireJobs()
+      self.theJobs[job.id()] = job
+    finally:
+      self.theLock.release()
+    self.theQueue.put(job)
+    return job
+
+  def job(self,jobId):
+    self.theLock.acquire()
+    try:
+      return self.theJobs.get(jobId,None)
+    finally:
+      self.theLock.release()
+
+  def cancel(self,jobId):
+    """
+    Cancels a queued job outright; a running job stops at its next progress report and its changes are rolled back.
+    A job which has started to clear the database runs to completion, and its progress says it was not cancelled.
+    """
+    job = self.job(jobId)
+    if (job == None or job.finished()):
+      return job
+    if (not job.progress().cancel()):
+      return job
+    if (job.status() == 'queued'):
+      job.setStatus('cancelled','Import cancelled')
+    return job
+
+  def expireJobs(self):
+    cutOff = time() - self.theRetention
+    for jobId,job in self.theJobs.items():
+      if (job.finished() and job.finishTime() < cutOff):
+        del self.theJobs[jobId]
+
+  def work(self):
+    while True:
+      job = self.theQueue.get()
+      try:
+        self.run(job)
+      finally:
+        self.theQueue.task_done()
+
+  def run(self,job):
+    if (job.progress().cancelled()):
+      self.removeImportFile(job)
+      return
+    job.setStatus('running')
+    setCurrentProgress(job.progress())
+    b = Borg()
+    pool = None
+    dbProxy = None
+    try:
+      job.progress().setPhase('parsing')
+      # Each job imports on a connection of its own, so it neither blocks nor shares the transaction of its session's requests
+      pool = b.get_dbproxy_pool(job.sessionId())
+      if (pool == None):
+        raise ARMException('The session of import job ' + job.id() + ' has expired')
+      dbProxy = pool.checkout()
+      b.bind_dbproxy(dbProxy)
+      msgStr = cimport.file_import(job.importFile(),job.modelType(),job.overwriteFlag(),session_id=job.sessionId())
+      job.setStatus('completed',msgStr)
+    except ImportCancelled, e:
+      job.setStatus('cancelled','Import cancelled')
+    except ARMException, e:
+      self.logger.error('Import job ' + job.id() + ' failed: ' + str(e.value))
+      job.setStatus('failed',str(e.value))
+    except Exception, e:
+      self.logger.error('Import job ' + job.id() + ' failed: ' + str(e))
+      job.setStatus('failed',str(e))
+    finally:
+      b.bind_dbproxy(None)
+      if (dbProxy != None):
+        pool.checkin(dbProxy)
+      setCurrentProgress(None)
+      self.removeImportFile(job)
+
+  def removeImportFile(self,job):
+    if (job.removeAfterwards):
+      try:
+        removeFile(job.importFile())
+      except OSError:
+        pass
@@ -0,0 +1,112 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from threading import Lock, local
+from ARM import ImportCancelled
+
+theCurrentProgress = local()
+
+def currentProgress():
+  """
+  Returns the progress of the import running on this thread; imports outside a job get a progress object nobody reads
+  """
+  progress = getattr(theCurrentProgress,'value',None)
+  if (progress == None):
+    return ImportProgress()
+  return progress
+
+def setCurrentProgress(progress):
+  theCurrentProgress.value = progress
+
+class ImportProgress:
+  """
+  Counts the objects an import has parsed and written per dimension.  Cancelling makes the next
+  progress report raise ImportCancelled, so the import stops and its transaction is rolled back.
+  Once an import starts a step that cannot be rolled back, such as clearing the database, it can no longer be cancelled.
+  """
+  def __init__(self):
+    self.thePhase = ''
+    self.theParsedCounts = {}
+    self.theWrittenCounts = {}
+    self.isCancelled = False
+    self.isCancellable = True
+    self.theLock = Lock()
+
+  def cancel(self):
+    """
+    Returns False if the import can no longer be cancelled
+    """
+    self.theLock.acquire()
+    try:
+      if (not self.isCancellable):
+        return False
+      self.isCancelled = True
+      return True
+    finally:
+      self.theLock.release()
+
+  def preventCancellation(self):
+    self.theLock.acquire()
+    try:
+      self.checkCancelled()
+      self.isCancellable = False
+    finally:
+      self.theLock.release()
+
+  def cancellable(self): return self.isCancellable
+
+  def cancelled(self): return self.isCancelled
+
+  def checkCancelled(self):
+    if (self.isCancelled):
+      raise ImportCancelled('Import cancelled')
+
+  def setPhase(self,phase):
+    self.checkCancelled()
+    self.thePhase = phase
+
+  def parsed(self,dimensionCounts):
+    self.theLock.acquire()
+    try:
+      for dimName,count in dimensionCounts.items():
+        self.theParsedCounts[dimName] = self.theParsedCounts.get(dimName,0) + count
+    finally:
+      self.theLock.release()
+
+  def written(self,dimName,count = 1):
+    self.checkCancelled()
+    self.theLock.acquire()
+    try:
+      self.theWrittenCounts[dimName] = self.theWrittenCounts.get(dimName,0) + count
+    finally:
+      self.theLock.release()
+
+  def phase(self): return self.thePhase
+
+  def parsedCounts(self):
+    self.theLock.acquire()
+    try:
+      return dict(self.theParsedCounts)
+    finally:
+      self.theLock.release()
+
+  def writtenCounts(self):
+    self.theLock.acquire()
+    try:
+      return dict(self.theWrittenCounts)
+    finally:
+      self.theLock.release()
@@ -44,6 +44,7 @@ class KaosModel:
     else:
       self.theGraph.set_graph_defaults(rankdir='BT')
     self.theGraphName = b.tmpDir + '/' + self.theKaosModel + '.dot'
+    self.theAttributes = None
 
   def size(self):
     return len(self.theAssociations)
@@ -54,9 +55,7 @@ class KaosModel:
       self.theGraph.add_node(pydot.Node(objtName,shape='parallelogram',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
 # soft-goal attributes      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',style='rounded',sides='6',distortion='-0.537997',orientation='52',skew='-0.960726',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'obstacle'):
-      obsId = self.dbProxy.getDimensionId(objtName,'obstacle')
-      envId = self.dbProxy.getDimensionId(self.theEnvironmentName,'environment')
-      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',skew='-0.4',style='filled',pencolor='black',colorscheme='ylorrd9',fillcolor=obstacleColourCode(self.dbProxy.obstacleProbability(obsId,envId)),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
+      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',skew='-0.4',style='filled',pencolor='black',colorscheme='ylorrd9',fillcolor=obstacleColourCode(self.theAttributes.obstacleProbability(objtName)),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'domainproperty'):
       self.theGraph.add_node(pydot.Node(objtName,shape='house',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'requirement'):
@@ -70,29 +69,21 @@ class KaosModel:
     elif (dimName == 'usecase'):
       self.theGraph.add_node(pydot.Node(objtName,shape='ellipse',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'task'):
-      objt = self.dbProxy.dimensionObject(objtName,'task')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('task',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName 
       else:
         objtLabel = objtName
-      taskScore = self.dbProxy.taskUsabilityScore(objtName,self.theEnvironmentName)
+      taskScore = self.theAttributes.usabilityScore(objtName)
       self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='ellipse',style='filled',color=usabilityColourCode(taskScore),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'misusecase'):
       ellipseColour = 'black'
       if (self.theKaosModel == 'task'):
         riskName = objtName[8:]
-        riskObjt = self.dbProxy.dimensionObject(riskName,'risk')
-        riskScores = self.dbProxy.riskScore(riskObjt.threat(),riskObjt.vulnerability(),self.theEnvironmentName,riskName)
-        highestScore = 0
-        for riskScore in riskScores:
-          currentScore = riskScore[2]
-          if (currentScore > highestScore):
-            highestScore = currentScore
+        highestScore = self.theAttributes.highestRiskScore(riskName)
         ellipseColour = threatColourCode(highestScore)
       self.theGraph.add_node(pydot.Node(objtName,shape='ellipse',style='filled',color=ellipseColour,fontcolor='white',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'persona'):
-      objt = self.dbProxy.dimensionObject(objtName,'persona')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('persona',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName 
         self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='circle',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
       else: 
@@ -273,6 +264,14 @@ class KaosModel:
       elif (self.theKaosModel == 'task' and self.theGoalName == ''):
         elements = self.dbProxy.taskModelElements(self.theEnvironmentName)
 
+      dimNames = set([element[0] for element in elements])
+      for association in self.theAssociations:
+        dimNames.add(association.goalDimension())
+        dimNames.add(association.subGoalDimension())
+      if (self.theKaosModel == 'task' and 'misusecase' in dimNames):
+        dimNames.add('risk')
+      self.theAttributes = self.dbProxy.environmentNodeAttributes(self.theEnvironmentName,dimNames)
+
       for element in elements:
         self.buildNode(element[0],element[1])
 
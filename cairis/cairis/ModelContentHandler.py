@@ -0,0 +1,63 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+
+from xml.sax.handler import ContentHandler,EntityResolver
+from Borg import Borg
+from ImportProgress import currentProgress
+
+class ModelContentHandler(ContentHandler,EntityResolver):
+  """
+  Forwards the events of a single parse of a CAIRIS model file to a list of content handlers, so each handler sees the file as if it had parsed it alone.
+  """
+  def __init__(self,handlers):
+    ContentHandler.__init__(self)
+    b = Borg()
+    self.configDir = b.configDir
+    self.theHandlers = handlers
+    self.theProgress = currentProgress()
+
+  def resolveEntity(self,publicId,systemId):
+    return self.configDir + '/cairis_model.dtd'
+
+  def handlers(self):
+    return self.theHandlers
+
+  def setDocumentLocator(self,locator):
+    for handler in self.theHandlers:
+      handler.setDocumentLocator(locator)
+
+  def startDocument(self):
+    for handler in self.theHandlers:
+      handler.startDocument()
+
+  def endDocument(self):
+    for handler in self.theHandlers:
+      handler.endDocument()
+
+  def startElement(self,name,attrs):
+    self.theProgress.checkCancelled()
+    for handler in self.theHandlers:
+      handler.startElement(name,attrs)
+
+  def endElement(self,name):
+    for handler in self.theHandlers:
+      handler.endElement(name)
+
+  def characters(self,data):
+    for handler in self.theHandlers:
+      handler.characters(data)
@@ -30,9 +30,34 @@ from ArchitecturalPatternContentHandler import ArchitecturalPatternContentHandle
 from SynopsesContentHandler import SynopsesContentHandler
 from TemplateAssetsContentHandler import TemplateAssetsContentHandler
 from ProcessesContentHandler import ProcessesContentHandler
+from DeletionsContentHandler import DeletionsContentHandler
+from ModelContentHandler import ModelContentHandler
+from ImportProgress import currentProgress
 from Borg import Borg
 import xml.sax
 
+def nameKey(objtName):
+  # Names are compared as the database collation compares them: ignoring case and trailing spaces
+  return objtName.lower().rstrip(' ')
+
+def existingIds(db_proxy,dimName):
+  return dict([(nameKey(objtName),objtId) for objtName,objtId in db_proxy.getDimensions(dimName).items()])
+
+def importInTransaction(importFn, *args, **kwargs):
+  """
+  Runs an import function as a single transaction on the session's database, rolling it back if the import fails
+  """
+  b = Borg()
+  db_proxy = b.get_dbproxy(kwargs.get('session_id',None))
+  db_proxy.startTransaction()
+  try:
+    msgStr = importFn(*args, **kwargs)
+  except:
+    db_proxy.rollbackTransaction()
+    raise
+  db_proxy.commitTransaction()
+  return msgStr
+
 def importSecurityPatterns(importFile, session_id=None):
   parser = xml.sax.make_parser()
   handler = SecurityPatternContentHandler()
@@ -92,11 +117,14 @@ def importTVTypeFile(importFile, isOverwrite=1, session_id=None):
   parser.setEntityResolver(handler)
   parser.parse(importFile)
   vulTypes,threatTypes = handler.types()
-  return importTVTypes(vulTypes,threatTypes,isOverwrite, session_id=session_id)
+  return importInTransaction(importTVTypes,vulTypes,threatTypes,isOverwrite, session_id=session_id)
  
 def importTVTypes(vulTypes,threatTypes,isOverwrite, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('types')
+  progress.parsed({'vulnerability_type' : len(vulTypes), 'threat_type' : len(threatTypes)})
 
   noOfVts = len(vulTypes)
   noOfTts = len(threatTypes)
@@ -139,62 +167,76 @@ def importRequirementsFile(importFile, session_id=None):
   parser.setContentHandler(handler)
   parser.setEntityResolver(handler)
   parser.parse(importFile)
-  return importRequirements(handler.domainProperties(),handler.goals(),handler.obstacles(),handler.requirements(),handler.countermeasures(), session_id=session_id)
+  return importInTransaction(importRequirements,handler.domainProperties(),handler.goals(),handler.obstacles(),handler.requirements(),handler.countermeasures(), session_id=session_id)
 
 def importRequirements(dpParameterSet,goalParameterSet,obsParameterSet,reqParameterSet,cmParameterSet, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('requirements')
+  progress.parsed({'domainproperty' : len(dpParameterSet), 'goal' : len(goalParameterSet), 'obstacle' : len(obsParameterSet), 'requirement' : len(reqParameterSet), 'countermeasure' : len(cmParameterSet)})
 
   dpCount = 0
+  dpIds = existingIds(db_proxy,'domainproperty')
   for dpParameters in dpParameterSet:
-    objtId = db_proxy.existingObject(dpParameters.name(),'domainproperty')
+    objtId = dpIds.get(nameKey(dpParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addDomainProperty(dpParameters)
+      dpIds[nameKey(dpParameters.name())] = db_proxy.addDomainProperty(dpParameters)
     else:
       dpParameters.setId(objtId)
       db_proxy.updateDomainProperty(dpParameters)
+    progress.written('domainproperty')
     dpCount += 1
 
   goalCount = 0
+  goalIds = existingIds(db_proxy,'goal')
   for goalParameters in goalParameterSet:
-    objtId = db_proxy.existingObject(goalParameters.name(),'goal')
+    objtId = goalIds.get(nameKey(goalParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addGoal(goalParameters)
+      goalIds[nameKey(goalParameters.name())] = db_proxy.addGoal(goalParameters)
     else:
       goalParameters.setId(objtId)
       db_proxy.updateGoal(goalParameters)
+    progress.written('goal')
     goalCount += 1
 
   obsCount = 0
+  obsIds = existingIds(db_proxy,'obstacle')
   for obsParameters in obsParameterSet:
-    objtId = db_proxy.existingObject(obsParameters.name(),'obstacle')
+    objtId = obsIds.get(nameKey(obsParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addObstacle(obsParameters)
+      obsIds[nameKey(obsParameters.name())] = db_proxy.addObstacle(obsParameters)
     else:
       obsParameters.setId(objtId)
       db_proxy.updateObstacle(obsParameters)
+    progress.written('obstacle')
     obsCount += 1
 
   reqCount = 0
+  reqIds = existingIds(db_proxy,'requirement')
   for req,refName,refType in reqParameterSet:
-    objtId = db_proxy.existingObject(req.name(),'requirement')
+    objtId = reqIds.get(nameKey(req.name()),-1)
     if objtId == -1:
       isAsset = True
       if (refType == 'environment'):
         isAsset = False
       db_proxy.addRequirement(req,refName,isAsset)
+      reqIds[nameKey(req.name())] = req.id()
     else:
       db_proxy.updateRequirement(req)
+    progress.written('requirement')
     reqCount += 1
 
   cmCount = 0
+  cmIds = existingIds(db_proxy,'countermeasure')
   for cmParameters in cmParameterSet:
-    objtId = db_proxy.existingObject(cmParameters.name(),'countermeasure')
+    objtId = cmIds.get(nameKey(cmParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addCountermeasure(cmParameters)
+      cmIds[nameKey(cmParameters.name())] = db_proxy.addCountermeasure(cmParameters)
     else:
       cmParameters.setId(objtId)
       db_proxy.updateCountermeasure(cmParameters)
+    progress.written('countermeasure')
     cmCount += 1
   msgStr = 'Imported ' + str(dpCount) + ' domain properties, ' + str(goalCount) + ' goals, ' + str(obsCount) + ' obstacles, ' + str(reqCount) + ' requirements, and ' + str(cmCount) + ' countermeasures.'
   return msgStr
@@ -205,85 +247,103 @@ def importRiskAnalysisFile(importFile, session_id=None):
   parser.setContentHandler(handler)
   parser.setEntityResolver(handler)
   parser.parse(importFile)
-  return importRiskAnalysis(handler.roles(),handler.assets(),handler.vulnerabilities(),handler.attackers(),handler.threats(),handler.risks(),handler.responses(),handler.associations(), session_id=session_id)
+  return importInTransaction(importRiskAnalysis,handler.roles(),handler.assets(),handler.vulnerabilities(),handler.attackers(),handler.threats(),handler.risks(),handler.responses(),handler.associations(), session_id=session_id)
 
 def importRiskAnalysis(roleParameterSet,assetParameterSet,vulParameterSet,attackerParameterSet,threatParameterSet,riskParameterSet,responseParameterSet,assocParameterSet, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('risk analysis')
+  progress.parsed({'role' : len(roleParameterSet), 'asset' : len(assetParameterSet), 'vulnerability' : len(vulParameterSet), 'attacker' : len(attackerParameterSet), 'threat' : len(threatParameterSet), 'risk' : len(riskParameterSet), 'response' : len(responseParameterSet), 'classassociation' : len(assocParameterSet)})
 
   roleCount = 0
+  roleIds = existingIds(db_proxy,'role')
   for roleParameters in roleParameterSet:
-    objtId = db_proxy.existingObject(roleParameters.name(),'role')
+    objtId = roleIds.get(nameKey(roleParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addRole(roleParameters)
+      roleIds[nameKey(roleParameters.name())] = db_proxy.addRole(roleParameters)
     else:
       roleParameters.setId(objtId)
       db_proxy.updateRole(roleParameters)
+    progress.written('role')
     roleCount += 1
 
   assetCount = 0
+  assetIds = existingIds(db_proxy,'asset')
   for assetParameters in assetParameterSet:
-    objtId = db_proxy.existingObject(assetParameters.name(),'asset')
+    objtId = assetIds.get(nameKey(assetParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addAsset(assetParameters)
+      assetIds[nameKey(assetParameters.name())] = db_proxy.addAsset(assetParameters)
     else:
       assetParameters.setId(objtId)
       db_proxy.updateAsset(assetParameters)
+    progress.written('asset')
     assetCount += 1
 
   vulCount = 0
+  vulIds = existingIds(db_proxy,'vulnerability')
   for vulParameters in vulParameterSet:
-    objtId = db_proxy.existingObject(vulParameters.name(),'vulnerability')
+    objtId = vulIds.get(nameKey(vulParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addVulnerability(vulParameters)
+      vulIds[nameKey(vulParameters.name())] = db_proxy.addVulnerability(vulParameters)
     else:
       vulParameters.setId(objtId)
       db_proxy.updateVulnerability(vulParameters)
+    progress.written('vulnerability')
     vulCount += 1
 
   attackerCount = 0
+  attackerIds = existingIds(db_proxy,'attacker')
   for attackerParameters in attackerParameterSet:
-    objtId = db_proxy.existingObject(attackerParameters.name(),'attacker')
+    objtId = attackerIds.get(nameKey(attackerParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addAttacker(attackerParameters)
+      attackerIds[nameKey(attackerParameters.name())] = db_proxy.addAttacker(attackerParameters)
     else:
       attackerParameters.setId(objtId)
       db_proxy.updateAttacker(attackerParameters)
+    progress.written('attacker')
     attackerCount += 1
 
   threatCount = 0
+  threatIds = existingIds(db_proxy,'threat')
   for threatParameters in threatParameterSet:
-    objtId = db_proxy.existingObject(threatParameters.name(),'threat')
+    objtId = threatIds.get(nameKey(threatParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addThreat(threatParameters)
+      threatIds[nameKey(threatParameters.name())] = db_proxy.addThreat(threatParameters)
     else:
       threatParameters.setId(objtId)
       db_proxy.updateThreat(threatParameters)
+    progress.written('threat')
     threatCount += 1
 
   riskCount = 0
+  riskIds = existingIds(db_proxy,'risk')
   for riskParameters in riskParameterSet:
-    objtId = db_proxy.existingObject(riskParameters.name(),'risk')
+    objtId = riskIds.get(nameKey(riskParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addRisk(riskParameters)
+      riskIds[nameKey(riskParameters.name())] = db_proxy.addRisk(riskParameters)
     else:
       riskParameters.setId(objtId)
       db_proxy.updateRisk(riskParameters)
+    progress.written('risk')
     riskCount += 1
 
   responseCount = 0
+  responseIds = existingIds(db_proxy,'response')
   for responseParameters in responseParameterSet:
-    objtId = db_proxy.existingObject(responseParameters.name(),'response')
+    objtId = responseIds.get(nameKey(responseParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addResponse(responseParameters)
+      responseIds[nameKey(responseParameters.name())] = db_proxy.addResponse(responseParameters)
     else:
       responseParameters.setId(objtId)
       db_proxy.updateResponse(responseParameters)
+    progress.written('response')
     responseCount += 1
 
   rshipCount = 0
   for assocParameters in assocParameterSet:
     db_proxy.addClassAssociation(assocParameters)
+    progress.written('classassociation')
     rshipCount += 1
 
   msgStr = 'Imported ' + str(roleCount) + ' roles, ' + str(assetCount) + ' assets, ' + str(vulCount) + ' vulnerabilities, ' + str(attackerCount) + ' attackers, ' + str(threatCount) + ' threats, ' + str(riskCount) + ' risks, ' + str(responseCount) + ' responses, and ' + str(rshipCount) + ' asset associations.'
@@ -295,76 +355,92 @@ def importUsabilityFile(importFile, session_id=None):
   parser.setContentHandler(handler)
   parser.setEntityResolver(handler)
   parser.parse(importFile)
-  return importUsability(handler.personas(),handler.externalDocuments(),handler.documentReferences(),handler.conceptReferences(),handler.personaCharacteristics(),handler.taskCharacteristics(),handler.tasks(),handler.usecases(), session_id=session_id)
+  return importInTransaction(importUsability,handler.personas(),handler.externalDocuments(),handler.documentReferences(),handler.conceptReferences(),handler.personaCharacteristics(),handler.taskCharacteristics(),handler.tasks(),handler.usecases(), session_id=session_id)
 
 
 def importUsability(personaParameterSet,edParameterSet,drParameterSet,crParameterSet,pcParameterSet,tcParameterSet,taskParameterSet,ucParameterSet, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('usability')
+  progress.parsed({'persona' : len(personaParameterSet), 'external_document' : len(edParameterSet), 'document_reference' : len(drParameterSet), 'concept_reference' : len(crParameterSet), 'persona_characteristic' : len(pcParameterSet), 'task_characteristic' : len(tcParameterSet), 'task' : len(taskParameterSet), 'usecase' : len(ucParameterSet)})
 
   personaCount = 0
+  personaIds = existingIds(db_proxy,'persona')
   for personaParameters in personaParameterSet:
-    objtId = db_proxy.existingObject(personaParameters.name(),'persona')
+    objtId = personaIds.get(nameKey(personaParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addPersona(personaParameters)
+      personaIds[nameKey(personaParameters.name())] = db_proxy.addPersona(personaParameters)
     else:
       personaParameters.setId(objtId)
       db_proxy.updatePersona(personaParameters)
+    progress.written('persona')
     personaCount += 1
 
   edCount = 0
+  edIds = existingIds(db_proxy,'external_document')
   for edParameters in edParameterSet:
-    objtId = db_proxy.existingObject(edParameters.name(),'external_document')
+    objtId = edIds.get(nameKey(edParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addExternalDocument(edParameters)
+      edIds[nameKey(edParameters.name())] = db_proxy.addExternalDocument(edParameters)
     else:
       edParameters.setId(objtId)
       db_proxy.updateExternalDocument(edParameters)
+    progress.written('external_document')
     edCount += 1
 
   drCount = 0
+  drIds = existingIds(db_proxy,'document_reference')
   for drParameters in drParameterSet:
-    objtId = db_proxy.existingObject(drParameters.name(),'document_reference')
+    objtId = drIds.get(nameKey(drParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addDocumentReference(drParameters)
+      drIds[nameKey(drParameters.name())] = db_proxy.addDocumentReference(drParameters)
     else:
       drParameters.setId(objtId)
       db_proxy.updateDocumentReference(drParameters)
+    progress.written('document_reference')
     drCount += 1
 
   taskCount = 0
+  taskIds = existingIds(db_proxy,'task')
   for taskParameters in taskParameterSet:
-    objtId = db_proxy.existingObject(taskParameters.name(),'task')
+    objtId = taskIds.get(nameKey(taskParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addTask(taskParameters)
+      taskIds[nameKey(taskParameters.name())] = db_proxy.addTask(taskParameters)
     else:
       taskParameters.setId(objtId)
       db_proxy.updateTask(taskParameters)
+    progress.written('task')
     taskCount += 1
 
   ucCount = 0
+  ucIds = existingIds(db_proxy,'usecase')
   for ucParameters in ucParameterSet:
-    objtId = db_proxy.existingObject(ucParameters.name(),'usecase')
+    objtId = ucIds.get(nameKey(ucParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addUseCase(ucParameters)
+      ucIds[nameKey(ucParameters.name())] = db_proxy.addUseCase(ucParameters)
     else:
       ucParameters.setId(objtId)
       db_proxy.updateUseCase(ucParameters)
+    progress.written('usecase')
     ucCount += 1
 
   crCount = 0
+  crIds = existingIds(db_proxy,'concept_reference')
   for crParameters in crParameterSet:
-    objtId = db_proxy.existingObject(crParameters.name(),'concept_reference')
+    objtId = crIds.get(nameKey(crParameters.name()),-1)
     if objtId == -1:
-      db_proxy.addConceptReference(crParameters)
+      crIds[nameKey(crParameters.name())] = db_proxy.addConceptReference(crParameters)
     else:
       crParameters.setId(objtId)
       db_proxy.updateConceptReference(crParameters)
+    progress.written('concept_reference')
     crCount += 1
 
   pcCount = 0
   for pcParameters in pcParameterSet:
     db_proxy.addPersonaCharacteristic(pcParameters)
+    progress.written('persona_characteristic')
     pcCount += 1
 
   tcCount = 0
@@ -375,6 +451,7 @@ def importUsability(personaParameterSet,edParameterSet,drParameterSet,crParamete
     else:
       tcParameters.setId(objtId)
       db_proxy.updateTaskCharacterisric(tcParameters)
+    progress.written('task_characteristic')
     tcCount += 1
   msgStr = 'Imported ' + str(personaCount) + ' personas, ' + str(edCount) + ' external documents, ' + str(drCount) + ' document references, ' + str(crCount) + ' concept references, ' + str(pcCount) + ' persona characteristics, ' + str(tcCount) + ' task characteristics, ' + str(taskCount) + ' tasks, and ' + str(ucCount) + ' use cases.'
   return msgStr
@@ -385,23 +462,27 @@ def importAssociationsFile(importFile, session_id=None):
   parser.setContentHandler(handler)
   parser.setEntityResolver(handler)
   parser.parse(importFile)
-  return importAssociations(handler.manualAssociations(),handler.goalAssociations(),handler.dependencyAssociations(), session_id=session_id)
+  return importInTransaction(importAssociations,handler.manualAssociations(),handler.goalAssociations(),handler.dependencyAssociations(), session_id=session_id)
   
 def importAssociations(maParameterSet,gaParameterSet,depParameterSet, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('associations')
+  progress.parsed({'trace' : len(maParameterSet), 'goalassociation' : len(gaParameterSet), 'dependency' : len(depParameterSet)})
 
-  maCount = 0
-  for tTable,fromId,toId,refType in maParameterSet:
-    db_proxy.addTrace(tTable,fromId,toId,refType)
-    maCount += 1
+  db_proxy.addTraces(maParameterSet)
+  maCount = len(maParameterSet)
+  progress.written('trace',maCount)
   gaCount = 0
   for gaParameters in gaParameterSet:
     db_proxy.addGoalAssociation(gaParameters)
+    progress.written('goalassociation')
     gaCount += 1
   depCount = 0
   for depParameters in depParameterSet:
     db_proxy.addDependency(depParameters)
+    progress.written('dependency')
     depCount += 1
   msgStr = 'Imported ' + str(maCount) + ' manual associations, ' + str(gaCount) + ' goal associations, and ' + str(depCount) + ' dependency associations.'
   return msgStr
@@ -414,11 +495,14 @@ def importProjectFile(importFile, session_id=None):
   parser.parse(importFile)
   pSettings = handler.settings()
   envParameterSet = handler.environments()
-  return importProjectData(pSettings,envParameterSet, session_id=session_id)
+  return importInTransaction(importProjectData,pSettings,envParameterSet, session_id=session_id)
 
 def importProjectData(pSettings,envParameterSet, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('project')
+  progress.parsed({'environment' : len(envParameterSet)})
 
   if (pSettings != None):
     db_proxy.updateSettings(pSettings[0],pSettings[1],pSettings[2],pSettings[3],pSettings[4],pSettings[5],pSettings[6],pSettings[7])
@@ -430,6 +514,7 @@ def importProjectData(pSettings,envParameterSet, session_id):
     else:
       envParameters.setId(objtId)
       db_proxy.updateEnvironment(envParameters)
+    progress.written('environment')
     envCount += 1
   msgText = 'Imported ' + str(envCount) + ' environments'
   if (pSettings != None):
@@ -444,7 +529,7 @@ def importComponentViewFile(importFile, session_id=None):
   parser.setEntityResolver(handler)
   parser.parse(importFile)
   view = handler.view()
-  return importComponentViewData(view, session_id=session_id)
+  return importInTransaction(importComponentViewData,view, session_id=session_id)
 
 def importAssetsFile(importFile, session_id=None):
   parser = xml.sax.make_parser()
@@ -492,11 +577,14 @@ def importSynopsesFile(importFile, session_id=None):
   stepSyns = handler.stepSynopses()
   refConts = handler.referenceContributions()
   ucConts = handler.useCaseContributions()
-  return importSynopses(charSyns,refSyns,stepSyns,refConts,ucConts, session_id=session_id)
+  return importInTransaction(importSynopses,charSyns,refSyns,stepSyns,refConts,ucConts, session_id=session_id)
 
 def importSynopses(charSyns,refSyns,stepSyns,refConts,ucConts, session_id):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('synopses')
+  progress.parsed({'characteristic_synopsis' : len(charSyns), 'reference_synopsis' : len(refSyns), 'step_synopsis' : len(stepSyns), 'reference_contribution' : len(refConts), 'usecase_contribution' : len(ucConts)})
 
   for cs in charSyns:
     db_proxy.addCharacteristicSynopsis(cs)
@@ -504,7 +592,7 @@ def importSynopses(charSyns,refSyns,stepSyns,refConts,ucConts, session_id):
     db_proxy.addReferenceSynopsis(rs)
   for ucName,envName,stepNo,synName,aType,aName in stepSyns:
     db_proxy.addStepSynopsis(ucName,envName,stepNo,synName,aType,aName)
-  db_proxy.conn.commit()
+  db_proxy.commitChanges()
   for rc in refConts:
     db_proxy.addReferenceContribution(rc)
   for uc in ucConts:
@@ -520,7 +608,7 @@ def importDomainValuesFile(importFile, session_id=None):
   parser.setEntityResolver(handler)
   parser.parse(importFile)
   tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues = handler.values()
-  return importDomainValues(tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues, session_id=session_id)
+  return importInTransaction(importDomainValues,tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues, session_id=session_id)
 
 def importDomainValues(tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues, session_id):
   noOfTvs = len(tvValues)
@@ -533,6 +621,8 @@ def importDomainValues(tvValues,rvValues,cvValues,svValues,lvValues,capValues,mo
  
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('domain values')
 
   tId = 0
   if (noOfTvs > 0):
@@ -589,7 +679,7 @@ def importProcessesFile(importFile, session_id=None):
   ics = handler.impliedCharacteristics()
   intentions = handler.intentions()
   contributions = handler.contributions()
-  return importProcesses(docs,codes,memos,quotations,codeNetworks,processes,ics,intentions,contributions, session_id=session_id)
+  return importInTransaction(importProcesses,docs,codes,memos,quotations,codeNetworks,processes,ics,intentions,contributions, session_id=session_id)
 
 def importProcesses(docs,codes,memos,quotations,codeNetworks,processes,ics,intentions,contributions, session_id):
   noOfDocs = len(docs)
@@ -643,19 +733,66 @@ def importProcesses(docs,codes,memos,quotations,codeNetworks,processes,ics,inten
   msgStr = 'Imported ' + str(noOfDocs) + ' internal documents, ' + str(noOfCodes) + ' codes, ' + str(noOfMemos) + ' memos, ' + str(noOfQuotations) + ' quotations, ' + str(noOfCNs) + ' code relationships, ' + str(noOfProcs) + ' implied processes, ' + str(noOfIntentions) + ' intentions, and ' + str(noOfContributions) + ' contributions.'
   return msgStr
 
+def importDeletions(deletions, session_id):
+  b = Borg()
+  db_proxy = b.get_dbproxy(session_id)
+  progress = currentProgress()
+  progress.setPhase('deletions')
+  progress.parsed({'deletion' : len(deletions)})
+
+  delCount = 0
+  for dimName,objtName in deletions:
+    if db_proxy.removeNamedObject(dimName,objtName):
+      delCount += 1
+    progress.written('deletion')
+  msgStr = 'Deleted ' + str(delCount) + ' objects.'
+  return msgStr
+
 def importModelFile(importFile, isOverwrite=1, session_id=None):
   b = Borg()
   db_proxy = b.get_dbproxy(session_id)
 
   modelTxt = ''
+  progress = currentProgress()
   if isOverwrite == 1:
+    progress.setPhase('clearing')
+    progress.preventCancellation()
     db_proxy.clearDatabase(session_id)
-    modelTxt += importTVTypeFile(importFile, session_id=session_id) + '  '
-  modelTxt += importDomainValuesFile(importFile, session_id=session_id) + ' '
-  modelTxt += importProjectFile(importFile, session_id=session_id) + ' '
-  modelTxt += importRiskAnalysisFile(importFile, session_id=session_id) + ' '
-  modelTxt += importUsabilityFile(importFile, session_id=session_id) + ' '
-  modelTxt += importRequirementsFile(importFile, session_id=session_id) + ' '
-  modelTxt += importAssociationsFile(importFile, session_id=session_id) + ' '
-  modelTxt += importSynopsesFile(importFile, session_id=session_id)
+
+  tvHandler = TVTypeContentHandler()
+  dvHandler = DomainValueContentHandler()
+  projectHandler = CairisContentHandler()
+  raHandler = RiskAnalysisContentHandler()
+  usabilityHandler = UsabilityContentHandler()
+  goalsHandler = GoalsContentHandler(session_id=session_id)
+  assocHandler = AssociationsContentHandler(session_id=session_id)
+  synHandler = SynopsesContentHandler(session_id=session_id)
+  delHandler = DeletionsContentHandler()
+
+  parser = xml.sax.make_parser()
+  handler = ModelContentHandler([tvHandler,dvHandler,projectHandler,raHandler,usabilityHandler,goalsHandler,assocHandler,synHandler,delHandler])
+  parser.setContentHandler(handler)
+  parser.setEntityResolver(handler)
+  progress.setPhase('parsing')
+  parser.parse(importFile)
+
+  db_proxy.startTransaction()
+  try:
+    if len(delHandler.deletions()) > 0:
+      modelTxt += importDeletions(delHandler.deletions(), session_id=session_id) + ' '
+    if isOverwrite == 1:
+      vulTypes,threatTypes = tvHandler.types()
+      modelTxt += importTVTypes(vulTypes,threatTypes,isOverwrite, session_id=session_id) + '  '
+    tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues = dvHandler.values()
+    modelTxt += importDomainValues(tvValues,rvValues,cvValues,svValues,lvValues,capValues,motValues, session_id=session_id) + ' '
+    modelTxt += importProjectData(projectHandler.settings(),projectHandler.environments(), session_id=session_id) + ' '
+    modelTxt += importRiskAnalysis(raHandler.roles(),raHandler.assets(),raHandler.vulnerabilities(),raHandler.attackers(),raHandler.threats(),raHandler.risks(),raHandler.responses(),raHandler.associations(), session_id=session_id) + ' '
+    modelTxt += importUsability(usabilityHandler.personas(),usabilityHandler.externalDocuments(),usabilityHandler.documentReferences(),usabilityHandler.conceptReferences(),usabilityHandler.personaCharacteristics(),usabilityHandler.taskCharacteristics(),usabilityHandler.tasks(),usabilityHandler.usecases(), session_id=session_id) + ' '
+    modelTxt += importRequirements(goalsHandler.domainProperties(),goalsHandler.goals(),goalsHandler.obstacles(),goalsHandler.requirements(),goalsHandler.countermeasures(), session_id=session_id) + ' '
+    modelTxt += importAssociations(assocHandler.manualAssociations(),assocHandler.goalAssociations(),assocHandler.dependencyAssociations(), session_id=session_id) + ' '
+    modelTxt += importSynopses(synHandler.characteristicSynopses(),synHandler.referenceSynopses(),synHandler.stepSynopses(),synHandler.referenceContributions(),synHandler.useCaseContributions(), session_id=session_id)
+  except:
+    db_proxy.rollbackTransaction()
+    raise
+  db_proxy.commitTransaction()
   return modelTxt
@@ -0,0 +1,211 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+
+import hashlib
+import json
+import struct
+import zlib
+from ARM import ARMException
+from Borg import Borg
+from MySQLDatabaseProxy import sqlChecksum, resetScript, newIdGeneration
+
+SNAPSHOT_MAGIC = 'CAIRISSS'
+SNAPSHOT_FORMAT = 2
+HEADER_SIZE = len(SNAPSHOT_MAGIC) + 4 + 32
+
+def snapshotTables():
+  srcDir = Borg().cairisRoot + '/cairis/sql'
+  tableNames,seedStatements = resetScript(srcDir,sqlChecksum(srcDir + '/init.sql'))
+  return list(reversed(tableNames))
+
+def schemaVersion(dbProxy):
+  initSql = Borg().cairisRoot + '/cairis/sql/init.sql'
+  return dbProxy.sqlChecksums().get('init.sql',sqlChecksum(initSql))
+
+def snapshotColumns(dbProxy):
+  # The only tables, and the only columns of each, a snapshot may load into
+  return dict([(tableName,dbProxy.tableColumns(tableName)) for tableName in snapshotTables()])
+
+def encodedValue(value):
+  # Strings are stored byte for byte as latin-1 text, so that JSON carries them unchanged
+  if (value == None or type(value) in (int,long,float)):
+    return value
+  if isinstance(value,unicode):
+    value = value.encode('utf-8')
+  elif not isinstance(value,str):
+    value = str(value)
+  return value.decode('latin-1')
+
+def decodedValue(value):
+  if (value == None or type(value) in (int,long,float)):
+    return value
+  if isinstance(value,unicode):
+    try:
+      return value.encode('latin-1')
+    except UnicodeEncodeError:
+      pass
+  raise ARMException('The snapshot is corrupt')
+
+def columnBlock(values):
+  if (len(values) > 0 and len([x for x in values if type(x) not in (int,long)]) == 0):
+    return 'q' + zlib.compress(struct.pack('>' + str(len(values)) + 'q',*values))
+  return 'j' + zlib.compress(json.dumps([encodedValue(x) for x in values]))
+
+def columnValues(block,rowCount):
+  try:
+    data = zlib.decompress(block[1:])
+    if (block[0:1] == 'q' and len(data) == rowCount * 8):
+      return list(struct.unpack('>' + str(rowCount) + 'q',data))
+    if (block[0:1] == 'j'):
+      values = json.loads(data)
+      if (isinstance(values,list) and len(values) == rowCount):
+        return [decodedValue(x) for x in values]
+  except (zlib.error,ValueError):
+    pass
+  raise ARMException('The snapshot is corrupt')
+
+def recordObject(data,fields):
+  # A metadata record is a JSON object holding exactly the given fields, each of the given type
+  try:
+    objt = json.loads(data)
+  except ValueError:
+    raise ARMException('The snapshot is corrupt')
+  if (not isinstance(objt,dict) or sorted(objt.keys()) != sorted(fields.keys())):
+    raise ARMException('The snapshot is corrupt')
+  for fieldName,fieldType in fields.items():
+    if not isinstance(objt[fieldName],fieldType):
+      raise ARMException('The snapshot is corrupt')
+  return objt
+
+def writeRecord(f,checksum,data):
+  record = struct.pack('>I',len(data)) + data
+  checksum.update(record)
+  f.write(record)
+
+def readRecord(f):
+  sizeBuf = f.read(4)
+  if (len(sizeBuf) != 4):
+    raise ARMException('The snapshot is corrupt')
+  recordSize = struct.unpack('>I',sizeBuf)[0]
+  data = f.read(recordSize)
+  if (len(data) != recordSize):
+    raise ARMException('The snapshot is corrupt')
+  return data
+
+def takeSnapshot(fileName,dbProxy):
+  """
+  Writes the magic string, the format version, the md5 checksum of the rest of the file and a sequence of length-prefixed
+  records: a JSON object with the schema version and table count, then for each table a JSON object with its name, column
+  names and row count followed by one zlib-compressed block per column, either packed 64-bit integers or a JSON list.
+  Tables are written in the order they need to be loaded, all read from one consistent view of the database.
+  """
+  tableNames = snapshotTables()
+  checksum = hashlib.md5()
+  f = open(fileName,'wb')
+  dbProxy.startConsistentRead()
+  try:
+    f.write(SNAPSHOT_MAGIC + struct.pack('>I',SNAPSHOT_FORMAT) + '0' * 32)
+    writeRecord(f,checksum,json.dumps({'schema' : schemaVersion(dbProxy),'tables' : len(tableNames)}))
+    for tableName in tableNames:
+      columnNames,rows = dbProxy.tableRows(tableName)
+      writeRecord(f,checksum,json.dumps({'table' : tableName,'columns' : columnNames,'rows' : len(rows)}))
+      for idx in range(len(columnNames)):
+        writeRecord(f,checksum,columnBlock([row[idx] for row in rows]))
+    f.seek(len(SNAPSHOT_MAGIC) + 4)
+    f.write(checksum.hexdigest())
+  finally:
+    dbProxy.discardChanges()
+    f.close()
+  return 'Snapshot of ' + str(len(tableNames)) + ' tables taken.'
+
+def validateSnapshot(fileName,dbProxy,tableColumns):
+  """
+  Checks the format, checksum and schema version of a snapshot, then reads the whole of it without loading anything,
+  so a snapshot that would fail part way through is rejected before the project is emptied
+  """
+  f = open(fileName,'rb')
+  try:
+    header = f.read(HEADER_SIZE)
+    if (len(header) != HEADER_SIZE or header[0:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC):
+      raise ARMException('The file is not a CAIRIS snapshot')
+    snapshotFormat = struct.unpack('>I',header[len(SNAPSHOT_MAGIC):len(SNAPSHOT_MAGIC) + 4])[0]
+    if (snapshotFormat != SNAPSHOT_FORMAT):
+      raise ARMException('Snapshot format ' + str(snapshotFormat) + ' is not supported')
+    checksum = hashlib.md5()
+    while True:
+      buf = f.read(65536)
+      if not buf:
+        break
+      checksum.update(buf)
+    if (checksum.hexdigest() != header[len(SNAPSHOT_MAGIC) + 4:]):
+      raise ARMException('The snapshot is corrupt')
+    f.seek(HEADER_SIZE)
+    snapshotHeader = recordObject(readRecord(f),{'schema' : unicode,'tables' : int})
+    if (snapshotHeader['schema'] != schemaVersion(dbProxy)):
+      raise ARMException('The snapshot was taken from a database with a different schema')
+  finally:
+    f.close()
+  for tableName,columnNames,rows in snapshotContents(fileName,tableColumns):
+    pass
+
+def snapshotContents(fileName,tableColumns):
+  """
+  Generates the (tableName,columnNames,rows) of a snapshot, refusing any table or column that tableColumns does not list
+  """
+  f = open(fileName,'rb')
+  try:
+    f.seek(HEADER_SIZE)
+    snapshotHeader = recordObject(readRecord(f),{'schema' : unicode,'tables' : int})
+    if (snapshotHeader['tables'] < 0 or snapshotHeader['tables'] > len(tableColumns)):
+      raise ARMException('The snapshot is corrupt')
+    tablesRead = set([])
+    for tableIdx in range(snapshotHeader['tables']):
+      tableRecord = recordObject(readRecord(f),{'table' : unicode,'columns' : list,'rows' : int})
+      tableName = tableRecord['table']
+      columnNames = tableRecord['columns']
+      rowCount = tableRecord['rows']
+      if (tableName not in tableColumns or tableName in tablesRead):
+        raise ARMException('The snapshot holds an unknown table ' + tableName)
+      tableName = str(tableName)
+      if (sorted(columnNames) != sorted(tableColumns[tableName])):
+        raise ARMException('The columns of ' + tableName + ' in the snapshot do not match the database')
+      if (rowCount < 0):
+        raise ARMException('The snapshot is corrupt')
+      tablesRead.add(tableName)
+      columnNames = [str(x) for x in columnNames]
+      columns = [columnValues(readRecord(f),rowCount) for x in columnNames]
+      yield (tableName,columnNames,zip(*columns) if len(columns) > 0 else [])
+    if (f.read(1) != ''):
+      raise ARMException('The snapshot is corrupt')
+  finally:
+    f.close()
+
+def restoreSnapshot(fileName,dbProxy,session_id = None):
+  b = Borg()
+  tableColumns = snapshotColumns(dbProxy)
+  validateSnapshot(fileName,dbProxy,tableColumns)
+  tableNames = snapshotTables()
+  revision = dbProxy.modelRevision()
+  dbProxy.resetTables(list(reversed(tableNames)),[])
+  dbProxy.loadTables(snapshotContents(fileName,tableColumns))
+  newIdGeneration(dbProxy.idDatabaseKey())
+  dbProxy.resetModelChanges(revision)
+  dbProxy.theDimensionIdCache.invalidate()
+  if b.runmode == 'web':
+    b.get_dbproxy_pool(session_id).clear()
+  return 'Snapshot of ' + str(len(tableNames)) + ' tables restored.'
@@ -19,11 +19,17 @@
 import string
 
 import MySQLdb
+import MySQLdb.cursors
 import _mysql_exceptions
 # from numpy import *
 import os
+import re
+import hashlib
+from threading import Lock
 
+from xml.sax.saxutils import quoteattr
 from Borg import Borg
+from DimensionIdCache import DimensionIdCache
 import RequirementFactory
 from ARM import *
 import DatabaseProxy
@@ -88,6 +94,7 @@ from ComponentViewParameters import ComponentViewParameters;
 from ComponentParameters import ComponentParameters;
 from WeaknessTarget import WeaknessTarget
 from ImpliedProcessParameters import ImpliedProcessParameters
+from NodeAttributes import NodeAttributes
 
 
 LABEL_COL = 0
@@ -290,10 +297,157 @@ REFERENCE_DIM_COL = 3
 
 collectedIds = set([])
 
+ID_BLOCK_SIZE = 1000
+# Ids set aside for the procedures that allocate their own, e.g. addTag, while a transaction is open
+PROCEDURE_ID_BLOCK_SIZE = 4 * ID_BLOCK_SIZE
+
+# Bumped whenever a database's id counter is reseeded, e.g. by a reset or a snapshot restore, so that every proxy
+# connected to it abandons the id block it reserved from the old counter
+idGenerations = {}
+idGenerationLock = Lock()
+
+def idGeneration(dbKey):
+  idGenerationLock.acquire()
+  try:
+    return idGenerations.get(dbKey,0)
+  finally:
+    idGenerationLock.release()
+
+def newIdGeneration(dbKey):
+  idGenerationLock.acquire()
+  try:
+    idGenerations[dbKey] = idGenerations.get(dbKey,0) + 1
+  finally:
+    idGenerationLock.release()
+
+RESET_EXCLUDED_TABLES = ['sql_checksum','model_change','model_revision']
+
+# The table or view linking each dimension to its environments, and its object id column; roles are in the environments
+# of their responsibilities and countermeasures, and risks in those shared by their threat and vulnerability
+ENVIRONMENT_LINK_TABLES = {'asset' : ('environment_asset','asset_id'),'attacker' : ('environment_attacker','attacker_id'),'goal' : ('environment_goal','goal_id'),'misusecase' : ('environment_misusecase','misusecase_id'),'requirement' : ('environment_requirement','requirement_id'),'response' : ('environment_response','response_id'),'risk' : ('environment_risk','id'),'role' : ('environment_role','role_id'),'threat' : ('environment_threat','threat_id'),'vulnerability' : ('environment_vulnerability','vulnerability_id')}
+TAGGED_DIMENSIONS = ['asset','attacker','goal','response','risk','threat','vulnerability']
+resetScripts = {}
+
+def sqlChecksum(fileName):
+  f = open(fileName,'rb')
+  checksum = hashlib.md5(f.read()).hexdigest()
+  f.close()
+  return checksum
+
+def resetScript(srcDir,initChecksum):
+  """
+  Returns the tables to truncate, in dependency order, and the statements reseeding the reference data of a fresh init.sql database.
+  Both are read once per version of init.sql.
+  """
+  if initChecksum not in resetScripts:
+    f = open(srcDir + '/orderedTables.txt')
+    tableNames = [x.strip() for x in f.readlines() if x.strip() != '']
+    f.close()
+    f = open(srcDir + '/init.sql')
+    initLines = f.readlines()
+    f.close()
+    for line in initLines:
+      m = re.match('\s*CREATE TABLE\s+(\w+)',line)
+      if (m != None and m.group(1) not in tableNames):
+        tableNames.append(m.group(1))
+    tableNames = [x for x in tableNames if x not in RESET_EXCLUDED_TABLES]
+    seedStatements = [x.strip().rstrip(';') for x in initLines if x.strip().lower().startswith('insert into')]
+    resetScripts[initChecksum] = (tableNames,seedStatements)
+  return resetScripts[initChecksum]
+
+def runSqlScript(host,port,user,passwd,db,scriptFile):
+  cmd = '/usr/bin/mysql -h ' + host + ' --port=' + str(port) + ' -u ' + user + ' --password=\'' + passwd + '\'' + ' --database ' + db + ' < ' + scriptFile
+  return os.system(cmd)
+
+MODEL_XML_HEADER = '<?xml version="1.0"?>\n<!DOCTYPE cairis_model PUBLIC "-//CAIRIS//DTD MODEL 1.0//EN" "http://www.cs.ox.ac.uk/cairis/dtd/cairis_model.dtd">\n<cairis_model>\n\n\n'
+MODEL_XML_SECTIONS = [('tvTypesToXml','threat and vulnerability types'),('domainValuesToXml','domain values'),('projectToXml','project data'),('riskAnalysisToXml','risk analysis artifacts'),('usabilityToXml','usability data'),('goalsToXml','goals'),('associationsToXml','association data')]
+# Sections whose procedures can return one row per exported object rather than the whole section in one row
+CHUNKED_XML_SECTIONS = ['riskAnalysisToXml','usabilityToXml','goalsToXml']
+
+# The model sections exporting each changed dimension, keyed by the table holding its objects
+CHANGE_SECTIONS = {
+  'vulnerability_type' : ['tvTypesToXml'],
+  'threat_type' : ['tvTypesToXml'],
+  'threat_value' : ['domainValuesToXml'],
+  'risk_class' : ['domainValuesToXml'],
+  'countermeasure_value' : ['domainValuesToXml'],
+  'severity' : ['domainValuesToXml'],
+  'likelihood' : ['domainValuesToXml'],
+  'asset_value' : ['projectToXml'],
+  'settings' : ['projectToXml'],
+  'environment' : ['projectToXml'],
+  'asset_type' : ['riskAnalysisToXml','goalsToXml'],
+  'role' : ['riskAnalysisToXml'],
+  'asset' : ['riskAnalysisToXml'],
+  'vulnerability' : ['riskAnalysisToXml'],
+  'attacker' : ['riskAnalysisToXml'],
+  'threat' : ['riskAnalysisToXml'],
+  'risk' : ['riskAnalysisToXml'],
+  'misusecase' : ['riskAnalysisToXml'],
+  'response' : ['riskAnalysisToXml'],
+  'classassociation' : ['riskAnalysisToXml'],
+  'persona' : ['usabilityToXml'],
+  'external_document' : ['usabilityToXml'],
+  'document_reference' : ['usabilityToXml'],
+  'concept_reference' : ['usabilityToXml'],
+  'persona_characteristic' : ['usabilityToXml'],
+  'task_characteristic' : ['usabilityToXml'],
+  'task' : ['usabilityToXml'],
+  'usecase' : ['usabilityToXml'],
+  'domainproperty' : ['goalsToXml'],
+  'goal' : ['goalsToXml'],
+  'obstacle' : ['goalsToXml'],
+  'requirement' : ['goalsToXml'],
+  'countermeasure' : ['goalsToXml'],
+  'trace' : ['associationsToXml'],
+  'goalassociation' : ['associationsToXml'],
+  'dependency' : ['associationsToXml']}
+
+# The methods removing a named object of each dimension when a differential export's deletions are imported
+DELETE_METHODS = {
+  'asset' : 'deleteAsset',
+  'asset_type' : 'deleteAssetType',
+  'attacker' : 'deleteAttacker',
+  'countermeasure' : 'deleteCountermeasure',
+  'document_reference' : 'deleteDocumentReference',
+  'domainproperty' : 'deleteDomainProperty',
+  'environment' : 'deleteEnvironment',
+  'external_document' : 'deleteExternalDocument',
+  'goal' : 'deleteGoal',
+  'misusecase' : 'deleteMisuseCase',
+  'obstacle' : 'deleteObstacle',
+  'persona' : 'deletePersona',
+  'requirement' : 'deleteRequirement',
+  'response' : 'deleteResponse',
+  'risk' : 'deleteRisk',
+  'role' : 'deleteRole',
+  'task' : 'deleteTask',
+  'threat' : 'deleteThreat',
+  'threat_type' : 'deleteThreatType',
+  'usecase' : 'deleteUseCase',
+  'vulnerability' : 'deleteVulnerability',
+  'vulnerability_type' : 'deleteVulnerabilityType'}
+
+def changeSections(dimName):
+  """
+  Returns the model sections holding a changed dimension.  Changes to dimensions no section is known to export may affect any section.
+  """
+  if (dimName not in CHANGE_SECTIONS):
+    return [procName for procName,sectionName in MODEL_XML_SECTIONS]
+  return CHANGE_SECTIONS[dimName]
+
 class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def __init__(self, host=None, port=None, user=None, passwd=None, db=None):
     DatabaseProxy.DatabaseProxy.__init__(self)
     self.theGrid = 0
+    self.theDimensionIdCache = DimensionIdCache()
+    self.thePendingIds = {}
+    self.theStaleIds = set([])
+    self.theUncommittedWrites = False
+    self.theTransactionDepth = 0
+    self.theStagedChanges = []
+    self.theIdLock = Lock()
+    self.releaseIds()
 
     if (host is None or port is None or user is None or passwd is None or db is None):
       b = Borg()
@@ -303,6 +457,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       passwd = b.dbPasswd
       db = b.dbName
 
+    self.theConnectionArgs = {'host' : host, 'port' : port, 'user' : user, 'passwd' : passwd, 'db' : db}
     try:
       self.conn = MySQLdb.connect(host=host,port=port,user=user,passwd=passwd,db=db)
       self.prepareDatabase()
@@ -338,7 +493,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       else:
         raise RuntimeError('Run mode not recognized')
 
+      self.theConnectionArgs = {'host' : host, 'port' : port, 'user' : user, 'passwd' : passwd, 'db' : db}
       self.conn = MySQLdb.connect(host=host,port=port,user=user,passwd=passwd,db=db)
+      self.theTransactionDepth = 0
+      self.releaseIds()
+      self.changesDiscarded()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error connecting to the IRIS database on host ' + b.dbHost + ' at port ' + str(b.dbPort) + ' with user ' + b.dbUser + ' (id:' + str(id) + ',message:' + msg
@@ -371,7 +530,80 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     if self.conn.open:
         self.conn.close()
 
-  def getRequirements(self,constraintId = '',isAsset = 1):
+  def commitChanges(self):
+    if (self.theTransactionDepth == 0):
+      self.flushChanges()
+      self.conn.commit()
+      self.changesCommitted()
+
+  def startTransaction(self):
+    # Until the matching commitTransaction, commitChanges leaves changes pending so they are committed, or rolled back, together
+    self.theTransactionDepth += 1
+    self.reserveProcedureIds()
+
+  def commitTransaction(self):
+    if (self.theTransactionDepth > 0):
+      self.theTransactionDepth -= 1
+    if (self.theTransactionDepth == 0):
+      self.flushChanges()
+      self.conn.commit()
+      self.changesCommitted()
+      self.releaseProcedureIds()
+
+  def rollbackTransaction(self):
+    self.discardChanges()
+    self.releaseIds()
+
+  def discardChanges(self):
+    # Rolls back whatever the connection has not committed, e.g. when it is handed back to the pool
+    self.theTransactionDepth = 0
+    self.conn.rollback()
+    self.changesDiscarded()
+    self.releaseProcedureIds()
+
+  def markWrite(self):
+    # Ids read from now until the next commit may belong to uncommitted changes, so they stay with this connection
+    self.theUncommittedWrites = True
+
+  def forgetId(self,dimensionTable,objtId):
+    for key,(dimId,readGeneration) in self.thePendingIds.items():
+      if (key[0] == dimensionTable and (dimId == objtId or objtId == -1)):
+        del self.thePendingIds[key]
+    self.theStaleIds.add((dimensionTable,objtId))
+    self.invalidateCachedId(dimensionTable,objtId)
+
+  def invalidateCachedId(self,dimensionTable,objtId):
+    if (objtId == -1):
+      self.theDimensionIdCache.invalidate(dimensionTable)
+    else:
+      self.theDimensionIdCache.invalidateId(dimensionTable,objtId)
+
+  def changesCommitted(self):
+    self.theDimensionIdCache.publish(self.thePendingIds)
+    for dimensionTable,objtId in self.theStaleIds:
+      self.invalidateCachedId(dimensionTable,objtId)
+    self.changesDiscarded()
+
+  def changesDiscarded(self):
+    self.thePendingIds = {}
+    self.theStaleIds = set([])
+    self.theStagedChanges = []
+    self.theUncommittedWrites = False
+
+  def inTransaction(self): return self.theTransactionDepth > 0
+
+  def dimensionIdCacheStats(self): return self.theDimensionIdCache.stats()
+
+  def isAlive(self):
+    if not self.conn.open:
+      return False
+    try:
+      self.conn.ping()
+      return True
+    except _mysql_exceptions.DatabaseError:
+      return False
+
+  def getRequirements(self,constraintId = '',isAsset = 1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getRequirements(%s,%s)',(constraintId,isAsset))
@@ -379,6 +611,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Undefined error while loading the requirements environment'
         raise DatabaseProxyException(exceptionText) 
       reqDict = {}
+      reqRows = []
       for row in curs.fetchall():
         row = list(row)
         reqId = row[ID_COL]
@@ -392,9 +625,12 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         reqType = row[TYPE_COL]
         reqVersion = row[VERSION_COL]
         reqDomain = row[ASSET_COL]
+        reqRows.append((reqId,reqLabel,reqName,reqDesc,priority,rationale,fitCriterion,originator,reqType,reqDomain,reqVersion))
+      curs.close()
+      reqRows = self.selectObjectRows('requirement',reqRows,selection,nameIdx=2,typeIdx=8,keyIdx=3)
+      for reqId,reqLabel,reqName,reqDesc,priority,rationale,fitCriterion,originator,reqType,reqDomain,reqVersion in reqRows:
         r = RequirementFactory.build(reqId,reqLabel,reqName,reqDesc,priority,rationale,fitCriterion,originator,reqType,reqDomain,reqVersion)
         reqDict[reqDesc] = r
-      curs.close()
       return reqDict
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -526,30 +762,100 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting latest identifier (id:' + str(id) + ',message:' + msg
       raise DatabaseProxyException(exceptionText) 
 
-  def newId(self):
+  def idDatabaseKey(self):
+    return (self.theConnectionArgs['host'],self.theConnectionArgs['port'],self.theConnectionArgs['db'])
+
+  def reserveIds(self,idCount):
+    # Atomically claims idCount consecutive identifiers, returning the first; no other session can be handed any of them.
+    # The claim is made and committed on a connection of its own, so it never waits on, or joins, a transaction open on this one.
     try: 
+      conn = MySQLdb.connect(**self.theConnectionArgs)
+      try:
+        curs = conn.cursor()
+        curs.execute('call reserveIds(%s)',(idCount))
+        if (curs.rowcount == -1):
+          exceptionText = 'Error reserving ' + str(idCount) + ' ids'
+          raise DatabaseProxyException(exceptionText) 
+        results = curs.fetchone()
+        firstId = int(results[0])
+        curs.close()
+        conn.commit()
+      finally:
+        conn.close()
+      return firstId
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error reserving ' + str(idCount) + ' identifiers (id:' + str(id) + ',message:' + msg
+      raise DatabaseProxyException(exceptionText) 
+
+  def releaseIds(self):
+    self.theNextId = 0
+    self.theLastReservedId = -1
+    self.theIdGeneration = -1
+    self.theProcedureIdGeneration = -1
+
+  def reserveProcedureIds(self):
+    """
+    Hands the connection a block of ids in @reservedNextId and @reservedLastId, which newId1 and newId2 take from instead of
+    updating the 'did' row.  Otherwise a procedure allocating an id inside a transaction would hold that row's lock until the
+    transaction ended, and the next reserveIds, from this proxy or any other, would wait on it.  The block is topped up
+    before each change while fewer than ID_BLOCK_SIZE ids are left.
+    """
+    currentGeneration = idGeneration(self.idDatabaseKey())
+    try:
       curs = self.conn.cursor()
-      curs.execute('call newId()',())
-      if (curs.rowcount == -1):
-        exceptionText = 'Error getting last id'
-        raise DatabaseProxyException(exceptionText) 
-      results = curs.fetchone()
-      newId = results[0]
+      if (self.theProcedureIdGeneration == currentGeneration):
+        curs.execute('select @reservedLastId - @reservedNextId + 1')
+        idsLeft = curs.fetchone()[0]
+        if (idsLeft != None and idsLeft >= ID_BLOCK_SIZE):
+          curs.close()
+          return
+      firstId = self.reserveIds(PROCEDURE_ID_BLOCK_SIZE)
+      curs.execute('set @reservedNextId = %s, @reservedLastId = %s',(firstId,firstId + PROCEDURE_ID_BLOCK_SIZE - 1))
+      curs.close()
+      self.theProcedureIdGeneration = currentGeneration
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error reserving identifiers for procedures (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def releaseProcedureIds(self):
+    # Outside a transaction each change commits straight away, so procedures go back to the 'did' row
+    if (self.theProcedureIdGeneration == -1):
+      return
+    self.theProcedureIdGeneration = -1
+    try:
+      curs = self.conn.cursor()
+      curs.execute('set @reservedNextId = null, @reservedLastId = null')
       curs.close()
-      return newId
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
-      exceptionText = 'MySQL error getting new identifier (id:' + str(id) + ',message:' + msg
+      exceptionText = 'MySQL error releasing identifiers reserved for procedures (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
+
+  def newId(self):
+    self.theIdLock.acquire()
+    try:
+      currentGeneration = idGeneration(self.idDatabaseKey())
+      if (self.theNextId > self.theLastReservedId or self.theIdGeneration != currentGeneration):
+        self.theNextId = self.reserveIds(ID_BLOCK_SIZE)
+        self.theLastReservedId = self.theNextId + ID_BLOCK_SIZE - 1
+        self.theIdGeneration = currentGeneration
+      newId = self.theNextId
+      self.theNextId += 1
+      return newId
+    finally:
+      self.theIdLock.release()
   
   def addRequirement(self,r,assetName,isAsset = True):
+    self.recordChange('requirement','add',r.id(),r.name())
     try:
       curs = self.conn.cursor()
       curs.execute('call addRequirement(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)',(r.label(),r.id(), r.version(), r.name(),r.description(), r.rationale(), r.originator(), r.fitCriterion(), r.priority(),r.type(),assetName,isAsset))
       if (curs.rowcount == -1):
         exceptionText = 'Error inserting new requirement ' + str(r.id())
         raise DatabaseProxyException(exceptionText)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -557,13 +863,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateRequirement(self,r):
+    self.recordChange('requirement','update',r.id(),r.name())
     try:
       curs = self.conn.cursor()
       curs.execute('call updateRequirement(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)',(r.label(),r.id(), r.version(), r.name(),r.description(), r.rationale(), r.originator(), r.fitCriterion(), r.priority(),r.type()))
       if (curs.rowcount == -1):
         exceptionText = 'Error updating requirement ' + str(r.id())
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -594,6 +901,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addEnvironment(self,parameters):
     environmentId = self.newId()
+    self.recordChange('environment','add',environmentId,parameters.name())
     environmentName = parameters.name()
     environmentShortCode = parameters.shortCode()
     environmentDescription = parameters.description()
@@ -617,7 +925,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           self.updateValueType(v)
 
       self.addValueTensions(environmentId,parameters.tensions())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -655,6 +963,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateEnvironment(self,parameters):
+    self.recordChange('environment','update',parameters.id(),parameters.name())
     environmentId = parameters.id()
     environmentName = parameters.name()
     environmentShortCode = parameters.shortCode()
@@ -679,7 +988,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (len(parameters.duplicateProperty()) > 0):
         self.addCompositeEnvironmentProperties(environmentId,parameters.duplicateProperty(),parameters.overridingEnvironment())
       self.addValueTensions(environmentId,parameters.tensions())
-      self.conn.commit()
+      self.invalidateRiskScores('environment',environmentId)
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -688,9 +998,9 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteRequirement(self,r):
     self.deleteObject(r,'requirement')
-    self.conn.commit()
+    self.commitChanges()
 
-  def getEnvironments(self,constraintId = -1):
+  def getEnvironments(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getEnvironments(%s)',(constraintId))
@@ -712,13 +1022,18 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       environmentDesc = row[ENVIRONMENTDESC_COL]
       envRows.append((environmentId,environmentName,environmentShortCode,environmentDesc))
     curs.close()
+    envRows = self.selectObjectRows('environment',envRows,selection)
     for environmentId,environmentName,environmentShortCode,environmentDesc in envRows:
-      cc = self.compositeEnvironments(environmentId)
+      cc = []
+      if (self.loadsField(selection,'theEnvironments') or self.loadsField(selection,'theDuplicateProperty') or self.loadsField(selection,'theOverridingEnvironment')):
+        cc = self.compositeEnvironments(environmentId)
       duplicateProperty = 'None'
       overridingEnvironment = ''
       if (len(cc) > 0):
         duplicateProperty,overridingEnvironment = self.duplicateProperties(environmentId)
-      tensions = self.environmentTensions(environmentName)
+      tensions = {}
+      if (self.loadsField(selection,'theTensions')):
+        tensions = self.environmentTensions(environmentName)
       p = EnvironmentParameters(environmentName,environmentShortCode,environmentDesc,cc,duplicateProperty,overridingEnvironment,tensions)
       cn = ObjectFactory.build(environmentId,p)
       environments[environmentName] = cn 
@@ -778,7 +1093,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error environments associated with composite environment id ' + str(environmentId) + ' (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getAttackers(self,constraintId = -1):
+  def getAttackers(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getAttackers(%s)',(constraintId))
@@ -796,10 +1111,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         attackerImage = row[ATTACKERS_IMAGE_COL]
         attackerRows.append((attackerId,attackerName,attackerDesc,attackerImage))
       curs.close()
+      attackerRows = self.selectObjectRows('attacker',attackerRows,selection)
       for attackerId,attackerName,attackerDesc,attackerImage in attackerRows:
-        tags = self.getTags(attackerName,'attacker')
+        tags = self.selectedTags(attackerName,'attacker',selection)
         environmentProperties = []
-        for environmentId,environmentName in self.dimensionEnvironments(attackerId,'attacker'):
+        for environmentId,environmentName in self.selectedEnvironments(attackerId,'attacker',selection):
           roles = self.dimensionRoles(attackerId,environmentId,'attacker')
           capabilities = self.attackerCapabilities(attackerId,environmentId)
           motives = self.attackerMotives(attackerId,environmentId)
@@ -909,6 +1225,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def addAttacker(self,parameters):
     try:
       attackerId = self.newId()
+      self.recordChange('attacker','add',attackerId,parameters.name())
       attackerName = parameters.name()
       attackerDesc = parameters.description()
       attackerImage = parameters.image()
@@ -925,7 +1242,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addAttackerMotives(attackerId,environmentName,environmentProperties.motives())
         self.addAttackerCapabilities(attackerId,environmentName,environmentProperties.capabilities())
         self.addDimensionRoles(attackerId,'attacker',environmentName,environmentProperties.roles())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return attackerId
     except _mysql_exceptions.DatabaseError, e:
@@ -976,6 +1293,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
   
   def updateAttacker(self,parameters):
+    self.recordChange('attacker','update',parameters.id(),parameters.name())
     try:
       curs = self.conn.cursor()
       curs.execute('call deleteAttackerComponents(%s)',(parameters.id()))
@@ -1001,7 +1319,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addAttackerMotives(attackerId,environmentName,environmentProperties.motives())
         self.addAttackerCapabilities(attackerId,environmentName,environmentProperties.capabilities())
         self.addDimensionRoles(attackerId,'attacker',environmentName,environmentProperties.roles())
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error updating attacker id ' + str(parameters.id()) + ' (id:' + str(id) + ',message:' + msg + ')'
@@ -1009,9 +1327,12 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteAttacker(self,attackerId):
     self.deleteObject(attackerId,'attacker')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteObject(self,objtId,tableName):
+    self.recordChange(tableName,'delete',objtId)
+    if (tableName in ['asset','threat','vulnerability','risk','response','countermeasure','environment']):
+      self.invalidateRiskScores(tableName,objtId)
     try: 
       curs = self.conn.cursor()
       sqlTxt = 'call delete_' + tableName + '(%s)'
@@ -1031,6 +1352,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addAsset(self,parameters):
     assetId = self.newId()
+    self.recordChange('asset','add',assetId,parameters.name())
     assetName = parameters.name()
     shortCode = parameters.shortCode()
     assetDesc = parameters.description()
@@ -1053,7 +1375,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addDimensionEnvironment(assetId,'asset',environmentName)
         self.addAssetAssociations(assetId,assetName,environmentName,cProperties.associations())
         self.addSecurityProperties('asset',assetId,environmentName,cProperties.properties(),cProperties.rationale())
-      self.conn.commit()
+      self.invalidateRiskScores('asset',assetId)
+      self.commitChanges()
       curs.close()
       return assetId
     except _mysql_exceptions.DatabaseError, e:
@@ -1062,6 +1385,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateAsset(self,parameters):
+    self.recordChange('asset','update',parameters.id(),parameters.name())
     assetId = parameters.id()
     assetName = parameters.name()
     shortCode = parameters.shortCode()
@@ -1091,7 +1415,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addDimensionEnvironment(assetId,'asset',environmentName)
         self.addAssetAssociations(assetId,assetName,environmentName,cProperties.associations())
         self.addSecurityProperties('asset',assetId,environmentName,cProperties.properties(),cProperties.rationale())
-      self.conn.commit()
+      self.invalidateRiskScores('asset',assetId)
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -1216,11 +1541,27 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteAsset(self,assetId):
     self.deleteObject(assetId,'asset')
-    self.conn.commit()
+    self.commitChanges()
 
   def dimensionObject(self,constraintName,dimensionTable):
-    if (dimensionTable != 'requirement'):
+    if (dimensionTable == 'requirement'):
+      objts = self.getRequirement(constraintName)
+      return (objts.values())[0]
+    constraintId = self.getDimensionId(constraintName,dimensionTable)
+    return self.dimensionObjectById(constraintId,dimensionTable)
+
+  def dimensionObjectByName(self,constraintName,dimensionTable):
+    try:
       constraintId = self.getDimensionId(constraintName,dimensionTable)
+    except DatabaseProxyException, e:
+      if (str(e.value).find('No identifier associated with') > -1):
+        return None
+      raise
+    if (constraintId == None):
+      return None
+    return self.dimensionObjectById(constraintId,dimensionTable)
+
+  def dimensionObjectById(self,constraintId,dimensionTable):
     objts = {}
     if (dimensionTable == 'provided_interface' or dimensionTable == 'required_interface'):
       objts = self.getInterfaces(constraintId)
@@ -1266,8 +1607,6 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       objts = self.getUseCases(constraintId)
     elif (dimensionTable == 'misusecase'):
       objts = self.getMisuseCases(constraintId)
-    elif (dimensionTable == 'requirement'):
-      objts = self.getRequirement(constraintName)
     elif (dimensionTable == 'environment'):
       objts = self.getEnvironments(constraintId)
     elif (dimensionTable == 'role'):
@@ -1299,9 +1638,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     elif (dimensionTable == 'persona_implied_process'):
       objts = self.getImpliedProcesses(constraintId)
 
+    if (objts == None or len(objts) == 0):
+      return None
     return (objts.values())[0]
 
-  def getAssets(self,constraintId = -1):
+  def getAssets(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getAssets(%s)',(constraintId))
@@ -1322,13 +1663,25 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         assetCriticalRationale = row[ASSETS_CRITICALRATIONALE_COL]
         assetRows.append((assetName,assetId,shortCode,assetDesc,assetSig,assetType,assetCriticality,assetCriticalRationale))
       curs.close()
+      assetRows = self.selectObjectRows('asset',assetRows,selection,nameIdx=0,typeIdx=5,idIdx=1)
+      if (len(assetRows) == 0):
+        return assets
+
+      loadEnvironments = self.loadsField(selection,'theEnvironmentProperties')
+      tagLookup,ifLookup,envLookup,propLookup,assocLookup = self.assetComponentsBulk(constraintId,self.loadsField(selection,'theTags'),self.loadsField(selection,'theInterfaces'),loadEnvironments)
+      compositeIds = []
+      if (loadEnvironments):
+        compositeIds = self.compositeEnvironmentIdList()
       for assetName,assetId,shortCode,assetDesc,assetSig,assetType,assetCriticality,assetCriticalRationale in assetRows:
-        tags = self.getTags(assetName,'asset')
-        ifs = self.getInterfaces(assetName,'asset')
+        tags = tagLookup.get(assetId,[])
+        ifs = ifLookup.get(assetId,[])
         environmentProperties = []
-        for environmentId,environmentName in self.dimensionEnvironments(assetId,'asset'):
-          syProperties,pRationale = self.relatedProperties('asset',assetId,environmentId)
-          assetAssociations = self.assetAssociations(assetId,environmentId)
+        for environmentId,environmentName in envLookup.get(assetId,[]):
+          if environmentId in compositeIds:
+            syProperties,pRationale = self.relatedProperties('asset',assetId,environmentId)
+          else:
+            syProperties,pRationale = propLookup.get((assetId,environmentId),([0] * 8,[None] * 8))
+          assetAssociations = assocLookup.get((assetId,environmentId),[])
           properties = AssetEnvironmentProperties(environmentName,syProperties,pRationale,assetAssociations)
           environmentProperties.append(properties) 
         parameters = AssetParameters(assetName,shortCode,assetDesc,assetSig,assetType,assetCriticality,assetCriticalRationale,tags,ifs,environmentProperties)
@@ -1340,7 +1693,140 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting assets (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getThreats(self,constraintId = -1):
+  def environmentObjectIds(self,dimName,envName):
+    if (dimName not in ENVIRONMENT_LINK_TABLES):
+      raise DatabaseProxyException('Cannot filter ' + dimName + ' objects by environment')
+    linkTable,idColumn = ENVIRONMENT_LINK_TABLES[dimName]
+    sqlTxt = 'select distinct x.' + idColumn + ' from ' + linkTable + ' x, environment e where x.environment_id = e.id and e.name = %s'
+    try:
+      curs = self.conn.cursor()
+      curs.execute(sqlTxt,(envName))
+      objtIds = set([row[0] for row in curs.fetchall()])
+      curs.close()
+      return objtIds
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting ' + dimName + ' objects in environment ' + envName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def taggedObjectIds(self,dimName,tagName):
+    if (dimName not in TAGGED_DIMENSIONS):
+      raise DatabaseProxyException('Cannot filter ' + dimName + ' objects by tag')
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select x.' + dimName + '_id from ' + dimName + '_tag x, tag t where x.tag_id = t.id and t.name = %s',(tagName))
+      objtIds = set([row[0] for row in curs.fetchall()])
+      curs.close()
+      return objtIds
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting ' + dimName + ' objects tagged ' + tagName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def selectObjectRows(self,dimName,rows,selection,nameIdx = 1,typeIdx = None,idIdx = 0,envIdx = None,keyIdx = None):
+    """
+    Applies an ObjectSelection to a loader's base rows, so objects outside the selected page are never built.
+    The environment and tag filters are resolved to object ids with a single query each.
+    """
+    if (selection == None):
+      return rows
+    objtIds = None
+    if (selection.environment() != None and envIdx == None):
+      objtIds = self.environmentObjectIds(dimName,selection.environment())
+    if (selection.tag() != None):
+      tagIds = self.taggedObjectIds(dimName,selection.tag())
+      if (objtIds == None):
+        objtIds = tagIds
+      else:
+        objtIds = objtIds & tagIds
+    try:
+      return selection.select(rows,nameIdx,typeIdx,objtIds,idIdx,envIdx,keyIdx)
+    except ARMException, ex:
+      raise DatabaseProxyException(str(ex.value))
+
+  def loadsField(self,selection,attrName):
+    return (selection == None or selection.loads(attrName))
+
+  def selectedTags(self,objtName,dimName,selection):
+    if (self.loadsField(selection,'theTags')):
+      return self.getTags(objtName,dimName)
+    return []
+
+  def selectedEnvironments(self,objtId,dimName,selection):
+    if (self.loadsField(selection,'theEnvironmentProperties')):
+      return self.dimensionEnvironments(objtId,dimName)
+    return []
+
+  def bulkRows(self,procName,constraintId = -1):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call ' + procName + '(%s)',(constraintId))
+      if (curs.rowcount == -1):
+        exceptionText = 'Error calling ' + procName
+        raise DatabaseProxyException(exceptionText) 
+      rows = []
+      for row in curs.fetchall():
+        rows.append(list(row))
+      curs.close()
+      return rows
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error calling ' + procName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def compositeEnvironmentIdList(self):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call compositeEnvironmentIdList()')
+      if (curs.rowcount == -1):
+        exceptionText = 'Error getting composite environments'
+        raise DatabaseProxyException(exceptionText) 
+      envIds = set([])
+      for row in curs.fetchall():
+        envIds.add(row[0])
+      curs.close()
+      return envIds
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting composite environments (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def assetComponentsBulk(self,constraintId = -1,loadTags = True,loadInterfaces = True,loadEnvironments = True):
+    tagLookup = {}
+    if (loadTags):
+      for assetId,tagName in self.bulkRows('getAssetTagsBulk',constraintId):
+        tagLookup.setdefault(assetId,[]).append(tagName)
+
+    ifLookup = {}
+    if (loadInterfaces):
+      for assetId,ifName,ifTypeId,arName,prName in self.bulkRows('getAssetInterfacesBulk',constraintId):
+        ifType = 'provided'
+        if (ifTypeId == 1):
+          ifType = 'required'
+        ifLookup.setdefault(assetId,[]).append((ifName,ifType,arName,prName))
+
+    envLookup = {}
+    propLookup = {}
+    assocLookup = {}
+    if (not loadEnvironments):
+      return (tagLookup,ifLookup,envLookup,propLookup,assocLookup)
+
+    for assetId,environmentId,environmentName in self.bulkRows('getAssetEnvironmentsBulk',constraintId):
+      envLookup.setdefault(assetId,[]).append((environmentId,environmentName))
+
+    for assetId,environmentId,propertyId,propertyValue,propertyRationale in self.bulkRows('getAssetPropertiesBulk',constraintId):
+      if (assetId,environmentId) not in propLookup:
+        propLookup[(assetId,environmentId)] = ([0] * 8,[None] * 8)
+      syProperties,pRationale = propLookup[(assetId,environmentId)]
+      syProperties[propertyId] = int(propertyValue)
+      pRationale[propertyId] = propertyRationale
+
+    for row in self.bulkRows('getAssetAssociationsBulk',constraintId):
+      headId,environmentId,headNav,headType,headMult,headRole,tailRole,tailMult,tailType,tailNav,tailName = row
+      assocLookup.setdefault((headId,environmentId),[]).append((headNav,headType,headMult,headRole,tailRole,tailMult,tailType,tailNav,tailName))
+    return (tagLookup,ifLookup,envLookup,propLookup,assocLookup)
+
+  def getThreats(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getThreats(%s)',(constraintId))
@@ -1362,10 +1848,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       thrMethod = row[THREAT_METHOD_COL]
       threatRows.append((threatId,threatName,threatType,thrMethod))
     curs.close()
+    threatRows = self.selectObjectRows('threat',threatRows,selection,typeIdx=2)
     for threatId,threatName,threatType,thrMethod in threatRows: 
-      tags = self.getTags(threatName,'threat')
+      tags = self.selectedTags(threatName,'threat',selection)
       environmentProperties = []
-      for environmentId,environmentName in self.dimensionEnvironments(threatId,'threat'):
+      for environmentId,environmentName in self.selectedEnvironments(threatId,'threat',selection):
         likelihood = self.threatLikelihood(threatId,environmentId)
         assets = self.threatenedAssets(threatId,environmentId) 
         attackers = self.threatAttackers(threatId,environmentId)
@@ -1382,6 +1869,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       return self.theDimNameLookup[dimensionName]
     if dimensionTable == 'linkand':
       dimensionTable = 'goalassociation'
+    pendingId = self.thePendingIds.get((dimensionTable,dimensionName),None)
+    if (pendingId != None):
+      return pendingId[0]
+    cachedId = self.theDimensionIdCache.get(dimensionTable,dimensionName)
+    if (cachedId != None):
+      return cachedId
+    objtName = dimensionName
+    readGeneration = self.theDimensionIdCache.generation(dimensionTable)
     try:
       curs = self.conn.cursor()
       sqlText = ''
@@ -1419,6 +1914,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           row = curs.fetchone()
           dimId = row[0]
       curs.close()
+      if (dimId != None):
+        if (self.theTransactionDepth == 0 and not self.theUncommittedWrites):
+          self.theDimensionIdCache.publish({(dimensionTable,objtName) : (dimId,readGeneration)})
+        else:
+          self.thePendingIds[(dimensionTable,objtName)] = (dimId,readGeneration)
       return dimId
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -1497,6 +1997,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addThreat(self,parameters,update = False):
     threatId = self.newId()
+    self.recordChange('threat','add',threatId,parameters.name())
     threatName = parameters.name()
     threatType = parameters.type()
     threatMethod = parameters.method()
@@ -1528,7 +2029,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           if (curs.rowcount == -1):
             exceptionText = 'Error adding new threat ' + threatName + ' to environment ' + environmentName
             raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return threatId
     except _mysql_exceptions.DatabaseError, e:
@@ -1538,6 +2039,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateThreat(self,parameters):
+    self.recordChange('threat','update',parameters.id(),parameters.name())
     threatId = parameters.id()
     threatName = parameters.name()
     threatType = parameters.type()
@@ -1575,13 +2077,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           if (curs.rowcount == -1):
             exceptionText = 'Error adding new threat ' + threatName + ' to environment ' + environmentName
             raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.invalidateRiskScores('threat',threatId)
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error updating threat ' + threatName + ' (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getVulnerabilities(self,constraintId = -1):
+  def getVulnerabilities(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getVulnerabilities(%s)',(constraintId))
@@ -1603,11 +2106,12 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       vulnerabilityType = row[VULNERABILITIES_TYPE_COL]
       vulRows.append((vulnerabilityId,vulnerabilityName,vulnerabilityDescription,vulnerabilityType))
     curs.close()
+    vulRows = self.selectObjectRows('vulnerability',vulRows,selection,typeIdx=3)
 
     for vulnerabilityId,vulnerabilityName,vulnerabilityDescription,vulnerabilityType in vulRows:
-      tags = self.getTags(vulnerabilityName,'vulnerability')
+      tags = self.selectedTags(vulnerabilityName,'vulnerability',selection)
       environmentProperties = []
-      for environmentId,environmentName in self.dimensionEnvironments(vulnerabilityId,'vulnerability'):
+      for environmentId,environmentName in self.selectedEnvironments(vulnerabilityId,'vulnerability',selection):
         severity = self.vulnerabilitySeverity(vulnerabilityId,environmentId)
         assets = self.vulnerableAssets(vulnerabilityId,environmentId)
         properties = VulnerabilityEnvironmentProperties(environmentName,severity,assets)
@@ -1619,7 +2123,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteVulnerability(self,vulId):
     self.deleteObject(vulId,'vulnerability')
-    self.conn.commit()
+    self.commitChanges()
 
   def addVulnerability(self,parameters):
     vulName = parameters.name()
@@ -1628,6 +2132,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     tags = parameters.tags()
     try:
       vulId = self.newId()
+      self.recordChange('vulnerability','add',vulId,parameters.name())
       curs = self.conn.cursor()
       curs.execute('call addVulnerability(%s,%s,%s,%s)',(vulId,vulName,vulDesc.encode('utf-8'),vulType))
       if (curs.rowcount == -1):
@@ -1648,7 +2153,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           if (curs.rowcount == -1):
             exceptionText = 'Error adding new threat ' + threatName + ' to environment ' + environmentName
             raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return vulId
     except _mysql_exceptions.DatabaseError, e:
@@ -1657,6 +2162,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateVulnerability(self,parameters):
+    self.recordChange('vulnerability','update',parameters.id(),parameters.name())
     vulId = parameters.id()
     vulName = parameters.name()
     vulDesc = parameters.description()
@@ -1686,7 +2192,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           if (curs.rowcount == -1):
             exceptionText = 'Error adding threat ' + threatName + ' to environment ' + environmentName
             raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.invalidateRiskScores('vulnerability',vulId)
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -1850,6 +2357,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def addPersona(self,parameters):
     try:
       personaId = self.newId()
+      self.recordChange('persona','add',personaId,parameters.name())
       personaName = parameters.name()
       activities = parameters.activities()
       attitudes = parameters.attitudes()
@@ -1878,7 +2386,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addPersonaDirect(personaId,environmentName,environmentProperties.directFlag())
         self.addDimensionRoles(personaId,'persona',environmentName,environmentProperties.roles())
         self.addPersonaEnvironmentCodes(personaName,environmentName,environmentProperties.codes())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return personaId
     except _mysql_exceptions.DatabaseError, e:
@@ -1902,6 +2410,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updatePersona(self,parameters):
+    self.recordChange('persona','update',parameters.id(),parameters.name())
     personaId = parameters.id()
     personaName = parameters.name()
     activities = parameters.activities()
@@ -1937,7 +2446,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addPersonaDirect(personaId,environmentName,environmentProperties.directFlag())
         self.addDimensionRoles(personaId,'persona',environmentName,environmentProperties.roles())
         self.addPersonaEnvironmentCodes(personaName,environmentName,environmentProperties.codes())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -1946,7 +2455,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deletePersona(self,personaId):
     self.deleteObject(personaId,'persona')
-    self.conn.commit()
+    self.commitChanges()
 
   def getTasks(self,constraintId = -1):
     try:
@@ -1992,7 +2501,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting tasks (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getMisuseCases(self,constraintId = -1):
+  def getMisuseCases(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getMisuseCases(%s)',(constraintId))
@@ -2009,10 +2518,13 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           mcName = row[MISUSECASES_NAME_COL]
           mcRows.append((mcId,mcName))
         curs.close()
+        mcRows = self.selectObjectRows('misusecase',mcRows,selection)
         for mcId,mcName in mcRows:
-          risk = self.misuseCaseRisk(mcId)
+          risk = ''
+          if (self.loadsField(selection,'theRiskName')):
+            risk = self.misuseCaseRisk(mcId)
           environmentProperties = []
-          for environmentId,environmentName in self.dimensionEnvironments(mcId,'misusecase'):
+          for environmentId,environmentName in self.selectedEnvironments(mcId,'misusecase',selection):
             narrative = self.misuseCaseNarrative(mcId,environmentId)
             properties = MisuseCaseEnvironmentProperties(environmentName,narrative)
             environmentProperties.append(properties)
@@ -2126,6 +2638,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     tags = parameters.tags()
     try:
       taskId = self.newId()
+      self.recordChange('task','add',taskId,parameters.name())
       curs = self.conn.cursor()
       curs.execute('call addTask(%s,%s,%s,%s,%s,%s)',(taskId,taskName,taskShortCode,taskObjective,isAssumption,taskAuthor))
       if (curs.rowcount == -1):
@@ -2143,7 +2656,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addTaskConcernAssociations(taskId,environmentName,cProperties.concernAssociations())
         self.addTaskNarrative(taskId,cProperties.narrative().encode('utf-8'),cProperties.consequences().encode('utf-8'),cProperties.benefits().encode('utf-8'),environmentName)
         self.addTaskEnvironmentCodes(taskName,environmentName,cProperties.codes())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return taskId
     except _mysql_exceptions.DatabaseError, e:
@@ -2165,7 +2678,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         environmentName = cProperties.name()
         self.addDimensionEnvironment(mcId,'misusecase',environmentName)
         self.addMisuseCaseNarrative(mcId,cProperties.narrative().encode('utf-8'),environmentName)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return mcId
     except _mysql_exceptions.DatabaseError, e:
@@ -2175,6 +2688,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateTask(self,parameters):
+    self.recordChange('task','update',parameters.id(),parameters.name())
     taskId = parameters.id()
     taskName = parameters.name()
     taskShortCode = parameters.shortCode()
@@ -2204,7 +2718,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           self.addTaskAssets(taskId,taskAssets,environmentName)
         self.addTaskNarrative(taskId,cProperties.narrative().encode('utf-8'),cProperties.consequences().encode('utf-8'),cProperties.benefits().encode('utf-8'),environmentName)
         self.addTaskEnvironmentCodes(taskName,environmentName,cProperties.codes())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -2212,6 +2726,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateMisuseCase(self,parameters):
+    self.recordChange('misusecase','update',parameters.id(),parameters.name())
     mcId = parameters.id()
     mcName = parameters.name()
     try:
@@ -2229,7 +2744,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         environmentName = cProperties.name()
         self.addDimensionEnvironment(mcId,'misusecase',environmentName)
         self.addMisuseCaseNarrative(mcId,cProperties.narrative().encode('utf-8'),environmentName)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -2277,15 +2792,15 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTask(self,taskId):
     self.deleteObject(taskId,'task')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteThreat(self,objtId):
     self.deleteObject(objtId,'threat')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteResponse(self,responseId):
     self.deleteObject(responseId,'response')
-    self.conn.commit()
+    self.commitChanges()
 
   def getTraceDimensions(self,dimName,isFrom):
     return self.traceDimensionList(self.getDimensionId(dimName,'trace_dimension'),isFrom)
@@ -2308,7 +2823,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting trace dimensions (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getRisks(self,constraintId = -1):
+  def getRisks(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getRisks(%s)',(constraintId))
@@ -2329,16 +2844,90 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       vulName = row[RISKS_VULNAME_COL]
       parameterList.append((riskId,riskName,threatName,vulName))
     curs.close()
-
-    for parameters in parameterList:
-      riskId = parameters[0]
-      mc = self.riskMisuseCase(riskId)
-      tags = self.getTags(parameters[1],'risk')
-      parameters = RiskParameters(parameters[1],parameters[2],parameters[3],mc,tags)
+    parameterList = self.selectObjectRows('risk',parameterList,selection)
+
+    if (len(parameterList) == 0):
+      return risks
+
+    tagLookup = {}
+    if (self.loadsField(selection,'theTags')):
+      for riskId,tagName in self.bulkRows('getRiskTagsBulk',constraintId):
+        tagLookup.setdefault(riskId,[]).append(tagName)
+
+    mcLookup = {}
+    mcRows = []
+    if (self.loadsField(selection,'theMisuseCase')):
+      mcRows = self.bulkRows('getRiskMisuseCasesBulk',constraintId)
+    for riskId,mcId,mcName,environmentId,environmentName,narrative in mcRows:
+      mcId,mcName,environmentProperties = mcLookup.setdefault(riskId,(mcId,mcName,[]))
+      if (environmentId != None):
+        environmentProperties.append(MisuseCaseEnvironmentProperties(environmentName,narrative))
+
+    for riskId,riskName,threatName,vulName in parameterList:
+      mc = None
+      if riskId in mcLookup:
+        mcId,mcName,environmentProperties = mcLookup[riskId]
+        mc = ObjectFactory.build(mcId,MisuseCaseParameters(mcName,environmentProperties,riskName))
+        mc.theThreatName = threatName
+        mc.theVulnerabilityName = vulName
+      tags = tagLookup.get(riskId,[])
+      parameters = RiskParameters(riskName,threatName,vulName,mc,tags)
       risk = ObjectFactory.build(riskId,parameters)
       risks[risk.name()] = risk
     return risks
 
+  def compositeEnvironmentMembers(self):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call compositeEnvironmentMembers()')
+      if (curs.rowcount == -1):
+        exceptionText = 'Error getting composite environment members'
+        raise DatabaseProxyException(exceptionText) 
+      members = {}
+      for row in curs.fetchall():
+        members.setdefault(row[0],[]).append(row[1])
+      curs.close()
+      return members
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting composite environment members (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def riskMisuseCaseSummaries(self,constraintId = -1):
+    members = self.compositeEnvironmentMembers()
+
+    assetLookup = {}
+    for riskId,environmentId,assetName,isVulnerable in self.bulkRows('getRiskAssetsBulk',constraintId):
+      assetLookup.setdefault((riskId,environmentId,isVulnerable),[]).append(assetName)
+
+    attackerLookup = {}
+    for riskId,environmentId,attackerName in self.bulkRows('getRiskAttackersBulk',constraintId):
+      attackerLookup.setdefault((riskId,environmentId),[]).append(attackerName)
+
+    def environmentNames(lookup,riskId,environmentId,*keySuffix):
+      if environmentId not in members:
+        return list(lookup.get((riskId,environmentId) + keySuffix,[]))
+      names = []
+      for memberId in members[environmentId]:
+        for name in lookup.get((riskId,memberId) + keySuffix,[]):
+          if name not in names:
+            names.append(name)
+      return names
+
+    summaries = {}
+    for row in self.bulkRows('getRiskEnvironmentRatingsBulk',constraintId):
+      riskId,threatName,vulName,environmentId,environmentName,likelihood,severity,rating = row
+      if environmentId in members:
+        try:
+          rating = self.riskRating(threatName,vulName,environmentName)
+        except TypeError:
+          rating = None
+      threatenedAssets = environmentNames(assetLookup,riskId,environmentId,0)
+      vulnerableAssets = environmentNames(assetLookup,riskId,environmentId,1)
+      attackers = environmentNames(attackerLookup,riskId,environmentId)
+      summaries.setdefault(riskId,{})[environmentName] = (likelihood,severity,rating,threatenedAssets,vulnerableAssets,attackers)
+    return summaries
+
 
   def addRisk(self,parameters):
     try:
@@ -2346,6 +2935,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       vulName = parameters.vulnerability()
       tags = parameters.tags()
       riskId = self.newId()
+      self.recordChange('risk','add',riskId,parameters.name())
       riskName = parameters.name()
       inTxt = parameters.intent()
       envName = parameters.environment()
@@ -2358,7 +2948,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       mcParameters = MisuseCaseParameters(mc.name(),mc.environmentProperties(),mc.risk())
       self.addMisuseCase(mcParameters)
       self.addTags(riskName,'risk',tags)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return riskId
     except _mysql_exceptions.DatabaseError, e:
@@ -2367,6 +2957,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateRisk(self,parameters):
+    self.recordChange('risk','update',parameters.id(),parameters.name())
     try:
       riskId = parameters.id()
       threatName = parameters.threat()
@@ -2385,7 +2976,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       mcParameters.setId(mc.id())
       self.updateMisuseCase(mcParameters)
       self.addTags(riskName,'risk',tags)
-      self.conn.commit()
+      self.invalidateRiskScores('risk',riskId)
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -2394,13 +2986,13 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteRisk(self,riskId):
     self.deleteObject(riskId,'risk')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteMisuseCase(self,mcId):
     self.deleteObject(mcId,'misusecase')
-    self.conn.commit()
+    self.commitChanges()
 
-  def getResponses(self,constraintId = -1):
+  def getResponses(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getResponses(%s)',(constraintId))
@@ -2418,10 +3010,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         respRisk = row[RESPONSES_RISK_COL]
         responseRows.append((respId,respName,respType,respRisk))
       curs.close()
+      responseRows = self.selectObjectRows('response',responseRows,selection,typeIdx=2)
       for respId,respName,respType,respRisk in responseRows:
-        tags = self.getTags(respName,'response')
+        tags = self.selectedTags(respName,'response',selection)
         environmentProperties = []
-        for environmentId,environmentName in self.dimensionEnvironments(respId,'response'):
+        for environmentId,environmentName in self.selectedEnvironments(respId,'response',selection):
           if (respType == 'Accept'):
             respCost = self.responseCost(respId,environmentId)
             respDescription = self.responseDescription(respId,environmentId)
@@ -2543,6 +3136,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       respType = parameters.responseType()
       tags = parameters.tags()
       respId = self.newId()
+      self.recordChange('response','add',respId,parameters.name())
       curs = self.conn.cursor()
       curs.execute('call addResponse(%s,%s,%s,%s)',(respId,respName,respType,respRisk))
       if (curs.rowcount == -1):
@@ -2569,7 +3163,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
            for detMech in cProperties.detectionMechanisms():
              self.addReactionDetectionMechanism(respId,detMech,environmentName)
 
-      self.conn.commit()
+      self.invalidateRiskScores('response',respId)
+      self.commitChanges()
       curs.close()
       return respId
     except _mysql_exceptions.DatabaseError, e:
@@ -2632,6 +3227,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText)
 
   def updateResponse(self,parameters):
+    self.recordChange('response','update',parameters.id(),parameters.name())
     respName = parameters.name()
     respRisk = parameters.risk()
     respType = parameters.responseType()
@@ -2639,6 +3235,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     respId = parameters.id()
     try:
       curs = self.conn.cursor()
+      self.invalidateRiskScores('response',respId)
       curs.execute('call deleteResponseComponents(%s)',(respId))
       if (curs.rowcount == -1):
         exceptionText = 'Error updating response ' + respName
@@ -2666,7 +3263,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           elif (mitType == 'React'):
            for detMech in cProperties.detectionMechanisms():
              self.addReactionDetectionMechanism(respId,detMech,environmentName)
-      self.conn.commit()
+      self.invalidateRiskScores('response',respId)
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -2829,7 +3427,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       dimName = dep[0]
       objtId = dep[1]
       self.deleteObject(objtId,dimName)
-    self.conn.commit()
+    self.commitChanges()
 
   def threatenedAssets(self,threatId,environmentId):
     try:
@@ -2869,6 +3467,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def addTrace(self,traceTable,fromId,toId,contributionType = 'and'):
+    self.recordChange('trace','add')
     try:
       curs = self.conn.cursor()
      
@@ -2885,16 +3484,42 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding fromId ' + str(fromId) + ' and toId ' + str(toId) + ' to link table ' + traceTable
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error adding fromId ' + str(fromId) + ' and toId ' + str(toId) + ' to link table ' + traceTable + ' (id: ' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
+  def addTraces(self,traces):
+    self.recordChange('trace','add')
+    # Inserts (traceTable,fromId,toId,contributionType) tuples with one multi-row insert per link table
+    tableRows = {}
+    for traceTable,fromId,toId,contributionType in traces:
+      if (traceTable != 'requirement_task' and traceTable != 'requirement_usecase' and traceTable != 'requirement_requirement'):
+        tableRows.setdefault(traceTable,[]).append((fromId,toId))
+      elif (traceTable == 'requirement_requirement'):
+        tableRows.setdefault(traceTable,[]).append((fromId,toId,contributionType))
+      else:
+        tableRows.setdefault(traceTable,[]).append((fromId,toId,self.getDimensionId(contributionType,'reference_type')))
+    try:
+      curs = self.conn.cursor()
+      for traceTable,rows in tableRows.items():
+        sqlText = 'insert into ' + traceTable + ' values(' + ','.join(['%s'] * len(rows[0])) + ')'
+        curs.executemany(sqlText,rows)
+        if (curs.rowcount == -1):
+          exceptionText = 'Error adding ' + str(len(rows)) + ' links to link table ' + traceTable
+          raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error adding links to link tables (id: ' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
   def deleteEnvironment(self,environmentId):
     self.deleteObject(environmentId,'environment')
-    self.conn.commit()
+    self.commitChanges()
 
   def riskRating(self,thrName,vulName,environmentName):
     try:
@@ -2916,6 +3541,9 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def riskScore(self,threatName,vulName,environmentName,riskName = ''):
+    return self.materialisedRiskScores(self.calculateRiskScores,threatName,vulName,environmentName,riskName)
+
+  def calculateRiskScores(self,threatName,vulName,environmentName,riskName):
     try:
       curs = self.conn.cursor()
       curs.execute('call riskScore(%s,%s,%s,%s)',(threatName,vulName,environmentName,riskName))
@@ -2939,6 +3567,139 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error calculating score for risk ' + riskName + ' (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
+  def environmentRiskScores(self,environmentName):
+    return self.materialisedRiskScores(self.calculateEnvironmentRiskScores,environmentName)
+
+  def materialisedRiskScores(self,scoreMethod,*args):
+    # Scores read for the first time are stored in risk_score, so they are committed straight away unless a transaction is already open
+    if (self.theTransactionDepth > 0 or self.theUncommittedWrites):
+      return scoreMethod(*args)
+    self.startTransaction()
+    try:
+      scores = scoreMethod(*args)
+    except:
+      self.rollbackTransaction()
+      raise
+    self.commitTransaction()
+    return scores
+
+  def calculateEnvironmentRiskScores(self,environmentName):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call environmentRiskScores(%s)',(environmentName))
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL calculating risk scores for environment ' + environmentName
+        raise DatabaseProxyException(exceptionText) 
+      riskScores = {}
+      for row in curs.fetchall():
+        row = list(row)
+        riskName = row[0]
+        riskResponse = row[1]
+        prmScore = row[2]
+        pomScore = row[3]
+        detailsBuf = row[4]
+        riskScores.setdefault(riskName,[]).append((riskResponse,prmScore,pomScore,detailsBuf))
+      curs.close()
+      return riskScores
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error calculating risk scores for environment ' + environmentName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def environmentNodeAttributes(self,environmentName,dimNames):
+    """
+    Prefetches the node attributes of the asset, persona, task, obstacle and risk objects in an environment, for the dimensions named in dimNames
+    """
+    try:
+      curs = self.conn.cursor()
+      flags = [int(dimName in dimNames) for dimName in ['asset','persona','task','obstacle']]
+      curs.execute('call environmentNodeAttributes(%s,%s,%s,%s,%s)',[environmentName] + flags)
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL error getting node attributes for environment ' + environmentName
+        raise DatabaseProxyException(exceptionText) 
+      rows = []
+      for row in curs.fetchall():
+        row = list(row)
+        rows.append((row[0],row[1],row[2]))
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting node attributes for environment ' + environmentName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+    riskScores = None
+    if ('risk' in dimNames):
+      riskScores = self.environmentRiskScores(environmentName)
+    return NodeAttributes(self,environmentName,rows,riskScores)
+
+  def invalidateRiskScores(self,dimName,objtId = -1):
+    # Asset and environment changes can affect any risk, so they drop every materialised score
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call invalidateRiskScores(%s,%s)',(dimName,objtId))
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL error invalidating risk scores for ' + dimName + ' id ' + str(objtId)
+        raise DatabaseProxyException(exceptionText) 
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error invalidating risk scores for ' + dimName + ' id ' + str(objtId) + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def riskScoreComponents(self,environmentName = ''):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call riskScoreComponents(%s)',(environmentName))
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL error getting risk score components'
+        raise DatabaseProxyException(exceptionText) 
+      components = []
+      for row in curs.fetchall():
+        row = list(row)
+        envName,riskName,responseName,threatLikelihood,vulSeverity,mitLikelihood,mitSeverity = row[0:7]
+        components.append((envName,riskName,responseName,threatLikelihood,vulSeverity,mitLikelihood,mitSeverity,row[7:15],row[15:23],row[23:31],row[31],row[32]))
+      curs.close()
+      return components
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting risk score components (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def responseMitigationComponents(self,environmentName = ''):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call responseMitigationComponents(%s)',(environmentName))
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL error getting response mitigation components'
+        raise DatabaseProxyException(exceptionText) 
+      components = []
+      for row in curs.fetchall():
+        row = list(row)
+        components.append((row[0],row[1],row[2],row[3],row[4],row[5:13]))
+      curs.close()
+      return components
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting response mitigation components (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def riskAssetComponents(self,environmentName = ''):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('call riskAssetComponents(%s)',(environmentName))
+      if (curs.rowcount == -1):
+        exceptionText = 'MySQL error getting risk asset components'
+        raise DatabaseProxyException(exceptionText) 
+      components = []
+      for row in curs.fetchall():
+        row = list(row)
+        components.append((row[0],row[1],row[2],row[3:11]))
+      curs.close()
+      return components
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting risk asset components (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
   def targetNames(self,reqList,envName):
     targetDict = {}
     for reqLabel in reqList:
@@ -2974,7 +3735,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting target names (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getRoles(self,constraintId = -1):
+  def getRoles(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getRoles(%s)',(constraintId))
@@ -2992,9 +3753,10 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         roleDescription = row[4]
         roleRows.append((roleId,roleName,roleType,shortCode,roleDescription))
       curs.close() 
+      roleRows = self.selectObjectRows('role',roleRows,selection,typeIdx=2)
       for roleId,roleName,roleType,shortCode,roleDescription in roleRows:
         environmentProperties = []
-        for environmentId,environmentName in self.dimensionEnvironments(roleId,'role'):
+        for environmentId,environmentName in self.selectedEnvironments(roleId,'role',selection):
           roleResponses = self.roleResponsibilities(roleId,environmentId)
           roleCountermeasures = self.roleCountermeasures(roleId,environmentId)
           properties = RoleEnvironmentProperties(environmentName,roleResponses,roleCountermeasures)
@@ -3010,6 +3772,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addRole(self,parameters):
     roleId = self.newId()
+    self.recordChange('role','add',roleId,parameters.name())
     roleName = parameters.name()
     roleType = parameters.type()
     shortCode = parameters.shortCode()
@@ -3021,7 +3784,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error adding new role ' + roleName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return roleId
     except _mysql_exceptions.DatabaseError, e:
@@ -3030,6 +3793,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateRole(self,parameters):
+    self.recordChange('role','update',parameters.id(),parameters.name())
     roleId = parameters.id()
     roleName = parameters.name()
     roleType = parameters.type()
@@ -3042,7 +3806,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error updating role ' + roleName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return roleId
     except _mysql_exceptions.DatabaseError, e:
@@ -3052,7 +3816,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteRole(self,roleId):
     self.deleteObject(roleId,'role')
-    self.conn.commit()
+    self.commitChanges()
 
   def roleResponsibilities(self,roleId,environmentId):
     try:
@@ -3229,6 +3993,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     cmType = parameters.type()
     tags = parameters.tags()
     cmId = self.newId()
+    self.recordChange('countermeasure','add',cmId,parameters.name())
     try:
       curs = self.conn.cursor()
       curs.execute('call addCountermeasure(%s,%s,%s,%s)',(cmId,cmName,cmDesc,cmType))
@@ -3247,7 +4012,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addCountermeasureRoles(cmId,cProperties.roles(),environmentName)
         self.addCountermeasurePersonas(cmId,cProperties.personas(),environmentName)
         self.addRequirementRoles(cmName,cProperties.roles(),cProperties.requirements(),environmentName)
-      self.conn.commit()
+      self.invalidateRiskScores('countermeasure',cmId)
+      self.commitChanges()
       curs.close()
       return cmId
     except _mysql_exceptions.DatabaseError, e:
@@ -3256,6 +4022,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText)
 
   def updateCountermeasure(self,parameters):
+    self.recordChange('countermeasure','update',parameters.id(),parameters.name())
     cmName = parameters.name()
     cmDesc = parameters.description()
     cmType = parameters.type()
@@ -3264,6 +4031,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     environmentProperties = parameters.environmentProperties()
     try:
       curs = self.conn.cursor()
+      self.invalidateRiskScores('countermeasure',cmId)
       curs.execute('call deleteCountermeasureComponents(%s)',(cmId))
       if (curs.rowcount == -1):
         exceptionText = 'Error updating response ' + respName
@@ -3284,7 +4052,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addCountermeasureRoles(cmId,cProperties.roles(),environmentName)
         self.addCountermeasurePersonas(cmId,cProperties.personas(),environmentName)
         self.updateRequirementRoles(cmName,cProperties.roles(),cProperties.requirements(),environmentName)
-      self.conn.commit()
+      self.invalidateRiskScores('countermeasure',cmId)
+      self.commitChanges()
       curs.close()
       return cmId
     except _mysql_exceptions.DatabaseError, e:
@@ -3744,13 +4513,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText)
 
   def deleteTrace(self,fromObjt,fromName,toObjt,toName):
+    self.recordChange('trace','delete')
     try:
       curs = self.conn.cursor()
       curs.execute('call delete_trace(%s,%s,%s,%s)',(fromObjt,fromName,toObjt,toName))
       if (curs.rowcount == -1):
         exceptionText = 'Error deleting trace relation: (' + fromObjt + ',' + fromName + ',' + toObjt + ',' + toName + ')'
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -3759,10 +4529,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteCountermeasure(self,cmId):
     self.deleteObject(cmId,'countermeasure')
-    self.conn.commit()
+    self.commitChanges()
 
   def addGoal(self,parameters):
     goalId = self.newId()
+    self.recordChange('goal','add',goalId,parameters.name())
     goalName = parameters.name()
     goalOrig = parameters.originator()
     tags = parameters.tags()
@@ -3784,7 +4555,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addGoalRefinements(goalId,goalName,environmentName,environmentProperties.goalRefinements(),environmentProperties.subGoalRefinements())
         self.addGoalConcerns(goalId,environmentName,environmentProperties.concerns())
         self.addGoalConcernAssociations(goalId,environmentName,environmentProperties.concernAssociations())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return goalId
     except _mysql_exceptions.DatabaseError, e:
@@ -3793,6 +4564,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateGoal(self,parameters):
+    self.recordChange('goal','update',parameters.id(),parameters.name())
     goalId = parameters.id()
     goalName = parameters.name()
     goalOrig = parameters.originator()
@@ -3819,14 +4591,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addGoalRefinements(goalId,goalName,environmentName,environmentProperties.goalRefinements(),environmentProperties.subGoalRefinements())
         self.addGoalConcerns(goalId,environmentName,environmentProperties.concerns())
         self.addGoalConcernAssociations(goalId,environmentName,environmentProperties.concernAssociations())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error updating goal ' + goalName + ' (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getGoals(self,constraintId = -1):
+  def getGoals(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getGoals(%s)',(constraintId))
@@ -3842,11 +4614,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         goalOrig = row[GOALS_ORIGINATOR_COL]
         goalRows.append((goalId,goalName,goalOrig))
       curs.close()
+      goalRows = self.selectObjectRows('goal',goalRows,selection)
 
       for goalId,goalName,goalOrig in goalRows:
-        tags = self.getTags(goalName,'goal')
-        environmentProperties = self.goalEnvironmentProperties(goalId)
-        parameters = GoalParameters(goalName,goalOrig,tags,self.goalEnvironmentProperties(goalId))
+        tags = self.selectedTags(goalName,'goal',selection)
+        environmentProperties = []
+        if (self.loadsField(selection,'theEnvironmentProperties')):
+          environmentProperties = self.goalEnvironmentProperties(goalId)
+        parameters = GoalParameters(goalName,goalOrig,tags,environmentProperties)
         goal = ObjectFactory.build(goalId,parameters)
         goals[goalName] = goal
       return goals
@@ -3855,7 +4630,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting goals (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getColouredGoals(self,constraintId = -1):
+  def getColouredGoals(self,constraintId = -1,selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getColouredGoals(%s)',(constraintId))
@@ -3872,11 +4647,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         goalColour = row[GOALS_COLOUR_COL]
         goalRows.append((goalId,goalName,goalOrig,goalColour))
       curs.close()
+      goalRows = self.selectObjectRows('goal',goalRows,selection)
 
       for goalId,goalName,goalOrig,goalColour in goalRows:
-        tags = self.getTags(goalName,'goal')
-        environmentProperties = self.goalEnvironmentProperties(goalId)
-        parameters = GoalParameters(goalName,goalOrig,tags,self.goalEnvironmentProperties(goalId))
+        tags = self.selectedTags(goalName,'goal',selection)
+        environmentProperties = []
+        if (self.loadsField(selection,'theEnvironmentProperties')):
+          environmentProperties = self.goalEnvironmentProperties(goalId)
+        parameters = GoalParameters(goalName,goalOrig,tags,environmentProperties)
         goal = ObjectFactory.build(goalId,parameters)
         goal.setColour(goalColour)
         goals[goalName] = goal
@@ -3910,7 +4688,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteGoal(self,goalId):
     self.deleteObject(goalId,'goal')
-    self.conn.commit()
+    self.commitChanges()
 
   def roleTasks(self,environmentName,roles):
     try:
@@ -4325,6 +5103,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addClassAssociation(self,parameters):
     associationId = self.newId()
+    self.recordChange('classassociation','add',associationId)
     envName = parameters.environment()
     headAsset = parameters.headAsset()
     headType = parameters.headType()
@@ -4343,7 +5122,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding new class association ' + envName + '/' + headAsset + '/' + tailAsset
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return associationId
     except _mysql_exceptions.DatabaseError, e:
@@ -4352,6 +5131,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateClassAssociation(self,parameters):
+    self.recordChange('classassociation','update',parameters.id())
     associationId = parameters.id()
     envName = parameters.environment()
     headAsset = parameters.headAsset()
@@ -4371,7 +5151,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating class association ' + envName + '/' + headAsset + '/' + tailAsset
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -4380,7 +5160,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteClassAssociation(self,associationId):
     self.deleteObject(associationId,'classassociation')
-    self.conn.commit()
+    self.commitChanges()
 
   def goalModel(self,envName,goalName = '',topLevelGoals = 0,caseFilter = 0):
     if (goalName == ''):
@@ -4519,6 +5299,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     aType = parameters.type()
     subGoalName = parameters.subGoal()
     subGoalDimName = parameters.subGoalDimension()
+    self.recordChange('goalassociation','add',associationId)
     alternativeId = parameters.alternative()
     rationale = parameters.rationale()
     try:
@@ -4527,7 +5308,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding new goal association ' + envName + '/' + goalName + '/' + subGoalName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return associationId
     except _mysql_exceptions.DatabaseError, e:
@@ -4536,6 +5317,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateGoalAssociation(self,parameters):
+    self.recordChange('goalassociation','update')
     associationId = parameters.id()
     envName = parameters.environment()
     goalName = parameters.goal()
@@ -4551,7 +5333,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating goal association ' + envName + '/' + goalName + '/' + subGoalName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -4559,13 +5341,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def deleteGoalAssociation(self,associationId,goalDimName,subGoalDimName):
+    self.recordChange('goalassociation','delete')
     try:
       curs = self.conn.cursor()
       curs.execute('call delete_goalassociation(%s,%s,%s)',(associationId,goalDimName,subGoalDimName))
       if (curs.rowcount == -1):
         exceptionText = 'Error deleting goal association id ' + str(objtId)
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.IntegrityError, e:
       id,msg = e
@@ -4987,6 +5770,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addDomainProperty(self,parameters):
     dpId = self.newId()
+    self.recordChange('domainproperty','add',dpId,parameters.name())
     dpName = parameters.name()
     dpDesc = parameters.description()
     dpType = parameters.type()
@@ -5000,7 +5784,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding new domain property ' + dpName
         raise DatabaseProxyException(exceptionText) 
       self.addTags(dpName,'domainproperty',tags)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return dpId
     except _mysql_exceptions.DatabaseError, e:
@@ -5009,6 +5793,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateDomainProperty(self,parameters):
+    self.recordChange('domainproperty','update',parameters.id(),parameters.name())
     dpId = parameters.id()
     dpName = parameters.name()
     dpDesc = parameters.description()
@@ -5023,7 +5808,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating domain property ' + dpName
         raise DatabaseProxyException(exceptionText) 
       self.addTags(dpName,'domainproperty',tags)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return dpId
     except _mysql_exceptions.DatabaseError, e:
@@ -5033,7 +5818,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteDomainProperty(self,dpId):
     self.deleteObject(dpId,'domainproperty')
-    self.conn.commit()
+    self.commitChanges()
 
   def getObstacles(self,constraintId = -1):
     try:
@@ -5140,6 +5925,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addObstacle(self,parameters):
     obsId = self.newId()
+    self.recordChange('obstacle','add',obsId,parameters.name())
     obsName = parameters.name().encode('utf-8')
     obsOrig = parameters.originator().encode('utf-8')
     tags = parameters.tags()
@@ -5157,7 +5943,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addObstacleCategory(obsId,environmentName,environmentProperties.category())
         self.addObstacleRefinements(obsId,obsName,environmentName,environmentProperties.goalRefinements(),environmentProperties.subGoalRefinements())
         self.addObstacleConcerns(obsId,environmentName,environmentProperties.concerns())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return obsId
     except _mysql_exceptions.DatabaseError, e:
@@ -5166,6 +5952,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateObstacle(self,parameters):
+    self.recordChange('obstacle','update',parameters.id(),parameters.name())
     obsId = parameters.id()
     obsName = parameters.name()
     obsOrig = parameters.originator()
@@ -5188,7 +5975,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addObstacleCategory(obsId,environmentName,environmentProperties.category())
         self.addObstacleRefinements(obsId,obsName,environmentName,environmentProperties.goalRefinements(),environmentProperties.subGoalRefinements())
         self.addObstacleConcerns(obsId,environmentName,environmentProperties.concerns())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5223,9 +6010,10 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteObstacle(self,obsId):
     self.deleteObject(obsId,'obstacle')
-    self.conn.commit()
+    self.commitChanges()
 
   def updateSettings(self, projName, background, goals, scope, definitions, contributors,revisions,richPicture,fontSize = '7.5',fontName = 'Times New Roman'):
+    self.recordChange('settings','update')
     try:
       curs = self.conn.cursor()
       curs.execute('call updateProjectSettings(%s,%s,%s,%s,%s,%s,%s)',(projName,background.encode('utf-8'),goals.encode('utf-8'),scope.encode('utf-8'),richPicture,fontSize,fontName))
@@ -5259,7 +6047,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         if (curs.rowcount == -1):
           exceptionText = 'Error adding revision'
           raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5358,6 +6146,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addDomain(self,parameters):
     domainId = self.newId()
+    self.recordChange('domain','add',domainId,parameters.name())
     modName = parameters.name()
     modShortCode = parameters.shortCode()
     modDesc = parameters.description()
@@ -5370,7 +6159,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding new requirement module ' + modName
         raise DatabaseProxyException(exceptionText) 
       self.addDomainAssociations(domainId,parameters.domains())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return domainId
     except _mysql_exceptions.DatabaseError, e:
@@ -5379,6 +6168,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateDomain(self,parameters):
+    self.recordChange('domain','update')
     domainId = parameters.id()
     modName = parameters.name()
     modShortCode = parameters.shortCode()
@@ -5396,7 +6186,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating requirement module ' + modName
         raise DatabaseProxyException(exceptionText) 
       self.addDomainAssociations(domainId,parameters.domains())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5405,7 +6195,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteDomain(self,r):
     self.deleteObject(r,'domain')
-    self.conn.commit()
+    self.commitChanges()
 
   def contextModelElements(self,envName):
     try:
@@ -5498,23 +6288,23 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteCapability(self,objtId):
     self.deleteObject(objtId,'capability')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteMotivation(self,objtId):
     self.deleteObject(objtId,'motivation')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteAssetType(self,objtId):
     self.deleteObject(objtId,'asset_type')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteThreatType(self,objtId):
     self.deleteObject(objtId,'threat_type')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteVulnerabilityType(self,objtId):
     self.deleteObject(objtId,'vulnerability_type')
-    self.conn.commit()
+    self.commitChanges()
 
   def addValueType(self,parameters):
     if (parameters.id() != -1):
@@ -5534,13 +6324,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'Cannot add ' + vtType + 's'
       raise DatabaseProxyException(exceptionText) 
 
+    self.recordChange(vtType,'add',valueTypeId,vtName)
     try:
       curs = self.conn.cursor()
       curs.execute('call addValueType(%s,%s,%s,%s,%s,%s)',(valueTypeId,vtName,vtDesc,vtType,vtScore,vtRat))
       if (curs.rowcount == -1):
         exceptionText = 'Error adding ' + vtType + ' ' + vtName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return valueTypeId
     except _mysql_exceptions.DatabaseError, e:
@@ -5549,6 +6340,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateValueType(self,parameters):
+    self.recordChange(parameters.type(),'update',parameters.id(),parameters.name())
     valueTypeId = parameters.id()
     vtName = parameters.name()
     vtDesc = parameters.description()
@@ -5562,7 +6354,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating ' + vtType + ' ' + vtName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5604,9 +6396,12 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         yPoints.append(row[4])
         curs.close()
 
+      riskScores = self.environmentRiskScores(envName)
       scores = []
       for risk,threat,vulnerability in riskDetails:
-        scoreDetails = self.riskScore(threat,vulnerability,envName,risk)
+        scoreDetails = riskScores.get(risk,None)
+        if (scoreDetails == None):
+          scoreDetails = self.riskScore(threat,vulnerability,envName,risk)
         highestScore = 0
         for resp,preScore,postScore,details in scoreDetails:
           if (postScore > highestScore):
@@ -5727,7 +6522,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error re-associating requirement id ' + str(reqId) + ' with asset ' + assetName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5810,7 +6605,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL error getting concern associations for task id ' + str(taskId) + ' in environment id ' + str(envId) + ' (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def getDependencies(self,constraintId = ''):
+  def getDependencies(self,constraintId = '',selection = None):
     try:
       curs = self.conn.cursor()
       curs.execute('call getDependencies(%s)',(constraintId))
@@ -5818,6 +6613,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error obtaining dependencies'
         raise DatabaseProxyException(exceptionText) 
       dependencies = {}
+      depRows = []
       for row in curs.fetchall():
         row = list(row)
         depId = row[DEPENDENCIES_ID_COL]
@@ -5827,11 +6623,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         dType = row[DEPENDENCIES_DTYPE_COL]
         dependencyName = row[DEPENDENCIES_DEPENDENCY_COL]
         rationale = row[DEPENDENCIES_RATIONALE_COL]
+        dLabel = envName + '/' + depender + '/' + dependee + '/' + dependencyName
+        depRows.append((depId,envName,depender,dependee,dType,dependencyName,rationale,dLabel))
+      curs.close()
+      depRows = self.selectObjectRows('dependency',depRows,selection,nameIdx=7,typeIdx=4,envIdx=1)
+      for depId,envName,depender,dependee,dType,dependencyName,rationale,dLabel in depRows:
         parameters = DependencyParameters(envName,depender,dependee,dType,dependencyName,rationale)
         dependency = ObjectFactory.build(depId,parameters)
-        dLabel = envName + '/' + depender + '/' + dependee + '/' + dependencyName
         dependencies[dLabel] = dependency
-      curs.close()
       return dependencies
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5840,6 +6639,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addDependency(self,parameters):
     depId = self.newId()
+    self.recordChange('dependency','add',depId)
     envName = parameters.environment()
     depender = parameters.depender()
     dependee = parameters.dependee()
@@ -5853,7 +6653,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding new dependency ' + envName + '/' + depender + '/' + dependee
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return depId
     except _mysql_exceptions.DatabaseError, e:
@@ -5863,6 +6663,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateDependency(self,parameters):
+    self.recordChange('dependency','update')
     depId = parameters.id()
     envName = parameters.environment()
     depender = parameters.depender()
@@ -5877,7 +6678,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating dependency ' + envName + '/' + depender + '/' + dependee
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -5885,13 +6686,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def deleteDependency(self,depId,depType):
+    self.recordChange('dependency','delete')
     try:
       curs = self.conn.cursor()
       curs.execute('call delete_dependency(%s,%s)',(depId,depType))
       if (curs.rowcount == -1):
         exceptionText = 'Error deleting dependency id ' + str(depId)
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.IntegrityError, e:
       id,msg = e
@@ -5977,6 +6779,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addTemplateAsset(self,parameters):
     assetId = self.newId()
+    self.recordChange('template_asset','add',assetId,parameters.name())
     assetName = parameters.name()
     shortCode = parameters.shortCode()
     assetDesc = parameters.description()
@@ -6012,7 +6815,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       self.addTags(assetName,'template_asset',tags)
       self.addInterfaces(assetName,'template_asset',ifs)
       self.addTemplateAssetProperties(assetId,cProp,iProp,avProp,acProp,anProp,panProp,unlProp,unoProp,cRat,iRat,avRat,acRat,anRat,panRat,unlRat,unoRat)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return assetId
     except _mysql_exceptions.DatabaseError, e:
@@ -6021,6 +6824,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateTemplateAsset(self,parameters):
+    self.recordChange('template_asset','update',parameters.id(),parameters.name())
     assetId = parameters.id()
     assetName = parameters.name()
     shortCode = parameters.shortCode()
@@ -6057,7 +6861,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       self.addTags(assetName,'template_asset',tags)
       self.addInterfaces(assetName,'template_asset',ifs)
       self.updateTemplateAssetProperties(assetId,cProp,iProp,avProp,acProp,anProp,panProp,unlProp,unoProp,cRat,iRat,avRat,acRat,anRat,panRat,unlRat,unoRat)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return assetId
     except _mysql_exceptions.DatabaseError, e:
@@ -6101,11 +6905,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTemplateAsset(self,assetId):
     self.deleteObject(assetId,'template_asset')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteSecurityPattern(self,patternId):
     self.deleteObject(patternId,'securitypattern')
-    self.conn.commit()
+    self.commitChanges()
 
   def getSecurityPatterns(self,constraintId = -1):
     try:
@@ -6186,6 +6990,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     if (patternId == -1):
       patternId = self.newId()
     patternName = parameters.name()
+    self.recordChange('securitypattern','add',patternId,patternName)
     patternContext = parameters.context()
     patternProblem = parameters.problem()
     patternSolution = parameters.solution()
@@ -6199,7 +7004,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addPatternStructure(patternId,patternStructure)
       self.addPatternRequirements(patternId,patternRequirements)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return patternId
     except _mysql_exceptions.DatabaseError, e:
@@ -6208,6 +7013,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateSecurityPattern(self,parameters):
+    self.recordChange('securitypattern','update',parameters.id(),parameters.name())
     patternId = parameters.id()
     patternName = parameters.name()
     patternContext = parameters.context()
@@ -6227,7 +7033,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addPatternStructure(patternId,patternStructure)
       self.addPatternRequirements(patternId,patternRequirements)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return patternId
     except _mysql_exceptions.DatabaseError, e:
@@ -6290,6 +7096,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addSituatedAssets(self,patternId,assetParametersList):
+    self.recordChange('situated_pattern','add')
     for assetParameters in assetParametersList:
       assetId = self.addAsset(assetParameters)
       self.situatePatternAsset(patternId,assetId)
@@ -6302,7 +7109,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error situating asset id ' + str(assetId) 
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -6373,6 +7180,8 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
   
   def updateCountermeasuresEffectiveness(self,objtId,dimName,expCMs):
+    self.recordChange('countermeasure','update')
+    self.invalidateRiskScores(dimName,objtId)
     for envName,cmName,assetName,cmEffectiveness in expCMs:
       self.updateCountermeasureEffectiveness(objtId,dimName,cmName,assetName,envName,cmEffectiveness) 
 
@@ -6415,6 +7224,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def deleteSituatedPattern(self,cmId,patternName):
+    self.recordChange('situated_pattern','delete')
     try:
       curs = self.conn.cursor()
       curs.execute('call deleteSituatedPattern(%s,%s)',(cmId,patternName))
@@ -6423,7 +7233,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error deletint pattern ' + patternName + ' associated with countermeasure id ' + str(cmId)
         raise DatabaseProxyException(exceptionText) 
       curs.close()
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error deleting pattern ' + patternName  + ' associated with countermeasure id ' + str(cmId) + ' (id:' + str(id) + ',message:' + msg + ')'
@@ -6456,7 +7266,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error associating countermeasure id ' + str(cmId) + ' with pattern ' + patternName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -6684,18 +7494,19 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteExternalDocument(self,docId = -1):
     self.deleteObject(docId,'external_document')
-    self.conn.commit()
+    self.commitChanges()
 
   def deleteDocumentReference(self,refId = -1):
     self.deleteObject(refId,'document_reference')
-    self.conn.commit()
+    self.commitChanges()
 
   def deletePersonaCharacteristic(self,pcId = -1):
     self.deleteObject(pcId,'persona_characteristic')
-    self.conn.commit()
+    self.commitChanges()
 
   def addExternalDocument(self,parameters):
     docId = self.newId()
+    self.recordChange('external_document','add',docId,parameters.name())
     docName = self.conn.escape_string(parameters.name())
     docVersion = parameters.version()
     docDate = self.conn.escape_string(parameters.date())
@@ -6707,7 +7518,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding external document ' + docName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return docId
     except _mysql_exceptions.DatabaseError, e:
@@ -6717,6 +7528,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateExternalDocument(self,parameters):
+    self.recordChange('external_document','update',parameters.id(),parameters.name())
     docId = parameters.id()
     docName = self.conn.escape_string(parameters.name())
     docVersion = parameters.version()
@@ -6729,7 +7541,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating external document ' + docName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -6738,6 +7550,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addDocumentReference(self,parameters):
     refId = self.newId()
+    self.recordChange('document_reference','add',refId,parameters.name())
     refName = parameters.name()
     docName = parameters.document()
     cName = parameters.contributor()
@@ -6748,7 +7561,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding document reference ' + refName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return refId
     except _mysql_exceptions.DatabaseError, e:
@@ -6757,6 +7570,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateDocumentReference(self,parameters):
+    self.recordChange('document_reference','update',parameters.id(),parameters.name())
     refId = parameters.id()
     refName = parameters.name()
     docName = parameters.document()
@@ -6768,7 +7582,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating document reference ' + refName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -6777,6 +7591,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addPersonaCharacteristic(self,parameters):
     pcId = self.newId()
+    self.recordChange('persona_characteristic','add',pcId)
     personaName = parameters.persona()
     qualName = parameters.qualifier()
     bVar = parameters.behaviouralVariable()
@@ -6792,7 +7607,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
 
       self.addPersonaCharacteristicReferences(pcId,grounds,warrant,rebuttal)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return pcId
     except _mysql_exceptions.DatabaseError, e:
@@ -6801,6 +7616,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updatePersonaCharacteristic(self,parameters):
+    self.recordChange('persona_characteristic','update',parameters.id())
     pcId = parameters.id()
     personaName = parameters.persona()
     qualName = parameters.qualifier()
@@ -6820,7 +7636,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating persona characteristic ' + cDesc
         raise DatabaseProxyException(exceptionText) 
       self.addPersonaCharacteristicReferences(pcId,grounds,warrant,rebuttal)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -6880,6 +7696,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addConceptReference(self,parameters):
     refId = self.newId()
+    self.recordChange('concept_reference','add',refId,parameters.name())
     refName = parameters.name()
     dimName = parameters.dimension()
     objtName = parameters.objectName()
@@ -6890,7 +7707,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding concept reference ' + refName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return refId
     except _mysql_exceptions.DatabaseError, e:
@@ -6899,6 +7716,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateConceptReference(self,parameters):
+    self.recordChange('concept_reference','update')
     refId = parameters.id()
     refName = parameters.name()
     dimName = parameters.dimension()
@@ -6910,7 +7728,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating concept reference ' + refName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return refId
     except _mysql_exceptions.DatabaseError, e:
@@ -6919,13 +7737,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def deleteConceptReference(self,refId,dimName):
+    self.recordChange('concept_reference','delete')
     try:
       curs = self.conn.cursor()
       curs.execute('call delete_concept_reference(%s,%s)',(refId,dimName))
       if (curs.rowcount == -1):
         exceptionText = 'Error deleting concept reference id ' + str(refId)
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.IntegrityError, e:
       id,msg = e
@@ -7108,13 +7927,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     self.addDirectory(vDir,'vulnerability',isOverwrite)
 
   def addDirectory(self,gDir,dimName,isOverwrite):
+    self.recordChange(dimName + '_directory','add')
     try:
       if (isOverwrite):
         self.deleteObject(-1,dimName + '_directory')
       for dLabel,dName,dDesc,dType,dRef in gDir:
         dTypeId = self.getDimensionId(dType,dimName + '_type')
         self.addDirectoryEntry(dLabel,dName,dDesc,dTypeId,dRef,dimName)
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error importing ' + dimName + ' directory (id:' + str(id) + ',message:' + msg + ')'
@@ -7299,6 +8119,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     tags = parameters.tags()
     try:
       ucId = self.newId()
+      self.recordChange('usecase','add',ucId,parameters.name())
       curs = self.conn.cursor()
       curs.execute('call addUseCase(%s,%s,%s,%s,%s)',(ucId,ucName,ucAuth,ucCode,ucDesc))
       if (curs.rowcount == -1):
@@ -7313,7 +8134,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addDimensionEnvironment(ucId,'usecase',environmentName)
         self.addUseCaseConditions(ucId,environmentName,cProperties.preconditions(),cProperties.postconditions())
         self.addUseCaseSteps(ucId,environmentName,cProperties.steps())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return ucId
     except _mysql_exceptions.DatabaseError, e:
@@ -7377,6 +8198,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding tag ' + tag + ' to step ' + str(stepNo) + ' in use case id ' + str(ucId)
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -7397,6 +8219,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateUseCase(self,parameters):
+    self.recordChange('usecase','update',parameters.id(),parameters.name())
     ucId = parameters.id()
     ucName = parameters.name()
     ucAuth = parameters.author()
@@ -7422,7 +8245,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.addDimensionEnvironment(ucId,'usecase',environmentName)
         self.addUseCaseConditions(ucId,environmentName,cProperties.preconditions(),cProperties.postconditions())
         self.addUseCaseSteps(ucId,environmentName,cProperties.steps())
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -7431,7 +8254,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteUseCase(self,ucId):
     self.deleteObject(ucId,'usecase')
-    self.conn.commit()
+    self.commitChanges()
 
   def environmentUseCases(self,envName):
     try:
@@ -7532,7 +8355,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def riskAnalysisToXml(self,includeHeader=True):
     try:
       curs = self.conn.cursor()
-      curs.execute('call riskAnalysisToXml(%s)',(includeHeader))
+      curs.execute('call riskAnalysisToXml(%s,%s)',(includeHeader,0))
       if (curs.rowcount == -1):
         exceptionText = 'Error exporting risk analysis artifacts to XML'
         raise DatabaseProxyException(exceptionText) 
@@ -7556,7 +8379,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def goalsToXml(self,includeHeader=True):
     try:
       curs = self.conn.cursor()
-      curs.execute('call goalsToXml(%s)',(includeHeader))
+      curs.execute('call goalsToXml(%s,%s)',(includeHeader,0))
       if (curs.rowcount == -1):
         exceptionText = 'Error exporting goals to XML'
         raise DatabaseProxyException(exceptionText) 
@@ -7577,7 +8400,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def usabilityToXml(self,includeHeader=True):
     try:
       curs = self.conn.cursor()
-      curs.execute('call usabilityToXml(%s)',(includeHeader))
+      curs.execute('call usabilityToXml(%s,%s)',(includeHeader,0))
       if (curs.rowcount == -1):
         exceptionText = 'Error exporting usability data to XML'
         raise DatabaseProxyException(exceptionText) 
@@ -7633,21 +8456,201 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def modelToXml(self,includeHeader=True):
+    return ''.join(self.modelToXmlChunks())
+
+  def sectionToXml(self,procName,sectionName):
     try:
       curs = self.conn.cursor()
-      curs.execute('call modelToXml(%s)',(includeHeader))
-      if (curs.rowcount == -1):
-        exceptionText = 'Error exporting model to XML'
-        raise DatabaseProxyException(exceptionText) 
+      curs.execute('call ' + procName + '(%s)',(0))
       row = curs.fetchone()
-      xmlBuf = row[0] 
+      if (row == None):
+        exceptionText = 'Error exporting ' + sectionName + ' to XML'
+        raise DatabaseProxyException(exceptionText) 
+      xmlBuf = row[0]
       curs.close()
       return xmlBuf
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
-      exceptionText = 'MySQL error exporting model to XML (id:' + str(id) + ',message:' + msg + ')'
+      exceptionText = 'MySQL error exporting ' + sectionName + ' to XML (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def sectionXmlChunks(self,procName,sectionName):
+    """
+    Generates a section's XML an object at a time, read through a server-side cursor, so no single row has to fit into max_allowed_packet.
+    """
+    curs = self.conn.cursor(MySQLdb.cursors.SSCursor)
+    try:
+      curs.execute('call ' + procName + '(%s,%s)',(0,1))
+      row = curs.fetchone()
+      if (row == None):
+        exceptionText = 'Error exporting ' + sectionName + ' to XML'
+        raise DatabaseProxyException(exceptionText) 
+      while (row != None):
+        yield row[0]
+        row = curs.fetchone()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error exporting ' + sectionName + ' to XML (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+    finally:
+      curs.close()
+
+  def modelToXmlChunks(self,sections = None,deletions = []):
+    """
+    Generates the XML for the whole model one section, or for the larger sections one object, at a time.
+    A differential export restricts the sections to those given, and lists the (dimension,name) of deleted objects.
+    """
+    yield MODEL_XML_HEADER
+    for procName,sectionName in MODEL_XML_SECTIONS:
+      if (sections == None or procName in sections):
+        if (procName in CHUNKED_XML_SECTIONS):
+          chunks = self.sectionXmlChunks(procName,sectionName)
+          try:
+            for chunk in chunks:
+              yield chunk
+          finally:
+            chunks.close()
+          yield '\n\n'
+        else:
+          yield self.sectionToXml(procName,sectionName) + '\n\n'
+    if (len(deletions) > 0):
+      xmlBuf = '<deletions>\n'
+      for dimName,objtName in deletions:
+        xmlBuf += '<deletion dimension=' + quoteattr(dimName) + ' name=' + quoteattr(objtName) + ' />\n'
+      yield xmlBuf + '</deletions>\n\n'
+    yield '</cairis_model>'
+
+  def objectName(self,tableNames,objtId):
+    for tableName in tableNames:
+      try:
+        curs = self.conn.cursor()
+        curs.execute('select name from ' + tableName + ' where id = %s',(objtId))
+        row = curs.fetchone()
+        curs.close()
+        if (row != None):
+          return row[0]
+      except _mysql_exceptions.DatabaseError, e:
+        continue
+    return None
+
+  def namedObjectId(self,tableNames,objtName):
+    for tableName in tableNames:
+      try:
+        curs = self.conn.cursor()
+        curs.execute('select id from ' + tableName + ' where name = %s',(objtName))
+        row = curs.fetchone()
+        curs.close()
+        if (row != None):
+          return row[0]
+      except _mysql_exceptions.DatabaseError, e:
+        continue
+    return None
+
+  def recordChange(self,dimName,changeType,objtId = None,objtName = None):
+    """
+    Stages a change to an object for model_change, where it is written when the change is committed.  Writers call this before
+    changing the database, so the previous name of an object being renamed or deleted can still be read.
+    """
+    self.markWrite()
+    if (self.theTransactionDepth > 0):
+      self.reserveProcedureIds()
+    if (changeType != 'add' and objtId != None):
+      previousName = None
+      if (objtId != -1):
+        previousName = self.objectName([dimName],objtId)
+      self.forgetId(dimName,objtId)
+      if (changeType == 'delete'):
+        objtName = previousName
+      elif (previousName != None and objtName != None and previousName != objtName):
+        self.theStagedChanges.append((dimName,'delete',objtId,previousName))
+    self.theStagedChanges.append((dimName,changeType,objtId,objtName))
+
+  def flushChanges(self):
+    """
+    Writes the staged changes under the next model revision.  The revision is claimed from model_revision as part of the committing
+    transaction, whose row lock orders revisions as their transactions commit, so a revision is never seen before an earlier one.
+    """
+    if (len(self.theStagedChanges) == 0):
+      return
+    try:
+      curs = self.conn.cursor()
+      curs.execute('insert into model_revision(id,revision) values(0,last_insert_id(1)) on duplicate key update revision = last_insert_id(revision + 1)')
+      curs.execute('select last_insert_id()')
+      revision = int(curs.fetchone()[0])
+      curs.executemany('insert into model_change(revision,dimension_name,object_id,object_name,change_type) values(%s,%s,%s,%s,%s)',[(revision,dimName,objtId,objtName,changeType) for dimName,changeType,objtId,objtName in self.theStagedChanges])
+      curs.close()
+      self.theStagedChanges = []
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      if (id == 1146):
+        # Databases built before changes were tracked have no model_change table until they are next rebuilt
+        self.theStagedChanges = []
+        return
+      exceptionText = 'MySQL error recording model changes (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def modelRevision(self):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select ifnull(max(revision),0) from model_revision')
+      revision = int(curs.fetchone()[0])
+      curs.close()
+      return revision
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting the model revision (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def resetModelChanges(self,revision):
+    """
+    Replaces the change history with a reset marker after the given revision, so revisions keep increasing when the whole model is replaced
+    """
+    try:
+      curs = self.conn.cursor()
+      curs.execute('delete from model_change')
+      curs.execute('insert into model_revision(id,revision) values(0,%s) on duplicate key update revision = values(revision)',(revision + 1))
+      curs.execute('insert into model_change(revision,dimension_name,change_type) values(%s,%s,%s)',(revision + 1,'model','reset'))
+      self.conn.commit()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error resetting the model change history (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
+  def modelDelta(self,sinceRevision):
+    """
+    Returns the export procedures of the sections changed since a revision, and the (dimension,name) of objects deleted since then and not recreated.
+    None is returned if the model was replaced after the revision, as only a full export then brings a copy up to date.
+    """
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select dimension_name,object_name,change_type from model_change where revision > %s order by revision,change_id',(sinceRevision))
+      rows = curs.fetchall()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting model changes since revision ' + str(sinceRevision) + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+    sections = set([])
+    lastChanges = {}
+    for dimName,objtName,changeType in rows:
+      if (changeType == 'reset'):
+        return None
+      sections.update(changeSections(dimName))
+      if (objtName != None):
+        lastChanges[(dimName,objtName)] = changeType
+    deletions = [key for key,changeType in lastChanges.items() if changeType == 'delete' and key[0] in DELETE_METHODS]
+    return (list(sections),sorted(deletions))
+
+  def removeNamedObject(self,dimName,objtName):
+    if (dimName not in DELETE_METHODS):
+      return False
+    objtId = self.namedObjectId([dimName],objtName)
+    if (objtId == None):
+      return False
+    getattr(self,DELETE_METHODS[dimName])(objtId)
+    return True
+
   def getTaskCharacteristics(self,constraintId = -1):
     try:
       curs = self.conn.cursor()
@@ -7679,6 +8682,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addTaskCharacteristic(self,parameters):
     tcId = self.newId()
+    self.recordChange('task_characteristic','add',tcId)
     taskName = self.conn.escape_string(parameters.task())
     qualName = self.conn.escape_string(parameters.qualifier())
     cDesc = self.conn.escape_string(parameters.characteristic())
@@ -7692,7 +8696,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding task characteristic ' + cDesc
         raise DatabaseProxyException(exceptionText) 
       self.addTaskCharacteristicReferences(tcId,grounds,warrant,rebuttal)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return tcId
     except _mysql_exceptions.DatabaseError, e:
@@ -7726,6 +8730,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateTaskCharacteristic(self,parameters):
+    self.recordChange('task_characteristic','update',parameters.id())
     tcId = parameters.id()
     taskName = parameters.task()
     qualName = parameters.qualifier()
@@ -7744,7 +8749,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating task characteristic ' + cDesc
         raise DatabaseProxyException(exceptionText) 
       self.addTaskCharacteristicReferences(tcId,grounds,warrant,rebuttal)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -7753,7 +8758,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTaskCharacteristic(self,pcId = -1):
     self.deleteObject(pcId,'task_characteristic')
-    self.conn.commit()
+    self.commitChanges()
 
   def assumptionTaskModel(self,taskName = '',tcName = ''):
     try:
@@ -8025,6 +9030,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addReferenceContribution(self,rc):
+    self.recordChange('reference_contribution','add')
     rsName = rc.source()
     csName = rc.destination()
     meName = rc.meansEnd()
@@ -8035,7 +9041,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding contribution for reference synopsis ' + rsName + ' and contribution synopsis ' + csName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8043,6 +9049,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateReferenceContribution(self,rc):
+    self.recordChange('reference_contribution','update')
     rsName = rc.source()
     csName = rc.destination()
     meName = rc.meansEnd()
@@ -8053,7 +9060,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating contribution for reference synopsis ' + rsName + ' and contribution synopsis ' + csName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8061,6 +9068,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addReferenceSynopsis(self,rs):
+    self.recordChange('reference_synopsis','add')
     rsId = self.newId()
     refName = rs.reference()
     rsName = rs.synopsis()
@@ -8073,7 +9081,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding synopsis ' + rsName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return rsId
     except _mysql_exceptions.DatabaseError, e:
@@ -8082,6 +9090,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateReferenceSynopsis(self,rs):
+    self.recordChange('reference_synopsis','update')
     rsId = rs.id()
     refName = rs.reference()
     rsName = rs.synopsis()
@@ -8094,7 +9103,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating synopsis ' + rsName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8102,6 +9111,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addCharacteristicSynopsis(self,cs):
+    self.recordChange('characteristic_synopsis','add')
     cName = cs.reference()
     csName = cs.synopsis()
     csDim = cs.dimension()
@@ -8113,7 +9123,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding synopsis ' + csName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8121,6 +9131,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateCharacteristicSynopsis(self,cs):
+    self.recordChange('characteristic_synopsis','update')
     cName = cs.reference()
     csName = cs.synopsis()
     csDim = cs.dimension()
@@ -8132,7 +9143,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating synopsis ' + csName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8225,7 +9236,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding synopsis ' + csName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8256,6 +9267,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addUseCaseContribution(self,rc):
+    self.recordChange('usecase_contribution','add')
     ucName = rc.source()
     csName = rc.destination()
     meName = rc.meansEnd()
@@ -8266,7 +9278,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding contribution for use case ' + ucName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8274,6 +9286,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateUseCaseContribution(self,rc):
+    self.recordChange('usecase_contribution','update')
     ucName = rc.source()
     csName = rc.destination()
     meName = rc.meansEnd()
@@ -8284,7 +9297,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating contribution for use case ' + ucName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8336,6 +9349,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateEnvironmentGoal(self,g,envName):
+    self.recordChange('goal','update',g.id(),g.name())
     envProps = g.environmentProperty(envName)
     goalDef = envProps.definition()
     goalCat = envProps.category()
@@ -8349,7 +9363,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating goal ' + str(g.id())
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8480,6 +9494,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateEnvironmentObstacle(self,o,envName):
+    self.recordChange('obstacle','update',o.id(),o.name())
     envProps = o.environmentProperty(envName)
     obsDef = envProps.definition()
     obsCat = envProps.category()
@@ -8490,7 +9505,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating obstacle ' + str(g.id())
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8504,7 +9519,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error relabelling goals'
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8518,7 +9533,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error relabelling obstacles'
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -8763,7 +9778,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       exceptionText = 'MySQL selecting interim redmine goals (id:' + str(id) + ',message:' + msg + ')'
       raise DatabaseProxyException(exceptionText) 
 
-  def clearDatabase(self, session_id=None):
+  def clearDatabase(self, session_id=None, fullRebuild=False):
+    """
+    Empties the database by truncating its tables and reseeding the reference data, reinstalling procs.sql only if it has changed.
+    The database is rebuilt from init.sql and procs.sql if init.sql has changed since it was installed, or if fullRebuild is set.
+    """
     b = Borg()
     if b.runmode == 'desktop':
       db_proxy = b.dbProxy
@@ -8774,7 +9793,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       db = b.dbName
     elif b.runmode == 'web':
       ses_settings = b.get_settings(session_id)
-      db_proxy = ses_settings['dbProxy']
+      db_proxy = b.get_dbproxy(session_id)
       host = ses_settings['dbHost']
       port = ses_settings['dbPort']
       user = ses_settings['dbUser']
@@ -8783,15 +9802,139 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
     else:
       raise RuntimeError('Run mode not recognized')
 
-    db_proxy.close()
     srcDir = b.cairisRoot + '/cairis/sql'
     initSql = srcDir + '/init.sql'
     procsSql = srcDir + '/procs.sql'
-    cmd = '/usr/bin/mysql -h ' + host + ' --port=' + str(port) + ' -u ' + user + ' --password=\'' + passwd + '\'' + ' --database ' + db + ' < ' + initSql
-    os.system(cmd)
-    cmd = '/usr/bin/mysql -h ' + host + ' --port=' + str(port) + ' -u ' + user + ' --password=\'' + passwd + '\'' + ' --database ' + db + ' < ' + procsSql
-    os.system(cmd)
-    db_proxy.reconnect(False, session_id)
+    initChecksum = sqlChecksum(initSql)
+    procsChecksum = sqlChecksum(procsSql)
+    installedChecksums = db_proxy.sqlChecksums()
+    try:
+      revision = db_proxy.modelRevision()
+    except DatabaseProxyException:
+      revision = 0
+
+    if (fullRebuild or installedChecksums.get('init.sql') != initChecksum):
+      db_proxy.close()
+      initStatus = runSqlScript(host,port,user,passwd,db,initSql)
+      procsStatus = runSqlScript(host,port,user,passwd,db,procsSql)
+      db_proxy.reconnect(False, session_id)
+      if (initStatus == 0 and procsStatus == 0):
+        db_proxy.setSqlChecksum('init.sql',initChecksum)
+        db_proxy.setSqlChecksum('procs.sql',procsChecksum)
+    else:
+      tableNames,seedStatements = resetScript(srcDir,initChecksum)
+      db_proxy.resetTables(tableNames,seedStatements)
+      if (installedChecksums.get('procs.sql') != procsChecksum):
+        if (runSqlScript(host,port,user,passwd,db,procsSql) == 0):
+          db_proxy.setSqlChecksum('procs.sql',procsChecksum)
+    newIdGeneration(db_proxy.idDatabaseKey())
+    db_proxy.resetModelChanges(revision)
+    db_proxy.theDimensionIdCache.invalidate()
+    if b.runmode == 'web':
+      b.get_dbproxy_pool(session_id).clear()
+
+  def sqlChecksums(self):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select file_name,checksum from sql_checksum')
+      checksums = dict(curs.fetchall())
+      curs.close()
+      return checksums
+    except _mysql_exceptions.DatabaseError, e:
+      # Databases built before checksums were recorded have no sql_checksum table, and need a full rebuild
+      return {}
+
+  def setSqlChecksum(self,fileName,checksum):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('replace into sql_checksum values(%s,%s)',(fileName,checksum))
+      self.conn.commit()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error recording checksum of ' + fileName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def resetTables(self,tableNames,seedStatements):
+    try:
+      curs = self.conn.cursor()
+      # Parent tables cannot be truncated while foreign keys refer to them, even when the referring tables are empty
+      curs.execute('set foreign_key_checks = 0')
+      try:
+        for tableName in tableNames:
+          curs.execute('truncate table ' + tableName)
+      finally:
+        curs.execute('set foreign_key_checks = 1')
+      for seedStatement in seedStatements:
+        curs.execute(seedStatement)
+      self.conn.commit()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error resetting the database (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def tableRows(self,tableName):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select * from ' + tableName)
+      columnNames = [x[0] for x in curs.description]
+      rows = curs.fetchall()
+      curs.close()
+      return (columnNames,rows)
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error reading table ' + tableName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def startConsistentRead(self):
+    # Every read until the next commit or rollback sees the database as it was when this is called
+    try:
+      curs = self.conn.cursor()
+      curs.execute('start transaction with consistent snapshot')
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error starting a consistent read (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def tableColumns(self,tableName):
+    try:
+      curs = self.conn.cursor()
+      curs.execute('select column_name from information_schema.columns where table_schema = database() and table_name = %s',(tableName))
+      columnNames = [x[0] for x in curs.fetchall()]
+      curs.close()
+      return columnNames
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error getting the columns of ' + tableName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
+
+  def loadTables(self,tables,batchSize = 1000):
+    """
+    Bulk loads an iterable of (tableName,columnNames,rows) into empty tables.  Key checks are switched off while loading, as the rows come from a consistent database.
+    """
+    tableName = ''
+    try:
+      curs = self.conn.cursor()
+      curs.execute('set foreign_key_checks = 0')
+      curs.execute('set unique_checks = 0')
+      try:
+        for tableName,columnNames,rows in tables:
+          if (len(rows) == 0):
+            continue
+          sqlText = 'insert into ' + tableName + '(' + ','.join(['`' + x + '`' for x in columnNames]) + ') values(' + ','.join(['%s'] * len(columnNames)) + ')'
+          for idx in range(0,len(rows),batchSize):
+            curs.executemany(sqlText,rows[idx:idx + batchSize])
+      finally:
+        curs.execute('set unique_checks = 1')
+        curs.execute('set foreign_key_checks = 1')
+      self.conn.commit()
+      curs.close()
+    except _mysql_exceptions.DatabaseError, e:
+      id,msg = e
+      exceptionText = 'MySQL error loading table ' + tableName + ' (id:' + str(id) + ',message:' + msg + ')'
+      raise DatabaseProxyException(exceptionText) 
 
   def conceptMapModel(self,envName,reqName = ''):
     try:
@@ -8960,6 +10103,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding tag ' + tagName + ' to ' + tagDim + ' ' + tagObjt
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9010,7 +10154,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTag(self,tagId):
     self.deleteObject(tagId,'tag')
-    self.conn.commit()
+    self.commitChanges()
 
   def componentView(self,cvName):
     try:
@@ -9056,7 +10200,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding component to view '
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9066,6 +10210,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addComponent(self,parameters,cvId = -1):
     componentId = self.newId()
+    self.recordChange('component','add',componentId,parameters.name())
     componentName = parameters.name()
     componentDesc = parameters.description()
     structure = parameters.structure()
@@ -9091,7 +10236,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       self.addComponentRequirements(componentId,requirements)
       self.addComponentGoals(componentId,goals)
       self.addComponentAssociations(componentId,assocs)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9129,7 +10274,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       self.addComponentRequirements(componentId,requirements)
       self.addComponentGoals(componentId,goals)
       self.addComponentAssociations(componentId,assocs)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9143,6 +10288,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding interface ' + ifName + ' to  component ' + str(componentId)
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9170,7 +10316,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding connector ' + cName
         raise DatabaseProxyException(exceptionText) 
       curs.close()
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error adding connector ' + cName + ' (id:' + str(id) + ',message:' + msg + ')'
@@ -9235,6 +10381,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding interface ' + ifName + ' to ' + ifDim + ' ' + ifObjt
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9381,6 +10528,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addComponentView(self,parameters):
     cvId = self.newId()
+    self.recordChange('component_view','add',cvId,parameters.name())
     cvName = parameters.name()
     cvSyn = parameters.synopsis()
     cvValueTypes = parameters.metricTypes()
@@ -9429,7 +10577,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
       for conParameters in cvCons:
         self.addConnector(conParameters)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return cvId
     except _mysql_exceptions.DatabaseError, e:
@@ -9438,6 +10586,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateComponentView(self,parameters):
+    self.recordChange('component_view','update',parameters.id(),parameters.name())
     cvId = parameters.id()
     cvName = parameters.name()
     cvSyn = parameters.synopsis()
@@ -9466,7 +10615,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         self.updateComponent(comParameters,cvId)
       for conParameters in cvCons:
         self.addConnector(conParameters)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return cvId
     except _mysql_exceptions.DatabaseError, e:
@@ -9476,7 +10625,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteComponentView(self,cvId):
     self.deleteObject(cvId,'component_view')
-    self.conn.commit()
+    self.commitChanges()
 
   def componentViewComponents(self,cvId):
     try:
@@ -9628,7 +10777,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error situating asset id ' + str(assetId) 
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9644,7 +10793,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
           curs.close()
           exceptionText = 'Error targetting ' + target.name() + ' with components ' + ",".join(target.components())
           raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9672,6 +10821,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def addTemplateRequirement(self,parameters):
     reqId = self.newId()
+    self.recordChange('template_requirement','add',reqId,parameters.name())
     reqName = parameters.name()
     reqAsset = parameters.asset()
     reqType = parameters.type()
@@ -9683,7 +10833,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       curs.execute('call addTemplateRequirement(%s,%s,%s,%s,%s,%s,%s)',(reqId,reqName,reqAsset,reqType,reqDesc,reqRat,reqFC))
       if (curs.rowcount == -1):
         exceptionText = 'Error adding template requirement ' + reqName
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return reqId
     except _mysql_exceptions.DatabaseError, e:
@@ -9692,6 +10842,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateTemplateRequirement(self,parameters):
+    self.recordChange('template_requirement','update',parameters.id(),parameters.name())
     reqId = parameters.id()
     reqName = parameters.name()
     reqAsset = parameters.asset()
@@ -9704,7 +10855,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       curs.execute('call updateTemplateRequirement(%s,%s,%s,%s,%s,%s,%s)',(reqId,reqName,reqAsset,reqType,reqDesc,reqRat,reqFC))
       if (curs.rowcount == -1):
         exceptionText = 'Error updating template requirement ' + reqName
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -9741,7 +10892,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTemplateRequirement(self,reqId):
     self.deleteObject(reqId,'template_requirement')
-    self.conn.commit()
+    self.commitChanges()
 
   def componentViewRequirements(self,cvName):
     try:
@@ -9789,7 +10940,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error situating requirements for component view' + cvName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10006,10 +11157,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteInternalDocument(self,docId = -1):
     self.deleteObject(docId,'internal_document')
-    self.conn.commit()
+    self.commitChanges()
 
   def addInternalDocument(self,parameters):
     docId = self.newId()
+    self.recordChange('internal_document','add',docId,parameters.name())
     docName = parameters.name()
     docDesc = parameters.description()
     docContent = parameters.content()
@@ -10023,7 +11175,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addDocumentCodes(docName,docCodes)
       self.addDocumentMemos(docName,docMemos)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return docId
     except _mysql_exceptions.DatabaseError, e:
@@ -10033,6 +11185,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateInternalDocument(self,parameters):
+    self.recordChange('internal_document','update',parameters.id(),parameters.name())
     docId = parameters.id()
     docName = parameters.name()
     docDesc = parameters.description()
@@ -10052,7 +11205,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addDocumentCodes(docName,docCodes)
       self.addDocumentMemos(docName,docMemos)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10086,10 +11239,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteCode(self,codeId = -1):
     self.deleteObject(codeId,'code')
-    self.conn.commit()
+    self.commitChanges()
 
   def addCode(self,parameters):
     codeId = self.newId()
+    self.recordChange('code','add',codeId,parameters.name())
     codeName = parameters.name()
     codeType = parameters.type()
     codeDesc = parameters.description()
@@ -10101,7 +11255,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding code ' + codeName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return codeId
     except _mysql_exceptions.DatabaseError, e:
@@ -10111,6 +11265,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateCode(self,parameters):
+    self.recordChange('code','update',parameters.id(),parameters.name())
     codeId = parameters.id()
     codeName = parameters.name()
     codeType = parameters.type()
@@ -10123,7 +11278,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating code ' + codeName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10163,6 +11318,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding code ' + docCode + ' to ' + docName
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10218,6 +11374,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding code ' + docCode + ' to ' + artType + ' ' + artName
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10275,6 +11432,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding code ' + docCode + ' to ' + artType + ' ' + artName + ' in environment ' + envName
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10305,13 +11463,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addCodeRelationship(self,personaName,fromName,toName,rshipType):
+    self.recordChange('code_network','add')
     try:
       curs = self.conn.cursor()
       curs.execute('call addArtifactCodeNetwork(%s,%s,%s,%s,%s)',(personaName,'persona',fromName,toName,rshipType))
       if (curs.rowcount == -1):
         exceptionText = 'Error adding ' + rshipType + ' to ' + personaName + ' code network'
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10319,6 +11478,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateCodeNetwork(self,personaName,rships):
+    self.recordChange('code_network','update')
     try:
       curs = self.conn.cursor()
       curs.execute('call deleteArtifactCodeNetwork(%s,%s)',(personaName,'persona'))
@@ -10326,7 +11486,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating code network for ' + personaName
         raise DatabaseProxyException(exceptionText) 
       curs.close()
-      self.conn.commit()
+      self.commitChanges()
       for fromName,toName,rshipType in rships:
         self.addCodeRelationship(personaName,fromName,toName,rshipType)
     except _mysql_exceptions.DatabaseError, e:
@@ -10392,6 +11552,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
   def addImpliedProcess(self,parameters):
     try:
       ipId = self.newId()
+      self.recordChange('persona_implied_process','add',ipId,parameters.name())
       ipName = parameters.name()
       ipDesc = parameters.description()
       pName = parameters.persona()
@@ -10406,7 +11567,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addImpliedProcessNetwork(ipId,pName,cNet)
       self.addImpliedProcessChannels(ipId,chs)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return ipId
     except _mysql_exceptions.DatabaseError, e:
@@ -10415,6 +11576,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateImpliedProcess(self,parameters):
+    self.recordChange('persona_implied_process','update',parameters.id(),parameters.name())
     try:
       ipId = parameters.id()
       ipName = parameters.name()
@@ -10436,7 +11598,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         raise DatabaseProxyException(exceptionText) 
       self.addImpliedProcessNetwork(ipId,pName,cNet)
       self.addImpliedProcessChannels(ipId,chs)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10462,15 +11624,17 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteImpliedProcess(self,ipId):
     self.deleteObject(ipId,'persona_implied_process')
-    self.conn.commit()
+    self.commitChanges()
 
   def addStepSynopsis(self,ucName,envName,stepNo,synName,aType,aName):
+    self.recordChange('step_synopsis','add')
     try:
       curs = self.conn.cursor()
       curs.execute('call addStepSynopsis(%s,%s,%s,%s,%s,%s)',(ucName,envName,stepNo,synName,aName,aType))
       if (curs.rowcount == -1):
         exceptionText = 'Error adding step synopsis ' + synName
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10527,7 +11691,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteTemplateGoal(self,tgId):
     self.deleteObject(tgId,'template_goal')
-    self.conn.commit()
+    self.commitChanges()
 
   def componentViewGoals(self,cvName):
     try:
@@ -10556,7 +11720,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error situating goals for component view' + cvName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10571,7 +11735,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         curs.close()
         exceptionText = 'Error situating goal associations for component view' + cvName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10611,7 +11775,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding template goal ' + goalName
       self.addTemplateGoalConcerns(goalId,goalConcerns)
       self.addTemplateGoalResponsibilities(goalId,goalResponsibilities)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return goalId
     except _mysql_exceptions.DatabaseError, e:
@@ -10637,7 +11801,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error updating template goal ' + reqName
       self.addTemplateGoalConcerns(goalId,goalConcerns)
       self.addTemplateGoalResponsibilities(goalId,goalResponsibilities)
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -10799,7 +11963,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       self.addComponentRequirements(componentId,requirements)
       self.addComponentGoals(componentId,goals)
       self.addComponentAssociations(componentId,assocs)
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error merging component ' + componentName + ' (id:' + str(id) + ',message:' + msg + ')'
@@ -10851,7 +12015,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         exceptionText = 'Error adding importing asset ' + taName + ' into environment ' + environmentName
         raise DatabaseProxyException(exceptionText) 
       curs.close()
-      self.conn.commit()
+      self.commitChanges()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
       exceptionText = 'MySQL error importing asset ' + taName + ' into environment ' + environmentName + ' (id:' + str(id) + ',message:' + msg + ')'
@@ -10952,6 +12116,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addQuotation(self,quotation):
+    self.recordChange('quotation','add')
     qType = quotation[0]
     cmName = quotation[1]
     artType = quotation[2]
@@ -10998,10 +12163,11 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
   def deleteMemo(self,memoId = -1):
     self.deleteObject(memoId,'memo')
-    self.conn.commit()
+    self.commitChanges()
 
   def addMemo(self,parameters):
     memoId = self.newId()
+    self.recordChange('memo','add',memoId,parameters.name())
     memoName = parameters.name()
     memoDesc = parameters.description()
     try:
@@ -11010,7 +12176,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding memo ' + memoName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
       return memoId
     except _mysql_exceptions.DatabaseError, e:
@@ -11019,6 +12185,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateMemo(self,parameters):
+    self.recordChange('memo','update',parameters.id(),parameters.name())
     memoId = parameters.id()
     memoName = parameters.name()
     memoDesc = parameters.description()
@@ -11028,7 +12195,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error updating memo ' + memoName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11069,6 +12236,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding memo ' + memoName + ' to ' + docName
         raise DatabaseProxyException(exceptionText) 
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11154,6 +12322,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateQuotation(self,codeName,atName,aName,oldStartIdx,oldEndIdx,startIdx,endIdx,synopsis,label):
+    self.recordChange('quotation','update')
     try:
       if atName == 'internal_document':
         curs = self.conn.cursor()
@@ -11161,7 +12330,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         if (curs.rowcount == -1):
           exceptionText = 'Error associating code ' + codeName + ' with ' + aName
           raise DatabaseProxyException(exceptionText) 
-        self.conn.commit()
+        self.commitChanges()
         curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11169,6 +12338,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def deleteQuotation(self,codeName,atName,aName,startIdx,endIdx):
+    self.recordChange('quotation','delete')
     try:
       if atName == 'internal_document':
         curs = self.conn.cursor()
@@ -11176,7 +12346,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
         if (curs.rowcount == -1):
           exceptionText = 'Error associating code ' + codeName + ' with ' + aName
           raise DatabaseProxyException(exceptionText) 
-        self.conn.commit()
+        self.commitChanges()
         curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11248,7 +12418,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding implied characteristic for ' + pName + '/' + fromCode + '/' + toCode + '/' + rtName 
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11256,6 +12426,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addImpliedCharacteristic(self,parameters):
+    self.recordChange('implied_characteristic','add')
     pName = parameters.persona()
     fromCode = parameters.fromCode()
     toCode = parameters.toCode()
@@ -11279,7 +12450,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       for lblName,rtName in rhsCodes:
         self.addImpliedCharacteristicElement(charName,lblName,rtName)
 
-      self.conn.commit()
+      self.commitChanges()
       curs.close() 
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11288,6 +12459,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
 
   def updateImpliedCharacteristic(self,parameters):
+    self.recordChange('implied_characteristic','update')
     pName = parameters.persona()
     fromCode = parameters.fromCode()
     toCode = parameters.toCode()
@@ -11315,7 +12487,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
 
       self.updateImpliedCharacteristicIntention(charName,intName,intType)
 
-      self.conn.commit()
+      self.commitChanges()
       curs.close() 
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11378,6 +12550,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addIntention(self,intention):
+    self.recordChange('intention','add')
     refName = intention[0]
     refType = intention[1]
     intentionName = intention[2]
@@ -11388,7 +12561,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding intention ' + intentionName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11396,6 +12569,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def addContribution(self,contribution):
+    self.recordChange('contribution','add')
     srcName = contribution[0]
     destName = contribution[1]
     meansEnd = contribution[2]
@@ -11406,7 +12580,7 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       if (curs.rowcount == -1):
         exceptionText = 'Error adding contribution ' + srcName + '/' + destName
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11446,13 +12620,14 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       raise DatabaseProxyException(exceptionText) 
 
   def updateImpliedCharacteristicElementIntention(self,ciName,elName,intName,intDim,meName,contName):
+    self.recordChange('implied_characteristic','update')
     try:
       curs = self.conn.cursor()
       curs.execute('call updateImpliedCharacteristicElementIntention(%s,%s,%s,%s,%s,%s)',(ciName,elName,intName,intDim,meName,contName))
       if (curs.rowcount == -1):
         exceptionText = 'Error updating intention for element ' + elName + ' for implied characteristic ' + ciName 
         raise DatabaseProxyException(exceptionText) 
-      self.conn.commit()
+      self.commitChanges()
       curs.close()
     except _mysql_exceptions.DatabaseError, e:
       id,msg = e
@@ -11515,3 +12690,4 @@ class MySQLDatabaseProxy(DatabaseProxy.DatabaseProxy):
       id,msg = e
       exceptionText = 'MySQL error getting while preparing database'
       raise DatabaseProxyException(exceptionText)
+
@@ -0,0 +1,77 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+class NodeAttributes:
+  """
+  The attributes model builders colour and label nodes with, fetched for a whole environment at once.
+  Objects missing from the prefetch, such as those only reachable through another environment, are looked up one at a time.
+  """
+  def __init__(self,dbProxy,envName,rows,riskScores = None):
+    self.dbProxy = dbProxy
+    self.theEnvironmentName = envName
+    self.theCriticalAssets = {}
+    self.theAssumptions = {}
+    self.theUsabilityScores = {}
+    self.theObstacleProbabilities = {}
+    self.theRiskScores = riskScores
+    for dimName,objtName,attrValue in rows:
+      if (dimName == 'asset'):
+        self.theCriticalAssets[objtName] = (int(attrValue) == 1)
+      elif (dimName == 'persona' or dimName == 'task'):
+        self.theAssumptions[(dimName,objtName)] = (int(attrValue) == 1)
+      elif (dimName == 'usability'):
+        self.theUsabilityScores[objtName] = int(attrValue)
+      elif (dimName == 'obstacle'):
+        self.theObstacleProbabilities[objtName] = attrValue
+
+  def critical(self,assetName):
+    if (assetName not in self.theCriticalAssets):
+      self.theCriticalAssets[assetName] = self.dbProxy.dimensionObject(assetName,'asset').critical()
+    return self.theCriticalAssets[assetName]
+
+  def assumption(self,dimName,objtName):
+    if ((dimName,objtName) not in self.theAssumptions):
+      self.theAssumptions[(dimName,objtName)] = (self.dbProxy.dimensionObject(objtName,dimName).assumption() == True)
+    return self.theAssumptions[(dimName,objtName)]
+
+  def usabilityScore(self,taskName):
+    if (taskName not in self.theUsabilityScores):
+      self.theUsabilityScores[taskName] = self.dbProxy.taskUsabilityScore(taskName,self.theEnvironmentName)
+    return self.theUsabilityScores[taskName]
+
+  def obstacleProbability(self,obsName):
+    if (obsName not in self.theObstacleProbabilities):
+      obsId = self.dbProxy.getDimensionId(obsName,'obstacle')
+      envId = self.dbProxy.getDimensionId(self.theEnvironmentName,'environment')
+      self.theObstacleProbabilities[obsName] = self.dbProxy.obstacleProbability(obsId,envId)
+    return self.theObstacleProbabilities[obsName]
+
+  def riskScores(self,riskName):
+    if (self.theRiskScores == None):
+      self.theRiskScores = self.dbProxy.environmentRiskScores(self.theEnvironmentName)
+    if (riskName not in self.theRiskScores):
+      riskObjt = self.dbProxy.dimensionObject(riskName,'risk')
+      self.theRiskScores[riskName] = self.dbProxy.riskScore(riskObjt.threat(),riskObjt.vulnerability(),self.theEnvironmentName,riskName)
+    return self.theRiskScores[riskName]
+
+  def highestRiskScore(self,riskName):
+    highestScore = 0
+    for riskScore in self.riskScores(riskName):
+      currentScore = riskScore[2]
+      if (currentScore > highestScore):
+        highestScore = currentScore
+    return highestScore
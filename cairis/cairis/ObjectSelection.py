@@ -0,0 +1,155 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+
+import base64
+import json
+from ARM import ARMException
+
+SORT_FIELDS = ['name','type']
+KEY_ATTRIBUTES = ['theId','theName']
+
+def utf8(value):
+  if (isinstance(value,unicode)):
+    return value.encode('utf-8')
+  return value
+
+def attributeName(fieldName):
+  """
+  Maps a field name like tags or theTags to the attribute name theTags
+  """
+  fieldName = utf8(fieldName.strip())
+  if (fieldName.startswith('the') and fieldName[3:4].isupper()):
+    return fieldName
+  return 'the' + fieldName[:1].upper() + fieldName[1:]
+
+class ObjectSelection:
+  """
+  One page of a dimension's objects: the filters to apply, the sort order, the offset or cursor the page starts from, and the fields wanted.
+  Loaders apply it to their base rows before building any objects, so only the selected page is hydrated, and skip loading the fields nobody asked for.
+  """
+  def __init__(self,offset = 0,limit = None,cursor = None,environment = None,tag = None,objtType = None,namePrefix = None,sortBy = None,descending = False,fields = None):
+    self.isPageSelected = (offset != 0 or limit != None or cursor != None or environment != None or tag != None or objtType != None or namePrefix != None or sortBy != None or descending)
+    if (sortBy == None):
+      sortBy = 'name'
+    if (sortBy not in SORT_FIELDS):
+      raise ARMException('Cannot sort by ' + str(sortBy) + '; use one of ' + ', '.join(SORT_FIELDS))
+    if (offset < 0):
+      raise ARMException('The offset cannot be negative')
+    if (limit != None and limit < 1):
+      raise ARMException('The limit must be at least 1')
+    self.theOffset = offset
+    self.theLimit = limit
+    self.theCursor = None
+    if (cursor != None):
+      self.theCursor = self.decodeCursor(cursor)
+    self.theEnvironment = utf8(environment)
+    self.theTag = utf8(tag)
+    self.theType = utf8(objtType)
+    self.theNamePrefix = utf8(namePrefix)
+    self.theSortBy = sortBy
+    self.theDescending = descending
+    self.theFields = None
+    if (fields != None):
+      self.theFields = set(KEY_ATTRIBUTES + [attributeName(x) for x in fields if x.strip() != ''])
+    self.theTotal = 0
+    self.theNextCursor = None
+    self.theKeys = []
+
+  def environment(self): return self.theEnvironment
+  def tag(self): return self.theTag
+  def type(self): return self.theType
+  def total(self): return self.theTotal
+  def nextCursor(self): return self.theNextCursor
+  def fields(self): return self.theFields
+  def isPaged(self): return self.isPageSelected
+
+  def loads(self,attrName):
+    return (self.theFields == None or attrName in self.theFields)
+
+  def decodeCursor(self,cursor):
+    try:
+      return [utf8(x) for x in json.loads(base64.urlsafe_b64decode(str(cursor)))]
+    except (TypeError,ValueError):
+      raise ARMException('Invalid cursor ' + str(cursor))
+
+  def encodeCursor(self,sortKey):
+    return base64.urlsafe_b64encode(json.dumps(list(sortKey)))
+
+  def select(self,rows,nameIdx,typeIdx = None,objtIds = None,idIdx = 0,envIdx = None,keyIdx = None):
+    """
+    Filters, sorts and pages the rows of a loader, remembering the total number of matches, the cursor for the next page and the dictionary keys of the rows selected.
+    objtIds restricts the rows to the ids of objects in the selected environment or with the selected tag; envIdx is used instead for rows which name their environment.
+    """
+    if (self.theType != None and typeIdx == None):
+      raise ARMException('These objects cannot be filtered by type')
+    if (self.theSortBy == 'type' and typeIdx == None):
+      raise ARMException('These objects cannot be sorted by type')
+    if (keyIdx == None):
+      keyIdx = nameIdx
+
+    def sortKey(row):
+      if (self.theSortBy == 'type'):
+        return (str(row[typeIdx]),row[nameIdx])
+      return (row[nameIdx],)
+
+    selectedRows = []
+    for row in rows:
+      if (objtIds != None and row[idIdx] not in objtIds):
+        continue
+      if (envIdx != None and self.theEnvironment != None and row[envIdx] != self.theEnvironment):
+        continue
+      if (self.theNamePrefix != None and not row[nameIdx].startswith(self.theNamePrefix)):
+        continue
+      if (self.theType != None and row[typeIdx] != self.theType):
+        continue
+      selectedRows.append(row)
+    selectedRows.sort(key=sortKey,reverse=self.theDescending)
+    self.theTotal = len(selectedRows)
+
+    startIdx = self.theOffset
+    if (self.theCursor != None):
+      cursorKey = tuple(self.theCursor)
+      startIdx = 0
+      while (startIdx < len(selectedRows)):
+        rowKey = sortKey(selectedRows[startIdx])
+        if ((not self.theDescending and rowKey > cursorKey) or (self.theDescending and rowKey < cursorKey)):
+          break
+        startIdx += 1
+    if (self.theLimit == None):
+      pageRows = selectedRows[startIdx:]
+    else:
+      pageRows = selectedRows[startIdx:startIdx + self.theLimit]
+    self.theNextCursor = None
+    if (len(pageRows) > 0 and startIdx + len(pageRows) < len(selectedRows)):
+      self.theNextCursor = self.encodeCursor(sortKey(pageRows[-1]))
+    self.theKeys = [row[keyIdx] for row in pageRows]
+    return pageRows
+
+  def ordered(self,objts):
+    """
+    Returns the selected objects of a loader's dictionary as a list, in the selected order
+    """
+    return [objts[key] for key in self.theKeys if key in objts]
+
+  def result(self,objts):
+    """
+    Returns a loader's dictionary as the caller asked for it: as an ordered list if a page was selected, or unchanged otherwise
+    """
+    if (self.isPageSelected):
+      return self.ordered(objts)
+    return objts
@@ -0,0 +1,128 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import numpy
+
+PROPERTY_COUNT = 8
+MIN_SCORE = 1
+MAX_SCORE = 9
+
+def asArray(values,columns = 0):
+  if (columns == 0):
+    return numpy.array([numpy.nan if x == None else x for x in values],dtype=float)
+  return numpy.array([[numpy.nan if x == None else x for x in row] for row in values],dtype=float).reshape(len(values),columns)
+
+def normaliseScores(totals):
+  # round(total / 1.2) as MySQL does for exact values, i.e. halves are rounded away from zero
+  return numpy.sign(totals) * numpy.floor((10 * numpy.abs(totals) + 6) / 12)
+
+def clipScores(scores):
+  scores = scores.copy()
+  scores[scores <= 0] = MIN_SCORE
+  scores[scores > MAX_SCORE] = MAX_SCORE
+  return scores
+
+def scoreComponents(threatLikelihoods,vulSeverities,mitLikelihoods,mitSeverities,mitProperties,threatProperties,assetProperties,threatCritical,vulCritical):
+  """
+  Vectorised calculateRiskScore.  Every argument has one row per score; the property arguments have
+  PROPERTY_COUNT columns.  Undefined inputs are NaN and, as in the stored procedure, yield a score
+  of 0 unless a critical asset check maximises it.
+  Returns (pre mitigation scores, post mitigation scores) as integer arrays.
+  """
+  olderr = numpy.seterr(invalid='ignore')
+  try:
+    likelihoods = numpy.maximum(threatLikelihoods - mitLikelihoods,0)
+    severities = numpy.maximum(vulSeverities - mitSeverities,0)
+    preAssets = threatProperties * assetProperties
+    assets = preAssets - mitProperties
+    preTotals = (preAssets * (threatLikelihoods * vulSeverities)[:,numpy.newaxis]).sum(axis=1)
+    postTotals = (assets * (likelihoods * severities)[:,numpy.newaxis]).sum(axis=1)
+
+    preScores = clipScores(normaliseScores(preTotals))
+    postScores = clipScores(normaliseScores(postTotals))
+    preScores[numpy.isnan(preScores)] = 0
+    postScores[numpy.isnan(postScores)] = 0
+
+    critical = ((likelihoods > 0) & (threatCritical > 0)) | ((severities > 0) & (vulCritical > 0))
+    preScores[critical] = MAX_SCORE
+    postScores[critical] = MAX_SCORE
+  finally:
+    numpy.seterr(**olderr)
+  return preScores.astype(int),postScores.astype(int)
+
+
+class RiskScoringEngine:
+  """
+  Holds the inputs of every (environment,risk,response) score, as returned by riskScoreComponents,
+  in arrays so the whole risk model can be scored in one pass and rescored after the inputs change.
+  """
+  def __init__(self,components):
+    self.theKeys = []
+    tl = []
+    vs = []
+    ml = []
+    ms = []
+    mc = []
+    tp = []
+    ap = []
+    tc = []
+    vc = []
+    for envName,riskName,responseName,threatLikelihood,vulSeverity,mitLikelihood,mitSeverity,mitProperties,threatProperties,assetProperties,threatCritical,vulCritical in components:
+      self.theKeys.append((envName,riskName,responseName))
+      tl.append(threatLikelihood)
+      vs.append(vulSeverity)
+      ml.append(mitLikelihood)
+      ms.append(mitSeverity)
+      mc.append(mitProperties)
+      tp.append(threatProperties)
+      ap.append(assetProperties)
+      tc.append(threatCritical)
+      vc.append(vulCritical)
+    self.theThreatLikelihoods = asArray(tl)
+    self.theVulnerabilitySeverities = asArray(vs)
+    self.theMitigatingLikelihoods = asArray(ml)
+    self.theMitigatingSeverities = asArray(ms)
+    self.theMitigatingProperties = asArray(mc,PROPERTY_COUNT)
+    self.theThreatProperties = asArray(tp,PROPERTY_COUNT)
+    self.theAssetProperties = asArray(ap,PROPERTY_COUNT)
+    self.theThreatCriticality = asArray(tc)
+    self.theVulnerabilityCriticality = asArray(vc)
+    self.theIndex = {}
+    for idx,key in enumerate(self.theKeys):
+      self.theIndex[key] = idx
+
+  def size(self): return len(self.theKeys)
+
+  def keys(self): return self.theKeys
+
+  def index(self,envName,riskName,responseName): return self.theIndex.get((envName,riskName,responseName),-1)
+
+  def arguments(self):
+    return (self.theThreatLikelihoods,self.theVulnerabilitySeverities,self.theMitigatingLikelihoods,self.theMitigatingSeverities,self.theMitigatingProperties,self.theThreatProperties,self.theAssetProperties,self.theThreatCriticality,self.theVulnerabilityCriticality)
+
+  def scores(self):
+    return scoreComponents(*self.arguments())
+
+  def scoreMap(self):
+    """
+    Returns {environment : {risk : [(response,pre mitigation score,post mitigation score)]}}
+    """
+    preScores,postScores = self.scores()
+    scoreMap = {}
+    for idx,(envName,riskName,responseName) in enumerate(self.theKeys):
+      scoreMap.setdefault(envName,{}).setdefault(riskName,[]).append((responseName,int(preScores[idx]),int(postScores[idx])))
+    return scoreMap
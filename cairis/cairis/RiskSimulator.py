@@ -0,0 +1,244 @@
+#  Licensed to the Apache Software Foundation (ASF) under one
+#  or more contributor license agreements.  See the NOTICE file
+#  distributed with this work for additional information
+#  regarding copyright ownership.  The ASF licenses this file
+#  to you under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance
+#  with the License.  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import numpy
+from ARM import ARMException
+from RiskScoringEngine import PROPERTY_COUNT, scoreComponents
+
+PROPERTY_NAMES = ['Confidentiality','Integrity','Availability','Accountability','Anonymity','Pseudonymity','Unlinkability','Unobservability']
+VALUE_NAMES = ['None','Low','Medium','High']
+CHANGE_TYPES = ['remove_response','add_response','countermeasure_effectiveness','asset_values']
+
+def valueId(value):
+  if (value in VALUE_NAMES):
+    return VALUE_NAMES.index(value)
+  try:
+    vId = int(value)
+  except (TypeError,ValueError):
+    raise ARMException('Unknown value ' + str(value))
+  if (vId < 0 or vId >= len(VALUE_NAMES)):
+    raise ARMException('Unknown value ' + str(value))
+  return vId
+
+def meanMitigations(vectors):
+  """
+  Mean of the (likelihood,severity,properties) vectors of a response's countermeasures, rounded as mitigatingValues does
+  """
+  if (len(vectors) == 0):
+    return numpy.zeros(PROPERTY_COUNT + 2)
+  totals = numpy.array(vectors,dtype=float).sum(axis=0)
+  count = len(vectors)
+  return numpy.sign(totals) * numpy.floor((2 * numpy.abs(totals) + count) / (2 * count))
+
+
+class RiskSimulation:
+  """
+  An in-memory copy of the risk model which evaluates hypothetical changes without touching the database.
+  Scenarios are lists of change dictionaries; each has a 'type' in CHANGE_TYPES and an optional 'environment' restricting it:
+    remove_response: {'response'}
+    add_response: {'risk','response','countermeasures' : [countermeasure names]}
+    countermeasure_effectiveness: {'countermeasure','likelihood','severity'}, with either effectiveness optional;
+      as with updateCountermeasuresEffectiveness, the named target effectiveness replaces the countermeasure's
+      mitigating likelihood or severity in every response it belongs to
+    asset_values: {'asset','properties' : {property name : value}}
+  """
+  def __init__(self,engine,mitigations,assets,effectiveness):
+    self.theEngine = engine
+    self.theEffectiveness = effectiveness
+    self.theBaseScores = engine.scores()
+    self.theResponseRows = {}
+    self.theRiskRows = {}
+    for idx,(envName,riskName,responseName) in enumerate(engine.keys()):
+      self.theRiskRows.setdefault((envName,riskName),[]).append(idx)
+      if (responseName != 'None'):
+        self.theResponseRows.setdefault((envName,responseName),[]).append(idx)
+    self.theCountermeasures = {}
+    for envName,responseName,cmName,mitLikelihood,mitSeverity,mitProperties in mitigations:
+      self.theCountermeasures.setdefault((envName,responseName),{})[cmName] = [mitLikelihood,mitSeverity] + list(mitProperties)
+    self.theAssets = {}
+    for envName,riskName,assetName,assetProperties in assets:
+      self.theAssets.setdefault((envName,riskName),{})[assetName] = list(assetProperties)
+
+  def environments(self,change):
+    envName = change.get('environment','')
+    if (envName == '' or envName == None):
+      return list(set([key[0] for key in self.theRiskRows]))
+    return [envName]
+
+  def validate(self,changes):
+    for change in changes:
+      changeType = change.get('type','')
+      if (changeType not in CHANGE_TYPES):
+        raise ARMException('Unknown change type ' + str(changeType))
+      envNames = self.environments(change)
+      if (changeType == 'remove_response'):
+        if (len([key for key in self.theResponseRows if key[0] in envNames and key[1] == change.get('response')]) == 0):
+          raise ARMException('Response ' + str(change.get('response')) + ' is not in the risk model')
+      elif (changeType == 'add_response'):
+        riskKeys = [key for key in self.theRiskRows if key[0] in envNames and key[1] == change.get('risk')]
+        if (len(riskKeys) == 0):
+          raise ARMException('Risk ' + str(change.get('risk')) + ' is not in the risk model')
+        if (change.get('response','') == ''):
+          raise ARMException('No name given for the new response to ' + str(change.get('risk')))
+        for envName,riskName in riskKeys:
+          for cmName in change.get('countermeasures',[]):
+            if (self.countermeasureValues(envName,cmName) == None):
+              raise ARMException('Countermeasure ' + cmName + ' does not mitigate any response in ' + envName)
+      elif (changeType == 'countermeasure_effectiveness'):
+        if (len([key for key,cms in self.theCountermeasures.items() if key[0] in envNames and change.get('countermeasure') in cms]) == 0):
+          raise ARMException('Countermeasure ' + str(change.get('countermeasure')) + ' does not mitigate any response')
+        for effName in ['likelihood','severity']:
+          if (effName in change):
+            self.effectivenessId(change[effName])
+      else:
+        if (len([key for key,assets in self.theAssets.items() if key[0] in envNames and change.get('asset') in assets]) == 0):
+          raise ARMException('Asset ' + str(change.get('asset')) + ' is not threatened by any risk')
+        for propertyName,value in change.get('properties',{}).items():
+          if (propertyName not in PROPERTY_NAMES):
+            raise ARMException('Unknown security property ' + str(propertyName))
+          valueId(value)
+
+  def effectivenessId(self,effName):
+    effId = self.theEffectiveness.get(effName,None)
+    if (effId == None):
+      raise ARMException('Unknown effectiveness ' + str(effName))
+    return effId
+
+  def countermeasureValues(self,envName,cmName):
+    for (cmEnvName,responseName),cms in self.theCountermeasures.items():
+      if (cmEnvName == envName and cmName in cms):
+        return cms[cmName]
+    return None
+
+  def run(self,changes):
+    """
+    Applies a scenario to a copy of the model and returns the
+    (environment,risk,response,pre mitigation score before,post mitigation score before,pre mitigation score after,post mitigation score after)
+    tuples of every score the scenario touched.  Scores of added responses have no before values.
+    """
+    tl,vs,ml,ms,mp,tp,ap,tc,vc = [x.copy() for x in self.theEngine.arguments()]
+    keys = list(self.theEngine.keys())
+    countermeasures = dict(self.theCountermeasures)
+    assets = dict(self.theAssets)
+    touched = set([])
+    removed = set([])
+    dirtyResponses = set([])
+    dirtyRisks = set([])
+    newRows = []
+
+    for change in changes:
+      changeType = change['type']
+      envNames = self.environments(change)
+      if (changeType == 'remove_response'):
+        for envName in envNames:
+          for idx in self.theResponseRows.get((envName,change['response']),[]):
+            ml[idx] = 0
+            ms[idx] = 0
+            mp[idx] = 0
+            removed.add(idx)
+            touched.add(idx)
+      elif (changeType == 'add_response'):
+        for envName in envNames:
+          riskRows = self.theRiskRows.get((envName,change['risk']),[])
+          if (len(riskRows) == 0):
+            continue
+          cmValues = dict([(cmName,self.countermeasureValues(envName,cmName)) for cmName in change.get('countermeasures',[])])
+          countermeasures[(envName,change['response'])] = cmValues
+          newRows.append((envName,change['risk'],change['response'],riskRows[0]))
+      elif (changeType == 'countermeasure_effectiveness'):
+        for key,cms in countermeasures.items():
+          if (key[0] in envNames and change['countermeasure'] in cms):
+            cms = dict(cms)
+            cmValues = list(cms[change['countermeasure']])
+            if ('likelihood' in change):
+              cmValues[0] = self.effectivenessId(change['likelihood'])
+            if ('severity' in change):
+              cmValues[1] = self.effectivenessId(change['severity'])
+            cms[change['countermeasure']] = cmValues
+            countermeasures[key] = cms
+            dirtyResponses.add(key)
+      else:
+        for key,riskAssets in assets.items():
+          if (key[0] in envNames and change['asset'] in riskAssets):
+            riskAssets = dict(riskAssets)
+            assetValues = list(riskAssets[change['asset']])
+            for propertyName,value in change.get('properties',{}).items():
+              assetValues[PROPERTY_NAMES.index(propertyName)] = valueId(value)
+            riskAssets[change['asset']] = assetValues
+            assets[key] = riskAssets
+            dirtyRisks.add(key)
+
+    for key in dirtyResponses:
+      mitigations = meanMitigations(list(countermeasures[key].values()))
+      for idx in self.theResponseRows.get(key,[]):
+        if (idx not in removed):
+          ml[idx] = mitigations[0]
+          ms[idx] = mitigations[1]
+          mp[idx] = mitigations[2:]
+          touched.add(idx)
+
+    for key in dirtyRisks:
+      delta = numpy.array(list(assets[key].values()),dtype=float).sum(axis=0) - numpy.array(list(self.theAssets[key].values()),dtype=float).sum(axis=0)
+      for idx in self.theRiskRows[key]:
+        ap[idx] = ap[idx] + delta
+        touched.add(idx)
+
+    if (len(newRows) > 0):
+      rowIds = [baseIdx for envName,riskName,responseName,baseIdx in newRows]
+      mitigations = numpy.array([meanMitigations(list(countermeasures[(envName,responseName)].values())) for envName,riskName,responseName,baseIdx in newRows]).reshape(len(newRows),PROPERTY_COUNT + 2)
+      tl = numpy.concatenate((tl,tl[rowIds]))
+      vs = numpy.concatenate((vs,vs[rowIds]))
+      ml = numpy.concatenate((ml,mitigations[:,0]))
+      ms = numpy.concatenate((ms,mitigations[:,1]))
+      mp = numpy.concatenate((mp,mitigations[:,2:]))
+      tp = numpy.concatenate((tp,tp[rowIds]))
+      ap = numpy.concatenate((ap,ap[rowIds]))
+      tc = numpy.concatenate((tc,tc[rowIds]))
+      vc = numpy.concatenate((vc,vc[rowIds]))
+      for envName,riskName,responseName,baseIdx in newRows:
+        touched.add(len(keys))
+        keys.append((envName,riskName,responseName))
+
+    preScores,postScores = scoreComponents(tl,vs,ml,ms,mp,tp,ap,tc,vc)
+    basePreScores,basePostScores = self.theBaseScores
+    deltas = []
+    for idx in sorted(touched):
+      envName,riskName,responseName = keys[idx]
+      if (idx < len(basePreScores)):
+        deltas.append((envName,riskName,responseName,int(basePreScores[idx]),int(basePostScores[idx]),int(preScores[idx]),int(postScores[idx])))
+      else:
+        deltas.append((envName,riskName,responseName,None,None,int(preScores[idx]),int(postScores[idx])))
+    return deltas
+
+  def simulate(self,scenarios,pool = None,workers = 1):
+    """
+    Validates and runs a batch of scenarios, splitting them into one chunk per worker of pool if one is given.
+    Each chunk carries its own copy of the simulation, so a worker process receives the model once per batch.
+    """
+    for changes in scenarios:
+      self.validate(changes)
+    if (pool == None or workers <= 1 or len(scenarios) <= 1):
+      return [self.run(changes) for changes in scenarios]
+    chunkSize = (len(scenarios) + workers - 1) / workers
+    chunks = [(self,scenarios[idx:idx + chunkSize]) for idx in range(0,len(scenarios),chunkSize)]
+    return [deltas for chunkDeltas in pool.map(runScenarios,chunks) for deltas in chunkDeltas]
+
+
+def runScenarios(args):
+  # Module level, so that a process pool can pickle it
+  simulation,scenarios = args
+  return [simulation.run(changes) for changes in scenarios]
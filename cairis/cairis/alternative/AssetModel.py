@@ -18,11 +18,10 @@
 
 from Borg import Borg
 import pydot
-import os
 
 
 class AssetModel:
-  def __init__(self,associations,envName,assetName = '',hideConcerns = False, graphName='asset.dot', db_proxy=None, fontName=None, fontSize=None):
+  def __init__(self,associations,envName,assetName = '',hideConcerns = False, db_proxy=None, fontName=None, fontSize=None):
     self.theAssociations = associations
     self.theEnvironmentName = envName
     self.theAssetName = assetName
@@ -39,7 +38,6 @@ class AssetModel:
     self.theGraph = pydot.Dot()
     self.hideConcerns = hideConcerns
     self.nodeList= set([])
-    self.theGraphName = os.path.join(b.tmpDir, graphName)
 
   def size(self):
     return len(self.theAssociations)
@@ -47,8 +45,7 @@ class AssetModel:
   def buildNode(self,dimName,objtName):
     objtUrl = dimName + '#' + objtName
     if (dimName == 'persona'):
-      objt = self.dbProxy.dimensionObject(objtName,'persona')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('persona',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName
         self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='ellipse',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
       else:
@@ -58,17 +55,15 @@ class AssetModel:
     elif (dimName == 'obstacleconcern'):
       self.theGraph.add_node(pydot.Node(objtName,shape='note',fontname=self.fontName,fontsize=self.fontSize,fontcolor='red',color='red',URL=objtUrl))
     else:
-      assetObjt = self.dbProxy.dimensionObject(objtName,dimName)
       borderColour = 'black'
-      if (dimName == 'asset' and assetObjt.critical()):
+      if (dimName == 'asset' and self.theAttributes.critical(objtName)):
         borderColour = 'red'
       assetNode = pydot.Node(objtName,shape='record',color=borderColour,fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl)
       self.theGraph.add_node(assetNode)
     self.nodeList.add(objtName)
 
   def layout(self,renderer = 'dot'):
-    self.theGraph.write_xdot(self.theGraphName,prog=renderer)
-    return open(self.theGraphName).read()
+    return self.theGraph.create(prog=renderer,format='xdot')
 
   def arrowType(self,headDim,asType,navType):
     if asType == 'Inheritance':
@@ -89,12 +84,13 @@ class AssetModel:
         arrowHead = 'crowvee'
     return arrowHead
 
-  def graph(self):
+  def graph(self,withCoordinates = False):
     assets = []
     if (self.theAssetName == ''):
       assets = self.dbProxy.classModelElements(self.theEnvironmentName,self.hideConcerns)
     if (len(assets) == 0 and self.theEnvironmentName == ''):
       self.theAssetName = 'Component'
+    self.theAttributes = self.dbProxy.environmentNodeAttributes(self.theEnvironmentName,['asset','persona'])
     self.nodeList = set([])
     for asset in assets:
       self.buildNode(asset[0],asset[1])
@@ -187,7 +183,9 @@ class AssetModel:
           edge = pydot.Edge(headObjt,tailObjt,label=edgeLabel,headlabel=tLabel,taillabel=hLabel,arrowhead=aTail,arrowtail=aHead,style=edgeStyle,dir='both',fontcolor=fontColour,color=edgeColour,fontsize=fontSize)
         self.theGraph.add_edge(edge)
         edgeList.add((headName,tailName))
-    return self.layout()
+    if (withCoordinates):
+      return self.layout()
+    return self.theGraph.to_string()
 
   def filterBlankStrings(self, edgeLabel, hLabel, tLabel):
     if edgeLabel == '':
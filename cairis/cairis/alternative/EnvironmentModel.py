@@ -35,9 +35,9 @@ class EnvironmentModel:
     b = Borg()
     self.fontSize = fontSize or b.fontSize
     self.fontName = fontName or b.fontName
-    self.theGraphName = b.tmpDir + '/pydotout.dot'
 
     self.theNodeLookup = {}
+    self.theAttributes = None
 
   def buildGraph(self):
     self.buildGraph()
@@ -54,9 +54,8 @@ class EnvironmentModel:
     elif (dimName == 'attacker'):
       self.theGraph.add_node(pydot.Node(objtName,shape='circle',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'asset'):
-      assetObjt = self.dbProxy.dimensionObject(objtName,'asset')
       borderColour = 'black'
-      if (assetObjt.critical()):
+      if (self.theAttributes.critical(objtName)):
         borderColour = 'red'
       self.theGraph.add_node(pydot.Node(objtName,shape='record',color=borderColour,fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'threat'):
@@ -64,13 +63,7 @@ class EnvironmentModel:
     elif (dimName == 'vulnerability'):
       self.theGraph.add_node(pydot.Node(objtName,shape='record',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'risk'):
-      riskObjt = self.dbProxy.dimensionObject(objtName,'risk')
-      riskScores = self.dbProxy.riskScore(riskObjt.threat(),riskObjt.vulnerability(),self.theEnvironmentName,objtName)
-      highestScore = 0
-      for riskScore in riskScores:
-        currentScore = riskScore[2]
-        if (currentScore > highestScore):
-          highestScore = currentScore
+      highestScore = self.theAttributes.highestRiskScore(objtName)
       self.theGraph.add_node(pydot.Node(objtName,shape='diamond',style='filled',color=threatColourCode(highestScore),fontcolor=riskTextColourCode(highestScore),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'response'):
       self.theGraph.add_node(pydot.Node(objtName,shape='note',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
@@ -95,7 +88,7 @@ class EnvironmentModel:
     elif (dimName == 'inconsistency'):
       self.theGraph.add_node(pydot.Node(objtName,shape='polygon',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'task'):
-      taskScore = self.dbProxy.taskUsabilityScore(objtName,self.theEnvironmentName)
+      taskScore = self.theAttributes.usabilityScore(objtName)
       self.theGraph.add_node(pydot.Node(objtName,shape='ellipse',style='filled',color=usabilityColourCode(taskScore),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
 
     elif (dimName == 'misusecase'):
@@ -103,9 +96,11 @@ class EnvironmentModel:
     else: 
       raise ARM.UnknownNodeType(dimName)
 
-  def graph(self):
+  def graph(self,withCoordinates = False):
     self.nodeNameSet = set([])
     self.dimNameSet = set([])
+    linkDimNames = set([dotLink.fromObject() for dotLink in self.theTraceLinks] + [dotLink.toObject() for dotLink in self.theTraceLinks])
+    self.theAttributes = self.dbProxy.environmentNodeAttributes(self.theEnvironmentName,linkDimNames)
 
 #    envReqs = self.dbProxy.getDimensionNames('requirement',self.theEnvironmentName)
 #    for envReq in envReqs:
@@ -129,8 +124,9 @@ class EnvironmentModel:
         self.theNodeLookup[toName] = toDimName + ' ' + dotLink.toName()
       edge = pydot.Edge(str(fromName),str(toName),dir='none',URL=fromDimName + '#' + toDimName)
       self.theGraph.add_edge(edge)
-    return self.layout()
+    if (withCoordinates):
+      return self.layout()
+    return self.theGraph.to_string()
 
   def layout(self,renderer = 'fdp'):
-    self.theGraph.write_xdot(self.theGraphName,prog=renderer)
-    return open(self.theGraphName).read()
\ No newline at end of file
+    return self.theGraph.create(prog=renderer,format='xdot')
\ No newline at end of file
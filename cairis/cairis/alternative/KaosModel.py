@@ -47,7 +47,7 @@ class KaosModel:
           self.theGraph.set_graph_defaults(rankdir='LR')
       else:
           self.theGraph.set_graph_defaults(rankdir='BT')
-      self.theGraphName = b.tmpDir + '/' + self.theKaosModel + '.dot'
+      self.theAttributes = None
 
   def size(self):
     return len(self.theAssociations)
@@ -58,9 +58,7 @@ class KaosModel:
       self.theGraph.add_node(pydot.Node(objtName,shape='parallelogram',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
 # soft-goal attributes      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',style='rounded',sides='6',distortion='-0.537997',orientation='52',skew='-0.960726',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'obstacle'):
-      obsId = self.dbProxy.getDimensionId(objtName,'obstacle')
-      envId = self.dbProxy.getDimensionId(self.theEnvironmentName,'environment')
-      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',skew='-0.4',style='filled',pencolor='black',colorscheme='ylorrd9',fillcolor=obstacleColourCode(self.dbProxy.obstacleProbability(obsId,envId)),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
+      self.theGraph.add_node(pydot.Node(objtName,shape='polygon',skew='-0.4',style='filled',pencolor='black',colorscheme='ylorrd9',fillcolor=obstacleColourCode(self.theAttributes.obstacleProbability(objtName)),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'domainproperty'):
       self.theGraph.add_node(pydot.Node(objtName,shape='house',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'requirement'):
@@ -74,29 +72,21 @@ class KaosModel:
     elif (dimName == 'usecase'):
       self.theGraph.add_node(pydot.Node(objtName,shape='ellipse',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'task'):
-      objt = self.dbProxy.dimensionObject(objtName,'task')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('task',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName 
       else:
         objtLabel = objtName
-      taskScore = self.dbProxy.taskUsabilityScore(objtName,self.theEnvironmentName)
+      taskScore = self.theAttributes.usabilityScore(objtName)
       self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='ellipse',style='filled',color=usabilityColourCode(taskScore),fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'misusecase'):
       ellipseColour = 'black'
       if (self.theKaosModel == 'task'):
         riskName = objtName[8:]
-        riskObjt = self.dbProxy.dimensionObject(riskName,'risk')
-        riskScores = self.dbProxy.riskScore(riskObjt.threat(),riskObjt.vulnerability(),self.theEnvironmentName,riskName)
-        highestScore = 0
-        for riskScore in riskScores:
-          currentScore = riskScore[2]
-          if (currentScore > highestScore):
-            highestScore = currentScore
+        highestScore = self.theAttributes.highestRiskScore(riskName)
         ellipseColour = threatColourCode(highestScore)
       self.theGraph.add_node(pydot.Node(objtName,shape='ellipse',style='filled',color=ellipseColour,fontcolor='white',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
     elif (dimName == 'persona'):
-      objt = self.dbProxy.dimensionObject(objtName,'persona')
-      if (objt.assumption() == True):
+      if (self.theAttributes.assumption('persona',objtName)):
         objtLabel = "&lt;&lt;Assumption&gt;&gt;" + objtName 
         self.theGraph.add_node(pydot.Node(objtName,label=objtLabel,shape='circle',fontname=self.fontName,fontsize=self.fontSize,URL=objtUrl))
       else: 
@@ -124,8 +114,7 @@ class KaosModel:
         renderer = 'twopi'
       elif (self.theKaosModel == 'task'):
         renderer = 'dot'
-    self.theGraph.write_xdot(self.theGraphName,prog=renderer)
-    return open(self.theGraphName).read()
+    return self.theGraph.create(prog=renderer,format='xdot')
 
   def buildGoalModel(self,isComponent=False):
     self.nodeNameSet = set([])
@@ -265,7 +254,7 @@ class KaosModel:
         self.theGraph.add_edge(pydot.Edge(subGoalName,goalName,style=edgeStyle,dir=assocDir,arrowhead=arrowHead,arrowtail=arrowTail,label=assocLabel,fontsize=fontSize,weight='1',fontcolor=fontColour,color=edgeColour,URL=objtUrl))
         edgeSet.add((subGoalName,goalName,assocLabel))
 
-  def graph(self):
+  def graph(self,withCoordinates = False):
     try:
       elements = []
       if (self.theKaosModel == 'goal' and self.theGoalName == ''):
@@ -277,6 +266,14 @@ class KaosModel:
       elif (self.theKaosModel == 'task' and self.theGoalName == ''):
         elements = self.dbProxy.taskModelElements(self.theEnvironmentName)
 
+      dimNames = set([element[0] for element in elements])
+      for association in self.theAssociations:
+        dimNames.add(association.goalDimension())
+        dimNames.add(association.subGoalDimension())
+      if (self.theKaosModel == 'task' and 'misusecase' in dimNames):
+        dimNames.add('risk')
+      self.theAttributes = self.dbProxy.environmentNodeAttributes(self.theEnvironmentName,dimNames)
+
       for element in elements:
         self.buildNode(element[0],element[1])
 
@@ -287,7 +284,9 @@ class KaosModel:
       else:
         self.buildTaskModel()
 
-      return self.layout()
+      if (withCoordinates):
+        return self.layout()
+      return self.theGraph.to_string()
     except ARM.DatabaseProxyException, errTxt:
       raise ARM.ARMException(errTxt)
 
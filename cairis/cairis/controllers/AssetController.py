@@ -10,12 +10,14 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import AssetMessage, AssetEnvironmentPropertiesMessage, ValueTypeMessage
 from tools.ModelDefinitions import AssetModel as SwaggerAssetModel, AssetEnvironmentPropertiesModel, ValueTypeModel
 from tools.SessionValidator import get_session_id, get_model_generator
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 
 class AssetsAPI(Resource):
     # region Swagger Doc
     @swagger.operation(
-        notes='Get all assets',
+        notes='Get all assets. ' + SELECTION_NOTES,
         responseClass=SwaggerAssetModel.__name__,
         nickname='assets-get',
         parameters=[
@@ -36,7 +38,7 @@ class AssetsAPI(Resource):
                 "dataType": int.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -49,12 +51,14 @@ class AssetsAPI(Resource):
         constraint_id = request.args.get('constraint_id', -1)
         session_id = get_session_id(session, request)
 
+        selection = get_object_selection(request)
         dao = AssetDAO(session_id)
-        assets = dao.get_assets(constraint_id=constraint_id)
+        assets = dao.get_assets(constraint_id=constraint_id, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(assets, session_id=session_id))
+        resp = make_response(json_serialize(assets, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
+        add_selection_headers(resp, selection)
         return resp
 
     # region Swagger Doc
@@ -160,7 +164,7 @@ class AssetByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -176,7 +180,7 @@ class AssetByNameAPI(Resource):
         found_asset = dao.get_asset_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(found_asset, session_id=session_id))
+        resp = make_response(json_serialize(found_asset, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
         return resp
 
@@ -296,7 +300,7 @@ class AssetByIdAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -314,7 +318,7 @@ class AssetByIdAPI(Resource):
         if asset is None:
             raise ObjectNotFoundHTTPError('The asset')
 
-        resp = make_response(json_serialize(asset, session_id=session_id))
+        resp = make_response(json_serialize(asset, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
         return resp
 
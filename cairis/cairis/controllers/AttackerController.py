@@ -8,6 +8,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import AttackerMessage, ValueTypeMessage
 from tools.ModelDefinitions import AttackerModel, ValueTypeModel
 from tools.SessionValidator import get_session_id
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -15,7 +17,7 @@ __author__ = 'Robin Quetin'
 class AttackersAPI(Resource):
     #region Swagger Doc
     @swagger.operation(
-        notes='Get all attackers',
+        notes='Get all attackers. ' + SELECTION_NOTES,
         nickname='attackers-get',
         responseClass=AttackerModel.__name__,
         responseContainer='List',
@@ -37,7 +39,7 @@ class AttackersAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -50,12 +52,14 @@ class AttackersAPI(Resource):
         session_id = get_session_id(session, request)
         constraint_id = request.args.get('constraint_id', -1)
 
+        selection = get_object_selection(request)
         dao = AttackerDAO(session_id)
-        attackers = dao.get_attackers(constraint_id=constraint_id)
+        attackers = dao.get_attackers(constraint_id=constraint_id, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(attackers, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(attackers, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.contenttype = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     # region Swagger Doc
@@ -128,7 +132,7 @@ class AttackerByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -144,7 +148,7 @@ class AttackerByNameAPI(Resource):
         attacker = dao.get_attacker_by_name(name=name)
         dao.close()
 
-        resp = make_response(json_serialize(attacker, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(attacker, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
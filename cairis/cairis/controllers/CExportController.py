@@ -0,0 +1,92 @@
+import httplib
+
+from flask import Response, request, session
+from flask.ext.restful import Resource
+from flask_restful_swagger import swagger
+
+from CairisHTTPError import CairisHTTPError
+from data.ExportDAO import ExportDAO
+from tools.SessionValidator import get_session_id
+
+__author__ = 'Robin Quetin'
+
+
+class CExportModelAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Exports the model as XML, streamed one section at a time.  The X-Model-Revision header gives the revision '
+              'exported, and X-Model-Export says whether the export is a full model or a delta.',
+        nickname='cexport-model-get',
+        parameters=[
+            {
+                "name": "compress",
+                "description": "If set to 1, the model is returned as a gzip-compressed file",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": int.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "since",
+                "description": "Only export the sections changed, and the objects deleted, since this revision",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": int.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The database connection was not properly set up'
+            },
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The revision is not a number'
+            }
+        ]
+    )
+    # endregion
+    def get(self):
+        session_id = get_session_id(session, request)
+        compress = request.args.get('compress', '0') == '1'
+        since = request.args.get('since', None)
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                raise CairisHTTPError(
+                    status_code=httplib.BAD_REQUEST,
+                    message='The revision ' + since + ' is not a number',
+                    status='Invalid revision'
+                )
+
+        dao = ExportDAO(session_id)
+        revision = dao.model_revision()
+        delta = None
+        if since is not None:
+            delta = dao.model_delta(since)
+        if delta is None:
+            chunks = dao.model_xml_chunks(compress)
+        else:
+            sections, deletions = delta
+            chunks = dao.model_xml_chunks(compress, sections, deletions)
+
+        if compress:
+            resp = Response(chunks, status=httplib.OK, mimetype='application/x-gzip')
+            resp.headers['Content-Disposition'] = 'attachment; filename=model.xml.gz'
+        else:
+            resp = Response(chunks, status=httplib.OK, mimetype='application/xml')
+            resp.headers['Content-Disposition'] = 'attachment; filename=model.xml'
+        resp.headers['X-Model-Revision'] = str(revision)
+        resp.headers['X-Model-Export'] = 'full' if delta is None else 'delta'
+        resp.call_on_close(dao.close)
+        return resp
@@ -1,5 +1,7 @@
 import httplib
+import zlib
 from os import close as fd_close
+from os import fdopen
 from os import remove as remove_file
 from tempfile import mkstemp
 from urllib import unquote
@@ -11,17 +13,146 @@ from werkzeug.datastructures import FileStorage
 
 from ARM import DatabaseProxyException, ARMException
 from Borg import Borg
-from CairisHTTPError import MalformedJSONHTTPError, CairisHTTPError, ARMHTTPError, MissingParameterHTTPError
+from CairisHTTPError import MalformedJSONHTTPError, CairisHTTPError, ARMHTTPError, MissingParameterHTTPError, ObjectNotFoundHTTPError
 import cimport
+from ImportJobManager import importJobManager
 from data.CairisDAO import CairisDAO
 from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import CImportMessage
 from tools.ModelDefinitions import CImportParams
+from tools.PseudoClasses import ImportJobStatus
 from tools.SessionValidator import validate_proxy, check_required_keys, get_session_id
 
 __author__ = 'Robin Quetin'
 
 
+def write_text_import_file(file_contents):
+    file_contents = unquote(file_contents)
+    if not file_contents.startswith('<?xml'):
+        raise CairisHTTPError(
+            status_code=httplib.BAD_REQUEST,
+            message='The provided file is not a valid XML file',
+            status='Invalid XML input'
+        )
+    fd, abs_path = mkstemp(suffix='.xml')
+    fs_temp = open(abs_path, 'w')
+    fs_temp.write(file_contents)
+    fs_temp.close()
+    fd_close(fd)
+    return abs_path
+
+
+def write_uploaded_import_file(file):
+    try:
+        fd, abs_path = mkstemp(suffix='.xml')
+        fs_temp = open(abs_path, 'w')
+        xml_text = file.stream.read()
+        fs_temp.write(xml_text)
+        fs_temp.close()
+        fd_close(fd)
+        return abs_path
+    except IOError:
+        raise CairisHTTPError(
+            status_code=httplib.CONFLICT,
+            status='Unable to load XML file',
+            message='The XML file could not be loaded on the server.' +
+                    'Please check if the application has permission to write temporary files.'
+        )
+
+
+def raise_size_limit_error(size_limit):
+    raise CairisHTTPError(
+        status_code=httplib.REQUEST_ENTITY_TOO_LARGE,
+        message='The model exceeds the import size limit of ' + str(size_limit) + ' bytes',
+        status='Model too large'
+    )
+
+
+def decompressed_pieces(decompressor, data, piece_size):
+    """
+    Decompresses data at most piece_size bytes at a time, so a small but highly compressed chunk is never expanded in memory all at once
+    """
+    while data:
+        piece = decompressor.decompress(data, piece_size)
+        data = decompressor.unconsumed_tail
+        yield piece
+
+
+def write_streamed_import_file(stream, size_limit, chunk_size=65536):
+    """
+    Spools a request body holding model XML, gzip-compressed or not, to a temporary file one chunk
+    at a time, so the model is never held in memory.  Bodies which are, or decompress to, more than
+    size_limit bytes are rejected.
+    :rtype : str
+    """
+    fd, abs_path = mkstemp(suffix='.xml')
+    fs_temp = fdopen(fd, 'wb')
+    decompressor = None
+    received = 0
+    written = 0
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            received += len(chunk)
+            if decompressor is None and received == len(chunk) and chunk.startswith('\x1f\x8b'):
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            pieces = [chunk]
+            if decompressor is not None:
+                pieces = decompressed_pieces(decompressor, chunk, chunk_size)
+            for piece in pieces:
+                if written == 0 and piece and not piece.lstrip().startswith('<?xml'):
+                    raise CairisHTTPError(
+                        status_code=httplib.BAD_REQUEST,
+                        message='The provided file is not a valid XML file',
+                        status='Invalid XML input'
+                    )
+                written += len(piece)
+                if written > size_limit:
+                    raise_size_limit_error(size_limit)
+                fs_temp.write(piece)
+        if decompressor is not None:
+            chunk = decompressor.flush()
+            written += len(chunk)
+            if written > size_limit:
+                raise_size_limit_error(size_limit)
+            fs_temp.write(chunk)
+        fs_temp.close()
+    except zlib.error:
+        fs_temp.close()
+        remove_file(abs_path)
+        raise CairisHTTPError(
+            status_code=httplib.BAD_REQUEST,
+            message='The provided file is not a valid gzip file',
+            status='Invalid gzip input'
+        )
+    except:
+        fs_temp.close()
+        remove_file(abs_path)
+        raise
+
+    if written == 0:
+        remove_file(abs_path)
+        raise MissingParameterHTTPError(param_names=['body'])
+    return abs_path
+
+
+def get_uploaded_file():
+    try:
+        if not request.files:
+            raise LookupError()
+        return request.files['file']
+    except LookupError:
+        raise MissingParameterHTTPError(param_names=['file'])
+
+
+def job_response(job, session_id, status_code=httplib.OK):
+    resp = make_response(json_serialize(job.summary(), session_id=session_id), status_code)
+    resp.headers['Content-Type'] = 'application/json'
+    return resp
+
+
 class CImportTextAPI(Resource):
     # region Swagger Doc
     @swagger.operation(
@@ -66,44 +197,30 @@ class CImportTextAPI(Resource):
 
         cimport_params = json_dict.get('object', None)
         check_required_keys(cimport_params or {}, CImportParams.required)
-        file_contents = cimport_params['urlenc_file_contents']
-        file_contents = unquote(file_contents)
         type = cimport_params['type']
         overwrite = cimport_params.get('overwrite', None)
+        abs_path = write_text_import_file(cimport_params['urlenc_file_contents'])
 
-        if file_contents.startswith('<?xml'):
-            fd, abs_path = mkstemp(suffix='.xml')
-            fs_temp = open(abs_path, 'w')
-            fs_temp.write(file_contents)
-            fs_temp.close()
-            fd_close(fd)
-
-            try:
-                result = cimport.file_import(abs_path, type, overwrite, session_id=session_id)
-            except DatabaseProxyException as ex:
-                raise ARMHTTPError(ex)
-            except ARMException as ex:
-                raise ARMHTTPError(ex)
-            except Exception as ex:
-                raise CairisHTTPError(
-                    status_code=500,
-                    message=str(ex.message),
-                    status='Unknown error'
-                )
-
-            remove_file(abs_path)
-
-            resp_dict = {'message': result}
-            resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
-            resp.headers['Content-Type'] = 'application/json'
-            return resp
-        else:
+        try:
+            result = cimport.file_import(abs_path, type, overwrite, session_id=session_id)
+        except DatabaseProxyException as ex:
+            raise ARMHTTPError(ex)
+        except ARMException as ex:
+            raise ARMHTTPError(ex)
+        except Exception as ex:
             raise CairisHTTPError(
-                status_code=httplib.BAD_REQUEST,
-                message='The provided file is not a valid XML file',
-                status='Invalid XML input'
+                status_code=500,
+                message=str(ex.message),
+                status='Unknown error'
             )
 
+        remove_file(abs_path)
+
+        resp_dict = {'message': result}
+        resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
+        resp.headers['Content-Type'] = 'application/json'
+        return resp
+
 
 class CImportFileAPI(Resource):
     # region Swagger Doc
@@ -160,28 +277,77 @@ class CImportFileAPI(Resource):
         session_id = get_session_id(session, request)
         overwrite = request.form.get('overwrite', None)
         overwrite = request.args.get('overwrite', overwrite)
-        try:
-            if not request.files:
-                raise LookupError()
-            file = request.files['file']
-        except LookupError:
-            raise MissingParameterHTTPError(param_names=['file'])
+        abs_path = write_uploaded_import_file(get_uploaded_file())
 
         try:
-            fd, abs_path = mkstemp(suffix='.xml')
-            fs_temp = open(abs_path, 'w')
-            xml_text = file.stream.read()
-            fs_temp.write(xml_text)
-            fs_temp.close()
-            fd_close(fd)
-        except IOError:
+            result = cimport.file_import(abs_path, type, overwrite, session_id=session_id)
+        except DatabaseProxyException as ex:
+            raise ARMHTTPError(ex)
+        except ARMException as ex:
+            raise ARMHTTPError(ex)
+        except Exception as ex:
             raise CairisHTTPError(
-                status_code=httplib.CONFLICT,
-                status='Unable to load XML file',
-                message='The XML file could not be loaded on the server.' +
-                        'Please check if the application has permission to write temporary files.'
+                status_code=500,
+                message=str(ex.message),
+                status='Unknown error'
             )
 
+        remove_file(abs_path)
+
+        resp_dict = { 'message': result }
+        resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
+        resp.headers['Content-Type'] = 'application/json'
+        return resp
+
+
+class CImportStreamAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Imports data from XML, or gzip-compressed XML, streamed as the request body',
+        nickname='cimport-stream-post',
+        parameters=[
+            {
+                'name':'body',
+                "description": "The model XML, optionally gzip-compressed, as the raw request body",
+                "required": True,
+                "allowMultiple": False,
+                'type': 'string',
+                'paramType': 'body'
+            },
+            {
+                "name": "overwrite",
+                "description": "Defines if existing data should be overwritten",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The provided file is not a valid XML file'
+            },
+            {
+                'code': httplib.REQUEST_ENTITY_TOO_LARGE,
+                'message': 'The model exceeds the import size limit'
+            }
+        ]
+    )
+    # endregion
+    def post(self, type):
+        session_id = get_session_id(session, request)
+        overwrite = request.args.get('overwrite', None)
+        abs_path = write_streamed_import_file(request.stream, Borg().importSizeLimit)
+
         try:
             result = cimport.file_import(abs_path, type, overwrite, session_id=session_id)
         except DatabaseProxyException as ex:
@@ -194,10 +360,239 @@ class CImportFileAPI(Resource):
                 message=str(ex.message),
                 status='Unknown error'
             )
+        finally:
+            remove_file(abs_path)
 
-        remove_file(abs_path)
-
-        resp_dict = { 'message': result }
+        resp_dict = {'message': result}
         resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
         resp.headers['Content-Type'] = 'application/json'
-        return resp
\ No newline at end of file
+        return resp
+
+
+class CImportTextJobAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Starts a background import of XML text',
+        nickname='cimport-job-text-post',
+        responseClass=ImportJobStatus.__name__,
+        parameters=[
+            {
+                'name':'body',
+                "description": "Options to be passed to the import tool",
+                "required": True,
+                "allowMultiple": False,
+                'type': CImportMessage.__name__,
+                'paramType': 'body'
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The provided file is not a valid XML file'
+            },
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': '''Some parameters are missing. Be sure 'file_contents' and 'type' are defined.'''
+            }
+        ]
+    )
+    # endregion
+    def post(self):
+        session_id = get_session_id(session, request)
+        json_dict = request.get_json(silent=True)
+
+        if json_dict is False or json_dict is None:
+            raise MalformedJSONHTTPError(data=request.get_data())
+
+        cimport_params = json_dict.get('object', None)
+        check_required_keys(cimport_params or {}, CImportParams.required)
+        type = cimport_params['type']
+        overwrite = cimport_params.get('overwrite', None)
+        abs_path = write_text_import_file(cimport_params['urlenc_file_contents'])
+
+        job = importJobManager().submit(session_id, abs_path, type, overwrite)
+        return job_response(job, session_id, httplib.ACCEPTED)
+
+
+class CImportFileJobAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Starts a background import of an XML file',
+        nickname='cimport-job-file-post',
+        responseClass=ImportJobStatus.__name__,
+        parameters=[
+            {
+                'name':'file',
+                "description": "The XML file to import",
+                "required": True,
+                "allowMultiple": False,
+                'type': 'file',
+                'paramType': 'form'
+            },
+            {
+                "name": "overwrite",
+                "description": "Defines if existing data should be overwritten",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "form"
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The file parameter is missing'
+            }
+        ]
+    )
+    # endregion
+    def post(self, type):
+        session_id = get_session_id(session, request)
+        overwrite = request.form.get('overwrite', None)
+        overwrite = request.args.get('overwrite', overwrite)
+        abs_path = write_uploaded_import_file(get_uploaded_file())
+
+        job = importJobManager().submit(session_id, abs_path, type, overwrite)
+        return job_response(job, session_id, httplib.ACCEPTED)
+
+
+class CImportStreamJobAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Starts a background import of XML, or gzip-compressed XML, streamed as the request body',
+        nickname='cimport-job-stream-post',
+        responseClass=ImportJobStatus.__name__,
+        parameters=[
+            {
+                'name':'body',
+                "description": "The model XML, optionally gzip-compressed, as the raw request body",
+                "required": True,
+                "allowMultiple": False,
+                'type': 'string',
+                'paramType': 'body'
+            },
+            {
+                "name": "overwrite",
+                "description": "Defines if existing data should be overwritten",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The provided file is not a valid XML file'
+            },
+            {
+                'code': httplib.REQUEST_ENTITY_TOO_LARGE,
+                'message': 'The model exceeds the import size limit'
+            }
+        ]
+    )
+    # endregion
+    def post(self, type):
+        session_id = get_session_id(session, request)
+        overwrite = request.args.get('overwrite', None)
+        abs_path = write_streamed_import_file(request.stream, Borg().importSizeLimit)
+
+        job = importJobManager().submit(session_id, abs_path, type, overwrite)
+        return job_response(job, session_id, httplib.ACCEPTED)
+
+
+class CImportJobAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Get the status and progress of an import job',
+        nickname='cimport-job-get',
+        responseClass=ImportJobStatus.__name__,
+        parameters=[
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.NOT_FOUND,
+                'message': 'The import job could not be found'
+            }
+        ]
+    )
+    # endregion
+    def get(self, job_id):
+        session_id = get_session_id(session, request)
+        return job_response(self.session_job(job_id, session_id), session_id)
+
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Cancel an import job; any changes it has made are rolled back',
+        nickname='cimport-job-delete',
+        responseClass=ImportJobStatus.__name__,
+        parameters=[
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.NOT_FOUND,
+                'message': 'The import job could not be found'
+            },
+            {
+                'code': httplib.CONFLICT,
+                'message': 'The import job has started replacing the model and can no longer be cancelled'
+            }
+        ]
+    )
+    # endregion
+    def delete(self, job_id):
+        session_id = get_session_id(session, request)
+        job = importJobManager().cancel(self.session_job(job_id, session_id).id())
+        if not job.finished() and not job.progress().cancelled():
+            raise CairisHTTPError(
+                status_code=httplib.CONFLICT,
+                message='The import job has started replacing the model and can no longer be cancelled',
+                status='Import not cancellable'
+            )
+        return job_response(job, session_id)
+
+    def session_job(self, job_id, session_id):
+        job = importJobManager().job(job_id)
+        if job is None or job.sessionId() != session_id:
+            raise ObjectNotFoundHTTPError('The import job')
+        return job
@@ -10,6 +10,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import DependencyMessage
 from tools.ModelDefinitions import DependencyModel
 from tools.SessionValidator import get_session_id
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -17,7 +19,7 @@ __author__ = 'Robin Quetin'
 class DependenciesAPI(Resource):
     #region Swagger Docs
     @swagger.operation(
-        notes='Get all dependencies',
+        notes='Get all dependencies. ' + SELECTION_NOTES,
         nickname='dependencies-get',
         responseClass=DependencyModel.__name__,
         parameters=[
@@ -36,7 +38,7 @@ class DependenciesAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -49,12 +51,14 @@ class DependenciesAPI(Resource):
         session_id = get_session_id(session, request)
         constraintsId = request.args.get('constraint_id', '')
 
+        selection = get_object_selection(request)
         dao = DependencyDAO(session_id)
-        dependencies = dao.get_dependencies(constraintsId)
+        dependencies = dao.get_dependencies(constraintsId, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(dependencies, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(dependencies, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     #region Swagger Docs
@@ -123,7 +127,7 @@ class DependencyByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -144,7 +148,7 @@ class DependencyByNameAPI(Resource):
         )
         dao.close()
 
-        resp = make_response(json_serialize(found_dependency, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(found_dependency, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
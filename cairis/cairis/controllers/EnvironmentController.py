@@ -11,6 +11,8 @@ from tools.ModelDefinitions import EnvironmentModel
 from tools.PseudoClasses import EnvironmentTensionModel
 from tools.SessionValidator import get_session_id
 from tools.JsonConverter import json_serialize
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 
 __author__ = 'Robin Quetin'
@@ -19,7 +21,7 @@ __author__ = 'Robin Quetin'
 class EnvironmentsAPI(Resource):
     #region Swagger Docs
     @swagger.operation(
-        notes='Get all environments',
+        notes='Get all environments. ' + SELECTION_NOTES,
         nickname='environments-get',
         responseClass=EnvironmentModel.__name__,
         parameters=[
@@ -31,7 +33,7 @@ class EnvironmentsAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -44,12 +46,14 @@ class EnvironmentsAPI(Resource):
         session_id = get_session_id(session, request)
         constraintsId = request.args.get('constraints_id', -1)
 
+        selection = get_object_selection(request)
         dao = EnvironmentDAO(session_id)
-        environments = dao.get_environments(constraintsId)
+        environments = dao.get_environments(constraintsId, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(environments, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(environments, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     #region Swagger Docs
@@ -122,7 +126,7 @@ class EnvironmentByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -138,7 +142,7 @@ class EnvironmentByNameAPI(Resource):
         found_environment = dao.get_environment_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(found_environment, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(found_environment, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
@@ -9,6 +9,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import GoalMessage
 from tools.ModelDefinitions import GoalModel as SwaggerGoalModel
 from tools.SessionValidator import get_session_id, get_model_generator
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -16,7 +18,7 @@ __author__ = 'Robin Quetin'
 class GoalsAPI(Resource):
     #region Swagger Doc
     @swagger.operation(
-        notes='Get all goals.',
+        notes='Get all goals. ' + SELECTION_NOTES,
         responseClass=SwaggerGoalModel.__name__,
         nickname='goals-get',
         parameters=[
@@ -36,7 +38,7 @@ class GoalsAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -50,12 +52,14 @@ class GoalsAPI(Resource):
         constraint_id = request.args.get('constraint_id', -1)
         coloured = request.args.get('coloured', False)
 
+        selection = get_object_selection(request)
         dao = GoalDAO(session_id)
-        goals = dao.get_goals(constraint_id=constraint_id, coloured=(coloured == '1'))
+        goals = dao.get_goals(constraint_id=constraint_id, coloured=(coloured == '1'), selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(goals, session_id=session_id))
+        resp = make_response(json_serialize(goals, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
+        add_selection_headers(resp, selection)
         return resp
 
     #region Swagger Doc
@@ -133,7 +137,7 @@ class GoalByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -150,7 +154,7 @@ class GoalByNameAPI(Resource):
         found_goal = dao.get_goal_by_name(name, coloured=(coloured == '1'))
         dao.close()
 
-        resp = make_response(json_serialize(found_goal, session_id=session_id))
+        resp = make_response(json_serialize(found_goal, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
         return resp
 
@@ -8,6 +8,8 @@ from data.RiskDAO import RiskDAO
 from tools.ModelDefinitions import MisuseCaseModel
 from tools.SessionValidator import get_session_id
 from tools.JsonConverter import json_serialize
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 
 __author__ = 'Robin Quetin'
@@ -16,7 +18,7 @@ __author__ = 'Robin Quetin'
 class MisuseCasesAPI(Resource):
     #region Swagger Docs
     @swagger.operation(
-        notes='Get all misuse cases',
+        notes='Get all misuse cases. ' + SELECTION_NOTES,
         nickname='misuse-cases-get',
         responseClass=MisuseCaseModel.__name__,
         parameters=[
@@ -28,7 +30,7 @@ class MisuseCasesAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -41,12 +43,14 @@ class MisuseCasesAPI(Resource):
         session_id = get_session_id(session, request)
         constraintsId = request.args.get('constraints_id', -1)
 
+        selection = get_object_selection(request)
         dao = RiskDAO(session_id)
-        misuse_cases = dao.get_misuse_cases(constraintsId)
+        misuse_cases = dao.get_misuse_cases(constraintsId, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(misuse_cases, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(misuse_cases, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
 
@@ -65,7 +69,7 @@ class MisuseCaseByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -81,6 +85,6 @@ class MisuseCaseByNameAPI(Resource):
         found_misuse_case = dao.get_misuse_case_by_risk_name(risk_name)
         dao.close()
 
-        resp = make_response(json_serialize(found_misuse_case, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(found_misuse_case, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
\ No newline at end of file
@@ -0,0 +1,37 @@
+import httplib
+
+from flask import session, request, make_response
+from flask.ext.restful import Resource
+from flask.ext.restful_swagger import swagger
+
+from tools.JsonConverter import json_serialize
+from tools.SessionValidator import get_session_id, get_model_generator
+
+__author__ = 'Robin Quetin'
+
+
+class ModelMetricsAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Get the counters of the model renderer',
+        nickname='model-metrics-get',
+        responseClass=dict.__name__,
+        parameters=[
+            {
+                'name': 'session_id',
+                'description': 'The ID of the session to use',
+                'required': False,
+                'allowMultiple': False,
+                'type': 'string',
+                'paramType': 'query'
+            }
+        ]
+    )
+    # endregion
+    def get(self):
+        session_id = get_session_id(session, request)
+        model_generator = get_model_generator()
+
+        resp = make_response(json_serialize(model_generator.metrics(), session_id=session_id), httplib.OK)
+        resp.contenttype = 'application/json'
+        return resp
@@ -1,7 +1,9 @@
 import httplib
-from flask import session, request, make_response
+from os import remove as remove_file
+from flask import session, request, make_response, Response
 from flask.ext.restful import Resource
 from flask.ext.restful_swagger import swagger
+from Borg import Borg
 from data.ProjectDAO import ProjectDAO
 from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import ProjectMessage
@@ -40,12 +42,113 @@ class ProjectCreateAPI(Resource):
 
         dao = ProjectDAO(session_id)
         dao.create_new_project()
+        dao.close()
 
         resp_dict = {'message': 'New project successfully created'}
         resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
         resp.contenttype = 'application/json'
         return resp
 
+def snapshot_chunks(abs_path, chunk_size=65536):
+    try:
+        fs_snapshot = open(abs_path, 'rb')
+        try:
+            while True:
+                chunk = fs_snapshot.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            fs_snapshot.close()
+    finally:
+        remove_file(abs_path)
+
+
+class ProjectSnapshotAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Take a binary snapshot of the project',
+        nickname='project-snapshot-post',
+        parameters=[
+            {
+                'name': 'session_id',
+                'description': 'The ID of the session to use',
+                'required': False,
+                'allowMultiple': False,
+                'type': 'string',
+                'paramType': 'query'
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.BAD_REQUEST,
+                'message': 'The provided parameters are invalid'
+            }
+        ]
+    )
+    # endregion
+    def post(self):
+        session_id = get_session_id(session, request)
+
+        dao = ProjectDAO(session_id)
+        abs_path = dao.take_snapshot()
+        dao.close()
+
+        resp = Response(snapshot_chunks(abs_path), status=httplib.OK, mimetype='application/octet-stream')
+        resp.headers['Content-Disposition'] = 'attachment; filename=model.snapshot'
+        return resp
+
+
+class ProjectRestoreAPI(Resource):
+    # region Swagger Doc
+    @swagger.operation(
+        notes='Replace the project with a snapshot streamed as the request body',
+        nickname='project-restore-post',
+        parameters=[
+            {
+                'name': 'body',
+                'description': 'The snapshot, as the raw request body',
+                'required': True,
+                'allowMultiple': False,
+                'type': 'string',
+                'paramType': 'body'
+            },
+            {
+                'name': 'session_id',
+                'description': 'The ID of the session to use',
+                'required': False,
+                'allowMultiple': False,
+                'type': 'string',
+                'paramType': 'query'
+            }
+        ],
+        responseMessages=[
+            {
+                'code': httplib.CONFLICT,
+                'message': 'The snapshot is corrupt or was taken from a database with a different schema'
+            },
+            {
+                'code': httplib.REQUEST_ENTITY_TOO_LARGE,
+                'message': 'The snapshot exceeds the size limit'
+            }
+        ]
+    )
+    # endregion
+    def post(self):
+        session_id = get_session_id(session, request)
+
+        dao = ProjectDAO(session_id)
+        try:
+            result = dao.restore_snapshot(request.stream, Borg().importSizeLimit)
+        finally:
+            dao.close()
+
+        resp_dict = {'message': result}
+        resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
+        resp.contenttype = 'application/json'
+        return resp
+
+
 class ProjectSettingsAPI(Resource):
     # region Swagger Doc
     @swagger.operation(
@@ -75,6 +178,7 @@ class ProjectSettingsAPI(Resource):
 
         dao = ProjectDAO(session_id)
         settings = dao.get_settings()
+        dao.close()
 
         resp = make_response(json_serialize(settings, session_id=session_id), httplib.OK)
         resp.contenttype = 'application/json'
@@ -116,6 +220,7 @@ class ProjectSettingsAPI(Resource):
         dao = ProjectDAO(session_id)
         settings = dao.from_json(request)
         dao.apply_settings(settings)
+        dao.close()
 
         resp_dict = {'message': 'Project settings successfully updated'}
         resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
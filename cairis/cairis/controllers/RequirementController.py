@@ -10,6 +10,8 @@ from tools.MessageDefinitions import RequirementMessage
 from tools.ModelDefinitions import RequirementModel
 from tools.SessionValidator import get_session_id
 from tools.JsonConverter import json_serialize
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 
 __author__ = 'Robin Quetin'
@@ -18,7 +20,7 @@ __author__ = 'Robin Quetin'
 class RequirementsAPI(Resource):
     # region Swagger Doc
     @swagger.operation(
-        notes='Get all requirements',
+        notes='Get all requirements. ' + SELECTION_NOTES,
         nickname='requirements-get',
         responseClass=RequirementModel.__name__,
         responseContainer='List',
@@ -49,7 +51,7 @@ class RequirementsAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -71,13 +73,15 @@ class RequirementsAPI(Resource):
         ordered = request.args.get('ordered', 0)
         constraint_id = request.args.get('constraint_id', '')
 
+        selection = get_object_selection(request)
         dao = RequirementDAO(session_id)
-        reqs = dao.get_requirements(constraint_id=constraint_id, ordered=(ordered=='1'))
+        reqs = dao.get_requirements(constraint_id=constraint_id, ordered=(ordered=='1'), selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(reqs, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(reqs, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         resp.headers['Access-Control-Allow-Origin'] = "*"
+        add_selection_headers(resp, selection)
         return resp
 
     # region Swagger Doc
@@ -322,7 +326,7 @@ class RequirementByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -350,7 +354,7 @@ class RequirementByNameAPI(Resource):
         req = dao.get_requirement_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(req, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(req, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
@@ -415,7 +419,7 @@ class RequirementByShortcodeAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 'code': ARMHTTPError.status_code,
@@ -439,6 +443,6 @@ class RequirementByShortcodeAPI(Resource):
         req = dao.get_requirement_by_shortcode(shortcode)
         dao.close()
 
-        resp = make_response(json_serialize(req, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(req, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
\ No newline at end of file
@@ -10,6 +10,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import ResponseMessage
 from tools.ModelDefinitions import ResponseModel as SwaggerResponseModel
 from tools.SessionValidator import get_session_id
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -17,7 +19,7 @@ __author__ = 'Robin Quetin'
 class ResponsesAPI(Resource):
     #region Swagger Doc
     @swagger.operation(
-        notes='Get all responses',
+        notes='Get all responses. ' + SELECTION_NOTES,
         responseClass=SwaggerResponseModel.__name__,
         nickname='responses-get',
         parameters=[
@@ -38,7 +40,7 @@ class ResponsesAPI(Resource):
                 "dataType": int.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -51,11 +53,14 @@ class ResponsesAPI(Resource):
         session_id = get_session_id(session, request)
         constraint_id = request.args.get('constraint_id', -1)
 
+        selection = get_object_selection(request)
         dao = ResponseDAO(session_id)
-        responses = dao.get_responses(constraint_id)
+        responses = dao.get_responses(constraint_id, selection=selection)
+        dao.close()
 
-        resp = make_response(json_serialize(responses, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(responses, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.contenttype = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     #region Swagger Docs
@@ -102,6 +107,7 @@ class ResponsesAPI(Resource):
         dao = ResponseDAO(session_id)
         response = dao.from_json(request)
         response_id = dao.add_response(response)
+        dao.close()
 
         resp_dict = {'message': 'Response successfully added', 'response_id': response_id}
         resp = make_response(json_serialize(resp_dict), httplib.OK)
@@ -123,7 +129,7 @@ class ResponseByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -139,7 +145,7 @@ class ResponseByNameAPI(Resource):
         found_response = dao.get_response_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(found_response, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(found_response, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
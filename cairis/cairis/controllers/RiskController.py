@@ -9,8 +9,10 @@ from data.RiskDAO import RiskDAO
 from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import RiskMessage
 from tools.ModelDefinitions import RiskModel as SwaggerRiskModel
-from tools.PseudoClasses import RiskScore
+from tools.PseudoClasses import RiskScore, RiskScoreDelta
 from tools.SessionValidator import get_session_id, get_model_generator
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -18,7 +20,7 @@ __author__ = 'Robin Quetin'
 class RisksAPI(Resource):
     #region Swagger Doc
     @swagger.operation(
-        notes='Get all risks',
+        notes='Get all risks. ' + SELECTION_NOTES,
         responseClass=SwaggerRiskModel.__name__,
         nickname='risks-get',
         parameters=[
@@ -39,7 +41,7 @@ class RisksAPI(Resource):
                 "dataType": int.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -52,11 +54,14 @@ class RisksAPI(Resource):
         session_id = get_session_id(session, request)
         constraint_id = request.args.get('constraint_id', -1)
 
+        selection = get_object_selection(request)
         dao = RiskDAO(session_id)
-        risks = dao.get_risks(constraint_id)
+        risks = dao.get_risks(constraint_id, selection=selection)
+        dao.close()
 
-        resp = make_response(json_serialize(risks, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(risks, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.contenttype = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     #region Swagger Docs
@@ -103,6 +108,7 @@ class RisksAPI(Resource):
         dao = RiskDAO(session_id)
         risk = dao.from_json(request)
         risk_id = dao.add_risk(risk)
+        dao.close()
 
         resp_dict = {'message': 'Risk successfully added', 'risk_id': risk_id}
         resp = make_response(json_serialize(resp_dict), httplib.OK)
@@ -124,7 +130,7 @@ class RiskByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -140,7 +146,7 @@ class RiskByNameAPI(Resource):
         found_risk = dao.get_risk_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(found_risk, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(found_risk, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
@@ -277,6 +283,7 @@ class RiskAnalysisModelByNameAPI(Resource):
 
         dao = RiskDAO(session_id)
         dotcode = dao.get_risk_analysis_model(environment, dim_name, obj_name)
+        dao.close()
         model_gen = get_model_generator()
         svg_code = model_gen.generate(dotcode, model_type='risk')
 
@@ -318,6 +325,7 @@ class RisksScoreByNameAPI(Resource):
 
         dao = RiskDAO(session_id)
         risk_scores = dao.get_scores_by_rtve(name, threat, vulnerability, environment)
+        dao.close()
 
         resp = make_response(json_serialize(risk_scores, session_id=session_id), httplib.OK)
         resp.contenttype = 'application/json'
@@ -353,7 +361,96 @@ class RisksRatingByNameAPI(Resource):
 
         dao = RiskDAO(session_id)
         risk_rating = dao.get_risk_rating_by_tve(threat, vulnerability, environment)
+        dao.close()
 
         resp = make_response(json_serialize(risk_rating, session_id=session_id), httplib.OK)
         resp.contenttype = 'application/json'
-        return resp
\ No newline at end of file
+        return resp
+
+class RisksScoreByEnvironmentAPI(Resource):
+    #region Swagger Doc
+    @swagger.operation(
+        notes='Get the risk scores of every risk and response in an environment, or in all environments',
+        responseClass=RiskScore.__name__,
+        nickname='risks-scores-by-environment-get',
+        parameters=[
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                "code": httplib.BAD_REQUEST,
+                "message": "The database connection was not properly set up"
+            }
+        ]
+    )
+    #endregion
+    def get(self, environment=''):
+        session_id = get_session_id(session, request)
+
+        dao = RiskDAO(session_id)
+        risk_scores = dao.get_scores_by_environment(environment)
+        dao.close()
+
+        resp = make_response(json_serialize(risk_scores, session_id=session_id), httplib.OK)
+        resp.contenttype = 'application/json'
+        return resp
+
+
+class RisksSimulationAPI(Resource):
+    #region Swagger Doc
+    @swagger.operation(
+        notes='Simulate changes to responses, countermeasure effectiveness and asset values without changing the risk model',
+        responseClass=RiskScoreDelta.__name__,
+        nickname='risks-simulate-post',
+        parameters=[
+            {
+                "name": "body",
+                "description": "The session ID and an object with an optional environment name and a list of scenarios, each being a list of changes",
+                "required": True,
+                "allowMultiple": False,
+                "dataType": dict.__name__,
+                "paramType": "body"
+            },
+            {
+                "name": "session_id",
+                "description": "The ID of the user's session",
+                "required": False,
+                "allowMultiple": False,
+                "dataType": str.__name__,
+                "paramType": "query"
+            }
+        ],
+        responseMessages=[
+            {
+                "code": httplib.BAD_REQUEST,
+                "message": "The database connection was not properly set up"
+            },
+            {
+                "code": MalformedJSONHTTPError.status_code,
+                "message": MalformedJSONHTTPError.status
+            },
+            {
+                "code": ARMHTTPError.status_code,
+                "message": ARMHTTPError.status
+            }
+        ]
+    )
+    #endregion
+    def post(self):
+        session_id = get_session_id(session, request)
+
+        dao = RiskDAO(session_id)
+        environment_name, scenarios = dao.simulation_from_json(request)
+        score_deltas = dao.simulate_scores(environment_name, scenarios)
+        dao.close()
+
+        resp = make_response(json_serialize(score_deltas, session_id=session_id), httplib.OK)
+        resp.contenttype = 'application/json'
+        return resp
@@ -9,6 +9,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import RoleMessage
 from tools.ModelDefinitions import RoleModel, RoleEnvironmentPropertiesModel
 from tools.SessionValidator import get_session_id
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 __author__ = 'Robin Quetin'
 
@@ -16,7 +18,7 @@ __author__ = 'Robin Quetin'
 class RolesAPI(Resource):
     # region Swagger Doc
     @swagger.operation(
-        notes='Get all roles',
+        notes='Get all roles. ' + SELECTION_NOTES,
         responseClass=RoleModel.__name__,
         nickname='roles-get',
         parameters=[
@@ -37,7 +39,7 @@ class RolesAPI(Resource):
                 "dataType": int.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -50,12 +52,14 @@ class RolesAPI(Resource):
         session_id = get_session_id(session, request)
         constraint_id = request.args.get('constraint_id', -1)
 
+        selection = get_object_selection(request)
         dao = RoleDAO(session_id)
-        roles = dao.get_roles(constraint_id)
+        roles = dao.get_roles(constraint_id, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(roles, session_id=session_id))
+        resp = make_response(json_serialize(roles, session_id=session_id, fields=get_requested_fields(request)))
         resp.contenttype = "application/json"
+        add_selection_headers(resp, selection)
         return resp
 
     # region Swagger Doc
@@ -124,7 +128,7 @@ class RolesByIdAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -140,7 +144,7 @@ class RolesByIdAPI(Resource):
         found_role = dao.get_role_by_id(id)
         dao.close()
 
-        resp = make_response(json_serialize(found_role, session_id=session_id))
+        resp = make_response(json_serialize(found_role, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
         return resp
 
@@ -260,7 +264,7 @@ class RolesByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -276,7 +280,7 @@ class RolesByNameAPI(Resource):
         found_role = dao.get_role_by_name(name)
         dao.close()
 
-        resp = make_response(json_serialize(found_role, session_id=session_id))
+        resp = make_response(json_serialize(found_role, session_id=session_id, fields=get_requested_fields(request)))
         resp.headers['Content-Type'] = "application/json"
         return resp
 
@@ -9,6 +9,8 @@ from tools.JsonConverter import json_serialize
 from tools.MessageDefinitions import ThreatMessage, ValueTypeMessage
 from tools.ModelDefinitions import ThreatModel, ValueTypeModel
 from tools.SessionValidator import get_session_id
+from tools.ObjectSelectionParser import FIELDS_PARAMETER, SELECTION_NOTES, SELECTION_PARAMETERS, add_selection_headers, \
+    get_object_selection, get_requested_fields
 
 
 __author__ = 'Robin Quetin'
@@ -17,7 +19,7 @@ __author__ = 'Robin Quetin'
 class ThreatAPI(Resource):
     #region Swagger Doc
     @swagger.operation(
-        notes='Get all threats',
+        notes='Get all threats. ' + SELECTION_NOTES,
         nickname='threats-get',
         responseClass=ThreatModel.__name__,
         responseContainer='List',
@@ -39,7 +41,7 @@ class ThreatAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + SELECTION_PARAMETERS,
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -52,12 +54,14 @@ class ThreatAPI(Resource):
         session_id = get_session_id(session, request)
         constraint_id = request.args.get('constraint_id', -1)
 
+        selection = get_object_selection(request)
         dao = ThreatDAO(session_id)
-        threats = dao.get_threats(constraint_id=constraint_id)
+        threats = dao.get_threats(constraint_id=constraint_id, selection=selection)
         dao.close()
 
-        resp = make_response(json_serialize(threats, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(threats, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.contenttype = 'application/json'
+        add_selection_headers(resp, selection)
         return resp
 
     # region Swagger Doc
@@ -126,7 +130,7 @@ class ThreatByIdAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -142,7 +146,7 @@ class ThreatByIdAPI(Resource):
         threat = dao.get_threat_by_id(threat_id=id)
         dao.close()
 
-        resp = make_response(json_serialize(threat, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(threat, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
@@ -161,7 +165,7 @@ class ThreatByNameAPI(Resource):
                 "dataType": str.__name__,
                 "paramType": "query"
             }
-        ],
+        ] + [FIELDS_PARAMETER],
         responseMessages=[
             {
                 "code": httplib.BAD_REQUEST,
@@ -177,7 +181,7 @@ class ThreatByNameAPI(Resource):
         threat = dao.get_threat_by_name(name=name)
         dao.close()
 
-        resp = make_response(json_serialize(threat, session_id=session_id), httplib.OK)
+        resp = make_response(json_serialize(threat, session_id=session_id, fields=get_requested_fields(request)), httplib.OK)
         resp.headers['Content-type'] = 'application/json'
         return resp
 
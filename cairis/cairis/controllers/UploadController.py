@@ -79,6 +79,7 @@ class UploadImageAPI(Resource):
 
         dao = UploadDAO(session_id)
         filename = dao.upload_image(file)
+        dao.close()
 
         resp_dict = {'message': 'File successfully uploaded', 'filename': filename}
         resp = make_response(json_serialize(resp_dict, session_id=session_id), httplib.OK)
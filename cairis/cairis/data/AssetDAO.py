@@ -32,9 +32,9 @@ class AssetDAO(CairisDAO):
         for key, value in self.attr_dict.items():
             self.rev_attr_dict[value] = key
 
-    def get_assets(self, constraint_id=-1, simplify=True):
+    def get_assets(self, constraint_id=-1, simplify=True, selection=None):
         try:
-            assets = self.db_proxy.getAssets(constraint_id)
+            assets = self.db_proxy.getAssets(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -43,6 +43,8 @@ class AssetDAO(CairisDAO):
             for key, value in assets.items():
                 assets[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(assets)
         return assets
 
     def get_asset_names(self, environment=''):
@@ -57,19 +59,12 @@ class AssetDAO(CairisDAO):
             raise ARMHTTPError(ex)
 
     def get_asset_by_id(self, id, simplify=True):
-        found_asset = None
         try:
-            assets = self.db_proxy.getAssets()
+            found_asset = self.db_proxy.dimensionObjectById(id, 'asset')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        idx = 0
-        while found_asset is None and idx < len(assets):
-            if assets.values()[idx].theId == id:
-                found_asset = assets.values()[idx]
-            idx += 1
-
         if found_asset is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided asset ID')
@@ -80,9 +75,8 @@ class AssetDAO(CairisDAO):
         return found_asset
 
     def get_asset_by_name(self, name, simplify=True):
-        found_asset = None
         try:
-            assets = self.db_proxy.getAssets()
+            found_asset = self.db_proxy.dimensionObjectByName(name, 'asset')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -90,9 +84,6 @@ class AssetDAO(CairisDAO):
             self.close()
             raise ARMHTTPError(ex)
 
-        if assets is not None:
-            found_asset = assets.get(name)
-
         if found_asset is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided asset name')
@@ -389,8 +380,7 @@ class AssetDAO(CairisDAO):
             self.get_asset_type_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
-            # Needs to reconnect after Error was raised
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
 
     # endregion
@@ -452,6 +442,7 @@ class AssetDAO(CairisDAO):
             self.get_asset_value_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
+            self.reopen()
             return False
 
     # endregion
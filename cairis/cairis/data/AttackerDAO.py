@@ -21,14 +21,15 @@ class AttackerDAO(CairisDAO):
         """
         CairisDAO.__init__(self, session_id)
 
-    def get_attackers(self, constraint_id=-1, simplify=True):
+    def get_attackers(self, constraint_id=-1, simplify=True, selection=None):
         """
-        :rtype: dict[str,Attacker]
-        :return
+        :type selection: ObjectSelection
+        :rtype: dict[str,Attacker]|list[Attacker]
+        :return The attackers, or the selected page of attackers in order if a selection is given
         :raise ARMHTTPError:
         """
         try:
-            attackers = self.db_proxy.getAttackers(constraint_id)
+            attackers = self.db_proxy.getAttackers(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -40,6 +41,8 @@ class AttackerDAO(CairisDAO):
             for key, value in attackers.items():
                 attackers[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(attackers)
         return attackers
 
     def get_attacker_by_name(self, name, simplify=True):
@@ -47,13 +50,22 @@ class AttackerDAO(CairisDAO):
         :rtype: Attacker
         :raise ObjectNotFoundHTTPError:
         """
-        attackers = self.get_attackers(simplify=simplify)
-        found_attacker = attackers.get(name, None)
+        try:
+            found_attacker = self.db_proxy.dimensionObjectByName(name, 'attacker')
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if found_attacker is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided attacker name')
 
+        if simplify:
+            found_attacker = self.simplify(found_attacker)
+
         return found_attacker
 
     def add_attacker(self, attacker):
@@ -252,7 +264,7 @@ class AttackerDAO(CairisDAO):
             self.get_attacker_capability_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
     # endregion
 
@@ -381,7 +393,7 @@ class AttackerDAO(CairisDAO):
             self.get_attacker_motivation_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
     # endregion
 
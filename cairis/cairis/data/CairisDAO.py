@@ -2,7 +2,8 @@ import httplib
 import logging
 
 from Borg import Borg
-from CairisHTTPError import CairisHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError
+from ARM import DatabaseProxyException
+from CairisHTTPError import CairisHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError, ARMHTTPError
 from MySQLDatabaseProxy import MySQLDatabaseProxy
 from ValueType import ValueType
 from tools.JsonConverter import json_serialize, json_deserialize
@@ -15,15 +16,30 @@ class CairisDAO(object):
     def __init__(self, session_id):
         b = Borg()
         self.db_proxy = self.get_dbproxy(session_id)
-        self.db_proxy.prepareDatabase()
         self.session_id = session_id
         self.logger = logging.getLogger('cairisd')
         self.logger.setLevel(b.logLevel)
 
     def close(self):
-        if self.db_proxy.conn.open:
+        if self.db_proxy is None:
+            return
+        pool = getattr(self.db_proxy, 'thePool', None)
+        if pool is not None:
+            if getattr(self, 'checked_out', False):
+                self.checked_out = False
+                pool.checkin(self.db_proxy)
+                self.logger.debug('Connection returned to pool')
+        elif self.db_proxy.conn.open:
             self.db_proxy.close()
-        self.logger.debug('Connection closed')
+            self.logger.debug('Connection closed')
+        self.db_proxy = None
+
+    def reopen(self):
+        """
+        Checks out a connection again after close() was called, e.g. after an expected lookup error
+        """
+        if not getattr(self, 'checked_out', False):
+            self.db_proxy = self.get_dbproxy(self.session_id)
 
     def from_json(self, request):
         json = request.get_json(silent=True)
@@ -56,7 +72,7 @@ class CairisDAO(object):
 
     def get_dbproxy(self, session_id):
         """
-        Searches the MySQLDatabaseProxy instance associated with the session ID.
+        Checks out a MySQLDatabaseProxy instance from the connection pool serving the session's database.
         :param
             session_id: The session ID
         :type
@@ -70,15 +86,21 @@ class CairisDAO(object):
         """
         if session_id:
             b = Borg()
-            db_proxy = b.get_dbproxy(session_id)
+            pool = b.get_dbproxy_pool(session_id)
 
-            if db_proxy is None:
+            if pool is None:
                 raise CairisHTTPError(
                     status_code=httplib.CONFLICT,
                     message='The database connection could not be created.'
                 )
-            elif isinstance(db_proxy, MySQLDatabaseProxy):
-                db_proxy.reconnect(session_id=session_id)
+
+            try:
+                db_proxy = pool.checkout()
+            except DatabaseProxyException as ex:
+                raise ARMHTTPError(ex)
+
+            if isinstance(db_proxy, MySQLDatabaseProxy):
+                self.checked_out = True
                 return db_proxy
             else:
                 raise CairisHTTPError(
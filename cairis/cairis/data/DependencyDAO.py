@@ -14,12 +14,13 @@ class DependencyDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_dependencies(self, constraint_id=''):
+    def get_dependencies(self, constraint_id='', selection=None):
         """
-        :rtype : dict[str, Dependency]
+        :type selection: ObjectSelection
+        :rtype : dict[str, Dependency]|list[Dependency]
         """
         try:
-            dependencies = self.db_proxy.getDependencies(constraint_id)
+            dependencies = self.db_proxy.getDependencies(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -27,6 +28,8 @@ class DependencyDAO(CairisDAO):
             self.close()
             raise ARMHTTPError
 
+        if selection is not None:
+            return selection.result(dependencies)
         return dependencies
 
     def get_dependency(self, environment, depender, dependee, dependency):
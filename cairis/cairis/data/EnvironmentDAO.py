@@ -15,15 +15,16 @@ class EnvironmentDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_environments(self, constraint_id=-1, simplify=True):
+    def get_environments(self, constraint_id=-1, simplify=True, selection=None):
         """
         Get all the environments in dictionary form with the key being the environment name.
         :param simplify: Defines if the environment should be changed to be compatible with JSON
+        :param selection: If given, only the selected page of environments is returned, as a list in the selected order
         :rtype list
         :raise ARMHTTPError:
         """
         try:
-            environments = self.db_proxy.getEnvironments(constraint_id)
+            environments = self.db_proxy.getEnvironments(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -31,6 +32,8 @@ class EnvironmentDAO(CairisDAO):
         if simplify:
             for key, value in environments.items():
                 environments[key] = self.simplify(value)
+        if selection is not None:
+            return selection.result(environments)
         return environments
 
     def get_environment_names(self):
@@ -54,16 +57,12 @@ class EnvironmentDAO(CairisDAO):
         :rtype: Environment
         :raise ObjectNotFoundHTTPError:
         """
-        found_environment = None
         try:
-            environments = self.db_proxy.getEnvironments()
+            found_environment = self.db_proxy.dimensionObjectByName(name, 'environment')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        if environments is not None:
-            found_environment = environments.get(name)
-
         if found_environment is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided environment name')
@@ -78,21 +77,12 @@ class EnvironmentDAO(CairisDAO):
         :rtype: Environment
         :raise ObjectNotFoundHTTPError:
         """
-        found_environment = None
         try:
-            environments = self.db_proxy.getEnvironments()
+            found_environment = self.db_proxy.dimensionObjectById(env_id, 'environment')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        if environments is not None:
-            found_environment = None
-            idx = 0
-            while found_environment is None and idx < len(environments):
-                if environments.values()[idx].theId == env_id:
-                    found_environment = environments.values()[idx]
-                idx += 1
-
         if found_environment is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided environment name')
@@ -155,6 +145,7 @@ class EnvironmentDAO(CairisDAO):
             if new_environment is not None:
                 return new_environment.theId
         except ObjectNotFoundHTTPError:
+            self.reopen()
             self.logger.warning('The new environment was not found in the database')
             self.logger.warning('Environment name: %s', environment.theName)
             return -1
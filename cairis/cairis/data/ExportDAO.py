@@ -0,0 +1,53 @@
+import zlib
+
+import ARM
+from CairisHTTPError import ARMHTTPError
+from data.CairisDAO import CairisDAO
+
+__author__ = 'Robin Quetin'
+
+
+class ExportDAO(CairisDAO):
+    def __init__(self, session_id):
+        CairisDAO.__init__(self, session_id)
+
+    def model_revision(self):
+        try:
+            return self.db_proxy.modelRevision()
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+
+    def model_delta(self, since):
+        """
+        Returns the sections changed and the objects deleted since a revision, or None if only a full export will do.
+        """
+        try:
+            return self.db_proxy.modelDelta(since)
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+
+    def model_xml_chunks(self, compress=False, sections=None, deletions=[]):
+        """
+        Generates the model XML section by section, gzip-compressing the chunks if requested.
+        The connection is returned to the pool once the generator is exhausted or closed, or by the response's
+        call_on_close hook if the generator is never started.
+        """
+        try:
+            compressor = None
+            if compress:
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            for chunk in self.db_proxy.modelToXmlChunks(sections, deletions):
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                if chunk:
+                    yield chunk
+            if compressor is not None:
+                yield compressor.flush()
+        except ARM.DatabaseProxyException as ex:
+            # The response headers have already been sent, so the stream can only be cut short
+            self.logger.error('Model export failed: ' + str(ex.value))
+            raise
+        finally:
+            self.close()
@@ -17,12 +17,12 @@ class GoalDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_goals(self, constraint_id=-1, coloured=False, simplify=True):
+    def get_goals(self, constraint_id=-1, coloured=False, simplify=True, selection=None):
         try:
             if coloured:
-                goals = self.db_proxy.getColouredGoals(constraint_id)
+                goals = self.db_proxy.getColouredGoals(constraint_id, selection)
             else:
-                goals = self.db_proxy.getGoals(constraint_id)
+                goals = self.db_proxy.getGoals(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -31,14 +31,24 @@ class GoalDAO(CairisDAO):
             for key, value in goals.items():
                 goals[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(goals)
         return goals
 
     def get_goal_by_name(self, name, coloured=False, simplify=True):
         found_goal = None
-        goals = self.get_goals(coloured=coloured, simplify=False)
-
-        if goals is not None:
-            found_goal = goals.get(name)
+        try:
+            if coloured:
+                goal_id = self.db_proxy.getDimensionId(name, 'goal')
+                goals = self.db_proxy.getColouredGoals(goal_id)
+                if goals is not None and len(goals) > 0:
+                    found_goal = goals.values()[0]
+            else:
+                found_goal = self.db_proxy.dimensionObjectByName(name, 'goal')
+        except ARM.DatabaseProxyException as ex:
+            if str(ex.value).find('No identifier associated with') == -1:
+                self.close()
+                raise ARMHTTPError(ex)
 
         if found_goal is None:
             self.close()
@@ -1,5 +1,13 @@
+import httplib
+from os import close as fd_close
+from os import fdopen
+from os import remove as remove_file
+from tempfile import mkstemp
+
 import ARM
-from CairisHTTPError import ARMHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError, SilentHTTPError
+import ModelSnapshot
+from CairisHTTPError import ARMHTTPError, CairisHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError, \
+    SilentHTTPError
 from data.CairisDAO import CairisDAO
 from tools.JsonConverter import json_deserialize
 from tools.PseudoClasses import ProjectSettings, Contributor, Revision
@@ -53,6 +61,56 @@ class ProjectDAO(CairisDAO):
         except ARM.ARMException as ex:
             raise ARMHTTPError(ex)
 
+    def take_snapshot(self):
+        """
+        Writes a snapshot of the project to a temporary file, which the caller is responsible for removing.
+        :rtype : str
+        """
+        fd, abs_path = mkstemp(suffix='.snapshot')
+        fd_close(fd)
+        try:
+            ModelSnapshot.takeSnapshot(abs_path, self.db_proxy)
+        except ARM.DatabaseProxyException as ex:
+            remove_file(abs_path)
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            remove_file(abs_path)
+            raise ARMHTTPError(ex)
+        return abs_path
+
+    def restore_snapshot(self, stream, size_limit, chunk_size=65536):
+        """
+        Spools a snapshot streamed as the request body to a temporary file, then replaces the project with it.
+        :rtype : str
+        """
+        fd, abs_path = mkstemp(suffix='.snapshot')
+        fs_temp = fdopen(fd, 'wb')
+        written = 0
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > size_limit:
+                    raise CairisHTTPError(
+                        status_code=httplib.REQUEST_ENTITY_TOO_LARGE,
+                        message='The snapshot exceeds the size limit of ' + str(size_limit) + ' bytes',
+                        status='Snapshot too large'
+                    )
+                fs_temp.write(chunk)
+            fs_temp.close()
+            if written == 0:
+                raise MissingParameterHTTPError(param_names=['body'])
+            return ModelSnapshot.restoreSnapshot(abs_path, self.db_proxy, session_id=self.session_id)
+        except ARM.DatabaseProxyException as ex:
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            raise ARMHTTPError(ex)
+        finally:
+            fs_temp.close()
+            remove_file(abs_path)
+
     def from_json(self, request):
         json = request.get_json(silent=True)
         if json is False or json is None:
@@ -14,9 +14,11 @@ class RequirementDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_requirements(self, constraint_id='', is_asset=True, ordered=False):
+    def get_requirements(self, constraint_id='', is_asset=True, ordered=False, selection=None):
         try:
-            if ordered:
+            if selection is not None:
+                requirements = self.db_proxy.getRequirements(constraint_id, is_asset, selection)
+            elif ordered:
                 requirements = self.db_proxy.getOrderedRequirements(constraint_id, is_asset)
             else:
                 requirements = self.db_proxy.getRequirements(constraint_id, is_asset)
@@ -24,6 +26,8 @@ class RequirementDAO(CairisDAO):
             self.close()
             raise ARMHTTPError(ex)
 
+        if selection is not None:
+            return selection.result(requirements)
         return requirements
 
     def get_requirement_by_id(self, req_id):
@@ -19,12 +19,13 @@ class ResponseDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_responses(self, constraint_id=-1, simplify=True):
+    def get_responses(self, constraint_id=-1, simplify=True, selection=None):
         """
-        :rtype : dict[str, Response]
+        :type selection: ObjectSelection
+        :rtype : dict[str, Response]|list[Response]
         """
         try:
-            responses = self.db_proxy.getResponses(constraintId=constraint_id)
+            responses = self.db_proxy.getResponses(constraintId=constraint_id, selection=selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -36,6 +37,8 @@ class ResponseDAO(CairisDAO):
             for key in responses:
                 responses[key] = self.simplify(responses[key])
 
+        if selection is not None:
+            return selection.result(responses)
         return responses
 
     def get_response_by_name(self, response_name, simplify=True):
@@ -45,13 +48,22 @@ class ResponseDAO(CairisDAO):
             ObjectNotFoundHTTPError:
             ARMHTTPError:
         """
-        responses = self.get_responses(simplify=simplify)
-        found_response = responses.get(response_name, None)
+        try:
+            found_response = self.db_proxy.dimensionObjectByName(response_name, 'response')
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if not found_response:
             self.close()
             raise ObjectNotFoundHTTPError(obj='The provided response name')
 
+        if simplify:
+            found_response = self.simplify(found_response)
+
         return found_response
 
     def delete_response(self, response_name):
@@ -126,7 +138,7 @@ class ResponseDAO(CairisDAO):
             self.get_response_by_name(risk_name)
             return True
         except ObjectNotFoundHTTPError:
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
 
     def from_json(self, request):
@@ -1,16 +1,18 @@
 import ARM
-from CairisHTTPError import ARMHTTPError, ObjectNotFoundHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError, \
+import httplib
+from CairisHTTPError import CairisHTTPError, ARMHTTPError, ObjectNotFoundHTTPError, MalformedJSONHTTPError, MissingParameterHTTPError, \
     OverwriteNotAllowedHTTPError, SilentHTTPError
 from MisuseCase import MisuseCase
 from MisuseCaseEnvironmentProperties import MisuseCaseEnvironmentProperties
 from RiskParameters import RiskParameters
 from data.AssetDAO import AssetDAO
 from data.CairisDAO import CairisDAO
+from Borg import Borg
 from Risk import Risk
 from alternative.EnvironmentModel import EnvironmentModel
 from tools.JsonConverter import json_deserialize
 from tools.ModelDefinitions import RiskModel, MisuseCaseModel, MisuseCaseEnvironmentPropertiesModel
-from tools.PseudoClasses import RiskScore, RiskRating
+from tools.PseudoClasses import RiskScore, RiskScoreDelta, RiskRating
 from tools.SessionValidator import check_required_keys, get_fonts
 
 __author__ = 'Robin Quetin'
@@ -20,14 +22,18 @@ class RiskDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_risks(self, constraint_id=-1, simplify=True, skip_misuse=False):
+    def get_risks(self, constraint_id=-1, simplify=True, skip_misuse=False, selection=None):
         """
         :type constraint_id: int
         :type simplify: bool
-        :rtype: dict[str,Risk]
+        :type selection: ObjectSelection
+        :rtype: dict[str,Risk]|list[Risk]
         """
         try:
-            risks = self.db_proxy.getRisks(constraintId=constraint_id)
+            risks = self.db_proxy.getRisks(constraintId=constraint_id, selection=selection)
+            summaries = {}
+            if not skip_misuse and (selection is None or selection.loads('theMisuseCase')):
+                summaries = self.db_proxy.riskMisuseCaseSummaries(constraintId=constraint_id)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -38,10 +44,13 @@ class RiskDAO(CairisDAO):
         if isinstance(risks, dict):
             for key, value in risks.items():
                 if value.theMisuseCase and not skip_misuse:
-                    risks[key].theMisuseCase = self.get_misuse_case_by_risk_name(value.theName, simplify=False)
+                    env_summaries = summaries.get(value.theId, {})
+                    risks[key].theMisuseCase = self.expand_mc_props(value.theMisuseCase, env_summaries)
                 if simplify:
                     risks[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(risks)
         return risks
 
     def get_risk_names(self):
@@ -53,13 +62,27 @@ class RiskDAO(CairisDAO):
         """
         :rtype : Risk
         """
-        risks = self.get_risks(simplify=simplify, skip_misuse=skip_misuse)
-        found_risk = risks.get(name, None)
+        try:
+            found_risk = self.db_proxy.dimensionObjectByName(name, 'risk')
+            if found_risk is not None and found_risk.theMisuseCase and not skip_misuse:
+                summaries = self.db_proxy.riskMisuseCaseSummaries(constraintId=found_risk.theId)
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if found_risk is None:
             self.close()
             raise ObjectNotFoundHTTPError(obj='The provided risk name')
 
+        if found_risk.theMisuseCase and not skip_misuse:
+            env_summaries = summaries.get(found_risk.theId, {})
+            found_risk.theMisuseCase = self.expand_mc_props(found_risk.theMisuseCase, env_summaries)
+        if simplify:
+            found_risk = self.simplify(found_risk)
+
         return found_risk
 
     def get_risk_analysis_model(self, environment_name, dim_name, obj_name):
@@ -141,21 +164,35 @@ class RiskDAO(CairisDAO):
 
     def check_existing_risk(self, risk_name):
         try:
-            self.get_risk_by_name(risk_name)
-            return True
-        except ObjectNotFoundHTTPError:
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.db_proxy.nameCheck(risk_name, 'risk')
             return False
+        except ARM.ARMException as ex:
+            if str(ex.value).find('already exists') > -1:
+                return True
+            self.close()
+            raise ARMHTTPError(ex)
 
     # region Misuse cases
-    def get_misuse_cases(self, constraint_id=-1, simplify=True):
+    def get_misuse_cases(self, constraint_id=-1, simplify=True, selection=None):
         """
         :type constraint_id: int
         :type simplify: bool
-        :rtype: dict[str,MisuseCase]
+        :type selection: ObjectSelection
+        :rtype: dict[str,MisuseCase]|list[MisuseCase]
         """
+        if str(constraint_id) == '-1' and selection is None:
+            risks = self.get_risks(simplify=False)
+            misuse_cases = {}
+            for risk in risks.values():
+                misuse_case = risk.theMisuseCase
+                if misuse_case:
+                    if simplify:
+                        misuse_case = self.simplify(misuse_case)
+                    misuse_cases[misuse_case.theName] = misuse_case
+            return misuse_cases
+
         try:
-            misuse_cases = self.db_proxy.getMisuseCases(constraintId=constraint_id)
+            misuse_cases = self.db_proxy.getMisuseCases(constraintId=constraint_id, selection=selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -163,11 +200,16 @@ class RiskDAO(CairisDAO):
             self.close()
             raise ARMHTTPError(ex)
 
+        if misuse_cases is None:
+            misuse_cases = {}
+
         for key in misuse_cases:
             misuse_case = self.expand_mc_props(misuse_cases[key])
             if simplify:
                 misuse_cases[key] = self.simplify(misuse_case)
 
+        if selection is not None:
+            return selection.result(misuse_cases)
         return misuse_cases
 
     def get_misuse_case_by_risk_name(self, risk_name, simplify=True):
@@ -239,7 +281,15 @@ class RiskDAO(CairisDAO):
             vulnerable_assets = dao.get_vulnerable_assets(vulnerability_name, environment_name)
         except ObjectNotFoundHTTPError as ex:
             SilentHTTPError(ex.message)
+        finally:
+            dao.close()
+
+        return self.get_misuse_case_objective(threatened_assets, vulnerable_assets)
 
+    def get_misuse_case_objective(self, threatened_assets, vulnerable_assets):
+        """
+        :rtype : str, list[str]
+        """
         objectiveText = 'Exploit vulnerabilities in '
         for idx,vulAsset in enumerate(vulnerable_assets):
             objectiveText += vulAsset
@@ -281,7 +331,26 @@ class RiskDAO(CairisDAO):
 
         return severity_name
 
-    def expand_mc_props(self, misuse_case):
+    def expand_mc_props(self, misuse_case, env_summaries=None):
+        """
+        :param env_summaries: Pre-loaded (likelihood, severity, rating, threatened assets, vulnerable assets, attackers)
+                              tuples per environment name, as returned by riskMisuseCaseSummaries
+        """
+        if env_summaries is not None:
+            threat_name = misuse_case.theThreatName
+            vuln_name = misuse_case.theVulnerabilityName
+            for env_prop in misuse_case.theEnvironmentProperties:
+                assert isinstance(env_prop, MisuseCaseEnvironmentProperties)
+                env_name = env_prop.theEnvironmentName
+                likelihood, severity, rating, threatened_assets, vulnerable_assets, attackers = \
+                    env_summaries.get(env_name, ('N/A', 'N/A', None, [], [], []))
+                env_prop.theObjective, env_prop.theAssets = self.get_misuse_case_objective(threatened_assets, vulnerable_assets)
+                env_prop.theLikelihood = likelihood
+                env_prop.theSeverity = severity
+                env_prop.theRiskRating = RiskRating(threat_name, vuln_name, env_name, rating)
+                env_prop.theAttackers = attackers
+            return misuse_case
+
         # Fetch threat and vulnerability name
         try:
             threat_name, vuln_name = self.db_proxy.misuseCaseRiskComponents(misuse_case.theName)
@@ -329,6 +398,93 @@ class RiskDAO(CairisDAO):
             self.close()
             raise ARMHTTPError(ex)
 
+    def get_scoring_engine(self, environment_name=''):
+        """
+        Loads the risk score inputs of an environment, or of every environment if none is given, into a RiskScoringEngine
+        :rtype: RiskScoringEngine
+        """
+        # The engine needs numpy, which only the scoring and simulation endpoints depend on
+        try:
+            from RiskScoringEngine import RiskScoringEngine
+        except ImportError as ex:
+            self.close()
+            raise CairisHTTPError(
+                status_code=httplib.NOT_IMPLEMENTED,
+                message='Risk scoring is unavailable: ' + str(ex),
+                status='Missing dependency'
+            )
+        try:
+            components = self.db_proxy.riskScoreComponents(environment_name)
+            return RiskScoringEngine(components)
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+
+    def get_scores_by_environment(self, environment_name=''):
+        """
+        Scores every risk under every response in one vectorised pass
+        :rtype: dict[str,dict[str,list[RiskScore]]]
+        """
+        engine = self.get_scoring_engine(environment_name)
+        env_scores = {}
+        for env_name, risk_scores in engine.scoreMap().items():
+            env_scores[env_name] = {}
+            for risk_name, response_scores in risk_scores.items():
+                env_scores[env_name][risk_name] = [RiskScore(response_name, pre_score, post_score, '') for response_name, pre_score, post_score in response_scores]
+        return env_scores
+
+    def simulate_scores(self, environment_name, scenarios):
+        """
+        Evaluates what-if scenarios against an in-memory copy of the risk model; nothing is written to the database
+        :type scenarios: list[list[dict]]
+        :return: The score deltas of every risk and response affected by each scenario
+        :rtype: list[list[RiskScoreDelta]]
+        """
+        engine = self.get_scoring_engine(environment_name)
+        from RiskSimulator import RiskSimulation
+        try:
+            mitigations = self.db_proxy.responseMitigationComponents(environment_name)
+            assets = self.db_proxy.riskAssetComponents(environment_name)
+            effectiveness = self.db_proxy.getDimensions('target_effectiveness')
+            simulation = RiskSimulation(engine, mitigations, assets, effectiveness)
+            b = Borg()
+            results = simulation.simulate(scenarios, pool=getattr(b, 'simulationPool', None), workers=getattr(b, 'simulationWorkers', 1))
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+        except ARM.ARMException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
+
+        return [[RiskScoreDelta(*delta) for delta in deltas] for deltas in results]
+
+    def simulation_from_json(self, request):
+        """
+        :return: The environment name, or '' for all environments, and the scenarios to simulate
+        :rtype: str, list[list[dict]]
+        """
+        json_dict = CairisDAO.from_json(self, request)
+        if not isinstance(json_dict, dict):
+            self.close()
+            raise MalformedJSONHTTPError(data=request.get_data())
+
+        if 'scenarios' in json_dict:
+            scenarios = json_dict['scenarios']
+        elif 'changes' in json_dict:
+            scenarios = [json_dict['changes']]
+        else:
+            self.close()
+            raise MissingParameterHTTPError(param_names=['scenarios'])
+
+        if not isinstance(scenarios, list) or not all(isinstance(changes, list) for changes in scenarios):
+            self.close()
+            raise MalformedJSONHTTPError(data=request.get_data())
+
+        return json_dict.get('environment', ''), scenarios
+
     def convert_scores(self, real_scores=None, fake_scores=None):
         new_scores = []
         if real_scores:
@@ -420,6 +576,9 @@ class RiskDAO(CairisDAO):
         elif isinstance(obj, MisuseCase):
             misuse_case = obj
 
+        if misuse_case is None:
+            return obj
+
         misuse_case.theEnvironmentDictionary = {}
         delattr(misuse_case, 'theEnvironmentDictionary')
 
@@ -15,21 +15,27 @@ class RoleDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_roles(self, constraint_id=-1, simplify=True):
-        roles = self.db_proxy.getRoles(constraint_id)
+    def get_roles(self, constraint_id=-1, simplify=True, selection=None):
+        try:
+            roles = self.db_proxy.getRoles(constraint_id, selection)
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if simplify:
             for key in roles:
                 roles[key] = self.simplify(roles[key])
 
+        if selection is not None:
+            return selection.result(roles)
         return roles
 
     def get_role_by_name(self, name, simplify=True):
-        found_role = None
-        roles = self.db_proxy.getRoles()
-
-        if roles is not None:
-            found_role = roles.get(name)
+        try:
+            found_role = self.db_proxy.dimensionObjectByName(name, 'role')
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if found_role is None:
             self.close()
@@ -41,14 +47,11 @@ class RoleDAO(CairisDAO):
         return found_role
 
     def get_role_by_id(self, role_id, simplify=True):
-        found_role = None
-        roles = self.db_proxy.getRoles()
-        idx = 0
-
-        while found_role is None and idx < len(roles):
-            if roles.values()[idx].theId == role_id:
-                found_role = roles.values()[idx]
-            idx += 1
+        try:
+            found_role = self.db_proxy.dimensionObjectById(role_id, 'role')
+        except ARM.DatabaseProxyException as ex:
+            self.close()
+            raise ARMHTTPError(ex)
 
         if found_role is None:
             self.close()
@@ -42,9 +42,9 @@ class ThreatDAO(CairisDAO):
         for key, value in self.prop_dict.items():
             self.rev_prop_dict[value] = key
 
-    def get_threats(self, constraint_id=-1, simplify=True):
+    def get_threats(self, constraint_id=-1, simplify=True, selection=None):
         try:
-            threats = self.db_proxy.getThreats(constraint_id)
+            threats = self.db_proxy.getThreats(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -53,22 +53,17 @@ class ThreatDAO(CairisDAO):
             for key, value in threats.items():
                 threats[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(threats)
         return threats
 
     def get_threat_by_id(self, threat_id, simplify=True):
-        found_threat = None
         try:
-            threats = self.db_proxy.getThreats()
+            found_threat = self.db_proxy.dimensionObjectById(threat_id, 'threat')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        idx = 0
-        while found_threat is None and idx < len(threats):
-            if threats.values()[idx].theId == threat_id:
-                found_threat = threats.values()[idx]
-            idx += 1
-
         if found_threat is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided threat ID')
@@ -79,16 +74,12 @@ class ThreatDAO(CairisDAO):
         return found_threat
     
     def get_threat_by_name(self, name, simplify=True):
-        found_threat = None
         try:
-            threats = self.db_proxy.getThreats()
+            found_threat = self.db_proxy.dimensionObjectByName(name, 'threat')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        if threats is not None:
-            found_threat = threats.get(name)
-
         if found_threat is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided threat name')
@@ -276,7 +267,7 @@ class ThreatDAO(CairisDAO):
             self.get_threat_type_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
     
     def from_json(self, request):
@@ -18,9 +18,9 @@ class VulnerabilityDAO(CairisDAO):
     def __init__(self, session_id):
         CairisDAO.__init__(self, session_id)
 
-    def get_vulnerabilities(self, constraint_id=-1, simplify=True):
+    def get_vulnerabilities(self, constraint_id=-1, simplify=True, selection=None):
         try:
-            vulnerabilities = self.db_proxy.getVulnerabilities(constraint_id)
+            vulnerabilities = self.db_proxy.getVulnerabilities(constraint_id, selection)
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
@@ -29,22 +29,17 @@ class VulnerabilityDAO(CairisDAO):
             for key, value in vulnerabilities.items():
                 vulnerabilities[key] = self.simplify(value)
 
+        if selection is not None:
+            return selection.result(vulnerabilities)
         return vulnerabilities
 
     def get_vulnerability_by_id(self, vuln_id, simplify=True):
-        found_vulnerability = None
         try:
-            vulnerabilities = self.db_proxy.getVulnerabilities()
+            found_vulnerability = self.db_proxy.dimensionObjectById(vuln_id, 'vulnerability')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        idx = 0
-        while found_vulnerability is None and idx < len(vulnerabilities):
-            if vulnerabilities.values()[idx].theId == vuln_id:
-                found_vulnerability = vulnerabilities.values()[idx]
-            idx += 1
-
         if found_vulnerability is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided vulnerability ID')
@@ -55,16 +50,12 @@ class VulnerabilityDAO(CairisDAO):
         return found_vulnerability
     
     def get_vulnerability_by_name(self, name, simplify=True):
-        found_vulnerability = None
         try:
-            vulnerabilities = self.db_proxy.getVulnerabilities()
+            found_vulnerability = self.db_proxy.dimensionObjectByName(name, 'vulnerability')
         except ARM.DatabaseProxyException as ex:
             self.close()
             raise ARMHTTPError(ex)
 
-        if vulnerabilities is not None:
-            found_vulnerability = vulnerabilities.get(name)
-
         if found_vulnerability is None:
             self.close()
             raise ObjectNotFoundHTTPError('The provided vulnerability name')
@@ -254,8 +245,7 @@ class VulnerabilityDAO(CairisDAO):
             self.get_vulnerability_type_by_name(name, environment_name)
             return True
         except ObjectNotFoundHTTPError:
-            # Needs to reconnect after Error was raised
-            self.db_proxy.reconnect(session_id=self.session_id)
+            self.reopen()
             return False
     # endregion
     
@@ -196,6 +196,8 @@ DROP TABLE IF EXISTS task_task;
 DROP TABLE IF EXISTS task_asset;
 DROP TABLE IF EXISTS usecase_asset;
 DROP TABLE IF EXISTS task_vulnerability;
+DROP TABLE IF EXISTS scored_risk;
+DROP TABLE IF EXISTS risk_score;
 DROP TABLE IF EXISTS misusecase_risk;
 DROP TABLE IF EXISTS environment_task;
 DROP TABLE IF EXISTS environment_misusecase;
@@ -349,7 +351,30 @@ DROP TABLE IF EXISTS security_property_value;
 DROP TABLE IF EXISTS securityusability_property_value;
 DROP TABLE IF EXISTS countermeasure_value;
 DROP TABLE IF EXISTS threat_value;
-
+DROP TABLE IF EXISTS sql_checksum;
+DROP TABLE IF EXISTS model_change;
+DROP TABLE IF EXISTS model_revision;
+
+CREATE TABLE sql_checksum(
+  file_name VARCHAR(50) NOT NULL,
+  checksum CHAR(32) NOT NULL,
+  PRIMARY KEY(file_name)
+) ENGINE=INNODB;
+CREATE TABLE model_change(
+  change_id INT NOT NULL AUTO_INCREMENT,
+  revision INT NOT NULL,
+  dimension_name VARCHAR(50) NOT NULL,
+  object_id INT,
+  object_name VARCHAR(255),
+  change_type VARCHAR(10) NOT NULL,
+  PRIMARY KEY(change_id),
+  KEY(revision)
+) ENGINE=INNODB;
+CREATE TABLE model_revision(
+  id INT NOT NULL,
+  revision INT NOT NULL,
+  PRIMARY KEY(id)
+) ENGINE=INNODB;
 CREATE TABLE trace_dimension(
   id INT NOT NULL,
   name VARCHAR(50) NOT NULL,
@@ -1101,6 +1126,20 @@ CREATE TABLE risk (
   FOREIGN KEY(threat_id) REFERENCES threat(id),
   FOREIGN KEY(vulnerability_id) REFERENCES vulnerability(id)
 ) ENGINE=INNODB;
+CREATE TABLE risk_score (
+  environment_id INT NOT NULL,
+  risk_id INT NOT NULL,
+  response_name VARCHAR(200) NOT NULL,
+  pre_score INT NOT NULL,
+  post_score INT NOT NULL,
+  details VARCHAR(1000) DEFAULT '',
+  PRIMARY KEY(environment_id,risk_id,response_name)
+) ENGINE=INNODB;
+CREATE TABLE scored_risk (
+  environment_id INT NOT NULL,
+  risk_id INT NOT NULL,
+  PRIMARY KEY(environment_id,risk_id)
+) ENGINE=INNODB;
 CREATE TABLE misusecase_risk (
   misusecase_id INT NOT NULL,
   risk_id INT NOT NULL,
@@ -79,9 +79,21 @@ drop procedure if exists attacker_capability;
 drop procedure if exists attacker_motivation;
 drop procedure if exists getAttackers;
 drop procedure if exists getAssets;
+drop procedure if exists getAssetTagsBulk;
+drop procedure if exists getAssetInterfacesBulk;
+drop procedure if exists getAssetEnvironmentsBulk;
+drop procedure if exists getAssetPropertiesBulk;
+drop procedure if exists getAssetAssociationsBulk;
+drop procedure if exists compositeEnvironmentIdList;
 drop procedure if exists getThreats;
 drop procedure if exists getVulnerabilities;
 drop procedure if exists getRisks;
+drop procedure if exists getRiskMisuseCasesBulk;
+drop procedure if exists getRiskTagsBulk;
+drop procedure if exists getRiskEnvironmentRatingsBulk;
+drop procedure if exists getRiskAssetsBulk;
+drop procedure if exists getRiskAttackersBulk;
+drop procedure if exists compositeEnvironmentMembers;
 drop function if exists threat_likelihood;
 drop function if exists vulnerability_severity;
 drop procedure if exists threat_asset;
@@ -299,6 +311,12 @@ drop procedure if exists goalCountermeasures;
 drop procedure if exists threatAssetProperties;
 drop procedure if exists mitigatingValues;
 drop procedure if exists riskScore;
+drop procedure if exists environmentRiskScores;
+drop procedure if exists environmentNodeAttributes;
+drop procedure if exists invalidateRiskScores;
+drop procedure if exists riskScoreComponents;
+drop procedure if exists responseMitigationComponents;
+drop procedure if exists riskAssetComponents;
 drop procedure if exists calculateRiskScore;
 drop procedure if exists getRequirements;
 drop procedure if exists getRequirement;
@@ -306,6 +324,7 @@ drop procedure if exists allowableTraces;
 drop procedure if exists traceDimensions;
 drop procedure if exists lastId;
 drop procedure if exists newId;
+drop procedure if exists reserveIds;
 drop procedure if exists newId2;
 drop procedure if exists addRequirement;
 drop procedure if exists updateRequirement;
@@ -1022,7 +1041,7 @@ begin
   declare propertiesCursor cursor for select environment_id from composite_environment where composite_environment_id = environmentId;  
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_assetproperties;
+  drop temporary table if exists temp_assetproperties;
   create temporary table temp_assetproperties (cProperty int,iProperty int,avProperty int, acProperty int, anProperty int, panProperty int, unlProperty int, unoProperty int, c_rat varchar(4000), i_rat varchar(4000), av_rat varchar(4000), ac_rat varchar(4000), an_rat varchar(4000), pan_rat varchar(4000), unl_rat varchar(4000), uno_rat varchar(4000));
 
   select count(environment_id) into compositeCount from composite_environment where composite_environment_id = environmentId limit 1;
@@ -1305,7 +1324,7 @@ begin
   declare propertiesCursor cursor for select environment_id from composite_environment where composite_environment_id = environmentId;  
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_threatproperties;
+  drop temporary table if exists temp_threatproperties;
   create temporary table temp_threatproperties (cProperty int,iProperty int,avProperty int, acProperty int, anProperty int, panProperty int, unlProperty int, unoProperty int, c_rat varchar(4000), i_rat varchar(4000), av_rat varchar(4000), ac_rat varchar(4000), an_rat varchar(4000), pan_rat varchar(4000), unl_rat varchar(4000), uno_rat varchar(4000));
 
   select count(environment_id) into compositeCount from composite_environment where composite_environment_id = environmentId limit 1;
@@ -1587,7 +1606,7 @@ begin
   declare propertiesCursor cursor for select environment_id from composite_environment where composite_environment_id = environmentId;  
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_countermeasureproperties;
+  drop temporary table if exists temp_countermeasureproperties;
   create temporary table temp_countermeasureproperties (c_property int,i_property int,av_property int, ac_property int, an_property int, pan_property int, unl_property int, uno_property int, c_rat varchar(4000), i_rat varchar(4000), av_rat varchar(4000), ac_rat varchar(4000), an_rat varchar(4000), pan_rat varchar(4000), unl_rat varchar(4000), uno_rat varchar(4000));
 
   select count(environment_id) into compositeCount from composite_environment where composite_environment_id = environmentId limit 1;
@@ -2119,6 +2138,42 @@ begin
 end
 //
 
+create procedure getAssetTagsBulk(in constraintId int)
+begin
+  select at.asset_id,t.name from asset_tag at, tag t where (constraintId = -1 or at.asset_id = constraintId) and at.tag_id = t.id;
+end
+//
+
+create procedure getAssetInterfacesBulk(in constraintId int)
+begin
+  select ai.asset_id,i.name,ai.required_id,ar.name,pr.name from asset_interface ai, interface i, access_right ar, privilege pr where (constraintId = -1 or ai.asset_id = constraintId) and ai.interface_id = i.id and ai.access_right_id = ar.id and ai.privilege_id = pr.id;
+end
+//
+
+create procedure getAssetEnvironmentsBulk(in constraintId int)
+begin
+  select ea.asset_id,ea.environment_id,e.name from environment_asset ea, environment e where (constraintId = -1 or ea.asset_id = constraintId) and ea.environment_id = e.id;
+end
+//
+
+create procedure getAssetPropertiesBulk(in constraintId int)
+begin
+  select ap.asset_id,ap.environment_id,ap.property_id,ap.property_value_id,ap.property_rationale from asset_property ap where (constraintId = -1 or ap.asset_id = constraintId);
+end
+//
+
+create procedure getAssetAssociationsBulk(in constraintId int)
+begin
+  select a.head_id,a.environment_id,a.head_navigation,hat.name,hm.name,a.head_role_name,a.tail_role_name,tm.name,tat.name,a.tail_navigation,ta.name from classassociation a, multiplicity_type hm, association_type hat, association_type tat, multiplicity_type tm, asset ta where (constraintId = -1 or a.head_id = constraintId) and a.head_multiplicity_id = hm.id and a.head_association_type_id = hat.id and a.tail_association_type_id = tat.id and a.tail_multiplicity_id = tm.id and a.tail_id = ta.id;
+end
+//
+
+create procedure compositeEnvironmentIdList()
+begin
+  select distinct composite_environment_id from composite_environment;
+end
+//
+
 create procedure getThreats(in constraintId int)
 begin
   if constraintId = -1
@@ -2152,6 +2207,44 @@ begin
 end
 //
 
+create procedure getRiskMisuseCasesBulk(in constraintId int)
+begin
+  select mr.risk_id,mc.id,mc.name,e.id,e.name,mn.narrative from misusecase_risk mr join misusecase mc on mr.misusecase_id = mc.id left join environment_misusecase em on em.misusecase_id = mc.id left join environment e on em.environment_id = e.id left join misusecase_narrative mn on mn.misusecase_id = mc.id and mn.environment_id = e.id where (constraintId = -1 or mr.risk_id = constraintId);
+end
+//
+
+create procedure getRiskTagsBulk(in constraintId int)
+begin
+  select rt.risk_id,t.name from risk_tag rt, tag t where (constraintId = -1 or rt.risk_id = constraintId) and rt.tag_id = t.id;
+end
+//
+
+create procedure getRiskEnvironmentRatingsBulk(in constraintId int)
+begin
+  select r.id,t.name,v.name,e.id,e.name,threat_likelihood(r.threat_id,e.id),vulnerability_severity(r.vulnerability_id,e.id),(select rc.name from threat_likelihood tl, vulnerability_severity vs, score s, risk_class rc where tl.threat_id = r.threat_id and tl.environment_id = e.id and vs.vulnerability_id = r.vulnerability_id and vs.environment_id = e.id and tl.likelihood_id = s.likelihood_id and vs.severity_id = s.severity_id and s.class_id = rc.id limit 1) from risk r, threat t, vulnerability v, misusecase_risk mr, environment_misusecase em, environment e where (constraintId = -1 or r.id = constraintId) and r.threat_id = t.id and r.vulnerability_id = v.id and mr.risk_id = r.id and em.misusecase_id = mr.misusecase_id and em.environment_id = e.id;
+end
+//
+
+create procedure getRiskAssetsBulk(in constraintId int)
+begin
+  select r.id,at.environment_id,a.name,0 from risk r, asset_threat at, asset a where (constraintId = -1 or r.id = constraintId) and at.threat_id = r.threat_id and at.asset_id = a.id
+  union all
+  select r.id,av.environment_id,a.name,1 from risk r, asset_vulnerability av, asset a where (constraintId = -1 or r.id = constraintId) and av.vulnerability_id = r.vulnerability_id and av.asset_id = a.id;
+end
+//
+
+create procedure getRiskAttackersBulk(in constraintId int)
+begin
+  select r.id,ta.environment_id,a.name from risk r, threat_attacker ta, attacker a where (constraintId = -1 or r.id = constraintId) and ta.threat_id = r.threat_id and ta.attacker_id = a.id;
+end
+//
+
+create procedure compositeEnvironmentMembers()
+begin
+  select composite_environment_id,environment_id from composite_environment;
+end
+//
+
 create function threat_likelihood(threatId int,environmentId int) 
 returns varchar(200)
 deterministic 
@@ -4188,7 +4281,7 @@ begin
   declare goalCursor cursor for select distinct goal_id from goalgoal_goalassociation where subgoal_id = reqGoalId and ref_type_id in (0,1);
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_risk;
+  drop temporary table if exists temp_risk;
   create temporary table temp_risk (name VARCHAR(50) NOT NULL);
 
 /*  select distinct requirement_id into reqId from requirement_countermeasure where countermeasure_id = cmId; */
@@ -4703,19 +4796,19 @@ end
 
 create procedure reportDependents(in dimId int, in dimName text)
 begin
-  drop table if exists temp_asset;
-  drop table if exists temp_domainproperty;
-  drop table if exists temp_threat;
-  drop table if exists temp_vulnerability;
-  drop table if exists temp_risk;
-  drop table if exists temp_response;
-  drop table if exists temp_requirement;
-  drop table if exists temp_countermeasure;
-  drop table if exists temp_goal;
-  drop table if exists temp_obstacle;
-  drop table if exists temp_task;
-  drop table if exists temp_usecase;
-  drop table if exists temp_persona;
+  drop temporary table if exists temp_asset;
+  drop temporary table if exists temp_domainproperty;
+  drop temporary table if exists temp_threat;
+  drop temporary table if exists temp_vulnerability;
+  drop temporary table if exists temp_risk;
+  drop temporary table if exists temp_response;
+  drop temporary table if exists temp_requirement;
+  drop temporary table if exists temp_countermeasure;
+  drop temporary table if exists temp_goal;
+  drop temporary table if exists temp_obstacle;
+  drop temporary table if exists temp_task;
+  drop temporary table if exists temp_usecase;
+  drop temporary table if exists temp_persona;
   create temporary table temp_asset (id INT NOT NULL,name VARCHAR(200) NOT NULL);
   create temporary table temp_domainproperty (id INT NOT NULL,name VARCHAR(200) NOT NULL);
   create temporary table temp_threat (id INT NOT NULL,name VARCHAR(200) NOT NULL);
@@ -6552,7 +6645,7 @@ begin
   select o.id into reqId from requirement o where o.name = viewLabel and o.version = (select max(i.version) from requirement i where i.id = o.id);
 
   select id into envId from environment where name = envName;
-  drop table if exists temp_target;
+  drop temporary table if exists temp_target;
   create temporary table temp_target (target_name VARCHAR(200) NOT NULL,response_name VARCHAR(200) NOT NULL);
 
   set done = 0;
@@ -7160,7 +7253,7 @@ begin
 
   if dropTableFlag = 1
   then
-    drop table if exists temp_countermeasure;
+    drop temporary table if exists temp_countermeasure;
     create temporary table temp_countermeasure (response_id int not null, countermeasure_id int not null);
   end if;
 
@@ -7237,7 +7330,7 @@ begin
   declare tacCursor cursor for select distinct asset_id from asset_threat where threat_id = threatId and environment_id in (select environment_id from composite_environment where composite_environment_id = envId);
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_threatassetproperties;
+  drop temporary table if exists temp_threatassetproperties;
   create temporary table temp_threatassetproperties (c_property int,i_property int,av_property int, ac_property int, an_property int, pan_property int, unl_property int, uno_property int);
 
   select count(*) into compositeCount from composite_environment where composite_environment_id = envId; 
@@ -7323,7 +7416,7 @@ begin
   declare cmCursor cursor for select distinct countermeasure_id from temp_countermeasure where response_id = responseId;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_mitigatingvalues;
+  drop temporary table if exists temp_mitigatingvalues;
   create temporary table temp_mitigatingvalues (likelihood int, severity int,cProperty int,iProperty int,avProperty int, acProperty int, anProperty int, panProperty int, unlProperty int, unoProperty int, ms_comments varchar(1000),ml_comments varchar(1000));
 
   select count(*) into compositeCount from composite_environment where composite_environment_id = envId; 
@@ -7390,6 +7483,8 @@ begin
   declare preScore int;
   declare postScore int;
   declare detailsBuf varchar(1000);
+  declare isMaterialised int default 0;
+  declare isScored int default 0;
   declare responseCursor cursor for select distinct id,name from response where risk_id = riskId;
   declare continue handler for not found set done = 1;
 
@@ -7406,28 +7501,48 @@ begin
   select vulnerability_severity(vulId,envId) into severityName;
   select id into threatLikelihood from likelihood where name = likelihoodName;
   select id into vulSeverity from severity where name = severityName;
-  drop table if exists temp_riskscore;
+  drop temporary table if exists temp_riskscore;
   create temporary table temp_riskscore (response_name varchar(50),preScore int, postScore int, details varchar(1000));
 
   if riskName != ''
   then
     select id into riskId from risk where name = riskName;
-    open responseCursor;
-    response_loop: loop
-      fetch responseCursor into responseId,responseName;
-      if done = 1
+    if envId is not null
+    then
+      select count(*) into isMaterialised from risk where id = riskId and threat_id = threatId and vulnerability_id = vulId;
+    end if;
+    if isMaterialised > 0
+    then
+      select count(*) into isScored from scored_risk where environment_id = envId and risk_id = riskId;
+    end if;
+
+    if isScored > 0
+    then
+      insert into temp_riskscore select response_name,pre_score,post_score,details from risk_score where environment_id = envId and risk_id = riskId;
+    else
+      open responseCursor;
+      response_loop: loop
+        fetch responseCursor into responseId,responseName;
+        if done = 1
+        then
+          leave response_loop;
+        end if;
+        call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,responseId,preScore,postScore,detailsBuf); 
+        insert into temp_riskscore values(responseName,ifnull(preScore,0),ifnull(postScore,0),ifnull(detailsBuf,''));
+        set responseNo = responseNo + 1;
+      end loop response_loop;
+      close responseCursor;
+      if responseNo = 0
       then
-        leave response_loop;
+        call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,-1,preScore,postScore,detailsBuf); 
+        insert into temp_riskscore values('None',ifnull(preScore,0),ifnull(postScore,0),ifnull(detailsBuf,''));
+      end if;
+      if isMaterialised > 0
+      then
+        delete from risk_score where environment_id = envId and risk_id = riskId;
+        insert into risk_score select envId,riskId,trs.response_name,trs.preScore,trs.postScore,trs.details from temp_riskscore trs;
+        insert ignore into scored_risk values(envId,riskId);
       end if;
-      call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,responseId,preScore,postScore,detailsBuf); 
-      insert into temp_riskscore values(responseName,ifnull(preScore,0),ifnull(postScore,0),ifnull(detailsBuf,''));
-      set responseNo = responseNo + 1;
-    end loop response_loop;
-    close responseCursor;
-    if responseNo = 0
-    then
-      call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,-1,preScore,postScore,detailsBuf); 
-      insert into temp_riskscore values('None',ifnull(preScore,0),ifnull(postScore,0),ifnull(detailsBuf,''));
     end if;
   else
     call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,-1,preScore,postScore,detailsBuf); 
@@ -7437,6 +7552,339 @@ begin
 end
 //
 
+create procedure environmentRiskScores(in envName text)
+begin
+  declare done int default 0;
+  declare envId int;
+  declare riskId int;
+  declare riskName varchar(200);
+  declare threatId int;
+  declare vulId int;
+  declare responseId int;
+  declare responseName varchar(50);
+  declare threatLikelihood int;
+  declare vulSeverity int;
+  declare preScore int;
+  declare postScore int;
+  declare detailsBuf varchar(1000);
+  declare riskCursor cursor for select r.id,r.name,r.threat_id,r.vulnerability_id,re.id,re.name from temp_environmentrisks er, risk r left join response re on re.risk_id = r.id where er.risk_id = r.id and er.stale = 1 order by r.id;
+  declare continue handler for not found set done = 1;
+
+  set envId = (select id from environment where name = envName);
+  drop temporary table if exists temp_environmentrisks;
+  create temporary table temp_environmentrisks (risk_id int, stale int);
+  insert into temp_environmentrisks select r.id,(select count(*) from scored_risk sr where sr.environment_id = envId and sr.risk_id = r.id) = 0 from risk r where r.threat_id in (select tl.threat_id from threat_likelihood tl where tl.environment_id = envId or tl.environment_id in (select environment_id from composite_environment where composite_environment_id = envId)) and r.vulnerability_id in (select vs.vulnerability_id from vulnerability_severity vs where vs.environment_id = envId or vs.environment_id in (select environment_id from composite_environment where composite_environment_id = envId));
+  delete from risk_score where environment_id = envId and risk_id in (select risk_id from temp_environmentrisks where stale = 1);
+
+  open riskCursor;
+  risk_loop: loop
+    fetch riskCursor into riskId,riskName,threatId,vulId,responseId,responseName;
+    if done = 1
+    then
+      leave risk_loop;
+    end if;
+    set threatLikelihood = (select id from likelihood where name = threat_likelihood(threatId,envId));
+    set vulSeverity = (select id from severity where name = vulnerability_severity(vulId,envId));
+    if responseId is null
+    then
+      set responseId = -1;
+      set responseName = 'None';
+    end if;
+    call calculateRiskScore(threatId,vulId,threatLikelihood,vulSeverity,envId,responseId,preScore,postScore,detailsBuf); 
+    insert into risk_score values(envId,riskId,responseName,ifnull(preScore,0),ifnull(postScore,0),ifnull(detailsBuf,''));
+    set done = 0;
+  end loop risk_loop;
+  close riskCursor;
+  insert ignore into scored_risk select envId,risk_id from temp_environmentrisks where stale = 1;
+  select r.name,rs.response_name,rs.pre_score,rs.post_score,rs.details from temp_environmentrisks er, risk r, risk_score rs where er.risk_id = r.id and rs.environment_id = envId and rs.risk_id = r.id order by r.id;
+end
+//
+
+create procedure environmentNodeAttributes(in envName text, in withAssets int, in withPersonas int, in withTasks int, in withObstacles int)
+begin
+  declare done int default 0;
+  declare envId int;
+  declare obsId int;
+  declare obsName varchar(100);
+  declare obsProb float default 0.0;
+  declare obsCursor cursor for select o.id,o.name from obstacle o, environment_obstacle eo where eo.environment_id = envId and eo.obstacle_id = o.id;
+  declare continue handler for not found set done = 1;
+
+  set envId = (select id from environment where name = envName);
+  drop temporary table if exists temp_nodeattributes;
+  create temporary table temp_nodeattributes (dimension_name varchar(50), object_name varchar(255), attribute_value float);
+
+  if withAssets = 1
+  then
+    insert into temp_nodeattributes select 'asset',a.name,a.is_critical from asset a, environment_asset ea where ea.environment_id = envId and ea.asset_id = a.id;
+  end if;
+  if withPersonas = 1
+  then
+    insert into temp_nodeattributes select 'persona',p.name,p.assumption_id from persona p, environment_persona ep where ep.environment_id = envId and ep.persona_id = p.id;
+  end if;
+  if withTasks = 1
+  then
+    insert into temp_nodeattributes select 'task',t.name,t.assumption_id from task t, environment_task et where et.environment_id = envId and et.task_id = t.id;
+    insert into temp_nodeattributes select 'usability',t.name,task_usability(t.name,envName) from task t, environment_task et where et.environment_id = envId and et.task_id = t.id;
+  end if;
+  if withObstacles = 1
+  then
+    set done = 0;
+    open obsCursor;
+    obs_loop: loop
+      fetch obsCursor into obsId,obsName;
+      if done = 1
+      then
+        leave obs_loop;
+      end if;
+      set obsProb = 0.0;
+      call obstacleProbability(obsId,envId,obsProb);
+      insert into temp_nodeattributes values('obstacle',obsName,obsProb);
+    end loop obs_loop;
+    close obsCursor;
+  end if;
+  select dimension_name,object_name,attribute_value from temp_nodeattributes;
+end
+//
+
+create procedure invalidateRiskScores(in dimName text, in objtId int)
+begin
+  if dimName in ('risk','threat','vulnerability','response','countermeasure')
+  then
+    drop temporary table if exists temp_staleriskscores;
+    create temporary table temp_staleriskscores (risk_id int);
+    if dimName = 'risk'
+    then
+      insert into temp_staleriskscores values(objtId);
+    elseif dimName = 'threat'
+    then
+      insert into temp_staleriskscores select id from risk where threat_id = objtId;
+    elseif dimName = 'vulnerability'
+    then
+      insert into temp_staleriskscores select id from risk where vulnerability_id = objtId;
+    elseif dimName = 'response'
+    then
+      insert into temp_staleriskscores select risk_id from response where id = objtId;
+    else
+      insert into temp_staleriskscores select re.risk_id from response re where re.id in (select response_id from countermeasure_threat_response_target where countermeasure_id = objtId union select response_id from countermeasure_vulnerability_response_target where countermeasure_id = objtId);
+    end if;
+    delete from scored_risk where risk_id in (select risk_id from temp_staleriskscores);
+    delete from risk_score where risk_id in (select risk_id from temp_staleriskscores);
+  else
+    delete from scored_risk;
+    delete from risk_score;
+  end if;
+end
+//
+
+create procedure riskScoreComponents(in envName text)
+begin
+  declare done int default 0;
+  declare envId int;
+  declare environmentName varchar(200);
+  declare riskName varchar(200);
+  declare threatId int;
+  declare vulId int;
+  declare responseId int;
+  declare responseName varchar(50);
+  declare threatLikelihood int;
+  declare vulSeverity int;
+  declare mitLikelihood int;
+  declare mitSeverity int;
+  declare mitCValue int;
+  declare mitIValue int;
+  declare mitAvValue int;
+  declare mitAcValue int;
+  declare mitAnValue int;
+  declare mitPanValue int;
+  declare mitUnlValue int;
+  declare mitUnoValue int;
+  declare msComments varchar(1000);
+  declare mlComments varchar(1000);
+  declare threatCProperty int;
+  declare threatIProperty int;
+  declare threatAvProperty int;
+  declare threatAcProperty int;
+  declare threatAnProperty int;
+  declare threatPanProperty int;
+  declare threatUnlProperty int;
+  declare threatUnoProperty int;
+  declare assetCProperty int;
+  declare assetIProperty int;
+  declare assetAvProperty int;
+  declare assetAcProperty int;
+  declare assetAnProperty int;
+  declare assetPanProperty int;
+  declare assetUnlProperty int;
+  declare assetUnoProperty int;
+  declare threatCritical int;
+  declare vulCritical int;
+  declare lastEnvId int default -1;
+  declare lastThreatId int default -1;
+  declare lastVulId int default -1;
+  declare componentCursor cursor for select e.id,e.name,r.name,r.threat_id,r.vulnerability_id,re.id,re.name from environment e, risk r left join response re on re.risk_id = r.id where (envName = '' or e.name = envName) and r.threat_id in (select tl.threat_id from threat_likelihood tl where tl.environment_id = e.id or tl.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) and r.vulnerability_id in (select vs.vulnerability_id from vulnerability_severity vs where vs.environment_id = e.id or vs.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) order by e.id,r.id;
+  declare continue handler for not found set done = 1;
+
+  drop temporary table if exists temp_riskscorecomponents;
+  create temporary table temp_riskscorecomponents (environment_name varchar(200), risk_name varchar(200), response_name varchar(50), threat_likelihood int, vulnerability_severity int, mitigating_likelihood int, mitigating_severity int, mitigating_c int, mitigating_i int, mitigating_av int, mitigating_ac int, mitigating_an int, mitigating_pan int, mitigating_unl int, mitigating_uno int, threat_c int, threat_i int, threat_av int, threat_ac int, threat_an int, threat_pan int, threat_unl int, threat_uno int, asset_c int, asset_i int, asset_av int, asset_ac int, asset_an int, asset_pan int, asset_unl int, asset_uno int, threat_critical int, vulnerability_critical int);
+
+  open componentCursor;
+  component_loop: loop
+    fetch componentCursor into envId,environmentName,riskName,threatId,vulId,responseId,responseName;
+    if done = 1
+    then
+      leave component_loop;
+    end if;
+    if (envId != lastEnvId or threatId != lastThreatId or vulId != lastVulId)
+    then
+      set threatLikelihood = (select id from likelihood where name = threat_likelihood(threatId,envId));
+      set vulSeverity = (select id from severity where name = vulnerability_severity(vulId,envId));
+
+      call suppressedThreatProperties(threatId,envId);
+      select cProperty,iProperty,avProperty,acProperty,anProperty,panProperty,unlProperty,unoProperty into threatCProperty,threatIProperty,threatAvProperty,threatAcProperty,threatAnProperty,threatPanProperty,threatUnlProperty,threatUnoProperty from temp_threatproperties;
+      call threatAssetProperties(threatId,envId);
+      select c_property,i_property,av_property,ac_property,an_property,pan_property,unl_property,uno_property into assetCProperty,assetIProperty,assetAvProperty,assetAcProperty,assetAnProperty,assetPanProperty,assetUnlProperty,assetUnoProperty from temp_threatassetproperties;
+
+      set threatCritical = (select count(*) from asset a, environment_asset ea, environment_threat et where ea.environment_id = envId and ea.asset_id = a.id and ea.environment_id = et.environment_id and et.threat_id = threatId and a.is_critical = 1);
+      set vulCritical = (select count(*) from asset a, environment_asset ea, environment_vulnerability ev where ea.environment_id = envId and ea.asset_id = a.id and ea.environment_id = ev.environment_id and ev.vulnerability_id = vulId and a.is_critical = 1);
+      set lastEnvId = envId;
+      set lastThreatId = threatId;
+      set lastVulId = vulId;
+    end if;
+
+    set mitLikelihood = 0;
+    set mitSeverity = 0;
+    set mitCValue = 0;
+    set mitIValue = 0;
+    set mitAvValue = 0;
+    set mitAcValue = 0;
+    set mitAnValue = 0;
+    set mitPanValue = 0;
+    set mitUnlValue = 0;
+    set mitUnoValue = 0;
+    if responseId is null
+    then
+      set responseName = 'None';
+    else
+      call mitigatingValues(responseId,envId);
+      select * into mitLikelihood,mitSeverity,mitCValue,mitIValue,mitAvValue,mitAcValue,mitAnValue,mitPanValue,mitUnlValue,mitUnoValue,msComments,mlComments from temp_mitigatingvalues;
+    end if;
+
+    insert into temp_riskscorecomponents values(environmentName,riskName,responseName,threatLikelihood,vulSeverity,ifnull(mitLikelihood,0),ifnull(mitSeverity,0),ifnull(mitCValue,0),ifnull(mitIValue,0),ifnull(mitAvValue,0),ifnull(mitAcValue,0),ifnull(mitAnValue,0),ifnull(mitPanValue,0),ifnull(mitUnlValue,0),ifnull(mitUnoValue,0),threatCProperty,threatIProperty,threatAvProperty,threatAcProperty,threatAnProperty,threatPanProperty,threatUnlProperty,threatUnoProperty,assetCProperty,assetIProperty,assetAvProperty,assetAcProperty,assetAnProperty,assetPanProperty,assetUnlProperty,assetUnoProperty,threatCritical,vulCritical);
+    set done = 0;
+  end loop component_loop;
+  close componentCursor;
+  select * from temp_riskscorecomponents;
+end
+//
+
+
+create procedure responseMitigationComponents(in envName text)
+begin
+  declare done int default 0;
+  declare envId int;
+  declare environmentName varchar(200);
+  declare responseId int;
+  declare responseName varchar(50);
+  declare compositeCount int;
+  declare cmId int;
+  declare cmName varchar(200);
+  declare mlhood int;
+  declare msev int;
+  declare mlComments text default '';
+  declare msComments text default '';
+  declare cmCProperty int;
+  declare cmIProperty int;
+  declare cmAvProperty int;
+  declare cmAcProperty int;
+  declare cmAnProperty int;
+  declare cmPanProperty int;
+  declare cmUnlProperty int;
+  declare cmUnoProperty int;
+  declare responseCursor cursor for select distinct e.id,e.name,re.id,re.name from environment e, risk r, response re where re.risk_id = r.id and (envName = '' or e.name = envName) and r.threat_id in (select tl.threat_id from threat_likelihood tl where tl.environment_id = e.id or tl.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) and r.vulnerability_id in (select vs.vulnerability_id from vulnerability_severity vs where vs.environment_id = e.id or vs.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) order by e.id,re.id;
+  declare cmCursor cursor for select distinct tc.countermeasure_id,c.name from temp_countermeasure tc, countermeasure c where tc.response_id = responseId and tc.countermeasure_id = c.id;
+  declare continue handler for not found set done = 1;
+
+  drop temporary table if exists temp_responsemitigationcomponents;
+  create temporary table temp_responsemitigationcomponents (environment_name varchar(200), response_name varchar(50), countermeasure_name varchar(200), likelihood int, severity int, c_property int, i_property int, av_property int, ac_property int, an_property int, pan_property int, unl_property int, uno_property int);
+
+  open responseCursor;
+  response_loop: loop
+    fetch responseCursor into envId,environmentName,responseId,responseName;
+    if done = 1
+    then
+      leave response_loop;
+    end if;
+
+    select count(*) into compositeCount from composite_environment where composite_environment_id = envId;
+    if (compositeCount > 0)
+    then
+      call mitigatingMultiEnvCountermeasures(responseId,envId);
+    else
+      call mitigatingCountermeasures(responseId,envId,1);
+    end if;
+    set done = 0;
+
+    open cmCursor;
+    cm_loop: loop
+      fetch cmCursor into cmId,cmName;
+      if done = 1
+      then
+        leave cm_loop;
+      end if;
+      call mitigatingLikelihood(cmId,responseId,envId,mlhood,mlComments);
+      call mitigatingSeverity(cmId,responseId,envId,msev,msComments);
+      call suppressedCountermeasureProperties(cmId,envId);
+      select c_property,i_property,av_property,ac_property,an_property,pan_property,unl_property,uno_property into cmCProperty,cmIProperty,cmAvProperty,cmAcProperty,cmAnProperty,cmPanProperty,cmUnlProperty,cmUnoProperty from temp_countermeasureproperties;
+      insert into temp_responsemitigationcomponents values(environmentName,responseName,cmName,ifnull(mlhood,0),ifnull(msev,0),ifnull(cmCProperty,0),ifnull(cmIProperty,0),ifnull(cmAvProperty,0),ifnull(cmAcProperty,0),ifnull(cmAnProperty,0),ifnull(cmPanProperty,0),ifnull(cmUnlProperty,0),ifnull(cmUnoProperty,0));
+      set done = 0;
+    end loop cm_loop;
+    close cmCursor;
+    set done = 0;
+  end loop response_loop;
+  close responseCursor;
+  select * from temp_responsemitigationcomponents;
+end
+//
+
+create procedure riskAssetComponents(in envName text)
+begin
+  declare done int default 0;
+  declare envId int;
+  declare environmentName varchar(200);
+  declare riskName varchar(200);
+  declare assetId int;
+  declare assetName varchar(200);
+  declare assetCProperty int;
+  declare assetIProperty int;
+  declare assetAvProperty int;
+  declare assetAcProperty int;
+  declare assetAnProperty int;
+  declare assetPanProperty int;
+  declare assetUnlProperty int;
+  declare assetUnoProperty int;
+  declare assetCursor cursor for select distinct e.id,e.name,r.name,a.id,a.name from environment e, risk r, asset_threat at, asset a where (envName = '' or e.name = envName) and r.threat_id = at.threat_id and at.asset_id = a.id and (at.environment_id = e.id or at.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) and r.threat_id in (select tl.threat_id from threat_likelihood tl where tl.environment_id = e.id or tl.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) and r.vulnerability_id in (select vs.vulnerability_id from vulnerability_severity vs where vs.environment_id = e.id or vs.environment_id in (select environment_id from composite_environment where composite_environment_id = e.id)) order by e.id,r.id,a.id;
+  declare continue handler for not found set done = 1;
+
+  drop temporary table if exists temp_riskassetcomponents;
+  create temporary table temp_riskassetcomponents (environment_name varchar(200), risk_name varchar(200), asset_name varchar(200), c_property int, i_property int, av_property int, ac_property int, an_property int, pan_property int, unl_property int, uno_property int);
+
+  open assetCursor;
+  asset_loop: loop
+    fetch assetCursor into envId,environmentName,riskName,assetId,assetName;
+    if done = 1
+    then
+      leave asset_loop;
+    end if;
+    call suppressedAssetProperties(assetId,envId);
+    select cProperty,iProperty,avProperty,acProperty,anProperty,panProperty,unlProperty,unoProperty into assetCProperty,assetIProperty,assetAvProperty,assetAcProperty,assetAnProperty,assetPanProperty,assetUnlProperty,assetUnoProperty from temp_assetproperties;
+    insert into temp_riskassetcomponents values(environmentName,riskName,assetName,assetCProperty,assetIProperty,assetAvProperty,assetAcProperty,assetAnProperty,assetPanProperty,assetUnlProperty,assetUnoProperty);
+    set done = 0;
+  end loop asset_loop;
+  close assetCursor;
+  select * from temp_riskassetcomponents;
+end
+//
 
 create procedure calculateRiskScore(in threatId int, in vulId int, in threatLikelihood int, in vulSeverity int, in envId int, in responseId int, out preScore int, out postScore int, out detailsBuf varchar(1000))
 begin
@@ -7733,23 +8181,27 @@ end
 
 create procedure newId()
 begin
-  declare lastId int;
-  select id into lastId from attributes;
-  set lastId = lastId + 1;
-  update attributes set id = lastId where name = 'did';
-  commit;
-  select lastId;
+  update attributes set id = last_insert_id(id + 1) where name = 'did';
+  select last_insert_id();
+end
+//
+
+create procedure reserveIds(in idCount int)
+begin
+  update attributes set id = last_insert_id(id + idCount) where name = 'did';
+  select last_insert_id() - idCount + 1;
 end
 //
 
 create procedure newId2(out newId int)
 begin
-  declare lastId int;
-  select id into lastId from attributes;
-  set lastId = lastId + 1;
-  update attributes set id = lastId where name = 'did';
-  commit;
-  set newId = lastId;
+  if (@reservedNextId is not null and @reservedNextId <= @reservedLastId) then
+    set newId = @reservedNextId;
+    set @reservedNextId = @reservedNextId + 1;
+  else
+    update attributes set id = last_insert_id(id + 1) where name = 'did';
+    set newId = last_insert_id();
+  end if;
 end
 //
 
@@ -9378,7 +9830,7 @@ begin
   declare gCursor cursor for select goal_id from goalgoal_goalassociation where subgoal_id = goalId and environment_id = environmentId union select goal_id from goalrequirement_goalassociation where subgoal_id = goalId and environment_id = environmentId;
   declare continue handler for not found set done = 1;
   
-  drop table if exists temp_goaltree;
+  drop temporary table if exists temp_goaltree;
   create temporary table temp_goaltree (id int,environment varchar(50),goal_name varchar(200), goal_dim varchar(50), ref_type varchar(50), subgoal_name varchar(200), subgoal_dim varchar(50), alternative_id int, rationale varchar(1000));
 
   if caseFilter = 1
@@ -9751,7 +10203,7 @@ begin
   declare toPanValue int;
   declare toUnlValue int;
   declare toUnoValue int;
-  drop table if exists temp_dependencywarnings;
+  drop temporary table if exists temp_dependencywarnings;
   create temporary table temp_dependencywarnings (warningtxt varchar(255));
 
   select id into fromAssetId from asset where name = fromAsset;
@@ -9839,7 +10291,7 @@ begin
   declare toPanValue int;
   declare toUnlValue int;
   declare toUnoValue int;
-  drop table if exists temp_dependencywarnings;
+  drop temporary table if exists temp_dependencywarnings;
   create temporary table temp_dependencywarnings (warningtxt varchar(255));
 
   select id into toAssetId from asset where name = toAsset;
@@ -10135,10 +10587,13 @@ end
 
 create procedure newId1(out lastId int)
 begin
-  select id into lastId from attributes;
-  set lastId = lastId + 1;
-  update attributes set id = lastId where name = 'did';
-  commit;
+  if (@reservedNextId is not null and @reservedNextId <= @reservedLastId) then
+    set lastId = @reservedNextId;
+    set @reservedNextId = @reservedNextId + 1;
+  else
+    update attributes set id = last_insert_id(id + 1) where name = 'did';
+    set lastId = last_insert_id();
+  end if;
 end
 //
 
@@ -11658,7 +12113,7 @@ begin
   declare soCursor cursor for select subgoal_id from obstacleobstacle_goalassociation where goal_id = obsId and environment_id = environmentId union select subgoal_id from obstaclerequirement_goalassociation where goal_id = obsId and environment_id = environmentId;
   declare continue handler for not found set done = 1;
   
-  drop table if exists temp_obstacletree;
+  drop temporary table if exists temp_obstacletree;
   create temporary table temp_obstacletree (id int,environment varchar(50),goal_name varchar(200), goal_dim varchar(50), ref_type varchar(50), subgoal_name varchar(200), subgoal_dim varchar(50), alternative_id int, rationale varchar(1000));
 
   select id into obsId from obstacle where name = obsName;
@@ -11837,7 +12292,7 @@ begin
   declare saCursor cursor for select tail_id from classassociation where head_id = assetId and environment_id = environmentId;
   declare continue handler for not found set done = 1;
   
-  drop table if exists temp_classtree;
+  drop temporary table if exists temp_classtree;
   create temporary table temp_classtree (id int,environment varchar(50),head_name varchar(50), head_dim varchar(50), head_nav int, head_assoc varchar(50), head_mult varchar(50), head_role varchar(50), tail_role varchar(50), tail_mult varchar(50), tail_assoc varchar(50), tail_nav int, tail_dim varchar(50), tail_name varchar(50), rationale varchar(1000));
 
   select id into assetId from asset where name = assetName;
@@ -11916,7 +12371,7 @@ begin
   declare saCursor cursor for select tail_id from classassociation where head_id = assetId and environment_id = environmentId;
   declare continue handler for not found set done = 1;
   
-  drop table if exists temp_classtree;
+  drop temporary table if exists temp_classtree;
   create temporary table temp_classtree (id int,environment varchar(50),head_name varchar(50), head_dim varchar(50), head_nav int, head_assoc varchar(50), head_mult varchar(50), head_role varchar(50), tail_role varchar(50), tail_mult varchar(50), tail_assoc varchar(50), tail_nav int, tail_dim varchar(50), tail_name varchar(50), rationale varchar(1000));
 
   select id into assetId from asset where name = assetName;
@@ -12011,7 +12466,7 @@ begin
 end
 //
 
-create procedure riskAnalysisToXml(in includeHeader int)
+create procedure riskAnalysisToXml(in includeHeader int, in chunked int)
 begin
   declare tagName varchar(255);
   declare roleName varchar(255);
@@ -12120,6 +12575,12 @@ begin
   declare assocCursor cursor for select e.name, ha.name,a.head_navigation,hat.name,hm.name,a.head_role_name,a.tail_role_name,tm.name,tat.name,a.tail_navigation,ta.name from classassociation a, environment e, asset ha, multiplicity_type hm, association_type hat, association_type tat, multiplicity_type tm, asset ta where a.environment_id = e.id and a.head_id = ha.id and a.head_multiplicity_id = hm.id and a.head_association_type_id = hat.id and a.tail_association_type_id = tat.id and a.tail_multiplicity_id = tm.id and a.tail_id = ta.id;
   declare continue handler for not found set done = 1;
 
+  if chunked = 1
+  then
+    drop temporary table if exists temp_xmlchunk;
+    create temporary table temp_xmlchunk (id int not null auto_increment, xml longtext, primary key(id));
+  end if;
+
   if includeHeader = 0
   then
     set buf = '<riskanalysis>\n';
@@ -12134,6 +12595,11 @@ begin
     end if;
     set buf = concat(buf,'<role name=\"',roleName,'\" type=\"',roleType,'\" short_code=\"',roleShortCode,'\" >\n  <description>',roleDesc,'</description>\n</role>\n');
     set roleCount = roleCount + 1;
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop role_loop;
   close roleCursor;
   set done = 0;
@@ -12231,6 +12697,11 @@ begin
     set done = 0;
     set buf = concat(buf,'</asset>\n');
     set assetCount = assetCount + 1;
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop asset_loop;
   close assetCursor;
 
@@ -12285,6 +12756,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</vulnerability>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop vul_loop;
   close vulCursor;
 
@@ -12362,6 +12838,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</attacker>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop attacker_loop;
   close attackerCursor;
 
@@ -12468,6 +12949,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</threat>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop threat_loop;
   close threatCursor;
 
@@ -12507,6 +12993,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</risk>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop risk_loop;
   close riskCursor;
 
@@ -12577,6 +13068,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</response>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop response_loop;
   close responseCursor;
 
@@ -12590,12 +13086,24 @@ begin
     end if;
     set buf = concat(buf,'<asset_association environment=\"',envName,'\"  head_name=\"',headName,'\" head_nav=\"',headNav,'\" head_adornment=\"',headAdornment,'\" head_nry=\"',s2a(headNry),'\" head_role=\"',headRole,'\" tail_role=\"',tailRole,'\" tail_nry=\"',s2a(tailNry),'\" tail_adornment=\"',tailAdornment,'\" tail_nav=\"',tailNav,'\" tail_name=\"',tailName,'\" />\n');
     set rshipCount = rshipCount + 1;
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop assoc_loop;
   close assocCursor;
 
 
   set buf = concat(buf,'\n</riskanalysis>');
-  select buf,roleCount,assetCount,vulCount,attackerCount,threatCount,riskCount,responseCount,rshipCount;
+  if chunked = 1
+  then
+    insert into temp_xmlchunk(xml) values(buf);
+    select xml from temp_xmlchunk order by id;
+    drop temporary table temp_xmlchunk;
+  else
+    select buf,roleCount,assetCount,vulCount,attackerCount,threatCount,riskCount,responseCount,rshipCount;
+  end if;
 end
 //
 
@@ -12628,7 +13136,7 @@ begin
 end
 //
 
-create procedure goalsToXml(in includeHeader int)
+create procedure goalsToXml(in includeHeader int, in chunked int)
 begin
   declare dpName varchar(255);
   declare dpDesc varchar(1000);
@@ -12728,6 +13236,12 @@ begin
 
   declare continue handler for not found set done = 1;
 
+  if chunked = 1
+  then
+    drop temporary table if exists temp_xmlchunk;
+    create temporary table temp_xmlchunk (id int not null auto_increment, xml longtext, primary key(id));
+  end if;
+
   if includeHeader = 0
   then
     set buf = '<goals>\n';
@@ -12742,6 +13256,11 @@ begin
     end if;
     set buf = concat(buf,'<domainproperty name=\"',dpName,'\" type=\"',dpType,'\" originator=\"',dpOrig,'\" >\n  <definition>',dpDesc,'</definition>\n</domainproperty>\n');
     set dpCount = dpCount + 1;
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop dp_loop;
   close dpCursor;
 
@@ -12796,6 +13315,11 @@ begin
 
 
     set buf = concat(buf,'</goal>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop goal_loop;
   close goalCursor;
   set done = 0;
@@ -12837,6 +13361,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</obstacle>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop obs_loop;
   close obsCursor;
   set done = 0;
@@ -12850,6 +13379,11 @@ begin
     end if;
     set buf = concat(buf,'<requirement name=\"',reqName,'\" reference=\"',refName,'\" reference_type=\"',refType,'\" label=\"',reqLabel,'\" type=\"',replace(reqType,' ','_'),'\" priority=\"',reqPriority,'\" >\n  <description>',reqDesc,'</description>\n  <rationale>',reqRat,'</rationale>\n  <fit_criterion>',reqFc,'</fit_criterion>\n  <originator>',reqOrig,'</originator>\n</requirement>\n');
     set reqCount = reqCount + 1;
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop req_loop;
   close reqCursor;
   set done = 0;
@@ -12982,11 +13516,23 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</countermeasure>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop cm_loop;
   close cmCursor;
 
   set buf = concat(buf,'</goals>');
-  select buf,dpCount,goalCount,obsCount,reqCount,cmCount;
+  if chunked = 1
+  then
+    insert into temp_xmlchunk(xml) values(buf);
+    select xml from temp_xmlchunk order by id;
+    drop temporary table temp_xmlchunk;
+  else
+    select buf,dpCount,goalCount,obsCount,reqCount,cmCount;
+  end if;
 end
 //
 
@@ -13023,7 +13569,7 @@ end
 //
 
 
-create procedure usabilityToXml(in includeHeader int)
+create procedure usabilityToXml(in includeHeader int, in chunked int)
 begin
   declare envId int;
   declare envName varchar(50);
@@ -13265,6 +13811,12 @@ begin
   declare continue handler for not found set done = 1;
 
 
+  if chunked = 1
+  then
+    drop temporary table if exists temp_xmlchunk;
+    create temporary table temp_xmlchunk (id int not null auto_increment, xml longtext, primary key(id));
+  end if;
+
   if includeHeader = 0
   then
     set buf = '<usability>\n';
@@ -13306,6 +13858,11 @@ begin
     close personaEnvCursor;
     set done = 0;
     set buf = concat(buf,'</persona>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop persona_loop;
   close personaCursor;
 
@@ -13319,6 +13876,11 @@ begin
     end if;
     set buf = concat(buf,'<external_document name=\"',edName,'\" version=\"',edVersion,'\" date=\"',edDate,'\" authors=\"',edAuthors,'\" >\n  <description>',edDesc,'</description>\n</external_document>\n');
     set edCount = edCount + 1; 
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop ed_loop;
   close edCursor;
 
@@ -13332,6 +13894,11 @@ begin
     end if;
     set buf = concat(buf,'<document_reference name=\"',drName,'\" contributor=\"',drCont,'\" document=\"',edName,'\" >\n  <excerpt>',drExcerpt,'</excerpt>\n</document_reference>\n');
     set drCount = drCount + 1; 
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop dr_loop;
   close drCursor;
 
@@ -13345,6 +13912,11 @@ begin
     end if;
     set buf = concat(buf,'<concept_reference name=\"',drName,'\" concept=\"',gwrType,'\" object=\"',gwrConcept,'\" >\n  <description>',drExcerpt,'</description>\n</concept_reference>\n');
     set drCount = drCount + 1; 
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop cr_loop;
   close crCursor;
 
@@ -13411,6 +13983,11 @@ begin
       set done = 0;
 
     set buf = concat(buf,'</persona_characteristic>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop pc_loop;
   close pcCursor;
 
@@ -13476,6 +14053,11 @@ begin
       set done = 0;
 
     set buf = concat(buf,'</task_characteristic>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop tc_loop;
   close tcCursor;
 
@@ -13545,6 +14127,11 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</task>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop task_loop;
   close taskCursor;
 
@@ -13629,11 +14216,23 @@ begin
     set done = 0;
 
     set buf = concat(buf,'</usecase>\n');
+    if chunked = 1
+    then
+      insert into temp_xmlchunk(xml) values(buf);
+      set buf = '';
+    end if;
   end loop uc_loop;
   close ucCursor;
 
   set buf = concat(buf,'</usability>');
-  select buf,personaCount,edCount,drCount,pcCount,taskCount,ucCount;
+  if chunked = 1
+  then
+    insert into temp_xmlchunk(xml) values(buf);
+    select xml from temp_xmlchunk order by id;
+    drop temporary table temp_xmlchunk;
+  else
+    select buf,personaCount,edCount,drCount,pcCount,taskCount,ucCount;
+  end if;
 end
 //
 
@@ -14303,7 +14902,7 @@ begin
 
   declare continue handler for not found set done = 1;
   
-  drop table if exists temp_labeltree;
+  drop temporary table if exists temp_labeltree;
   create temporary table temp_labeltree (id int,label varchar(100),goal_definition varchar(1000), goal_issue varchar(1000), goal_originator varchar(100));
   select id into environmentId from environment where name = envName;
   select count(*) into compositeCount from composite_environment where composite_environment_id = environmentId;
@@ -14765,7 +15364,7 @@ end
 create procedure grepModel(in inTxt text, in psFlag int, in envFlag int, in roleFlag int, in pcFlag int, in tcFlag int, in refFlag int, in pFlag int, in taskFlag int, in ucFlag int, in dpFlag int, in goalFlag int, in obsFlag int, in reqFlag int, in assetFlag int, in vulFlag int, in attackerFlag int, in thrFlag int, in riskFlag int, in respFlag int, in cmFlag int, in dirFlag int, in codeFlag int, in memoFlag int, in idFlag int)
 begin
 
-  drop table if exists temp_searchresults;
+  drop temporary table if exists temp_searchresults;
   create temporary table temp_searchresults (environment_name varchar(100), dimension_name varchar(50), object_name varchar(200));
 
   if psFlag = 1
@@ -15566,7 +16165,7 @@ begin
   declare envCursor cursor for select name from environment;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_modelstats;
+  drop temporary table if exists temp_modelstats;
 
   set done = 0;
   open envCursor;
@@ -15655,7 +16254,7 @@ begin
   declare pCursor cursor for select id,name from persona;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_pcstats;
+  drop temporary table if exists temp_pcstats;
   create temporary table temp_pcstats (persona_name varchar(50), total int, Activities int, Attitudes int, Aptitudes int, Motivations int, Skills int, Environment_Narrative int);
 
   set done = 0;
@@ -15720,7 +16319,7 @@ begin
   declare pCursor cursor for select id,name from persona;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_prstats;
+  drop temporary table if exists temp_prstats;
   create temporary table temp_prstats (persona_name varchar(50), total int, Document int, Concept int);
   set done = 0;
   open pCursor;
@@ -16023,7 +16622,7 @@ begin
 
   select id into envId from environment where name = envName;
   
-  drop table if exists temp_tensions;
+  drop temporary table if exists temp_tensions;
   create temporary table temp_tensions (anTension varchar(5100), panTension varchar(5100), unlTension varchar(5100), unoTension varchar(5100));
 
   insert into temp_tensions(anTension,panTension,unlTension,unoTension) values( tensionValue(envId,0,4), tensionValue(envId,0,5), tensionValue(envId,0,6), tensionValue(envId,0,7));
@@ -16149,7 +16748,7 @@ begin
 
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_actordef;
+  drop temporary table if exists temp_actordef;
   create temporary table temp_actordef (actor_id int, actor_name varchar(100));
 
   drop table if exists temp_pId;
@@ -17333,7 +17932,7 @@ begin
 
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_usecase;
+  drop temporary table if exists temp_usecase;
   create temporary table temp_usecase (name varchar(200),short_code varchar(100), author varchar(255), text varchar(90000000));
 
   open ucCursor;
@@ -17461,7 +18060,7 @@ begin
 
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_redminegoal;
+  drop temporary table if exists temp_redminegoal;
   create temporary table temp_redminegoal(goal_id int, environment_id int, goal_label varchar(255),goal_name varchar(100),originator varchar(50), goal_definition varchar(1000), goal_category varchar(50), goal_priority varchar(50), goal_fitcriterion varchar(1000), goal_issue varchar(1000));
 
   select id into envId from environment where name = envName;
@@ -17553,7 +18152,7 @@ begin
   declare taskPersonaCursor cursor for select p.name,duv.name,fv.name,dev.name,gv.name from persona p, task_persona tp, security_property_value duv, security_property_value fv, security_property_value dev, security_property_value gv where tp.task_id = taskId and tp.environment_id = envId and tp.persona_id = p.id and tp.duration_id = duv.id and tp.frequency_id = fv.id and tp.demands_id = dev.id and tp.goalsupport_id = gv.id;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_task;
+  drop temporary table if exists temp_task;
   create temporary table temp_task (name varchar(200),environment varchar(50), text varchar(90000000));
 
   open taskCursor;
@@ -17904,7 +18503,7 @@ begin
   declare reqCursor cursor for select name from requirement order by 1;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_depcheck;
+  drop temporary table if exists temp_depcheck;
   create temporary table temp_depcheck (requirement_name varchar(255), has_circular_dependency int, dependency_chain varchar(900000000));
 
   open reqCursor;
@@ -18370,7 +18969,7 @@ create procedure componentViewWeaknesses(in cvName text, in envName text)
 begin
   declare cvId int;
   declare envId int;
-  drop table if exists temp_templateasset_asset;
+  drop temporary table if exists temp_templateasset_asset;
   create temporary table temp_templateasset_asset (component_name varchar(255),template_asset_name varchar(255),asset_name varchar(255),target_type varchar(50),target_name varchar(255));
 
   select id into cvId from component_view where name = cvName;
@@ -18957,7 +19556,7 @@ begin
   declare personaCursor cursor for select name from persona order by 1;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_personaImpact;
+  drop temporary table if exists temp_personaImpact;
   create temporary table temp_personaImpact (name varchar(50),impact int);
 
   open personaCursor;
@@ -18986,7 +19585,7 @@ begin
   declare taskCursor cursor for select tp.task_id from task_persona tp, persona_role pr, usecase_role ur, component_usecase cu, component_view_component cvc where tp.persona_id = personaId and tp.environment_id = environmentId and tp.persona_id = pr.persona_id and tp.environment_id = pr.environment_id and pr.role_id = ur.role_id and ur.usecase_id = cu.usecase_id and cu.component_id = cvc.component_id and cvc.component_view_id = cvId;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_impact;
+  drop temporary table if exists temp_impact;
   create temporary table temp_impact (impact int);
 
   select id into cvId from component_view where name = cvName;
@@ -19022,7 +19621,7 @@ begin
   declare taskCursor cursor for select distinct t.name,durationLabel(duv.name),frequencyLabel(fv.name),dev.name,gv.name from persona p, task_persona tp, security_property_value duv, security_property_value fv, security_property_value dev, security_property_value gv, task t, persona_role pr, usecase_role ur, component_usecase cu, component_view_component cvc where tp.task_id = t.id and tp.environment_id = envId and tp.persona_id = p.id and tp.duration_id = duv.id and tp.frequency_id = fv.id and tp.demands_id = dev.id and tp.goalsupport_id = gv.id and tp.persona_id = personaId and tp.persona_id = pr.persona_id and pr.role_id = ur.role_id and ur.usecase_id = cu.usecase_id and cu.component_id = cvc.component_id and cvc.component_view_id = cvId;
   declare continue handler for not found set done = 1;
  
-  drop table if exists temp_impactrationale;
+  drop temporary table if exists temp_impactrationale;
   create temporary table temp_impactrationale (task_name varchar(200),duration_label varchar(50), frequency_label varchar(50), demand_label varchar(50), goalconflict_label varchar(50));
 
   select id into cvId from component_view where name = cvName;
@@ -20134,7 +20733,7 @@ begin
   declare obsCursor cursor for select distinct o.id,o.name from obstacle o, obstacle_concern oc, template_goal_responsibility tgr, role gr, obstaclerole_goalassociation ga, role obr, asset a, template_goal_concern tgc, template_asset ta, template_goal tg where tg.name = goalName and tg.id = tgc.template_goal_id and tgc.template_asset_id = ta.id and ta.name = a.name and a.id = oc.asset_id and oc.environment_id = envId and oc.obstacle_id = o.id and oc.obstacle_id = ga.goal_id and oc.environment_id = ga.environment_id and ga.subgoal_id = obr.id and obr.name = gr.name and gr.id = obr.id and obr.id = tgr.role_id and tgr.template_goal_id = tg.id;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_goalobstacle;
+  drop temporary table if exists temp_goalobstacle;
   create temporary table temp_goalobstacle (goal_name varchar(255), obstacle_name varchar(100), probability float);
 
   select id into cvId from component_view where name = cvName;
@@ -20225,7 +20824,7 @@ begin
 
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_architecture;
+  drop temporary table if exists temp_architecture;
   create temporary table temp_architecture (name varchar(200),artifact_type varchar(50),text varchar(90000000));
 
   set done = 0;
@@ -20470,11 +21069,11 @@ begin
   declare rootCursor cursor for select obstacle_id from temp_rootobstacle;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_rootobstacle;
+  drop temporary table if exists temp_rootobstacle;
   create temporary table temp_rootobstacle (obstacle_id int,obstacle_name varchar(200));
 
-  drop table if exists temp_obstacletree;
-  create table temp_obstacletree (id int,environment varchar(50),goal_name varchar(200), goal_dim varchar(50), ref_type varchar(50), subgoal_name varchar(200), subgoal_dim varchar(50), alternative_id int, rationale varchar(1000));
+  drop temporary table if exists temp_obstacletree;
+  create temporary table temp_obstacletree (id int,environment varchar(50),goal_name varchar(200), goal_dim varchar(50), ref_type varchar(50), subgoal_name varchar(200), subgoal_dim varchar(50), alternative_id int, rationale varchar(1000));
 
   select id into riskId from risk where name = riskName;
   select id into envId from environment where name = envName;
@@ -20632,7 +21231,7 @@ begin
 
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_attackpattern;
+  drop temporary table if exists temp_attackpattern;
   create temporary table temp_attackpattern (name varchar(200),environment_name varchar(50), content_type varchar(50), text varchar(90000000));
 
   open apCursor;
@@ -20824,7 +21423,7 @@ begin
   declare apThrCursor cursor for select distinct t.name from component c, component_asset ca, asset a, template_asset ta, asset_threat at, threat t where ca.component_id = c.id and ca.component_id in (select component_id from component_view_component where component_view_id = apId) and ca.asset_id = ta.id and ta.name = a.name and a.id = at.asset_id and at.environment_id = envId and at.threat_id = t.id order by 1;
   declare continue handler for not found set done = 1;
 
-  drop table if exists temp_architecturesummary;
+  drop temporary table if exists temp_architecturesummary;
   create temporary table temp_architecturesummary (name varchar(200),text varchar(90000000));
 
   select id into envId from environment where name = envName limit 1;
@@ -20956,9 +21555,9 @@ begin
   declare loCursor cursor for select distinct obstacle_name from temp_leafobstacle order by 1;
   declare continue handler for not found set done = 1;
  
-  drop table if exists temp_rootobstacle;
+  drop temporary table if exists temp_rootobstacle;
   create temporary table temp_rootobstacle (obstacle_id int,obstacle_name varchar(200));
-  drop table if exists temp_leafobstacle;
+  drop temporary table if exists temp_leafobstacle;
   create temporary table temp_leafobstacle (obstacle_name varchar(200));
 
   select id into envId from environment where name = envName;
@@ -70,6 +70,55 @@ class AssetTests(CairisTests):
         self.logger.info('[%s] Assets found: %d', method, len(assets))
         self.logger.info('[%s] First asset: %s [%d]\n', method, assets.values()[0].theName, assets.values()[0].theId)
 
+    def test_get_page(self):
+        method = 'test_get_page'
+        rv = self.app.get('/api/assets?session_id=test&limit=2&sort=name')
+        self.assertEqual(rv.status_code, 200)
+        first_page = jsonpickle.decode(rv.data)
+        self.assertIsInstance(first_page, list, 'The page is not a list as expected')
+        self.assertLessEqual(len(first_page), 2, 'The page is larger than the limit')
+        total = int(rv.headers['X-Total-Count'])
+        self.assertGreater(total, 0, 'No assets counted')
+        names = [asset['theName'] for asset in first_page]
+        self.assertEqual(names, sorted(names), 'The page is not sorted by name')
+
+        next_cursor = rv.headers.get('X-Next-Cursor', None)
+        if total > 2:
+            self.assertIsNotNone(next_cursor, 'No cursor for the next page')
+            rv = self.app.get('/api/assets?session_id=test&limit=2&cursor=%s' % quote(next_cursor))
+            second_page = jsonpickle.decode(rv.data)
+            self.assertGreater(second_page[0]['theName'], names[-1], 'The next page does not follow the first')
+
+        rv = self.app.get('/api/assets?session_id=test&name_prefix=%s' % quote(self.existing_asset_name))
+        matches = jsonpickle.decode(rv.data)
+        self.assertGreater(len(matches), 0, 'No assets match the name prefix')
+        for asset in matches:
+            self.assertTrue(asset['theName'].startswith(self.existing_asset_name))
+
+        rv = self.app.get('/api/assets?session_id=test&limit=0')
+        self.assertEqual(rv.status_code, 400)
+        self.logger.info('[%s] Assets counted: %d\n', method, total)
+
+    def test_get_fields(self):
+        method = 'test_get_fields'
+        rv = self.app.get('/api/assets?session_id=test&fields=shortCode,tags')
+        assets = jsonpickle.decode(rv.data)
+        self.assertIsInstance(assets, dict, 'The result is not a dictionary as expected')
+        self.assertGreater(len(assets), 0, 'No assets in the dictionary')
+        for asset in assets.values():
+            self.assertIn('theName', asset)
+            self.assertIn('theShortCode', asset)
+            self.assertIn('theTags', asset)
+            self.assertNotIn('theEnvironmentProperties', asset)
+            self.assertNotIn('theDescription', asset)
+
+        url = '/api/assets/name/%s?session_id=test&fields=type' % quote(self.existing_asset_name)
+        asset = jsonpickle.decode(self.app.get(url).data)
+        self.assertEqual(asset['theName'], self.existing_asset_name)
+        self.assertIn('theType', asset)
+        self.assertNotIn('theInterfaces', asset)
+        self.logger.info('[%s] Asset fields: %s\n', method, ', '.join(asset.keys()))
+
     def test_post(self):
         method = 'test_post_new'
         rv = self.app.post('/api/assets', content_type='application/json', data=self.new_asset_body)
@@ -0,0 +1,97 @@
+import logging
+from StringIO import StringIO
+from gzip import GzipFile
+from urllib import quote
+
+import jsonpickle
+
+from Borg import Borg
+from ValueType import ValueType
+from tests.CairisTests import CairisTests
+
+__author__ = 'Robin Quetin'
+
+
+class CExportTests(CairisTests):
+    logger = logging.getLogger(__name__)
+
+    def test_cexport_model_get(self):
+        method = 'test_cexport_model_get'
+        url = '/api/export/model?session_id=test'
+        self.logger.info('[%s] URL: %s', method, url)
+        rv = self.app.get(url)
+        self.assertIsNotNone(rv.data, 'No response')
+        self.assertEqual(rv.mimetype, 'application/xml', 'The response is not XML')
+        self.assertTrue(rv.data.startswith('<?xml'), 'The response is not a valid XML file')
+        self.assertGreater(rv.data.find('</cairis_model>'), -1, 'The model was not completely exported')
+
+    def test_cexport_model_gzip_get(self):
+        method = 'test_cexport_model_gzip_get'
+        url = '/api/export/model?session_id=test&compress=1'
+        self.logger.info('[%s] URL: %s', method, url)
+        rv = self.app.get(url)
+        self.assertIsNotNone(rv.data, 'No response')
+        xml_text = GzipFile(fileobj=StringIO(rv.data), mode='rb').read()
+        self.assertTrue(xml_text.startswith('<?xml'), 'The response is not a valid XML file')
+        self.assertGreater(xml_text.find('</cairis_model>'), -1, 'The model was not completely exported')
+
+    def test_cexport_model_unread_get(self):
+        method = 'test_cexport_model_unread_get'
+        url = '/api/export/model?session_id=test'
+        self.logger.info('[%s] URL: %s', method, url)
+        pool = Borg().get_dbproxy_pool('test')
+        checked_out = pool.theCheckedOutCount
+        rv = self.app.get(url, buffered=False)
+        rv.close()
+        self.assertEqual(pool.theCheckedOutCount, checked_out, 'The unread export kept its connection')
+
+    def test_cexport_model_delta_get(self):
+        method = 'test_cexport_model_delta_get'
+        rv = self.app.get('/api/export/model?session_id=test')
+        revision = rv.headers.get('X-Model-Revision')
+        self.assertIsNotNone(revision, 'The export has no revision')
+        self.assertEqual(rv.headers.get('X-Model-Export'), 'full', 'The export is not a full model')
+
+        url = '/api/export/model?session_id=test&since=%s' % revision
+        self.logger.info('[%s] URL: %s', method, url)
+        rv = self.app.get(url)
+        self.assertEqual(rv.headers.get('X-Model-Export'), 'delta', 'The export is not a delta')
+        self.assertTrue(rv.data.startswith('<?xml'), 'The response is not a valid XML file')
+        self.assertEqual(rv.data.find('<riskanalysis>'), -1, 'An unchanged section was exported')
+
+        url = '/api/import/stream/type/all?session_id=test&overwrite=0'
+        rv = self.app.post(url, data=rv.data, content_type='application/xml')
+        json_dict = jsonpickle.decode(rv.data)
+        self.assertIsInstance(json_dict, dict, 'The response is not a valid JSON dictionary')
+        self.assertIsNotNone(json_dict.get('message'), 'The delta was not imported')
+
+    def test_cexport_model_delta_asset_type(self):
+        method = 'test_cexport_model_delta_asset_type'
+        rv = self.app.get('/api/export/model?session_id=test')
+        revision = int(rv.headers.get('X-Model-Revision'))
+
+        type_name = 'Test export asset type'
+        type_url = '/api/assets/types/name/%s?session_id=test' % quote(type_name)
+        new_type = ValueType(valueTypeId=-1, valueTypeName=type_name, valueTypeDescription='', vType='asset_type')
+        json_body = jsonpickle.encode({'session_id': 'test', 'object': new_type}, unpicklable=False)
+        self.app.delete(type_url)
+        self.app.post('/api/assets/types', content_type='application/json', data=json_body)
+        self.app.delete(type_url)
+
+        url = '/api/export/model?session_id=test&since=%d' % revision
+        self.logger.info('[%s] URL: %s', method, url)
+        rv = self.app.get(url)
+        self.assertGreater(int(rv.headers.get('X-Model-Revision')), revision, 'The changes did not advance the revision')
+        self.assertEqual(rv.headers.get('X-Model-Export'), 'delta', 'The export is not a delta')
+        self.assertGreater(rv.data.find('<riskanalysis>'), -1, 'The assets using asset types were not exported')
+        self.assertGreater(rv.data.find('<goals>'), -1, 'The countermeasures using asset types were not exported')
+        self.assertEqual(rv.data.find('<usability>'), -1, 'An unchanged section was exported')
+        deletion = '<deletion dimension="asset_type" name="%s" />' % type_name
+        self.assertGreater(rv.data.find(deletion), -1, 'The asset type deletion was not exported')
+
+    def test_cexport_section_chunks(self):
+        db_proxy = Borg().get_dbproxy('test')
+        for proc_name, section_tag in [('riskAnalysisToXml', 'riskanalysis'), ('usabilityToXml', 'usability'), ('goalsToXml', 'goals')]:
+            chunks = list(db_proxy.sectionXmlChunks(proc_name, section_tag))
+            self.assertGreater(len(chunks), 1, 'The %s section was not split into objects' % section_tag)
+            self.assertEqual(''.join(chunks), getattr(db_proxy, proc_name)(0)[0], 'The %s chunks differ from the whole section' % section_tag)
@@ -1,9 +1,12 @@
 import logging
 from urllib import quote
 from StringIO import StringIO
+from gzip import GzipFile
+from time import sleep
 
 import jsonpickle
 
+from MySQLDatabaseProxy import ID_BLOCK_SIZE
 from tests.CairisTests import CairisTests
 
 __author__ = 'Robin Quetin'
@@ -61,4 +64,164 @@ class CImportTests(CairisTests):
         message = json_dict.get('message')
         self.assertIsNotNone(message, 'Response does not contain a message')
         self.logger.info('[%s] Message: %s', method, message)
-        self.assertGreater(message.find('Imported'), -1, 'Nothing imported')
\ No newline at end of file
+        self.assertGreater(message.find('Imported'), -1, 'Nothing imported')
+
+    def test_cimport_job_post(self):
+        method = 'test_cimport_job_post'
+        url = '/api/import/jobs/text'
+        fs_xmlfile = open(self.xmlfile, 'rb')
+        file_contents = fs_xmlfile.read()
+        self.logger.info('[%s] URL: %s', method, url)
+
+        json_dict = {
+            'session_id': 'test',
+            'object': {
+                'urlenc_file_contents': quote(file_contents),
+                'type': 'all'
+            }
+        }
+        rv = self.app.post(url, data=jsonpickle.encode(json_dict), content_type='application/json')
+        self.assertEqual(rv.status_code, 202, 'The import job was not accepted')
+        job = jsonpickle.decode(rv.data)
+        self.assertIsInstance(job, dict, 'The response is not a valid JSON dictionary')
+        job_id = job.get('id')
+        self.assertIsNotNone(job_id, 'Response does not contain a job ID')
+
+        job = self.wait_for_job(job_id)
+        self.logger.info('[%s] Job: %s', method, job)
+        self.assertEqual(job['status'], 'completed', 'The import job did not complete')
+        self.assertGreater(job['message'].find('Imported'), -1, 'Nothing imported')
+        self.assertGreater(job['written'].get('asset', 0), 0, 'No assets were written')
+
+        rv = self.app.get('/api/import/jobs/unknown?session_id=test')
+        self.assertEqual(rv.status_code, 404, 'An unknown job was found')
+
+    def test_cimport_job_cancel(self):
+        method = 'test_cimport_job_cancel'
+        assets_before = jsonpickle.decode(self.app.get('/api/assets?session_id=test').data)
+        job_id = self.submit_job(overwrite=0)
+        status_url = '/api/import/jobs/%s?session_id=test' % job_id
+        for attempt in range(6000):
+            job = jsonpickle.decode(self.app.get(status_url).data)
+            if job['status'] != 'queued' and job['phase'] not in ['', 'parsing']:
+                break
+            sleep(0.01)
+        self.assertEqual(job['status'], 'running', 'The import job finished before it could be cancelled while writing')
+        rv = self.app.delete('/api/import/jobs/%s?session_id=test' % job_id)
+        self.assertEqual(rv.status_code, 200, 'The import job could not be cancelled')
+        job = self.wait_for_job(job_id)
+        self.logger.info('[%s] Job: %s', method, job)
+        self.assertEqual(job['status'], 'cancelled', 'The import job was not cancelled')
+        assets_after = jsonpickle.decode(self.app.get('/api/assets?session_id=test').data)
+        self.assertEqual(sorted(assets_before.keys()), sorted(assets_after.keys()), 'The cancelled import changed the model')
+
+    def test_cimport_job_cancel_after_clearing(self):
+        method = 'test_cimport_job_cancel_after_clearing'
+        job_id = self.submit_job(overwrite=1)
+        status_url = '/api/import/jobs/%s?session_id=test' % job_id
+        for attempt in range(600):
+            job = jsonpickle.decode(self.app.get(status_url).data)
+            if job['status'] != 'queued' and job['phase'] not in ['', 'clearing']:
+                break
+            sleep(0.1)
+        if job['status'] == 'running':
+            rv = self.app.delete('/api/import/jobs/%s?session_id=test' % job_id)
+            self.assertEqual(rv.status_code, 409, 'An import was cancelled after clearing the model')
+        job = self.wait_for_job(job_id)
+        self.logger.info('[%s] Job: %s', method, job)
+        self.assertEqual(job['status'], 'completed', 'The import job did not complete after clearing the model')
+        self.assertGreater(job['written'].get('asset', 0), 0, 'No assets were written')
+
+    def submit_job(self, overwrite):
+        fs_xmlfile = open(self.xmlfile, 'rb')
+        file_contents = fs_xmlfile.read()
+        fs_xmlfile.close()
+        json_dict = {
+            'session_id': 'test',
+            'object': {
+                'urlenc_file_contents': quote(file_contents),
+                'type': 'all',
+                'overwrite': overwrite
+            }
+        }
+        rv = self.app.post('/api/import/jobs/text', data=jsonpickle.encode(json_dict), content_type='application/json')
+        self.assertEqual(rv.status_code, 202, 'The import job was not accepted')
+        return jsonpickle.decode(rv.data)['id']
+
+    def wait_for_job(self, job_id):
+        status_url = '/api/import/jobs/%s?session_id=test' % job_id
+        for attempt in range(600):
+            job = jsonpickle.decode(self.app.get(status_url).data)
+            if job['status'] not in ['queued', 'running']:
+                break
+            sleep(1)
+        return job
+
+    def test_cimport_stream_post(self):
+        method = 'test_cimport_stream_post'
+        url = '/api/import/stream/type/all?session_id=test'
+        fs_xmlfile = open(self.xmlfile, 'rb')
+        file_contents = fs_xmlfile.read()
+        self.logger.info('[%s] URL: %s', method, url)
+
+        gzip_buf = StringIO()
+        gzip_file = GzipFile(fileobj=gzip_buf, mode='wb')
+        gzip_file.write(file_contents)
+        gzip_file.close()
+        rv = self.app.post(url, data=gzip_buf.getvalue(), content_type='application/gzip')
+        self.assertIsNotNone(rv.data, 'No response')
+        json_dict = jsonpickle.decode(rv.data)
+        self.assertIsInstance(json_dict, dict, 'The response is not a valid JSON dictionary')
+        message = json_dict.get('message')
+        self.assertIsNotNone(message, 'Response does not contain a message')
+        self.logger.info('[%s] Message: %s', method, message)
+        self.assertGreater(message.find('Imported'), -1, 'Nothing imported')
+
+    def test_cimport_tagged_assets_post(self):
+        method = 'test_cimport_tagged_assets_post'
+        asset_count = ID_BLOCK_SIZE + 100
+        asset_xml = []
+        for idx in range(asset_count):
+            asset_xml.append(
+                '<asset name="Bulk asset %d" short_code="BA%d" type="Information" is_critical="0">'
+                '<description>Bulk asset</description><tag name="Bulk tag"/><tag name="Bulk tag %d"/>'
+                '<significance>None</significance></asset>' % (idx, idx, idx)
+            )
+        file_contents = '<?xml version="1.0"?>\n' \
+            '<!DOCTYPE riskanalysis PUBLIC "-//CAIRIS//DTD RISKANALYSIS 1.0//EN" ' \
+            '"http://www.cs.ox.ac.uk/cairis/dtd/riskanalysis.dtd">\n' \
+            '<riskanalysis>%s</riskanalysis>' % ''.join(asset_xml)
+        json_dict = {
+            'session_id': 'test',
+            'object': {
+                'urlenc_file_contents': quote(file_contents),
+                'type': 'riskanalysis'
+            }
+        }
+        try:
+            rv = self.app.post('/api/import/text', data=jsonpickle.encode(json_dict), content_type='application/json')
+            self.assertEqual(rv.status_code, 200, 'The tagged assets could not be imported')
+            message = jsonpickle.decode(rv.data).get('message')
+            self.logger.info('[%s] Message: %s', method, message)
+
+            rv = self.app.get('/api/assets?session_id=test&tag=%s&limit=1' % quote('Bulk tag'))
+            self.assertEqual(int(rv.headers['X-Total-Count']), asset_count, 'Not every tagged asset was imported')
+            rv = self.app.get('/api/assets?session_id=test&tag=%s' % quote('Bulk tag %d' % (asset_count - 1)))
+            self.assertEqual(len(jsonpickle.decode(rv.data)), 1, 'The last asset was not tagged')
+        finally:
+            self.import_example()
+
+    def import_example(self):
+        fs_xmlfile = open(self.xmlfile, 'rb')
+        file_contents = fs_xmlfile.read()
+        fs_xmlfile.close()
+        json_dict = {
+            'session_id': 'test',
+            'object': {
+                'urlenc_file_contents': quote(file_contents),
+                'type': 'all',
+                'overwrite': 1
+            }
+        }
+        rv = self.app.post('/api/import/text', data=jsonpickle.encode(json_dict), content_type='application/json')
+        self.assertEqual(rv.status_code, 200, 'The example model could not be imported')
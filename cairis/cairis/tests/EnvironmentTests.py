@@ -2,6 +2,7 @@ import logging
 from urllib import quote
 import jsonpickle
 from Environment import Environment
+from MySQLDatabaseProxy import ENVIRONMENT_LINK_TABLES, TAGGED_DIMENSIONS
 from tests.CairisTests import CairisTests
 from tools.PseudoClasses import EnvironmentTensionModel
 
@@ -14,6 +15,18 @@ class EnvironmentTests(CairisTests):
     existing_environment_id = 117
     existing_environment_name = 'Stroke'
     environment_class = Environment.__module__+'.'+Environment.__name__
+    dimension_urls = {
+        'asset': '/api/assets',
+        'attacker': '/api/attackers',
+        'goal': '/api/goals',
+        'misusecase': '/api/misuse-cases',
+        'requirement': '/api/requirements',
+        'response': '/api/responses',
+        'risk': '/api/risks',
+        'role': '/api/roles',
+        'threat': '/api/threats',
+        'vulnerability': '/api/vulnerabilities'
+    }
     # endregion
     
     def test_get_all(self):
@@ -48,6 +61,31 @@ class EnvironmentTests(CairisTests):
         self.assertIsNotNone(environment, 'No results after deserialization')
         self.logger.info('[%s] Environment: %s [%d]\n', method, environment['theName'], environment['theId'])
 
+    def test_get_dimensions_by_environment(self):
+        method = 'test_get_dimensions_by_environment'
+        for dim_name in sorted(ENVIRONMENT_LINK_TABLES.keys()):
+            url = '%s?session_id=test&environment=%s' % (self.dimension_urls[dim_name], quote(self.existing_environment_name))
+            rv = self.app.get(url)
+            self.assertEqual(rv.status_code, 200, 'The %s objects could not be filtered by environment' % dim_name)
+            objts = jsonpickle.decode(rv.data)
+            self.assertIsInstance(objts, list, 'The %s objects are not a list as expected' % dim_name)
+            for objt in objts:
+                env_names = [props['theEnvironmentName'] for props in objt.get('theEnvironmentProperties', None) or []]
+                if len(env_names) > 0:
+                    self.assertIn(self.existing_environment_name, env_names, '%s is not in the environment' % objt['theName'])
+            self.logger.info('[%s] %s objects in %s: %d', method, dim_name, self.existing_environment_name, len(objts))
+
+        rv = self.app.get('/api/dependencies?session_id=test&environment=%s' % quote(self.existing_environment_name))
+        self.assertEqual(rv.status_code, 200, 'The dependencies could not be filtered by environment')
+
+    def test_get_dimensions_by_tag(self):
+        method = 'test_get_dimensions_by_tag'
+        for dim_name in TAGGED_DIMENSIONS:
+            rv = self.app.get('%s?session_id=test&tag=%s' % (self.dimension_urls[dim_name], quote('Test tag')))
+            self.assertEqual(rv.status_code, 200, 'The %s objects could not be filtered by tag' % dim_name)
+            self.assertIsInstance(jsonpickle.decode(rv.data), list, 'The %s objects are not a list as expected' % dim_name)
+        self.logger.info('[%s] Dimensions filtered by tag: %d\n', method, len(TAGGED_DIMENSIONS))
+
     def test_delete(self):
         method = 'test_delete'
         url = '/api/environments/name/%s?session_id=test' % quote(self.prepare_new_environment().theName)
@@ -1,11 +1,13 @@
 import unittest
 import sys
 from tests.AssetTests import AssetTests
+from tests.CExportTests import CExportTests
 from tests.CImportTests import CImportTests
 from tests.DependencyTests import DependencyTests
 from tests.EnvironmentTests import EnvironmentTests
 from tests.GoalTests import GoalTests
 from tests.MisuseCaseTests import MisuseCaseTests
+from tests.ModelRenderingTests import ModelRenderingTests
 from tests.ProjectTests import ProjectTests
 from tests.RequirementTests import RequirementTests
 from tests.ResponseTests import ResponseTests
@@ -22,10 +24,12 @@ tests_dict = {
     'asset': [0, AssetTests],
     'dependency': [0, DependencyTests],
     'environment': [0, EnvironmentTests],
+    'export': [0, CExportTests],
     'goal': [0, GoalTests],
     'import': [0, CImportTests],
     'misusecase': [0, MisuseCaseTests],
     'project': [0, ProjectTests],
+    'rendering': [0, ModelRenderingTests],
     'requirement': [0, RequirementTests],
     'response': [0, ResponseTests],
     'risk': [0, RiskTests],
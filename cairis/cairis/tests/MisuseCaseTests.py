@@ -34,4 +34,23 @@ class MisuseCaseTests(CairisTests):
         self.logger.debug('[%s] Response data: %s', method, rv.data)
         misuse_case = jsonpickle.decode(rv.data)
         self.assertIsNotNone(misuse_case, 'No results after deserialization')
-        self.logger.info('[%s] MisuseCase: %s [%d]\n', method, misuse_case['theName'], misuse_case['theId'])
\ No newline at end of file
+        self.logger.info('[%s] MisuseCase: %s [%d]\n', method, misuse_case['theName'], misuse_case['theId'])
+
+    def test_get_all_matches_get_by_risk(self):
+        method = 'test_get_all_matches_get_by_risk'
+        rv = self.app.get('/api/misuse-cases?session_id=test')
+        misuse_cases = jsonpickle.decode(rv.data)
+        url = '/api/misuse-cases/risk/%s?session_id=test' % quote(self.existing_risk_name)
+        rv = self.app.get(url)
+        misuse_case = jsonpickle.decode(rv.data)
+        self.assertIn(misuse_case['theName'], misuse_cases, 'Misuse case of the risk not found in the list')
+        listed_case = misuse_cases[misuse_case['theName']]
+        self.assertEqual(listed_case['theThreatName'], misuse_case['theThreatName'])
+        self.assertEqual(listed_case['theVulnerabilityName'], misuse_case['theVulnerabilityName'])
+        listed_props = dict((p['theEnvironmentName'], p) for p in listed_case['theEnvironmentProperties'])
+        for env_prop in misuse_case['theEnvironmentProperties']:
+            listed_prop = listed_props[env_prop['theEnvironmentName']]
+            for key in ['theLikelihood', 'theSeverity', 'theObjective', 'theAttackers']:
+                self.assertEqual(listed_prop[key], env_prop[key], '%s differs in %s' % (key, env_prop['theEnvironmentName']))
+            self.assertEqual(sorted(listed_prop['theAssets']), sorted(env_prop['theAssets']))
+        self.logger.info('[%s] MisuseCase: %s\n', method, misuse_case['theName'])
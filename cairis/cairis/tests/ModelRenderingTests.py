@@ -0,0 +1,174 @@
+import logging
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+from time import sleep, time
+from urllib import quote
+
+import jsonpickle
+
+from Borg import Borg
+from tests.CairisTests import CairisTests
+from tools.GraphicsGenerator import GraphicsGenerator
+from tools.LayoutPool import LayoutPool, LayoutTimeoutError
+from tools.ModelCache import ModelCache, model_key
+
+__author__ = 'Robin Quetin'
+
+
+class ModelRenderingTests(CairisTests):
+    logger = logging.getLogger(__name__)
+    environment_names = ['Stroke', 'Psychosis']
+    model_urls = [
+        '/api/assets/model/environment/%s?session_id=test',
+        '/api/goals/model/environment/%s?session_id=test',
+        '/api/risks/model/environment/%s?session_id=test'
+    ]
+    rounds = 4
+
+    def render(self, url):
+        rv = self.app.get(url)
+        return rv.status_code, rv.data
+
+    def test_concurrent_rendering(self):
+        method = 'test_concurrent_rendering'
+        b = Borg()
+        urls = [model_url % quote(environment_name) for model_url in self.model_urls for environment_name in self.environment_names]
+        layout_pool = LayoutPool(workers=2, queue_limit=len(urls) * self.rounds)
+        model_generator = b.model_generator
+        b.model_generator = GraphicsGenerator('svg', layout_pool)
+        try:
+            expected = {}
+            for url in urls:
+                status_code, svg_text = self.render(url)
+                self.assertEqual(status_code, 200, 'Rendering %s failed' % url)
+                self.assertGreater(svg_text.find('<svg'), -1, '%s did not return an SVG image' % url)
+                expected[url] = (status_code, svg_text)
+
+            results = []
+
+            def render_model(url):
+                results.append((url, self.render(url)))
+
+            threads = [Thread(target=render_model, args=(url,)) for idx in range(self.rounds) for url in urls]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            b.model_generator = model_generator
+
+        self.assertEqual(len(results), len(threads), 'Not every model was rendered')
+        for url, result in results:
+            self.assertEqual(result, expected[url], 'The model rendered by %s does not match its input' % url)
+        self.assertEqual(layout_pool.metrics()['jobs'], len(urls) + len(threads), 'Not every model was laid out')
+        self.logger.info('[%s] Models rendered concurrently: %d\n', method, len(results))
+
+    def test_saturated_pool(self):
+        method = 'test_saturated_pool'
+        b = Borg()
+        layout_pool = LayoutPool(workers=1, queue_limit=1, timeout=10)
+        model_generator = b.model_generator
+        b.model_generator = GraphicsGenerator('svg', layout_pool)
+        try:
+            busy_jobs = []
+            for idx in range(2):
+                busy_job = Thread(target=layout_pool.run, args=(['sleep', '2'], ''))
+                busy_job.start()
+                busy_jobs.append(busy_job)
+                for attempt in range(100):
+                    if layout_pool.queue.unfinished_tasks == idx + 1 and layout_pool.queue.qsize() == idx:
+                        break
+                    sleep(0.05)
+            url = self.model_urls[0] % quote(self.environment_names[0])
+            rv = self.app.get(url)
+            self.assertEqual(rv.status_code, 503, 'A saturated layout pool accepted %s' % url)
+            self.assertEqual(rv.headers.get('Retry-After'), '5', 'No Retry-After header was returned')
+            for busy_job in busy_jobs:
+                busy_job.join()
+        finally:
+            b.model_generator = model_generator
+        self.assertEqual(layout_pool.metrics()['rejected'], 1)
+        self.logger.info('[%s] Layout metrics: %s\n', method, layout_pool.metrics())
+
+    def test_layout_timeout(self):
+        method = 'test_layout_timeout'
+        layout_pool = LayoutPool(workers=1, queue_limit=1, timeout=1)
+        start_time = time()
+        self.assertRaises(LayoutTimeoutError, layout_pool.run, ['sleep', '30'], '')
+        self.assertLess(time() - start_time, 10, 'The layout was not killed when it timed out')
+        metrics = layout_pool.metrics()
+        self.assertEqual(metrics['timeouts'], 1)
+        self.assertEqual(metrics['jobs'], 1)
+        self.assertEqual(layout_pool.run(['cat'], 'digraph {}'), 'digraph {}', 'The worker did not recover from the timeout')
+        self.logger.info('[%s] Layout metrics: %s\n', method, metrics)
+
+    def test_metrics_get(self):
+        method = 'test_metrics_get'
+        status_code, svg_text = self.render(self.model_urls[0] % quote(self.environment_names[0]))
+        self.assertEqual(status_code, 200)
+        rv = self.app.get('/api/models/metrics?session_id=test')
+        self.assertEqual(rv.status_code, 200)
+        metrics = jsonpickle.decode(rv.data)
+        self.assertIsInstance(metrics, dict, 'The metrics are not a dictionary as expected')
+        for counter in ['jobs', 'rejected', 'timeouts', 'queued', 'queue_wait_mean', 'layout_time_mean']:
+            self.assertIn(counter, metrics['layout'])
+        for counter in ['hits', 'disk_hits', 'misses', 'evictions', 'entries', 'bytes']:
+            self.assertIn(counter, metrics['cache'])
+        self.logger.info('[%s] Model metrics: %s\n', method, metrics)
+
+    def test_cached_rendering(self):
+        method = 'test_cached_rendering'
+        url = self.model_urls[1] % quote(self.environment_names[0])
+        status_code, svg_text = self.render(url)
+        self.assertEqual(status_code, 200)
+        metrics_before = jsonpickle.decode(self.app.get('/api/models/metrics?session_id=test').data)
+        self.assertEqual(self.render(url), (status_code, svg_text), 'The cached model does not match the rendered one')
+        metrics_after = jsonpickle.decode(self.app.get('/api/models/metrics?session_id=test').data)
+        self.assertEqual(metrics_after['cache']['hits'], metrics_before['cache']['hits'] + 1, 'The model was not served from the cache')
+        self.assertEqual(metrics_after['layout']['jobs'], metrics_before['layout']['jobs'], 'A cached model was laid out again')
+        self.logger.info('[%s] Cache metrics: %s\n', method, metrics_after['cache'])
+
+    def test_cache_eviction(self):
+        method = 'test_cache_eviction'
+        model_cache = ModelCache(max_bytes=20)
+        keys = [model_key('digraph { %d }' % idx, 'goal', 'dot', 'svg') for idx in range(3)]
+        model_cache.put(keys[0], 'x' * 8)
+        model_cache.put(keys[1], 'y' * 8)
+        self.assertEqual(model_cache.get(keys[0]), 'x' * 8)
+        model_cache.put(keys[2], 'z' * 8)
+        self.assertIsNone(model_cache.get(keys[1]), 'The least recently used model was not evicted')
+        self.assertEqual(model_cache.get(keys[0]), 'x' * 8)
+        self.assertEqual(model_cache.get(keys[2]), 'z' * 8)
+        model_cache.put(keys[1], 'y' * 40)
+        self.assertIsNone(model_cache.get(keys[1]), 'A model larger than the cache was kept')
+        metrics = model_cache.metrics()
+        self.assertEqual(metrics['hits'], 3)
+        self.assertEqual(metrics['misses'], 2)
+        self.assertEqual(metrics['evictions'], 1)
+        self.assertEqual(metrics['entries'], 2)
+        self.assertEqual(metrics['bytes'], 16)
+        self.assertNotEqual(keys[0], model_key('digraph { 0 }', 'risk', 'dot', 'svg'), 'The model type is not part of the key')
+        self.logger.info('[%s] Cache metrics: %s\n', method, metrics)
+
+    def test_cache_disk_tier(self):
+        method = 'test_cache_disk_tier'
+        disk_dir = mkdtemp()
+        try:
+            keys = [model_key('digraph { %d }' % idx, 'asset', 'dot', 'svg') for idx in range(3)]
+            model_cache = ModelCache(max_bytes=8, disk_dir=disk_dir, disk_max_bytes=16)
+            for idx, key in enumerate(keys):
+                model_cache.put(key, str(idx) * 8)
+            self.assertEqual(model_cache.metrics()['disk_evictions'], 1, 'The oldest model was not evicted from disk')
+
+            reopened_cache = ModelCache(max_bytes=8, disk_dir=disk_dir, disk_max_bytes=16)
+            self.assertIsNone(reopened_cache.get(keys[0]))
+            self.assertEqual(reopened_cache.get(keys[1]), '1' * 8, 'The model was not kept on disk')
+            self.assertEqual(reopened_cache.get(keys[1]), '1' * 8)
+            metrics = reopened_cache.metrics()
+            self.assertEqual(metrics['disk_hits'], 1)
+            self.assertEqual(metrics['hits'], 1)
+            self.assertEqual(metrics['misses'], 1)
+            self.logger.info('[%s] Cache metrics: %s\n', method, metrics)
+        finally:
+            rmtree(disk_dir)
@@ -1,7 +1,12 @@
+import hashlib
+import json
 import logging
+import re
+import struct
 from urllib import quote
 from StringIO import StringIO
 import jsonpickle
+from Borg import Borg
 from tests.CairisTests import CairisTests
 from tools.PseudoClasses import ProjectSettings, Contributor, Revision
 
@@ -65,6 +70,82 @@ class ProjectTests(CairisTests):
         self.logger.info('[%s] Message: %s', method, message)
         self.assertGreater(message.find('successfully'), -1, 'Failed to create new project')
 
+        self.import_example(import_url)
+        self.logger.info('[%s] Successfully created new project and restored the example project\n', method)
+
+    def test_create_new_project_reset(self):
+        method = 'test_create_new_project_reset'
+        rv = self.app.post('/api/settings/create?session_id=test')
+        json_dict = jsonpickle.decode(rv.data)
+        self.assertGreater(str(json_dict.get('message')).find('successfully'), -1, 'Failed to create new project')
+
+        b = Borg()
+        fs_init = open(b.cairisRoot + '/cairis/sql/init.sql')
+        init_lines = fs_init.readlines()
+        fs_init.close()
+        seeded_rows = {}
+        for line in init_lines:
+            m = re.match('\s*insert into\s+(\w+)', line, re.IGNORECASE)
+            if m is not None:
+                seeded_rows[m.group(1)] = seeded_rows.get(m.group(1), 0) + 1
+        last_id = int(re.search('\((\d+),\s*\'did\'\)', ''.join(init_lines)).group(1))
+
+        db_proxy = b.get_dbproxy('test')
+        for table_name, row_count in seeded_rows.items():
+            column_names, rows = db_proxy.tableRows(table_name)
+            self.assertEqual(len(rows), row_count, 'The reset left %d rows in %s' % (len(rows), table_name))
+        column_names, rows = db_proxy.tableRows('asset')
+        self.assertEqual(len(rows), 0, 'The reset left assets behind')
+        self.assertEqual(db_proxy.newId(), last_id + 1, 'The reset did not reseed the id counter')
+        self.logger.info('[%s] Reseeded %d tables\n', method, len(seeded_rows))
+
+        self.import_example('/api/import/file/type/all')
+
+    def test_snapshot_restore(self):
+        method = 'test_snapshot_restore'
+        url = '/api/settings/snapshot?session_id=test'
+        rv = self.app.post(url)
+        self.assertIsNotNone(rv.data, 'No response')
+        self.assertEqual(rv.mimetype, 'application/octet-stream', 'The response is not a snapshot')
+        snapshot = rv.data
+        self.logger.info('[%s] Snapshot size: %d bytes', method, len(snapshot))
+
+        url = '/api/settings/restore?session_id=test'
+        rv = self.app.post(url, data=snapshot, content_type='application/octet-stream')
+        self.assertIsNotNone(rv.data, 'No response')
+        json_dict = jsonpickle.decode(rv.data)
+        self.assertIsInstance(json_dict, dict, 'Response is not a valid JSON dictionary')
+        message = json_dict.get('message', None)
+        self.assertIsNotNone(message, 'No message in response')
+        self.assertGreater(message.find('restored'), -1, 'The snapshot was not restored')
+
+        rv = self.app.post(url, data=snapshot[:-1], content_type='application/octet-stream')
+        self.assertEqual(rv.status_code, 409, 'A truncated snapshot was restored')
+        self.logger.info('[%s] Message: %s\n', method, message)
+
+    def test_snapshot_restore_unknown_table(self):
+        method = 'test_snapshot_restore_unknown_table'
+        rv = self.app.post('/api/settings/snapshot?session_id=test')
+        snapshot = rv.data
+        header_size = len('CAIRISSS') + 4 + 32
+        record_size = struct.unpack('>I', snapshot[header_size:header_size + 4])[0]
+        schema = json.loads(snapshot[header_size + 4:header_size + 4 + record_size])['schema']
+        records = [
+            json.dumps({'schema': schema, 'tables': 1}),
+            json.dumps({'table': 'asset; drop table asset', 'columns': ['id'], 'rows': 0})
+        ]
+        body = ''.join([struct.pack('>I', len(x)) + x for x in records])
+        forged_snapshot = snapshot[:len('CAIRISSS') + 4] + hashlib.md5(body).hexdigest() + body
+
+        assets_before = jsonpickle.decode(self.app.get('/api/assets?session_id=test').data)
+        url = '/api/settings/restore?session_id=test'
+        rv = self.app.post(url, data=forged_snapshot, content_type='application/octet-stream')
+        self.assertEqual(rv.status_code, 409, 'A snapshot with an unknown table was restored')
+        assets_after = jsonpickle.decode(self.app.get('/api/assets?session_id=test').data)
+        self.assertEqual(sorted(assets_before.keys()), sorted(assets_after.keys()), 'The rejected snapshot changed the model')
+        self.logger.info('[%s] Message: %s\n', method, jsonpickle.decode(rv.data).get('message'))
+
+    def import_example(self, import_url):
         fs_xmlfile = open(self.xmlfile, 'rb')
         file_contents = fs_xmlfile.read()
         data = {
@@ -79,7 +160,6 @@ class ProjectTests(CairisTests):
         message = json_dict.get('message', None)
         self.assertIsNotNone(message, 'No message in response')
         self.assertGreater(message.find('Imported'), -1, 'Failed to import any data')
-        self.logger.info('[%s] Successfully created new project and restored the example project\n', method)
 
     def convert_to_obj(self, json_dict):
         has_all_keys = all (k in json_dict for k in ProjectSettings.required)
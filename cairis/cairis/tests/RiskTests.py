@@ -7,7 +7,7 @@ from MisuseCaseEnvironmentProperties import MisuseCaseEnvironmentProperties
 
 from Risk import Risk
 from tests.CairisTests import CairisTests
-from tools.PseudoClasses import RiskScore
+from tools.PseudoClasses import RiskScore, RiskScoreDelta
 
 __author__ = 'Robin Quetin'
 
@@ -34,6 +34,18 @@ class RiskTests(CairisTests):
         risk = risks.values()[0]
         self.logger.info('[%s] First risk: %s [%d]\n', method, risk['theName'], risk['theId'])
 
+    def test_get_fields(self):
+        method = 'test_get_fields'
+        rv = self.app.get('/api/risks?session_id=test&fields=name')
+        self.assertEqual(rv.status_code, 200, 'The risk names could not be retrieved')
+        risks = jsonpickle.decode(rv.data)
+        self.assertIsInstance(risks, dict, 'The result is not a dictionary as expected')
+        self.assertGreater(len(risks), 0, 'No risks in the dictionary')
+        for risk in risks.values():
+            self.assertIn('theName', risk)
+            self.assertNotIn('theMisuseCase', risk)
+        self.logger.info('[%s] Risks found: %d\n', method, len(risks))
+
     def test_get_by_name(self):
         method = 'test_get_by_name'
         url = '/api/risks/name/%s?session_id=test' % quote(self.existing_risk_name)
@@ -151,6 +163,136 @@ class RiskTests(CairisTests):
         self.assertTrue(has_all_keys, 'Response is not a RiskScore object')
         self.logger.info('[%s] %s - %d - %d\n', method, score['responseName'], score['unmitScore'], score['mitScore'])
 
+    def test_get_scores_by_environment(self):
+        method = 'test_get_scores_by_environment'
+        url = '/api/risks/scores/environment/%s?session_id=test' % quote(self.existing_environment_name)
+        rv = self.app.get(url)
+        self.assertIsNotNone(rv.data, 'No response')
+        self.logger.debug('[%s] Response data: %s', method, rv.data)
+        env_scores = jsonpickle.decode(rv.data)
+        self.assertIsInstance(env_scores, dict, 'The result is not a dictionary as expected')
+        risk_scores = env_scores.get(self.existing_environment_name, {})
+        scores = risk_scores.get(self.existing_risk_name, [])
+        self.assertGreater(len(scores), 0, 'No scores for the existing risk')
+        score = scores[0]
+        has_all_keys = all (k in score.keys() for k in RiskScore.required)
+        self.assertTrue(has_all_keys, 'Response is not a RiskScore object')
+        self.logger.info('[%s] %s - %d - %d\n', method, score['responseName'], score['unmitScore'], score['mitScore'])
+
+    def test_scores_by_environment_match_stored_procedures(self):
+        method = 'test_scores_by_environment_match_stored_procedures'
+        url = '/api/risks/scores/environment/%s?session_id=test' % quote(self.existing_environment_name)
+        rv = self.app.get(url)
+        env_scores = jsonpickle.decode(rv.data)
+        risk_scores = env_scores.get(self.existing_environment_name, {})
+        self.assertGreater(len(risk_scores), 0, 'No scores for the environment')
+        for risk_name, engine_scores in risk_scores.items():
+            rv = self.app.get('/api/risks/name/%s?session_id=test' % quote(risk_name))
+            risk = jsonpickle.decode(rv.data)
+            url = '/api/risks/name/%s/threat/%s/vulnerability/%s/environment/%s?session_id=test' % (
+                quote(risk_name),
+                quote(risk['theThreatName']),
+                quote(risk['theVulnerabilityName']),
+                quote(self.existing_environment_name)
+            )
+            rv = self.app.get(url)
+            proc_scores = jsonpickle.decode(rv.data)
+            expected = dict((score['responseName'], (score['unmitScore'], score['mitScore'])) for score in proc_scores)
+            actual = dict((score['responseName'], (score['unmitScore'], score['mitScore'])) for score in engine_scores)
+            self.logger.debug('[%s] %s: %s - %s', method, risk_name, expected, actual)
+            self.assertEqual(expected, actual, 'Engine scores for %s differ from the stored procedures' % risk_name)
+
+    def test_scores_follow_likelihood_changes(self):
+        method = 'test_scores_follow_likelihood_changes'
+        threat_url = '/api/threats/name/%s?session_id=test' % quote(self.existing_threat_name)
+        rv = self.app.get(threat_url)
+        threat = jsonpickle.decode(rv.data)
+        env_props = [p for p in threat['theEnvironmentProperties'] if p['theEnvironmentName'] == self.existing_environment_name][0]
+        old_likelihood = env_props['theLikelihood']
+        new_likelihood = 'Incredible' if old_likelihood != 'Incredible' else 'Frequent'
+
+        self.assert_scores_are_current(method)
+        try:
+            env_props['theLikelihood'] = new_likelihood
+            rv = self.app.put(threat_url, content_type='application/json', data=jsonpickle.encode({'session_id': 'test', 'object': threat}))
+            self.assertEqual(rv.status_code, 200, 'The threat likelihood was not updated')
+            self.assert_scores_are_current(method)
+        finally:
+            env_props['theLikelihood'] = old_likelihood
+            self.app.put(threat_url, content_type='application/json', data=jsonpickle.encode({'session_id': 'test', 'object': threat}))
+        self.assert_scores_are_current(method)
+
+    def assert_scores_are_current(self, method):
+        # The engine reads the live model, so the stored scores must match it after every change
+        url = '/api/risks/name/%s/threat/%s/vulnerability/%s/environment/%s?session_id=test' % (
+            quote(self.existing_risk_name),
+            quote(self.existing_threat_name),
+            quote(self.existing_vulnerability),
+            quote(self.existing_environment_name)
+        )
+        rv = self.app.get(url)
+        stored = dict((score['responseName'], (score['unmitScore'], score['mitScore'])) for score in jsonpickle.decode(rv.data))
+        rv = self.app.get('/api/risks/scores/environment/%s?session_id=test' % quote(self.existing_environment_name))
+        env_scores = jsonpickle.decode(rv.data)
+        engine_scores = env_scores[self.existing_environment_name][self.existing_risk_name]
+        current = dict((score['responseName'], (score['unmitScore'], score['mitScore'])) for score in engine_scores)
+        self.logger.info('[%s] Stored scores: %s, current scores: %s', method, stored, current)
+        self.assertEqual(stored, current, 'The stored scores are stale')
+
+    def test_simulate(self):
+        method = 'test_simulate'
+        url = '/api/risks/simulate'
+        sim_body = jsonpickle.encode({
+            'session_id': 'test',
+            'object': {
+                'environment': self.existing_environment_name,
+                'scenarios': [
+                    [{'type': 'add_response', 'risk': self.existing_risk_name, 'response': 'Test response', 'countermeasures': []}]
+                ]
+            }
+        })
+        rv = self.app.post(url, content_type='application/json', data=sim_body)
+        self.assertIsNotNone(rv.data, 'No response')
+        self.logger.debug('[%s] Response data: %s', method, rv.data)
+        results = jsonpickle.decode(rv.data)
+        self.assertIsInstance(results, list, 'The result is not a list as expected')
+        self.assertEqual(len(results), 1, 'Expected the deltas of one scenario')
+        self.assertEqual(len(results[0]), 1, 'Expected the delta of the added response only')
+        delta = results[0][0]
+        has_all_keys = all (k in delta.keys() for k in RiskScoreDelta.required)
+        self.assertTrue(has_all_keys, 'Response is not a RiskScoreDelta object')
+        self.assertEqual(delta['responseName'], 'Test response')
+        self.logger.info('[%s] %s - %d - %d\n', method, delta['responseName'], delta['unmitScoreAfter'], delta['mitScoreAfter'])
+
+        sim_body = jsonpickle.encode({
+            'session_id': 'test',
+            'object': {'changes': [{'type': 'unknown'}]}
+        })
+        rv = self.app.post(url, content_type='application/json', data=sim_body)
+        self.assertNotEqual(rv.status_code, 200, 'Unknown change types should be rejected')
+
+    def test_simulate_batch(self):
+        method = 'test_simulate_batch'
+        response_names = ['Test response %d' % idx for idx in range(9)]
+        sim_body = jsonpickle.encode({
+            'session_id': 'test',
+            'object': {
+                'environment': self.existing_environment_name,
+                'scenarios': [
+                    [{'type': 'add_response', 'risk': self.existing_risk_name, 'response': response_name, 'countermeasures': []}]
+                    for response_name in response_names
+                ]
+            }
+        })
+        rv = self.app.post('/api/risks/simulate', content_type='application/json', data=sim_body)
+        self.assertEqual(rv.status_code, 200, 'The batch could not be simulated')
+        results = jsonpickle.decode(rv.data)
+        self.assertEqual(len(results), len(response_names), 'Expected the deltas of every scenario')
+        self.assertEqual([deltas[0]['responseName'] for deltas in results], response_names, 'The deltas are not in scenario order')
+        scores = set([(deltas[0]['unmitScoreAfter'], deltas[0]['mitScoreAfter']) for deltas in results])
+        self.assertEqual(len(scores), 1, 'Identical scenarios were scored differently')
+        self.logger.info('[%s] Scenarios simulated: %d\n', method, len(results))
+
     def prepare_new_risk(self):
         new_misuse_case = MisuseCase(
             mcId=-1,
@@ -44,6 +44,18 @@ class ThreatTests(CairisTests):
         self.assertIsNotNone(threat, 'No results after deserialization')
         self.logger.info('[%s] Threat: %s [%d]\n', method, threat['theThreatName'], threat['theId'])
 
+    def test_get_by_id(self):
+        method = 'test_get_by_id'
+        url = '/api/threats/id/%d?session_id=test' % self.existing_threat_id
+        rv = self.app.get(url)
+        self.assertIsNotNone(rv.data, 'No response')
+        self.logger.debug('[%s] Response data: %s', method, rv.data)
+        threat = jsonpickle.decode(rv.data)
+        self.assertIsNotNone(threat, 'No results after deserialization')
+        self.assertEqual(threat['theId'], self.existing_threat_id)
+        self.assertEqual(threat['theThreatName'], self.existing_threat_name)
+        self.logger.info('[%s] Threat: %s [%d]\n', method, threat['theThreatName'], threat['theId'])
+
     def test_delete(self):
         method = 'test_delete'
         url = '/api/threats/name/%s?session_id=test' % quote(self.prepare_new_threat().theThreatName)
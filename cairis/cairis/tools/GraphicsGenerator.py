@@ -1,17 +1,39 @@
+from tools.ModelCache import model_key
 from tools.SVGGenerator import SVGGenerator
 
 __author__ = 'Robin Quetin'
 
 class GraphicsGenerator(object):
-    def __init__(self, output_format='svg'):
+    def __init__(self, output_format='svg', layout_pool=None, model_cache=None):
         output_format = output_format.lower()
         if output_format == 'svg':
-            self.ded_generator = SVGGenerator()
+            self.ded_generator = SVGGenerator(layout_pool)
         else:
             raise RuntimeError('There is no generator registered for the provided output format.')
+        self.output_format = output_format
+        self.model_cache = model_cache
+
+    def generate(self, dot_code, output_path=None, model_type=None, renderer='dot'):
+        if self.model_cache is None:
+            output = self.ded_generator.generate(dot_code, model_type, renderer)
+        else:
+            key = model_key(dot_code, model_type, renderer, self.output_format)
+            output = self.model_cache.get(key)
+            if output is None:
+                output = self.ded_generator.generate(dot_code, model_type, renderer)
+                self.model_cache.put(key, output)
 
-    def generate(self, dot_code, output_path=None, model_type=None):
         if output_path is None:
-            return self.ded_generator.generate(dot_code, model_type)
+            return output
         else:
-            self.ded_generator.generate_file(dot_code, output_path, model_type)
\ No newline at end of file
+            self.ded_generator.write_file(output, output_path)
+
+    def metrics(self):
+        """
+        Returns the counters of the layout pool and of the model cache
+        :rtype : dict
+        """
+        metrics = {'layout': self.ded_generator.metrics(), 'cache': {}}
+        if self.model_cache is not None:
+            metrics['cache'] = self.model_cache.metrics()
+        return metrics
@@ -1,3 +1,4 @@
+from copy import copy
 from json import dumps, loads
 
 from flask import session, request
@@ -23,7 +24,24 @@ conv_terms = {
     'py/tuple': '__python_tuple__',
 }
 
-def json_serialize(obj, pretty_printing=False, session_id=None):
+def select_fields(obj, fields):
+    """
+    Copies an object, or the objects in a dictionary or list, keeping only the given attributes.
+    :type fields: collections.Iterable
+    """
+    if isinstance(obj, dict):
+        return dict((key, select_fields(value, fields)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return [select_fields(value, fields) for value in obj]
+    if not hasattr(obj, '__dict__'):
+        return obj
+    selected_obj = copy(obj)
+    for attr_name in obj.__dict__.keys():
+        if attr_name not in fields:
+            delattr(selected_obj, attr_name)
+    return selected_obj
+
+def json_serialize(obj, pretty_printing=False, session_id=None, fields=None):
     """
     Serializes the Python object to a JSON serialized string.
     :param obj: The object to be serialized
@@ -32,8 +50,13 @@ def json_serialize(obj, pretty_printing=False, session_id=None):
     :type pretty_printing: bool
     :param session_id: The user's session ID
     :type session_id: int
+    :param fields: If given, only these attributes of the object, or of the objects it contains, are serialized
+    :type fields: list[str]
     :return: Returns a JSON serialized string of the object
     """
+    if fields is not None:
+        obj = select_fields(obj, fields)
+
     b = Borg()
     if session_id is None:
         session_id = session.get('session_id', None)
@@ -0,0 +1,169 @@
+import logging
+from Queue import Full, Queue
+from subprocess import CalledProcessError, PIPE, Popen
+from threading import Event, Lock, Thread, Timer
+from time import time
+
+__author__ = 'Robin Quetin'
+
+DEFAULT_WORKERS = 4
+DEFAULT_QUEUE_LIMIT = 16
+DEFAULT_TIMEOUT = 30
+
+
+class LayoutPoolSaturatedError(Exception):
+    def __init__(self, queue_limit):
+        Exception.__init__(self, 'All layout workers are busy and {0} jobs are already waiting'.format(queue_limit))
+
+
+class LayoutTimeoutError(Exception):
+    def __init__(self, args, timeout):
+        Exception.__init__(self, '{0} did not finish within {1} seconds'.format(' '.join(args), timeout))
+
+
+def run_layout(args, input_text, timeout=None):
+    """
+    Runs a Graphviz command over the input text and returns its output, killing the process if it runs for longer than timeout seconds
+    :raise CalledProcessError: When the command exits with a nonzero status
+    :raise LayoutTimeoutError: When the command is killed for running too long
+    """
+    proc = Popen(args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    timed_out = Event()
+    timer = None
+    if timeout:
+        timer = Timer(timeout, kill_process, (proc, timed_out))
+        timer.daemon = True
+        timer.start()
+    try:
+        output, errors = proc.communicate(input_text)
+    finally:
+        if timer is not None:
+            timer.cancel()
+    if timed_out.is_set():
+        raise LayoutTimeoutError(args, timeout)
+    if proc.returncode != 0:
+        raise CalledProcessError(proc.returncode, ' '.join(args), errors)
+    return output
+
+
+def kill_process(proc, timed_out):
+    timed_out.set()
+    try:
+        proc.kill()
+    except OSError:
+        pass
+
+
+class LayoutJob(object):
+    def __init__(self, args, input_text):
+        self.args = args
+        self.input_text = input_text
+        self.output = None
+        self.error = None
+        self.submission_time = time()
+        self.done = Event()
+
+
+class LayoutPool(object):
+    """
+    Runs Graphviz layouts on a fixed number of worker threads, each job in its own process with a time limit.
+    When every worker is busy and queue_limit jobs are already waiting, new jobs are refused rather than queued.
+    """
+    def __init__(self, workers=DEFAULT_WORKERS, queue_limit=DEFAULT_QUEUE_LIMIT, timeout=DEFAULT_TIMEOUT):
+        self.queue_limit = max(1, queue_limit)
+        self.timeout = timeout
+        self.queue = Queue(self.queue_limit)
+        self.lock = Lock()
+        self.logger = logging.getLogger('cairisd')
+        self.counters = {
+            'jobs': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'failures': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0,
+            'layout_time_total': 0.0,
+            'layout_time_max': 0.0
+        }
+        self.workers = []
+        for idx in range(max(1, workers)):
+            worker = Thread(target=self.work, name='layout-worker-' + str(idx))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+    def run(self, args, input_text):
+        """
+        Queues a layout and blocks until a worker has run it
+        :raise LayoutPoolSaturatedError: When the queue is full
+        :raise LayoutTimeoutError: When the layout runs for longer than the pool's timeout
+        """
+        job = LayoutJob(args, input_text)
+        try:
+            self.queue.put_nowait(job)
+        except Full:
+            self.count('rejected')
+            raise LayoutPoolSaturatedError(self.queue_limit)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.output
+
+    def work(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self.execute(job)
+            finally:
+                self.queue.task_done()
+                job.done.set()
+
+    def execute(self, job):
+        start_time = time()
+        queue_wait = start_time - job.submission_time
+        try:
+            job.output = run_layout(job.args, job.input_text, self.timeout)
+        except LayoutTimeoutError, ex:
+            self.count('timeouts')
+            job.error = ex
+        except Exception, ex:
+            self.count('failures')
+            job.error = ex
+        layout_time = time() - start_time
+        self.record(queue_wait, layout_time)
+        self.logger.debug('Layout job waited {0:.3f}s and ran for {1:.3f}s'.format(queue_wait, layout_time))
+
+    def count(self, counter):
+        self.lock.acquire()
+        try:
+            self.counters[counter] += 1
+        finally:
+            self.lock.release()
+
+    def record(self, queue_wait, layout_time):
+        self.lock.acquire()
+        try:
+            self.counters['jobs'] += 1
+            self.counters['queue_wait_total'] += queue_wait
+            self.counters['queue_wait_max'] = max(self.counters['queue_wait_max'], queue_wait)
+            self.counters['layout_time_total'] += layout_time
+            self.counters['layout_time_max'] = max(self.counters['layout_time_max'], layout_time)
+        finally:
+            self.lock.release()
+
+    def metrics(self):
+        """
+        Returns the pool's counters, with the mean queue wait and layout time of the jobs run so far
+        :rtype : dict
+        """
+        self.lock.acquire()
+        try:
+            metrics = dict(self.counters)
+        finally:
+            self.lock.release()
+        metrics['queued'] = self.queue.qsize()
+        metrics['workers'] = len(self.workers)
+        jobs = metrics['jobs']
+        metrics['queue_wait_mean'] = metrics['queue_wait_total'] / jobs if jobs else 0.0
+        metrics['layout_time_mean'] = metrics['layout_time_total'] / jobs if jobs else 0.0
+        return metrics
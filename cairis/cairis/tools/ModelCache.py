@@ -0,0 +1,196 @@
+import logging
+import os
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from uuid import uuid4
+
+__author__ = 'Robin Quetin'
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def model_key(dot_code, model_type, renderer, output_format):
+    """
+    Hashes everything that decides how a model is rendered. The DOT text carries the session's font name and size,
+    so models drawn with different font settings get different keys.
+    """
+    if isinstance(dot_code, unicode):
+        dot_code = dot_code.encode('utf-8')
+    digest = sha1()
+    for part in [output_format, renderer, str(model_type)]:
+        digest.update(part)
+        digest.update('\0')
+    digest.update(dot_code or '')
+    return digest.hexdigest()
+
+
+class ModelCache(object):
+    """
+    Keeps rendered models in memory, evicting the least recently used once they take up more than max_bytes.
+    When a disk directory is given, models are also written there and evicted oldest first once the directory
+    holds more than disk_max_bytes, so they survive memory eviction and daemon restarts.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None, disk_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.disk_dir = None
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_entries = OrderedDict()
+        self.disk_bytes = 0
+        self.lock = Lock()
+        self.logger = logging.getLogger('cairisd')
+        self.counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+        if disk_dir is not None and disk_max_bytes > 0:
+            self.open_disk_tier(disk_dir)
+
+    def open_disk_tier(self, disk_dir):
+        try:
+            if not os.path.exists(disk_dir):
+                os.makedirs(disk_dir, 0700)
+            files = []
+            for file_name in os.listdir(disk_dir):
+                if file_name.endswith('.svg'):
+                    file_stat = os.stat(os.path.join(disk_dir, file_name))
+                    files.append((file_stat.st_mtime, file_name[:-4], file_stat.st_size))
+        except OSError, ex:
+            self.logger.warning('Unable to use {0} for the model cache: {1}'.format(disk_dir, str(ex)))
+            return
+        self.disk_dir = disk_dir
+        for mtime, key, size in sorted(files):
+            self.disk_entries[key] = size
+            self.disk_bytes += size
+        self.prune_disk()
+
+    def get(self, key):
+        self.lock.acquire()
+        try:
+            if key in self.entries:
+                output, size = self.entries.pop(key)
+                self.entries[key] = (output, size)
+                self.counters['hits'] += 1
+                return output
+            on_disk = key in self.disk_entries
+        finally:
+            self.lock.release()
+
+        output = None
+        if on_disk:
+            output = self.read_disk(key)
+        self.lock.acquire()
+        try:
+            if output is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['disk_hits'] += 1
+            if key in self.disk_entries:
+                self.disk_entries[key] = self.disk_entries.pop(key)
+            self.store(key, output)
+            return output
+        finally:
+            self.lock.release()
+
+    def put(self, key, output):
+        self.lock.acquire()
+        try:
+            self.store(key, output)
+            write_to_disk = self.disk_dir is not None and key not in self.disk_entries
+        finally:
+            self.lock.release()
+        if write_to_disk:
+            self.write_disk(key, output)
+
+    def store(self, key, output):
+        size = len(encoded(output))
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (output, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            old_key, (old_output, old_size) = self.entries.popitem(last=False)
+            self.bytes -= old_size
+            self.counters['evictions'] += 1
+
+    def disk_path(self, key):
+        return os.path.join(self.disk_dir, key + '.svg')
+
+    def read_disk(self, key):
+        try:
+            fs_input = open(self.disk_path(key), 'rb')
+            try:
+                output = fs_input.read().decode('utf-8')
+            finally:
+                fs_input.close()
+            os.utime(self.disk_path(key), None)
+            return output
+        except (IOError, OSError, UnicodeDecodeError):
+            self.lock.acquire()
+            try:
+                if key in self.disk_entries:
+                    self.disk_bytes -= self.disk_entries.pop(key)
+            finally:
+                self.lock.release()
+            return None
+
+    def write_disk(self, key, output):
+        data = encoded(output)
+        if len(data) > self.disk_max_bytes:
+            return
+        tmp_path = os.path.join(self.disk_dir, '.' + uuid4().hex)
+        try:
+            fs_output = open(tmp_path, 'wb')
+            try:
+                fs_output.write(data)
+            finally:
+                fs_output.close()
+            os.rename(tmp_path, self.disk_path(key))
+        except (IOError, OSError), ex:
+            self.logger.warning('Unable to write model to the disk cache: {0}'.format(str(ex)))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.lock.acquire()
+        try:
+            if key not in self.disk_entries:
+                self.disk_entries[key] = len(data)
+                self.disk_bytes += len(data)
+            self.prune_disk()
+        finally:
+            self.lock.release()
+
+    def prune_disk(self):
+        while self.disk_bytes > self.disk_max_bytes and len(self.disk_entries) > 0:
+            old_key, old_size = self.disk_entries.popitem(last=False)
+            self.disk_bytes -= old_size
+            self.counters['disk_evictions'] += 1
+            try:
+                os.remove(self.disk_path(old_key))
+            except OSError:
+                pass
+
+    def metrics(self):
+        """
+        Returns the hit and miss counters with the number and size of the models held in memory and on disk
+        :rtype : dict
+        """
+        self.lock.acquire()
+        try:
+            metrics = dict(self.counters)
+            metrics['entries'] = len(self.entries)
+            metrics['bytes'] = self.bytes
+            metrics['disk_entries'] = len(self.disk_entries)
+            metrics['disk_bytes'] = self.disk_bytes
+        finally:
+            self.lock.release()
+        return metrics
+
+
+def encoded(output):
+    if isinstance(output, unicode):
+        return output.encode('utf-8')
+    return output
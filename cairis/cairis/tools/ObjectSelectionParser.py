@@ -0,0 +1,165 @@
+import httplib
+
+from ARM import ARMException
+from CairisHTTPError import CairisHTTPError
+from ObjectSelection import KEY_ATTRIBUTES, ObjectSelection, attributeName
+
+__author__ = 'Robin Quetin'
+
+SELECTION_ARGS = ['offset', 'limit', 'cursor', 'environment', 'tag', 'type', 'name_prefix', 'sort', 'order']
+
+SELECTION_PARAMETERS = [
+    {
+        "name": "offset",
+        "description": "The number of objects to skip",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": int.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "limit",
+        "description": "The maximum number of objects to return",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": int.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "cursor",
+        "description": "The X-Next-Cursor header of the previous page; used instead of offset",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "environment",
+        "description": "Only return objects in this environment",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "tag",
+        "description": "Only return objects with this tag",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "type",
+        "description": "Only return objects of this type",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "name_prefix",
+        "description": "Only return objects whose name starts with this prefix",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "sort",
+        "description": "The field to sort on: name (the default) or type",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    },
+    {
+        "name": "order",
+        "description": "The sort order: asc (the default) or desc",
+        "required": False,
+        "allowMultiple": False,
+        "dataType": str.__name__,
+        "paramType": "query"
+    }
+]
+
+FIELDS_PARAMETER = {
+    "name": "fields",
+    "description": "A comma-separated list of the attributes to return, e.g. name,tags; the id and name are always returned",
+    "required": False,
+    "allowMultiple": False,
+    "dataType": str.__name__,
+    "paramType": "query"
+}
+
+SELECTION_PARAMETERS.append(FIELDS_PARAMETER)
+
+SELECTION_NOTES = ('If any of the paging, filtering or sorting parameters are given, only the selected page is returned, '
+                   'as a list in the selected order. The X-Total-Count header gives the number of objects matching the '
+                   'filters, and X-Next-Cursor, if present, the cursor of the next page. The fields parameter limits the '
+                   'attributes both loaded and returned.')
+
+
+def get_object_selection(request):
+    """
+    Builds the ObjectSelection described by the query string of a list request.
+    :return: The selection, or None if the request does not page, filter, sort or project the list
+    :rtype: ObjectSelection
+    :raise CairisHTTPError:
+    """
+    fields = get_requested_fields(request)
+    if fields is None and not any(arg in request.args for arg in SELECTION_ARGS):
+        return None
+
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = request.args.get('limit', None)
+        if limit is not None:
+            limit = int(limit)
+    except ValueError:
+        raise CairisHTTPError(httplib.BAD_REQUEST, 'The offset and limit must be numbers', 'Invalid list parameters')
+
+    order = request.args.get('order', 'asc')
+    if order not in ['asc', 'desc']:
+        raise CairisHTTPError(httplib.BAD_REQUEST, 'The order must be asc or desc', 'Invalid list parameters')
+    sort_by = request.args.get('sort', None)
+    if sort_by is None and 'order' in request.args:
+        sort_by = 'name'
+
+    try:
+        return ObjectSelection(
+            offset=offset,
+            limit=limit,
+            cursor=request.args.get('cursor', None),
+            environment=request.args.get('environment', None),
+            tag=request.args.get('tag', None),
+            objtType=request.args.get('type', None),
+            namePrefix=request.args.get('name_prefix', None),
+            sortBy=sort_by,
+            descending=(order == 'desc'),
+            fields=fields
+        )
+    except ARMException as ex:
+        raise CairisHTTPError(httplib.BAD_REQUEST, str(ex.value), 'Invalid list parameters')
+
+
+def get_requested_fields(request):
+    """
+    :return: The attribute names listed in the fields parameter, including the id and name, or None if all are wanted
+    :rtype: list[str]
+    """
+    fields = request.args.get('fields', None)
+    if fields is None:
+        return None
+    return KEY_ATTRIBUTES + [attributeName(field) for field in fields.split(',') if field.strip() != '']
+
+
+def add_selection_headers(resp, selection):
+    """
+    Adds the paging headers of a selected list to its response.
+    """
+    if selection is not None and selection.isPaged():
+        resp.headers['X-Total-Count'] = str(selection.total())
+        if selection.nextCursor() is not None:
+            resp.headers['X-Next-Cursor'] = selection.nextCursor()
+    return resp
@@ -239,6 +239,41 @@ class RiskScore(object):
         self.details = details
 
 
+@swagger.model
+class RiskScoreDelta(object):
+    # region Swagger Docs
+    resource_fields = {
+        obj_id_field: fields.String,
+        'environmentName': fields.String,
+        'riskName': fields.String,
+        'responseName': fields.String,
+        'unmitScoreBefore': fields.Integer,
+        'mitScoreBefore': fields.Integer,
+        'unmitScoreAfter': fields.Integer,
+        'mitScoreAfter': fields.Integer
+    }
+    required = resource_fields.keys()
+    required.remove(obj_id_field)
+    swagger_metadata = {
+        obj_id_field: { 'enum': [__name__+'.RiskScoreDelta'] }
+    }
+    # endregion
+    def __init__(self, environment_name, risk_name, response_name, unmit_score_before, mit_score_before, unmit_score_after, mit_score_after):
+        """
+        :type unmit_score_before: int
+        :type mit_score_before: int
+        :type unmit_score_after: int
+        :type mit_score_after: int
+        """
+        self.environmentName = environment_name
+        self.riskName = risk_name
+        self.responseName = response_name
+        self.unmitScoreBefore = unmit_score_before
+        self.mitScoreBefore = mit_score_before
+        self.unmitScoreAfter = unmit_score_after
+        self.mitScoreAfter = mit_score_after
+
+
 @swagger.model
 class RiskRating(object):
     # region Swagger Doc
@@ -347,4 +382,23 @@ class ValuedRole(object):
     # endregion
     def __init__(self, role_name, cost):
         self.roleName = role_name
-        self.cost = cost
\ No newline at end of file
+        self.cost = cost
+
+
+@swagger.model
+class ImportJobStatus(object):
+    # region Swagger Docs
+    resource_fields = {
+        'id': fields.String,
+        'type': fields.String,
+        'status': fields.String,
+        'phase': fields.String,
+        'parsed': fields.Raw,
+        'written': fields.Raw,
+        'message': fields.String
+    }
+    required = resource_fields.keys()
+    swagger_metadata = {
+        'status': { 'enum': ['queued', 'running', 'completed', 'failed', 'cancelled'] }
+    }
+    # endregion
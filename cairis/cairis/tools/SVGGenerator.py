@@ -1,34 +1,47 @@
-import os
 from re import sub as substitute
-from subprocess import check_output as cmd
-from tempfile import mkstemp as make_tempfile
 from xml.dom import minidom
 
+from tools.LayoutPool import run_layout
+
 __author__ = 'Robin Quetin'
 
 
 class SVGGenerator(object):
-    def __init__(self):
+    def __init__(self, layout_pool=None):
         self.extension = 'svg'
+        self.layout_pool = layout_pool
 
-    def generate(self, dot_code, model_type):
+    def generate(self, dot_code, model_type, renderer='dot'):
+        """
+        Lays out the DOT text and renders it as SVG in a single Graphviz run, piping the text in and the SVG out.
+        The run goes through the layout pool when there is one.
+        """
         if not dot_code:
             dot_code = ''
-        fd, temp_abspath = make_tempfile(suffix=self.extension)
-        temp_file = open(temp_abspath, 'wb')
-        temp_file.write(dot_code)
-        temp_file.close()
-        os.close(fd)
-        output = cmd(['dot', '-Tsvg', temp_abspath])
-        os.remove(temp_abspath)
-        output = self.process_output(str(output), model_type)
+        if isinstance(dot_code, unicode):
+            dot_code = dot_code.encode('utf-8')
+        args = [renderer, '-T' + self.extension]
+        if self.layout_pool is None:
+            output = run_layout(args, dot_code)
+        else:
+            output = self.layout_pool.run(args, dot_code)
+        output = self.process_output(output, model_type)
         return output
 
-    def generate_file(self, dot_code, output_file, model_type):
-        output = self.generate(dot_code, model_type)
+    def metrics(self):
+        if self.layout_pool is None:
+            return {}
+        return self.layout_pool.metrics()
+
+    def generate_file(self, dot_code, output_file, model_type, renderer='dot'):
+        output = self.generate(dot_code, model_type, renderer)
+        self.write_file(output, output_file)
 
+    def write_file(self, output, output_file):
+        if isinstance(output, unicode):
+            output = output.encode('utf-8')
         try:
-            fs_output = open(output_file, 'rb')
+            fs_output = open(output_file, 'wb')
             fs_output.write(output)
             fs_output.close()
         except Exception, ex:
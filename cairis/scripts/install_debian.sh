@@ -4,7 +4,7 @@
 # Fixed values
 CAIRIS_GIT='https://github.com/RobinQuetin/CAIRIS-web.git'
 APTDEP="python-dev build-essential mysql-server mysql-client graphviz docbook dblatex python-pip git libmysqlclient-dev --no-install-recommends texlive-latex-extra"
-PYTHONDEP="mysql-python==1.2.3 pyparsing==1.5.7 pydot flask flask-restful flask-restful-swagger flask-cors tornado jsonpickle"
+PYTHONDEP="mysql-python==1.2.3 pyparsing==1.5.7 pydot flask flask-restful flask-restful-swagger flask-cors tornado jsonpickle numpy"
 # Global variables
 INSTALL_DESKTOP='x'
 CAIRIS_USER=$USER